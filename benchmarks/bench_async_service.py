@@ -0,0 +1,157 @@
+"""Benchmark: asyncio load through ``AsyncDecisionService`` versus one executor hop per call.
+
+``--concurrency`` client tasks share ``--requests`` v3 decisions (and a tenth
+as many v4 envelope validations). The baseline awaits
+``loop.run_in_executor`` per call on a one-thread pool; the service coalesces
+the same calls into micro-batches of up to ``--max-batch-size`` held for at
+most ``--max-wait-ms``. Reports throughput and per-call p50/p95/p99 latency.
+Run with ``PYTHONPATH=src python benchmarks/bench_async_service.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import random
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from qwg.async_service import AsyncDecisionService
+from qwg.engine import DecisionEngine
+from qwg.risk_context import RiskContext, RiskLevel
+from qwg.serve import latency_percentiles
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES, SUPPORTED_REASON_IDS
+from qwg.v4.crypto_verdict import (
+    build_signed_crypto_verdict_envelope,
+    build_unsigned_crypto_verdict_payload,
+    validate_crypto_verdict_envelope,
+)
+from qwg.v4.signing import (
+    build_signature_bundle,
+    build_test_signature_entry,
+    signed_payload_hash,
+    verify_test_only_signature,
+)
+from qwg.v4.trust_profile import CLASSICAL_ED25519, ML_DSA, build_test_trust_profile
+
+VALIDATION = {
+    "expected_context_hash": "a" * 64,
+    "trust_profile": build_test_trust_profile(),
+    "verification_time": "2026-06-21T00:01:00Z",
+    "verifier": verify_test_only_signature,
+}
+
+
+def contexts(count: int) -> list[RiskContext]:
+    rng = random.Random(11)
+    levels = list(RiskLevel)
+    return [
+        RiskContext(
+            sentinel_level=rng.choice(levels),
+            adn_level=rng.choice(levels[:3]),
+            wallet_balance=rng.choice([100.0, 5_000.0, 50_000.0]),
+            tx_amount=rng.uniform(0, 20_000),
+            behaviour_score=rng.uniform(0.5, 2.0),
+            trusted_device=rng.random() > 0.2,
+        )
+        for _ in range(count)
+    ]
+
+
+def envelope() -> dict[str, Any]:
+    payload = build_unsigned_crypto_verdict_payload(
+        request_id="bench-request",
+        context_hash="a" * 64,
+        freshness_nonce="bench-nonce",
+        not_before="2026-06-21T00:00:00Z",
+        not_after="2026-06-21T00:05:00Z",
+        decision="ALLOW",
+        reason_ids=[SUPPORTED_REASON_IDS[0]],
+        evidence_hash="b" * 64,
+        evidence_families=[SUPPORTED_EVIDENCE_FAMILIES[0]],
+        metadata={"pilot": "bench"},
+        key_registry_version=1,
+    )
+    payload_hash = signed_payload_hash(payload=payload)
+    signatures = [build_test_signature_entry(algorithm=algorithm, signed_hash=payload_hash) for algorithm in (CLASSICAL_ED25519, ML_DSA)]
+    return build_signed_crypto_verdict_envelope(unsigned_payload=payload, signature_bundle=build_signature_bundle(signatures=signatures))
+
+
+async def drive(call: Callable[[Any], Awaitable[Any]], items: list[Any], concurrency: int) -> tuple[list[Any], list[int], float]:
+    results: list[Any] = [None] * len(items)
+    latencies: list[int] = []
+    cursor = iter(range(len(items)))
+
+    async def client() -> None:
+        for index in cursor:
+            started = time.perf_counter_ns()
+            results[index] = await call(items[index])
+            latencies.append(time.perf_counter_ns() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return results, latencies, time.perf_counter() - started
+
+
+def report(label: str, count: int, latencies: list[int], elapsed: float) -> None:
+    summary = latency_percentiles(latencies)
+    print(
+        f"{label:<34} {count / elapsed:>9.0f}/s  p50 {summary['p50']:>7.3f} ms"
+        f"  p95 {summary['p95']:>7.3f} ms  p99 {summary['p99']:>7.3f} ms"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = DecisionEngine()
+    batch = contexts(args.requests)
+    expected = [engine.evaluate_transaction_v3(ctx) for ctx in batch]
+    envelopes = [envelope() for _ in range(max(1, args.requests // 10))]
+    checked = validate_crypto_verdict_envelope(envelopes[0], **VALIDATION)
+    validate = functools.partial(validate_crypto_verdict_envelope, **VALIDATION)
+    loop = asyncio.get_running_loop()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+
+        async def per_call_v3(ctx: RiskContext) -> Any:
+            return await loop.run_in_executor(executor, engine.evaluate_transaction_v3, ctx)
+
+        async def per_call_v4(verdict: dict[str, Any]) -> Any:
+            return await loop.run_in_executor(executor, validate, verdict)
+
+        results, latencies, elapsed = await drive(per_call_v3, batch, args.concurrency)
+        assert results == expected
+        report("v3, executor hop per call", len(batch), latencies, elapsed)
+        results, latencies, elapsed = await drive(per_call_v4, envelopes, args.concurrency)
+        assert all(result == checked for result in results)
+        report("v4 validate, executor hop per call", len(envelopes), latencies, elapsed)
+
+    async with AsyncDecisionService(
+        engine, max_batch_size=args.max_batch_size, max_wait=args.max_wait_ms / 1e3
+    ) as service:
+        results, latencies, elapsed = await drive(service.evaluate_transaction_v3, batch, args.concurrency)
+        assert results == expected
+        report("v3, AsyncDecisionService", len(batch), latencies, elapsed)
+
+        async def service_v4(verdict: dict[str, Any]) -> Any:
+            return await service.validate_crypto_verdict_envelope(verdict, **VALIDATION)
+
+        results, latencies, elapsed = await drive(service_v4, envelopes, args.concurrency)
+        assert all(result == checked for result in results)
+        report("v4 validate, AsyncDecisionService", len(envelopes), latencies, elapsed)
+        print(f"service stats: {service.stats()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=1.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
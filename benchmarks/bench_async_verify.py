@@ -0,0 +1,146 @@
+"""Benchmark: asyncio bundle verification versus sequential synchronous verification.
+
+A stub backend models an HSM or remote verifier with a fixed latency per call
+(``--latency-ms``): the synchronous path sleeps in the calling thread, the
+asyncio path awaits ``asyncio.sleep`` so thousands of verifications overlap.
+Run with ``PYTHONPATH=src python benchmarks/bench_async_verify.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import time
+from typing import Any
+
+from qwg.v4 import COMPONENT_ROLE
+from qwg.v4.real_crypto_backend import (
+    build_real_crypto_signature_input,
+    decode_binary_signature_material,
+    encode_binary_signature_material,
+    make_async_real_crypto_signature_verifier,
+    make_real_crypto_signature_verifier,
+)
+from qwg.v4.signing import (
+    COMPONENT_VERDICT_DOMAIN,
+    build_signature_bundle,
+    verify_signature_bundle,
+    verify_signature_bundle_async,
+)
+from qwg.v4.trust_profile import REQUIRED_ALGORITHMS, default_standard_profile_for_algorithm
+
+PAYLOAD_HASH = "a" * 64
+VERIFY_WINDOW = {
+    "verification_time": "2026-06-21T00:03:00Z",
+    "artifact_not_before": "2026-06-21T00:01:00Z",
+    "artifact_not_after": "2026-06-21T00:02:00Z",
+}
+
+
+def expected_signature(algorithm: str, public_key: str, message: bytes) -> str:
+    digest = hashlib.sha256(f"{algorithm}|".encode() + decode_binary_signature_material(public_key, field="public_key") + message)
+    return encode_binary_signature_material(digest.digest(), field="signature")
+
+
+class SyncStubBackend:
+    backend_name = "stub-latency-backend"
+    backend_version = "bench"
+    supported_algorithms = REQUIRED_ALGORITHMS
+
+    def __init__(self, latency_seconds: float) -> None:
+        self.latency_seconds = latency_seconds
+
+    def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> bool:
+        time.sleep(self.latency_seconds)
+        return signature == expected_signature(algorithm, public_key, message)
+
+
+class AsyncStubBackend(SyncStubBackend):
+    async def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> bool:  # type: ignore[override]
+        await asyncio.sleep(self.latency_seconds)
+        return signature == expected_signature(algorithm, public_key, message)
+
+
+def trust_key(algorithm: str) -> dict[str, Any]:
+    return {
+        "role": COMPONENT_ROLE,
+        "key_id": f"prod-{COMPONENT_ROLE}-{algorithm}-v1",
+        "key_version": 1,
+        "algorithm": algorithm,
+        "not_before": "2026-06-21T00:00:00Z",
+        "not_after": "2026-06-21T00:05:00Z",
+        "status": "active",
+        "public_key": encode_binary_signature_material(f"public-{algorithm}".encode(), field="public_key"),
+    }
+
+
+def signed_entry(key: dict[str, Any]) -> dict[str, Any]:
+    standard_profile = default_standard_profile_for_algorithm(key["algorithm"])
+    message = build_real_crypto_signature_input(
+        algorithm=key["algorithm"],
+        standard_profile=standard_profile,
+        domain_tag=COMPONENT_VERDICT_DOMAIN,
+        signed_payload_hash=PAYLOAD_HASH,
+        key_id=key["key_id"],
+        key_version=key["key_version"],
+    )
+    return {
+        "algorithm": key["algorithm"],
+        "standard_profile": standard_profile,
+        "domain_tag": COMPONENT_VERDICT_DOMAIN,
+        "signed_payload_hash": PAYLOAD_HASH,
+        "key_id": key["key_id"],
+        "key_version": key["key_version"],
+        "signature": expected_signature(key["algorithm"], key["public_key"], message),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bundles", type=int, default=2_000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1_000
+    keys = [trust_key(algorithm) for algorithm in REQUIRED_ALGORITHMS]
+    profile = {"schema_version": "shield.key_registry.v1", "registry_version": 1, "entries": keys}
+    bundle = build_signature_bundle(signatures=[signed_entry(key) for key in keys])
+    sync_verifier = make_real_crypto_signature_verifier(SyncStubBackend(latency))
+    async_verifier = make_async_real_crypto_signature_verifier(AsyncStubBackend(latency), timeout_seconds=60)
+
+    def verify_sync() -> dict[str, Any]:
+        return verify_signature_bundle(
+            bundle, expected_signed_payload_hash=PAYLOAD_HASH, trust_profile=profile, verifier=sync_verifier, **VERIFY_WINDOW
+        )
+
+    async def verify_async(count: int) -> list[dict[str, Any]]:
+        return await asyncio.gather(
+            *(
+                verify_signature_bundle_async(
+                    bundle, expected_signed_payload_hash=PAYLOAD_HASH, trust_profile=profile, verifier=async_verifier, **VERIFY_WINDOW
+                )
+                for _ in range(count)
+            )
+        )
+
+    assert asyncio.run(verify_async(1)) == [verify_sync()]
+
+    sync_bundles = max(1, min(args.bundles, int(0.5 / max(latency * len(keys), 1e-6))))
+    started = time.perf_counter()
+    for _ in range(sync_bundles):
+        verify_sync()
+    sync_rate = sync_bundles / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    asyncio.run(verify_async(args.bundles))
+    async_rate = args.bundles / (time.perf_counter() - started)
+
+    print(f"signatures per bundle: {len(keys)}, backend latency: {args.latency_ms} ms, in flight: {args.bundles * len(keys)}")
+    print(f"{'sequential':<12} {sync_rate:9.1f} bundles/s")
+    print(f"{'asyncio':<12} {async_rate:9.1f} bundles/s")
+    print(f"{'speedup':<12} {async_rate / sync_rate:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark: audit log write throughput and indexed lookups.
+
+Appends ``--records`` v3.2 verdicts from ``--threads`` writer threads with
+one fsync per batch and with one fsync per record (``max_batch=1``), then
+times ``find_by_request_id`` against a linear scan over ``records()``. Run
+with ``PYTHONPATH=src python benchmarks/bench_audit_log.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any
+
+from qwg.audit_log import AuditLog, AuditRecordLocation
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES, SUPPORTED_REASON_IDS, build_verdict
+
+
+def verdict(number: int) -> dict[str, Any]:
+    return build_verdict(
+        request_id=f"bench-request-{number}",
+        context_hash=f"{number % 4096:064x}",
+        decision="ALLOW",
+        reason_ids=(SUPPORTED_REASON_IDS[0],),
+        evidence_hash="b" * 64,
+        evidence_families=(SUPPORTED_EVIDENCE_FAMILIES[0],),
+        metadata={"segment": "retail"},
+    )
+
+
+def write(directory: str, *, records: int, threads: int, max_batch: int, segment_bytes: int) -> tuple[float, dict[str, int]]:
+    verdicts = [verdict(number) for number in range(records)]
+    log = AuditLog(directory, max_batch=max_batch, segment_bytes=segment_bytes)
+
+    def writer(offset: int) -> None:
+        futures: list[Future[AuditRecordLocation]] = [log.append(item) for item in verdicts[offset::threads]]
+        for future in futures:
+            future.result()
+
+    workers = [threading.Thread(target=writer, args=(offset,)) for offset in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    stats = log.stats()
+    log.close()
+    return elapsed, stats
+
+
+def linear_find(log: AuditLog, request_id: str) -> list[dict[str, Any]]:
+    return [record for _, record in log.records() if record.get("request_id") == request_id]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    parser.add_argument("--segment-mib", type=int, default=4)
+    args = parser.parse_args()
+    segment_bytes = args.segment_mib * 1024 * 1024
+
+    print(f"{'writes':<16} {'records':>8} {'batches':>8} {'seconds':>8} {'records/s':>10}")
+    for label, max_batch in (("batched fsync", 256), ("fsync per record", 1)):
+        with tempfile.TemporaryDirectory() as directory:
+            elapsed, stats = write(
+                directory, records=args.records, threads=args.threads, max_batch=max_batch, segment_bytes=segment_bytes
+            )
+            assert stats["records"] == args.records
+            print(f"{label:<16} {stats['records']:>8} {stats['batches']:>8} {elapsed:>8.2f} {stats['records'] / elapsed:>10.0f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        write(directory, records=args.records, threads=1, max_batch=256, segment_bytes=segment_bytes)
+        with AuditLog(directory) as log:
+            print(f"reopened: {log.stats()['segments']} segments")
+            targets = [f"bench-request-{random.Random(seed).randrange(args.records)}" for seed in range(args.lookups)]
+            for request_id in targets[:20]:
+                assert log.find_by_request_id(request_id) == linear_find(log, request_id)
+
+            started = time.perf_counter()
+            for request_id in targets:
+                log.find_by_request_id(request_id)
+            indexed = (time.perf_counter() - started) / len(targets)
+
+            scans = max(1, len(targets) // 200)
+            started = time.perf_counter()
+            for request_id in targets[:scans]:
+                linear_find(log, request_id)
+            linear = (time.perf_counter() - started) / scans
+            print(f"indexed lookup {indexed * 1e6:10.1f} us   linear scan {linear * 1e6:10.1f} us   {linear / indexed:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
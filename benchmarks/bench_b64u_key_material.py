@@ -0,0 +1,111 @@
+"""Benchmark: ``b64u:`` decoding and per-snapshot public-key caching.
+
+Uses ML-DSA-sized (2420-byte signature, 1952-byte public key) and
+Falcon-sized (1280-byte signature, 1793-byte public key) material. The verify
+rows run the real-backend adapter with a stub backend that accepts every
+signature, so they measure only QWG's validation and decoding overhead. Run with
+``PYTHONPATH=src python benchmarks/bench_b64u_key_material.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import binascii
+import os
+import timeit
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from qwg.v4 import COMPONENT_ROLE
+from qwg.v4.real_crypto_backend import (
+    REAL_SIGNATURE_ENCODING_PREFIX,
+    DecodedPublicKeyCache,
+    decode_binary_signature_material,
+    encode_binary_signature_material,
+    make_real_crypto_signature_verifier,
+)
+from qwg.v4.signing import COMPONENT_VERDICT_DOMAIN
+from qwg.v4.trust_profile import default_standard_profile_for_algorithm
+
+_BASE64URL_ALPHABET = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+MATERIAL_SIZES = {"ml-dsa": (2420, 1952), "fn-dsa": (1280, 1793)}
+
+
+def set_based_decode(encoded: str) -> bytes:
+    """The previous implementation: build a character set, then urlsafe-decode."""
+
+    body = encoded[len(REAL_SIGNATURE_ENCODING_PREFIX) :]
+    if "=" in body or set(body) - _BASE64URL_ALPHABET:
+        raise ValueError("invalid")
+    try:
+        return base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError("invalid") from exc
+
+
+class AcceptingBackend:
+    backend_name = "stub-accepting-backend"
+    backend_version = "bench"
+    supported_algorithms = tuple(MATERIAL_SIZES)
+
+    def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> bool:
+        return True
+
+
+def registry_key(algorithm: str, public_key: bytes) -> dict[str, Any]:
+    return {
+        "role": COMPONENT_ROLE,
+        "key_id": f"prod-{COMPONENT_ROLE}-{algorithm}-v1",
+        "key_version": 1,
+        "algorithm": algorithm,
+        "not_before": "2026-06-21T00:00:00Z",
+        "not_after": "2026-06-21T00:05:00Z",
+        "status": "active",
+        "public_key": encode_binary_signature_material(public_key, field="public_key"),
+    }
+
+
+def signature_entry(key: dict[str, Any], signature: bytes) -> dict[str, Any]:
+    return {
+        "algorithm": key["algorithm"],
+        "standard_profile": default_standard_profile_for_algorithm(key["algorithm"]),
+        "domain_tag": COMPONENT_VERDICT_DOMAIN,
+        "signed_payload_hash": "a" * 64,
+        "key_id": key["key_id"],
+        "key_version": key["key_version"],
+        "signature": encode_binary_signature_material(signature, field="signature"),
+    }
+
+
+def per_call_us(callback: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(callback, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(f"{'case':<34} {'before us':>10} {'after us':>10} {'speedup':>8}")
+    for algorithm, (signature_size, public_key_size) in MATERIAL_SIZES.items():
+        signature = os.urandom(signature_size)
+        encoded = encode_binary_signature_material(signature, field="signature")
+        assert set_based_decode(encoded) == decode_binary_signature_material(encoded) == signature
+        before = per_call_us(partial(set_based_decode, encoded), args.number)
+        after = per_call_us(partial(decode_binary_signature_material, encoded), args.number)
+        print(f"{f'decode {algorithm} {signature_size} B signature':<34} {before:10.2f} {after:10.2f} {before / after:7.2f}x")
+
+        key = registry_key(algorithm, os.urandom(public_key_size))
+        entry = signature_entry(key, signature)
+        uncached = make_real_crypto_signature_verifier(AcceptingBackend())
+        cached = make_real_crypto_signature_verifier(AcceptingBackend(), public_key_cache=DecodedPublicKeyCache())
+        assert uncached(entry, key) is cached(entry, key) is True
+        before = per_call_us(partial(uncached, entry, key), args.number)
+        after = per_call_us(partial(cached, entry, key), args.number)
+        print(f"{f'verify {algorithm} entry, key cache':<34} {before:10.2f} {after:10.2f} {before / after:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark: binary wire format versus canonical JSON for signed v4 envelopes.
+
+Envelopes carry ML-DSA-65 (3309-byte) and Falcon-1024 (1280-byte) sized
+signatures next to a classical one, as on the production wire. Reports size
+and per-envelope encode/parse time; "parse" is
+``parse_json_no_duplicate_keys`` for JSON and the strict binary decoder for
+the binary form. Run with ``PYTHONPATH=src python benchmarks/bench_binary_envelope.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import timeit
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES, SUPPORTED_REASON_IDS
+from qwg.v4.binary_envelope import (
+    decode_binary_crypto_verdict_envelope,
+    encode_binary_crypto_verdict_envelope,
+)
+from qwg.v4.crypto_verdict import (
+    build_signed_crypto_verdict_envelope,
+    build_unsigned_crypto_verdict_payload,
+)
+from qwg.v4.real_crypto_backend import encode_binary_signature_material
+from qwg.v4.signing import (
+    COMPONENT_VERDICT_DOMAIN,
+    build_signature_bundle,
+    parse_json_no_duplicate_keys,
+    signed_payload_hash,
+    to_canonical_json,
+)
+from qwg.v4.trust_profile import default_standard_profile_for_algorithm
+
+SIGNATURE_SIZES = {"classical-ed25519": 64, "ml-dsa": 3309, "fn-dsa": 1280}
+
+
+def build_envelope(metadata_entries: int) -> dict[str, Any]:
+    payload = build_unsigned_crypto_verdict_payload(
+        request_id="bench-request-1",
+        context_hash=os.urandom(32).hex(),
+        freshness_nonce="bench-nonce-1",
+        not_before="2026-06-21T00:00:00Z",
+        not_after="2026-06-21T00:05:00Z",
+        decision="ALLOW",
+        reason_ids=list(SUPPORTED_REASON_IDS[:2]),
+        evidence_hash=os.urandom(32).hex(),
+        evidence_families=list(SUPPORTED_EVIDENCE_FAMILIES),
+        key_registry_version=1,
+        metadata={f"field-{index}": {"segment": "retail", "score": index} for index in range(metadata_entries)},
+    )
+    payload_hash = signed_payload_hash(payload=payload)
+    entries = [
+        {
+            "algorithm": algorithm,
+            "standard_profile": default_standard_profile_for_algorithm(algorithm),
+            "key_id": f"prod-qwg-{algorithm}-v1",
+            "key_version": 1,
+            "signed_payload_hash": payload_hash,
+            "domain_tag": COMPONENT_VERDICT_DOMAIN,
+            "signature": encode_binary_signature_material(os.urandom(size), field="signature"),
+        }
+        for algorithm, size in SIGNATURE_SIZES.items()
+    ]
+    return build_signed_crypto_verdict_envelope(
+        unsigned_payload=payload, signature_bundle=build_signature_bundle(signatures=entries)
+    )
+
+
+def per_call_us(callback: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(callback, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'metadata':>8} {'json B':>8} {'binary B':>9} {'ratio':>6} {'json enc us':>12} {'bin enc us':>11} {'json parse us':>14} {'bin parse us':>13}")
+    for metadata_entries in (1, 16, 128):
+        envelope = build_envelope(metadata_entries)
+        text = to_canonical_json(envelope)
+        raw = encode_binary_crypto_verdict_envelope(envelope)
+        assert decode_binary_crypto_verdict_envelope(raw) == parse_json_no_duplicate_keys(text) == json.loads(text)
+        number = max(1, args.number // metadata_entries)
+        json_encode = per_call_us(partial(to_canonical_json, envelope), number)
+        binary_encode = per_call_us(partial(encode_binary_crypto_verdict_envelope, envelope), number)
+        json_parse = per_call_us(partial(parse_json_no_duplicate_keys, text), number)
+        binary_parse = per_call_us(partial(decode_binary_crypto_verdict_envelope, raw), number)
+        print(
+            f"{metadata_entries:>8} {len(text.encode()):>8} {len(raw):>9} {len(raw) / len(text.encode()):>6.2f}"
+            f" {json_encode:>12.1f} {binary_encode:>11.1f} {json_parse:>14.1f} {binary_parse:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
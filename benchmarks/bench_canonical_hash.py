@@ -0,0 +1,75 @@
+"""Benchmark: single-pass canonical hashing versus the two-pass reference.
+
+Run with the package importable, e.g. ``PYTHONPATH=src python benchmarks/bench_canonical_hash.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+
+from qwg.v4.signing import (
+    COMPONENT_VERDICT_DOMAIN,
+    SIGNED_PAYLOAD_HASH_PREFIX,
+    normalise_for_signing,
+    signed_payload_hash,
+)
+
+
+def two_pass_signed_payload_hash(payload: dict) -> str:
+    canonical = json.dumps(
+        normalise_for_signing(payload, path="$"),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        allow_nan=False,
+    )
+    prefix = f"{SIGNED_PAYLOAD_HASH_PREFIX}\n{COMPONENT_VERDICT_DOMAIN}\n"
+    return hashlib.sha256((prefix + canonical).encode("utf-8")).hexdigest()
+
+
+def build_payload(metadata_entries: int) -> dict:
+    return {
+        "request_id": "bench-request",
+        "context_hash": "a" * 64,
+        "reason_ids": ["QWG_OK_POSTURE_ALLOW"],
+        "metadata": {
+            f"enrichment_{index:06d}": {
+                "label": f"wallet-segment-{index}",
+                "score_bp": index % 10_000,
+                "flags": [True, False, index % 3 == 0],
+                "note": "caf\u00e9" if index % 7 == 0 else "plain",
+            }
+            for index in range(metadata_entries)
+        },
+    }
+
+
+def timed(label: str, func, payload: dict, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func(payload)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / rounds * 1e3:9.3f} ms/op")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 20_000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        payload = build_payload(size)
+        assert signed_payload_hash(payload=payload) == two_pass_signed_payload_hash(payload)
+        print(f"metadata entries: {size}")
+        baseline = timed("two-pass (normalise+dumps)", two_pass_signed_payload_hash, payload, args.rounds)
+        streamed = timed("single-pass copy-on-write", lambda item: signed_payload_hash(payload=item), payload, args.rounds)
+        print(f"{'speedup':<28} {baseline / streamed:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
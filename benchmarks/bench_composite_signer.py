@@ -0,0 +1,121 @@
+"""Benchmark: composite concurrent signing versus per-algorithm sequential signing.
+
+Stub backends model an HSM or liboqs call that releases the GIL with a fixed
+latency per signature (``--latency-ms``). Run with
+``PYTHONPATH=src python benchmarks/bench_composite_signer.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import time
+from typing import Any
+
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES, SUPPORTED_REASON_IDS
+from qwg.v4 import COMPONENT_ROLE
+from qwg.v4.composite_signer import CompositeSigningKey, CompositeVerdictSigner
+from qwg.v4.crypto_verdict import (
+    build_signed_crypto_verdict_envelope,
+    build_unsigned_crypto_verdict_payload,
+)
+from qwg.v4.real_crypto_backend import (
+    build_signature_entry_with_real_backend,
+    encode_binary_signature_material,
+)
+from qwg.v4.signing import COMPONENT_VERDICT_DOMAIN, build_signature_bundle, signed_payload_hash
+from qwg.v4.trust_profile import SUPPORTED_ALGORITHMS, default_standard_profile_for_algorithm
+
+
+class StubBackend:
+    backend_name = "stub-latency-backend"
+    backend_version = "bench"
+    supported_algorithms = SUPPORTED_ALGORITHMS
+
+    def __init__(self, latency_seconds: float) -> None:
+        self.latency_seconds = latency_seconds
+
+    def sign_message(self, *, algorithm: str, private_key_reference: str, message: bytes) -> str:
+        time.sleep(self.latency_seconds)
+        digest = hashlib.sha256(f"{algorithm}|{private_key_reference}|".encode() + message).digest()
+        return encode_binary_signature_material(digest, field="signature")
+
+
+def build_payload(index: int) -> dict[str, Any]:
+    return build_unsigned_crypto_verdict_payload(
+        request_id=f"bench-request-{index}",
+        context_hash="a" * 64,
+        freshness_nonce=f"bench-nonce-{index}",
+        not_before="2026-06-21T00:00:00Z",
+        not_after="2026-06-21T00:05:00Z",
+        decision="ALLOW",
+        reason_ids=list(SUPPORTED_REASON_IDS[:2]),
+        evidence_hash="b" * 64,
+        evidence_families=list(SUPPORTED_EVIDENCE_FAMILIES),
+        key_registry_version=1,
+        metadata={"segment": "retail"},
+    )
+
+
+def sequential_sign(backend: StubBackend, payload: dict[str, Any]) -> dict[str, Any]:
+    payload_hash = signed_payload_hash(payload=payload)
+    entries = [
+        build_signature_entry_with_real_backend(
+            algorithm=algorithm,
+            standard_profile=default_standard_profile_for_algorithm(algorithm),
+            domain_tag=COMPONENT_VERDICT_DOMAIN,
+            signed_payload_hash=payload_hash,
+            key_id=f"prod-{COMPONENT_ROLE}-{algorithm}-v1",
+            key_version=1,
+            private_key_reference=f"hsm://qwg/{algorithm}/v1",
+            backend=backend,
+        )
+        for algorithm in SUPPORTED_ALGORITHMS
+    ]
+    return build_signed_crypto_verdict_envelope(
+        unsigned_payload=payload,
+        signature_bundle=build_signature_bundle(signatures=entries),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--verdicts", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    backend = StubBackend(args.latency_ms / 1_000)
+    payloads = [build_payload(index) for index in range(args.verdicts)]
+    signer = CompositeVerdictSigner(
+        signing_keys=[
+            CompositeSigningKey(
+                algorithm=algorithm,
+                key_id=f"prod-{COMPONENT_ROLE}-{algorithm}-v1",
+                key_version=1,
+                private_key_reference=f"hsm://qwg/{algorithm}/v1",
+                backend=backend,
+            )
+            for algorithm in SUPPORTED_ALGORITHMS
+        ]
+    )
+    assert signer.sign(payloads[0])[1] == sequential_sign(backend, payloads[0])
+
+    started = time.perf_counter()
+    for payload in payloads:
+        sequential_sign(backend, payload)
+    sequential = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for payload in payloads:
+        signer.sign(payload)
+    composite = time.perf_counter() - started
+    signer.close()
+
+    print(f"algorithms per verdict: {len(SUPPORTED_ALGORITHMS)}, backend latency: {args.latency_ms} ms")
+    print(f"{'sequential':<12} {args.verdicts / sequential:9.1f} verdicts/s")
+    print(f"{'composite':<12} {args.verdicts / composite:9.1f} verdicts/s")
+    print(f"{'speedup':<12} {sequential / composite:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark: mmap streaming validation of an NDJSON envelope file.
+
+Writes ``--envelopes`` signed test envelopes to a temporary file, then
+validates them with the streaming reader and with a read-everything baseline
+(``read_bytes().splitlines()``), each in a fresh child process so peak RSS is
+measured per approach. Run with
+``PYTHONPATH=src python benchmarks/bench_envelope_stream.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES, SUPPORTED_REASON_IDS
+from qwg.v4.crypto_verdict import (
+    build_signed_crypto_verdict_envelope,
+    build_unsigned_crypto_verdict_payload,
+)
+from qwg.v4.signing import (
+    build_signature_bundle,
+    build_test_signature_entry,
+    signed_payload_hash,
+    to_canonical_json,
+)
+from qwg.v4.trust_profile import REQUIRED_ALGORITHMS
+
+CHILD = """
+import json, resource, sys, time
+from pathlib import Path
+from qwg.v4.crypto_verdict import validate_crypto_verdict_envelope
+from qwg.v4.envelope_stream import stream_validate_crypto_verdict_envelopes
+from qwg.v4.signing import parse_json_no_duplicate_keys, verify_test_only_signature
+from qwg.v4.trust_profile import build_test_trust_profile
+
+mode, path = sys.argv[1], Path(sys.argv[2])
+profile = build_test_trust_profile()
+started = time.perf_counter()
+valid = 0
+if mode == "stream":
+    for result in stream_validate_crypto_verdict_envelopes(
+        path, trust_profile=profile, verifier=verify_test_only_signature, bind_to_recorded_context=True
+    ):
+        valid += result["valid"]
+else:
+    for line in path.read_bytes().splitlines():
+        verdict = parse_json_no_duplicate_keys(line.decode("utf-8"))
+        validate_crypto_verdict_envelope(
+            verdict, expected_context_hash=verdict["context_hash"], trust_profile=profile,
+            verification_time=verdict["not_before"], verifier=verify_test_only_signature,
+        )
+        valid += 1
+elapsed = time.perf_counter() - started
+print(json.dumps({"valid": valid, "seconds": elapsed, "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+
+def signed_test_envelope() -> dict[str, Any]:
+    payload = build_unsigned_crypto_verdict_payload(
+        request_id="bench-request-1",
+        context_hash="a" * 64,
+        freshness_nonce="bench-nonce-1",
+        not_before="2026-06-21T00:00:00Z",
+        not_after="2026-06-21T00:05:00Z",
+        decision="ALLOW",
+        reason_ids=[SUPPORTED_REASON_IDS[0]],
+        evidence_hash="b" * 64,
+        evidence_families=[SUPPORTED_EVIDENCE_FAMILIES[0]],
+        metadata={"segment": "retail"},
+        key_registry_version=1,
+    )
+    payload_hash = signed_payload_hash(payload=payload)
+    signatures = [build_test_signature_entry(algorithm=algorithm, signed_hash=payload_hash) for algorithm in REQUIRED_ALGORITHMS]
+    return build_signed_crypto_verdict_envelope(
+        unsigned_payload=payload, signature_bundle=build_signature_bundle(signatures=signatures)
+    )
+
+
+def write_file(path: Path, envelopes: int) -> None:
+    line = to_canonical_json(signed_test_envelope()).encode("utf-8") + b"\n"
+    with path.open("wb") as handle:
+        for _ in range(envelopes):
+            handle.write(line)
+
+
+def run(mode: str, path: Path) -> dict[str, float]:
+    output = subprocess.run([sys.executable, "-c", CHILD, mode, str(path)], check=True, capture_output=True, text=True)
+    return json.loads(output.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--envelopes", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "verdicts.ndjson"
+        started = time.perf_counter()
+        write_file(path, args.envelopes)
+        size_mib = path.stat().st_size / 1024 / 1024
+        print(f"wrote {args.envelopes} envelopes, {size_mib:.1f} MiB in {time.perf_counter() - started:.1f}s")
+        print(f"{'mode':<10} {'valid':>7} {'seconds':>8} {'MiB/s':>7} {'env/s':>8} {'peak RSS MiB':>13}")
+        for mode in ("read-all", "stream"):
+            result = run(mode, path)
+            assert result["valid"] == args.envelopes
+            print(
+                f"{mode:<10} {int(result['valid']):>7} {result['seconds']:>8.2f} {size_mib / result['seconds']:>7.2f}"
+                f" {result['valid'] / result['seconds']:>8.0f} {result['max_rss_kib'] / 1024:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: incremental evidence hashing versus rehashing every family.
+
+Builds four evidence families of ``--entries`` items each, then repeatedly
+changes only ``dormancy_context`` and recomputes the ``evidence_hash``
+four ways: a fresh ``compute_evidence_hash`` over all families, an
+``EvidenceAccumulator`` that is handed every family again (each is
+re-serialized, only the changed one is rehashed), the same with a
+``version`` per family so unchanged ones are skipped unserialized, and one
+that is handed only the changed family. Run with
+``PYTHONPATH=src python benchmarks/bench_evidence_hash.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+
+from qwg.v3.evidence import EvidenceAccumulator, compute_evidence_hash
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES
+
+
+def build_evidence(entries: int) -> dict[str, dict[str, Any]]:
+    return {
+        family: {f"{family}_{index:06d}": {"score_bp": index % 10_000, "seen": index % 3 == 0} for index in range(entries)}
+        for family in SUPPORTED_EVIDENCE_FAMILIES
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    evidence = build_evidence(args.entries)
+    dormancy = {"dormant_days": 0}
+    accumulator = EvidenceAccumulator()
+
+    started = time.perf_counter()
+    for round_number in range(args.rounds):
+        dormancy["dormant_days"] = round_number
+        expected = compute_evidence_hash({**evidence, "dormancy_context": dormancy})
+    full = (time.perf_counter() - started) / args.rounds
+
+    started = time.perf_counter()
+    for round_number in range(args.rounds):
+        dormancy["dormant_days"] = round_number
+        for family, family_evidence in evidence.items():
+            accumulator.update(family, dormancy if family == "dormancy_context" else family_evidence)
+        resubmitted = accumulator.evidence_hash()
+    all_families = (time.perf_counter() - started) / args.rounds
+    assert resubmitted == expected
+
+    started = time.perf_counter()
+    for round_number in range(args.rounds):
+        dormancy["dormant_days"] = round_number
+        for family, family_evidence in evidence.items():
+            if family == "dormancy_context":
+                accumulator.update(family, dormancy, version=round_number)
+            else:
+                accumulator.update(family, family_evidence, version=0)
+        versioned = accumulator.evidence_hash()
+    all_versioned = (time.perf_counter() - started) / args.rounds
+    assert versioned == expected
+
+    started = time.perf_counter()
+    for round_number in range(args.rounds):
+        dormancy["dormant_days"] = round_number
+        accumulator.update("dormancy_context", dormancy)
+        result = accumulator.evidence_hash()
+    changed_only = (time.perf_counter() - started) / args.rounds
+    assert result == expected
+
+    print(f"4 families x {args.entries} entries, one family changed per round")
+    print(f"full rehash                  {full * 1e3:9.3f} ms/round")
+    print(f"accumulator, every family    {all_families * 1e3:9.3f} ms/round  ({full / all_families:.2f}x)")
+    print(f"accumulator, versioned       {all_versioned * 1e3:9.3f} ms/round  ({full / all_versioned:.0f}x)")
+    print(f"accumulator, changed family  {changed_only * 1e3:9.3f} ms/round  ({full / changed_only:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
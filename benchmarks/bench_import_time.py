@@ -0,0 +1,59 @@
+"""Benchmark: cold import cost of the ``qwg`` entry points.
+
+Runs ``python -X importtime -c "import MODULE"`` in a fresh interpreter
+``--runs`` times per module and reports the median cumulative import time
+of the module itself plus how many modules the import loads after
+interpreter startup. Before
+timing, it checks that every lazily exported name resolves to the object
+defined in its home module. Run with
+``PYTHONPATH=src python benchmarks/bench_import_time.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+
+import qwg
+import qwg.v4
+
+MODULES = ("qwg", "qwg.v4", "qwg.v4.crypto_verdict", "qwg.engine")
+
+
+def import_profile(module: str) -> tuple[int, int]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        env=os.environ,
+        text=True,
+    )
+    lines = [line for line in completed.stderr.splitlines() if line.startswith("import time:") and "|" in line]
+    rows = [line.split("|") for line in lines[1:]]
+    names = [row[2].strip() for row in rows]
+    cumulative = int(rows[names.index(module)][1])
+    return cumulative, len(names) - names.index("site") - 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=9)
+    args = parser.parse_args()
+
+    for package in (qwg, qwg.v4):
+        for name, module_name in package._LAZY_EXPORTS.items():
+            assert getattr(package, name) is getattr(importlib.import_module(module_name), name)
+
+    print(f"{'module':<24} {'median ms':>10} {'modules':>8}")
+    for module in MODULES:
+        samples = [import_profile(module) for _ in range(args.runs)]
+        median = statistics.median(cumulative for cumulative, _ in samples)
+        print(f"{module:<24} {median / 1000:>10.2f} {samples[0][1]:>8}")
+
+
+if __name__ == "__main__":
+    main()
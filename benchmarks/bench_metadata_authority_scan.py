@@ -0,0 +1,96 @@
+"""Benchmark: forbidden-authority metadata scanning on adversarial shapes.
+
+Compares the previous recursive set-intersection scan with the iterative,
+budgeted scanner and with the fused canonical walk used by envelope
+validation. Run with ``PYTHONPATH=src python benchmarks/bench_metadata_authority_scan.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+
+from qwg.v4.crypto_verdict import (
+    DEFAULT_METADATA_BUDGET,
+    FORBIDDEN_METADATA_AUTHORITY_KEYS,
+    contains_forbidden_metadata_authority,
+)
+from qwg.v4.signing import CanonicalBudget, to_canonical_json
+
+
+def recursive_scan(value: Any) -> bool:
+    if isinstance(value, dict):
+        if set(value) & FORBIDDEN_METADATA_AUTHORITY_KEYS:
+            return True
+        return any(recursive_scan(item) for item in value.values())
+    if isinstance(value, list):
+        return any(recursive_scan(item) for item in value)
+    return False
+
+
+def nested(depth: int, leaf: Any) -> Any:
+    value = leaf
+    for index in range(depth):
+        value = {"level": value} if index % 2 else [value]
+    return value
+
+
+def shapes(width: int) -> dict[str, Any]:
+    max_depth = DEFAULT_METADATA_BUDGET.max_depth
+    return {
+        "wide-clean": {f"attr_{index:06d}": {"score": index, "tags": ["a", "b"]} for index in range(width)},
+        "wide-forbidden-last": {
+            **{f"attr_{index:06d}": {"score": index} for index in range(width)},
+            "zz": {"override": True},
+        },
+        "deep-at-budget": {"blob": nested(max_depth, "leaf")},
+        "deep-adversarial": {"blob": nested(20_000, "leaf")},
+        "wide-over-budget": {"blob": list(range(DEFAULT_METADATA_BUDGET.max_nodes or 0))},
+    }
+
+
+def run(func, value: Any, rounds: int) -> str:
+    started = time.perf_counter()
+    outcome = "clean"
+    for _ in range(rounds):
+        try:
+            outcome = "forbidden" if func(value) else "clean"
+        except RecursionError:
+            return f"{'RecursionError':>22}"
+        except ValueError as exc:
+            outcome = "over budget" if "budget" in str(exc) else "forbidden"
+    elapsed = (time.perf_counter() - started) / rounds * 1e3
+    return f"{elapsed:>8.3f}ms {outcome:>11}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--width", type=int, default=20_000)
+    args = parser.parse_args()
+    budget = CanonicalBudget(
+        max_depth=DEFAULT_METADATA_BUDGET.max_depth + 1,
+        max_nodes=(DEFAULT_METADATA_BUDGET.max_nodes or 0) + 1,
+    )
+
+    def fused(metadata: Any) -> bool:
+        to_canonical_json(
+            {"metadata": metadata},
+            nested_forbidden_keys=FORBIDDEN_METADATA_AUTHORITY_KEYS,
+            budget=budget,
+        )
+        return False
+
+    print(f"{'shape':<22} {'recursive':>22} {'iterative':>22} {'fused canonical':>22}")
+    for name, metadata in shapes(args.width).items():
+        print(
+            f"{name:<22} "
+            f"{run(recursive_scan, metadata, args.rounds)} "
+            f"{run(contains_forbidden_metadata_authority, metadata, args.rounds)} "
+            f"{run(fused, metadata, args.rounds)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark: replay-protection nonce store throughput at high occupancy.
+
+Records ``--nonces`` unique ``(request_id, freshness_nonce)`` pairs with a
+five minute ``not_after`` while time advances, first in anonymous memory and
+then memory-mapped from a file, and reports checks per second plus the number
+of live nonces at the end. Run with
+``PYTHONPATH=src python benchmarks/bench_nonce_store.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from qwg.v4.nonce_store import NonceStore
+
+
+def timestamps(seconds: int) -> list[str]:
+    start = datetime(2026, 6, 21, tzinfo=UTC)
+    return [(start + timedelta(seconds=second)).strftime("%Y-%m-%dT%H:%M:%SZ") for second in range(seconds)]
+
+
+def run(store: NonceStore, nonces: int, per_second: int) -> float:
+    stamps = timestamps(nonces // per_second + 301)
+    started = time.perf_counter()
+    for number in range(nonces):
+        second = number // per_second
+        store.check_and_record(
+            request_id=f"request-{number}",
+            freshness_nonce=f"nonce-{number}",
+            not_after=stamps[second + 300],
+            verification_time=stamps[second],
+        )
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nonces", type=int, default=1_000_000)
+    parser.add_argument("--per-second", type=int, default=5_000)
+    args = parser.parse_args()
+    per_bucket = args.per_second * 60 * 2
+
+    print(f"{'mode':<8} {'nonces':>9} {'seconds':>8} {'checks/s':>9} {'live':>9}")
+    with NonceStore(bucket_seconds=60, buckets=8, max_nonces_per_bucket=per_bucket) as store:
+        elapsed = run(store, args.nonces, args.per_second)
+        print(f"{'memory':<8} {args.nonces:>9} {elapsed:>8.2f} {args.nonces / elapsed:>9.0f} {store.stats()['live_nonces']:>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "nonces.bin"
+        with NonceStore(bucket_seconds=60, buckets=8, max_nonces_per_bucket=per_bucket, path=path) as store:
+            elapsed = run(store, args.nonces, args.per_second)
+            live = store.stats()["live_nonces"]
+        print(f"{'mmap':<8} {args.nonces:>9} {elapsed:>8.2f} {args.nonces / elapsed:>9.0f} {live:>9}")
+        print(f"file size {path.stat().st_size / 1024 / 1024:.0f} MiB for {8 * per_bucket} nonces")
+
+
+if __name__ == "__main__":
+    main()
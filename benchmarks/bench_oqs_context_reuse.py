@@ -0,0 +1,139 @@
+"""Benchmark: pooled OQS Signature contexts versus a fresh context per call.
+
+The default run uses a pure-Python stub of ``oqs`` that models liboqs-python's
+per-call setup (mechanism list discovery, ``Signature`` allocation and the
+``details`` mapping) so the backend overhead can be measured without liboqs.
+Pass ``--real`` to time the installed liboqs-python instead.
+
+Run with ``PYTHONPATH=src python benchmarks/bench_oqs_context_reuse.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib
+import time
+from typing import Any
+
+from qwg.v4.oqs_mldsa_backend import OQS_ML_DSA_MECHANISM, OqsMlDsaBackend
+from qwg.v4.real_crypto_backend import (
+    decode_binary_signature_material,
+    encode_binary_signature_material,
+)
+
+STUB_MECHANISMS = tuple(f"STUB-SIG-{index}" for index in range(64)) + (OQS_ML_DSA_MECHANISM,)
+
+
+class StubSignature:
+    def __init__(self, mechanism: str, secret_key: bytes | None = None) -> None:
+        self.mechanism = mechanism
+        self.secret_key = secret_key
+        self._workspace = bytearray(4096)
+        self.details = {
+            "name": mechanism,
+            "version": "stub",
+            "claimed_nist_level": 3,
+            "is_euf_cma": True,
+            "length_public_key": 32,
+            "length_secret_key": 32,
+            "length_signature": 32,
+        }
+
+    def __enter__(self) -> StubSignature:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self._workspace = bytearray()
+
+    def generate_keypair(self) -> bytes:
+        self.secret_key = hashlib.sha256(b"stub-keypair").digest()
+        return self.secret_key
+
+    def sign(self, message: bytes) -> bytes:
+        assert self.secret_key is not None
+        return hashlib.sha256(self.secret_key + message).digest()
+
+    def verify(self, message: bytes, signature: bytes, public_key: bytes) -> bool:
+        return signature == hashlib.sha256(public_key + message).digest()
+
+
+class StubOqsModule:
+    Signature = StubSignature
+
+    @staticmethod
+    def get_enabled_sig_mechanisms() -> list[str]:
+        return [str(name) for name in STUB_MECHANISMS]
+
+
+def per_call_verify(oqs: Any, public_key: str, message: bytes, signature: str) -> bool:
+    """The pre-pooling backend path: discover, allocate, read details, verify, free."""
+
+    public_key_bytes = decode_binary_signature_material(public_key, field="public_key")
+    signature_bytes = decode_binary_signature_material(signature, field="signature")
+    if OQS_ML_DSA_MECHANISM not in tuple(oqs.get_enabled_sig_mechanisms()):
+        raise RuntimeError("mechanism not enabled")
+    with oqs.Signature(OQS_ML_DSA_MECHANISM) as verifier:
+        details = verifier.details
+        assert len(public_key_bytes) == details["length_public_key"]
+        return bool(verifier.verify(message, signature_bytes, public_key_bytes))
+
+
+def per_call_sign(oqs: Any, secret_key: bytes, message: bytes) -> str:
+    if OQS_ML_DSA_MECHANISM not in tuple(oqs.get_enabled_sig_mechanisms()):
+        raise RuntimeError("mechanism not enabled")
+    with oqs.Signature(OQS_ML_DSA_MECHANISM, secret_key) as signer:
+        return encode_binary_signature_material(signer.sign(message), field="signature")
+
+
+def timed(label: str, func: Any, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / rounds * 1e6:9.2f} us/op")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20_000)
+    parser.add_argument("--real", action="store_true", help="use the installed liboqs-python")
+    args = parser.parse_args()
+
+    oqs: Any = importlib.import_module("oqs") if args.real else StubOqsModule()
+    with oqs.Signature(OQS_ML_DSA_MECHANISM) as keygen:
+        public_key_bytes = keygen.generate_keypair()
+        secret_key = keygen.export_secret_key() if args.real else keygen.secret_key
+    public_key = encode_binary_signature_material(public_key_bytes, field="public_key")
+    message = b"qwg-v4-benchmark-evidence"
+    backend = OqsMlDsaBackend(private_key_resolver=lambda reference: secret_key, oqs_module=oqs)
+    signature = backend.sign_message(algorithm="ml-dsa", private_key_reference="hsm://bench", message=message)
+
+    assert per_call_verify(oqs, public_key, message, signature) is True
+    assert backend.verify_signature(algorithm="ml-dsa", public_key=public_key, message=message, signature=signature)
+    if not args.real:
+        assert per_call_sign(oqs, secret_key, message) == signature
+
+    print("verify")
+    baseline = timed("fresh context per call", lambda: per_call_verify(oqs, public_key, message, signature), args.rounds)
+    pooled = timed(
+        "pooled verifier context",
+        lambda: backend.verify_signature(algorithm="ml-dsa", public_key=public_key, message=message, signature=signature),
+        args.rounds,
+    )
+    print(f"{'speedup':<28} {baseline / pooled:9.2f}x")
+
+    print("sign")
+    baseline = timed("fresh context per call", lambda: per_call_sign(oqs, secret_key, message), args.rounds)
+    pooled = timed(
+        "pooled signer context",
+        lambda: backend.sign_message(algorithm="ml-dsa", private_key_reference="hsm://bench", message=message),
+        args.rounds,
+    )
+    print(f"{'speedup':<28} {baseline / pooled:9.2f}x")
+    backend.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: duplicate-key rejecting JSON parse of inbound verdict envelopes.
+
+Compares the previous hook-for-every-object parser with
+``parse_json_no_duplicate_keys`` on canonical signed envelopes (ML-DSA-65,
+Falcon-1024 and Ed25519 sized signatures) with growing metadata, plus plain
+``json.loads`` as the floor. Run with
+``PYTHONPATH=src python benchmarks/bench_parse_json_no_duplicate_keys.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from bench_binary_envelope import build_envelope
+
+from qwg.v4.signing import (
+    parse_json_no_duplicate_keys,
+    reject_duplicate_json_keys,
+    to_canonical_json,
+)
+
+
+def hook_parse(raw_json: str) -> dict[str, Any]:
+    """The previous implementation: NFC-normalizing hook on every object."""
+
+    parsed = json.loads(raw_json, object_pairs_hook=reject_duplicate_json_keys)
+    if not isinstance(parsed, dict):
+        raise ValueError("json root must be object")
+    return parsed
+
+
+def per_call_us(callback: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(callback, number=number, repeat=7)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=4_000)
+    args = parser.parse_args()
+
+    print(f"{'metadata':>8} {'bytes':>7} {'json.loads us':>14} {'hook us':>9} {'fast us':>9} {'speed-up':>9}")
+    for metadata_entries in (1, 16, 128):
+        text = to_canonical_json(build_envelope(metadata_entries))
+        assert parse_json_no_duplicate_keys(text) == hook_parse(text) == json.loads(text)
+        number = max(1, args.number // metadata_entries)
+        plain = per_call_us(partial(json.loads, text), number)
+        hooked = per_call_us(partial(hook_parse, text), number)
+        fast = per_call_us(partial(parse_json_no_duplicate_keys, text), number)
+        print(f"{metadata_entries:>8} {len(text):>7} {plain:>14.1f} {hooked:>9.1f} {fast:>9.1f} {hooked / fast:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: process-pool signing versus in-process signing under burst load.
+
+This script doubles as a pure-Python stub ``oqs`` module whose ``sign`` burns
+CPU while holding the GIL, like a liboqs call that blocks its thread. Run with
+``PYTHONPATH=src python benchmarks/bench_process_signing_pool.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import time
+
+from qwg.v4.oqs_mldsa_backend import OQS_ML_DSA_MECHANISM, OqsMlDsaBackend
+from qwg.v4.process_signing_pool import OqsWorkerBackendFactory, ProcessSigningPool
+
+STUB_OQS_MODULE = "bench_process_signing_pool"
+SECRET_KEY = b"qwg-v4-bench-process-key"
+SIGN_WORK_ROUNDS = 20_000
+
+
+def get_enabled_sig_mechanisms() -> tuple[str, ...]:
+    return (OQS_ML_DSA_MECHANISM,)
+
+
+class Signature:
+    def __init__(self, mechanism: str, secret_key: bytes | None = None) -> None:
+        self.secret_key = secret_key
+
+    def sign(self, message: bytes) -> bytes:
+        assert self.secret_key is not None
+        accumulator = 0
+        for index in range(SIGN_WORK_ROUNDS):
+            accumulator = (accumulator * 31 + index) & 0xFFFFFFFF
+        return hashlib.sha256(self.secret_key + message).digest()
+
+
+def resolve_private_key(reference: str) -> bytes:
+    return SECRET_KEY
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=400)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    import bench_process_signing_pool as stub_oqs
+
+    requests = [("ml-dsa", "hsm://qwg/ml-dsa/v1", f"verdict-{index}".encode()) for index in range(args.messages)]
+    backend = OqsMlDsaBackend(private_key_resolver=resolve_private_key, oqs_module=stub_oqs)
+    factory = OqsWorkerBackendFactory(
+        backend_cls=OqsMlDsaBackend,
+        private_key_resolver=resolve_private_key,
+        oqs_module_name=STUB_OQS_MODULE,
+        preload_private_key_references=("hsm://qwg/ml-dsa/v1",),
+    )
+
+    with ProcessSigningPool(backend_factories=[factory], processes=args.processes, batch_size=args.batch_size) as pool:
+        pool.sign_messages(requests[: args.processes])  # start and warm every worker
+        started = time.perf_counter()
+        pooled = pool.sign_messages(requests)
+        pooled_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    in_process = [
+        backend.sign_message(algorithm=algorithm, private_key_reference=reference, message=message)
+        for algorithm, reference, message in requests
+    ]
+    in_process_elapsed = time.perf_counter() - started
+    assert pooled == in_process
+
+    print(f"messages: {args.messages}, processes: {args.processes}, batch size: {args.batch_size}")
+    print(f"{'in-process':<12} {args.messages / in_process_elapsed:9.1f} signatures/s")
+    print(f"{'pool':<12} {args.messages / pooled_elapsed:9.1f} signatures/s")
+    print(f"{'speedup':<12} {in_process_elapsed / pooled_elapsed:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
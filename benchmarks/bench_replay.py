@@ -0,0 +1,69 @@
+"""Benchmark: replay throughput for recorded v3 context snapshots.
+
+Writes ``--records`` snapshots to a temporary NDJSON file and replays them
+against two policies in-process and with ``--processes`` worker processes.
+Run with ``PYTHONPATH=src python benchmarks/bench_replay.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from qwg.engine import DecisionEngine
+from qwg.policies import WalletPolicy
+from qwg.replay import replay_snapshots
+from qwg.risk_context import RiskContext, RiskLevel
+
+POLICIES = {
+    "current": WalletPolicy(),
+    "strict": WalletPolicy(max_tx_ratio_normal=0.2, threshold_extra_auth=500.0, max_allowed_risk=RiskLevel.ELEVATED),
+}
+
+
+def write_snapshots(path: Path, records: int) -> None:
+    rng = random.Random(1)
+    levels = list(RiskLevel)
+    engine = DecisionEngine()
+    with path.open("w", encoding="utf-8") as handle:
+        for _ in range(records):
+            ctx = RiskContext(
+                sentinel_level=rng.choice(levels),
+                adn_level=rng.choice(levels[:3]),
+                wallet_balance=rng.choice([100.0, 5_000.0, 50_000.0]),
+                tx_amount=rng.uniform(0, 20_000),
+                behaviour_score=rng.uniform(0.5, 2.0),
+                trusted_device=rng.random() > 0.2,
+            )
+            handle.write(json.dumps(engine._build_v3_context(ctx)) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=500_000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "snapshots.ndjson"
+        write_snapshots(path, args.records)
+        print(f"{args.records} snapshots, {path.stat().st_size / 1024 / 1024:.1f} MiB, 2 policies")
+        baseline = None
+        for processes in sorted({1, args.processes}):
+            started = time.perf_counter()
+            summary = replay_snapshots(path, POLICIES, processes=processes)
+            elapsed = time.perf_counter() - started
+            assert summary["records"] == args.records
+            assert baseline is None or summary == baseline
+            baseline = summary
+            print(f"processes={processes:<3} {elapsed:8.2f}s {args.records / elapsed:>10.0f} records/s")
+        print(f"changed under strict: {baseline['diff']['strict']['changed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark: per-transaction Python helper process vs the warm ``qwg.serve`` daemon.
+
+Times ``--spawns`` decisions made by starting a fresh interpreter per
+transaction, as non-Python wallet frontends do today, then ``--requests``
+decisions over the Unix socket one round trip at a time, pipelined, and as
+``--batch``-sized ``contexts`` batches, with the server's latency percentiles.
+Run with ``PYTHONPATH=src python benchmarks/bench_serve.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from qwg.engine import DecisionEngine
+from qwg.replay import snapshot_to_risk_context
+from qwg.risk_context import RiskContext, RiskLevel
+from qwg.serve import DecisionClient, DecisionServer
+
+HELPER = (
+    "import json, sys\n"
+    "from qwg.engine import DecisionEngine\n"
+    "from qwg.replay import snapshot_to_risk_context\n"
+    "print(DecisionEngine().evaluate_transaction(snapshot_to_risk_context(json.loads(sys.argv[1]))).decision.value)\n"
+)
+
+
+def snapshots(count: int) -> list[dict[str, Any]]:
+    rng = random.Random(3)
+    levels = list(RiskLevel)
+    engine = DecisionEngine()
+    return [
+        engine._build_v3_context(
+            RiskContext(
+                sentinel_level=rng.choice(levels),
+                adn_level=rng.choice(levels[:3]),
+                wallet_balance=rng.choice([100.0, 5_000.0, 50_000.0]),
+                tx_amount=rng.uniform(0, 20_000),
+                behaviour_score=rng.uniform(0.5, 2.0),
+                trusted_device=rng.random() > 0.2,
+            )
+        )
+        for _ in range(count)
+    ]
+
+
+def report(label: str, count: int, elapsed: float) -> None:
+    print(f"{label:<28} {count / elapsed:>10.0f} decisions/s  {elapsed / count * 1e3:>8.3f} ms each")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--spawns", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    contexts = snapshots(args.requests)
+    engine = DecisionEngine()
+    expected = [engine.evaluate_transaction(snapshot_to_risk_context(item)).decision.value for item in contexts]
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+
+    started = time.perf_counter()
+    for index in range(args.spawns):
+        output = subprocess.run(
+            [sys.executable, "-c", HELPER, json.dumps(contexts[index])],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=environment,
+        ).stdout.strip()
+        assert output == expected[index]
+    report("process per transaction", args.spawns, time.perf_counter() - started)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "qwg.sock"
+        with DecisionServer(path) as server, DecisionClient(path) as client:
+            started = time.perf_counter()
+            for index, context in enumerate(contexts):
+                assert client.request({"op": "evaluate", "context": context})["result"]["decision"] == expected[index]
+            report("daemon, one round trip each", args.requests, time.perf_counter() - started)
+            sequential = server.stats()["latency_ms"]
+
+            started = time.perf_counter()
+            responses = client.pipeline([{"op": "evaluate", "context": context} for context in contexts])
+            report("daemon, pipelined", args.requests, time.perf_counter() - started)
+            assert [response["result"]["decision"] for response in responses] == expected
+
+            started = time.perf_counter()
+            batches = client.pipeline(
+                [
+                    {"op": "evaluate", "contexts": contexts[offset : offset + args.batch]}
+                    for offset in range(0, len(contexts), args.batch)
+                ]
+            )
+            report(f"daemon, batches of {args.batch}", args.requests, time.perf_counter() - started)
+            decisions = [item["result"]["decision"] for batch in batches for item in batch["results"]]
+            assert decisions == expected
+            print(f"server latency, one round trip each: {json.dumps(sequential)}")
+            print(f"server latency, last window: {json.dumps(server.stats()['latency_ms'])}")
+
+
+if __name__ == "__main__":
+    main()
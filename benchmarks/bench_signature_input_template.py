@@ -0,0 +1,132 @@
+"""Benchmark: pre-encoded signature-input templates on the real-crypto verify path.
+
+Compares the previous validate-join-encode construction of the real-signature
+input with the per-key template, both in isolation and inside the verify
+adapter (stub backend that accepts every signature, shared public key cache,
+short signature so base64 decoding does not drown out the difference).
+Run with ``PYTHONPATH=src python benchmarks/bench_signature_input_template.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import timeit
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+import qwg.v4.real_crypto_backend as real_crypto_backend
+from qwg.v4 import COMPONENT_ROLE
+from qwg.v4.real_crypto_backend import (
+    REAL_CRYPTO_SIGNATURE_INPUT_PREFIX,
+    DecodedPublicKeyCache,
+    build_real_crypto_signature_input,
+    encode_binary_signature_material,
+    make_real_crypto_signature_verifier,
+)
+from qwg.v4.signing import COMPONENT_VERDICT_DOMAIN
+from qwg.v4.trust_profile import default_standard_profile_for_algorithm
+
+ALGORITHM = "ml-dsa"
+STANDARD_PROFILE = default_standard_profile_for_algorithm(ALGORITHM)
+KEY_ID = f"prod-{COMPONENT_ROLE}-{ALGORITHM}-v1"
+
+
+def joined_signature_input(
+    *,
+    algorithm: str,
+    standard_profile: str,
+    domain_tag: str,
+    signed_payload_hash: str,
+    key_id: str,
+    key_version: int,
+) -> bytes:
+    """The previous construction: validate every field, then join and encode."""
+
+    clean_algorithm = real_crypto_backend._require_real_supported_algorithm(algorithm)
+    clean_domain = real_crypto_backend._require_real_non_empty_str(domain_tag, field="domain_tag")
+    if clean_domain != COMPONENT_VERDICT_DOMAIN:
+        raise ValueError("domain_tag must be the QWG Shield v4 component signing domain")
+    clean_profile = real_crypto_backend._require_real_supported_standard_profile(
+        algorithm=clean_algorithm,
+        standard_profile=standard_profile,
+    )
+    clean_hash = real_crypto_backend._require_hash(signed_payload_hash, field="signed_payload_hash")
+    clean_key_id = real_crypto_backend._require_real_non_empty_str(key_id, field="key_id")
+    clean_key_version = real_crypto_backend._require_real_positive_int(key_version, field="key_version")
+    return "\n".join(
+        (
+            REAL_CRYPTO_SIGNATURE_INPUT_PREFIX,
+            clean_domain,
+            clean_hash,
+            clean_algorithm,
+            clean_profile,
+            clean_key_id,
+            str(clean_key_version),
+        )
+    ).encode("utf-8")
+
+
+class AcceptingBackend:
+    backend_name = "stub-accepting-backend"
+    backend_version = "bench"
+    supported_algorithms = (ALGORITHM,)
+
+    def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> bool:
+        return True
+
+
+def per_call_us(callback: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(callback, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    fields: dict[str, Any] = {
+        "algorithm": ALGORITHM,
+        "standard_profile": STANDARD_PROFILE,
+        "domain_tag": COMPONENT_VERDICT_DOMAIN,
+        "signed_payload_hash": os.urandom(32).hex(),
+        "key_id": KEY_ID,
+        "key_version": 1,
+    }
+    key = {
+        "role": COMPONENT_ROLE,
+        "key_id": KEY_ID,
+        "key_version": 1,
+        "algorithm": ALGORITHM,
+        "not_before": "2026-06-21T00:00:00Z",
+        "not_after": "2026-06-21T00:05:00Z",
+        "status": "active",
+        "public_key": encode_binary_signature_material(os.urandom(1952), field="public_key"),
+    }
+    entry = {
+        key_name: fields[key_name]
+        for key_name in ("algorithm", "standard_profile", "domain_tag", "signed_payload_hash", "key_id", "key_version")
+    }
+    entry["signature"] = encode_binary_signature_material(os.urandom(64), field="signature")
+    assert joined_signature_input(**fields) == build_real_crypto_signature_input(**fields)
+
+    verifier = make_real_crypto_signature_verifier(AcceptingBackend(), public_key_cache=DecodedPublicKeyCache())
+    assert verifier(entry, key) is True
+    template_build = per_call_us(partial(build_real_crypto_signature_input, **fields), args.number)
+    template_verify = per_call_us(partial(verifier, entry, key), args.number // 4)
+
+    real_crypto_backend.build_real_crypto_signature_input = joined_signature_input  # type: ignore[assignment]
+    try:
+        joined_build = per_call_us(partial(joined_signature_input, **fields), args.number)
+        joined_verify = per_call_us(partial(verifier, entry, key), args.number // 4)
+    finally:
+        real_crypto_backend.build_real_crypto_signature_input = build_real_crypto_signature_input
+
+    print(f"{'case':<30} {'joined us':>10} {'template us':>12} {'saving us':>10}")
+    print(f"{'build signature input':<30} {joined_build:10.2f} {template_build:12.2f} {joined_build - template_build:10.2f}")
+    print(f"{'verify entry, 64 B signature':<30} {joined_verify:10.2f} {template_verify:12.2f} {joined_verify - template_verify:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark: key lookups against a trust registry with many revoked keys.
+
+Builds a registry with the three active test keys plus ``--revoked`` revoked
+entries and times ``find_trusted_key`` on the raw profile, which re-validates
+and scans the registry on every call, against a prebuilt
+``TrustProfileIndex``. Lookups mix active, revoked and unknown keys. Also
+reports the cost of a full index build and of an incremental ``rebuild``
+after a ``registry_version`` bump that revokes one more key. Run with
+``PYTHONPATH=src python benchmarks/bench_trust_profile_index.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+
+from qwg.v4 import COMPONENT_ROLE
+from qwg.v4.trust_profile import (
+    ML_DSA,
+    REVOKED,
+    SUPPORTED_ALGORITHMS,
+    TrustProfileIndex,
+    build_test_trust_profile,
+    find_trusted_key,
+)
+
+
+def registry(revoked: int, version: int) -> dict[str, Any]:
+    profile = build_test_trust_profile()
+    profile["registry_version"] = version
+    for number in range(revoked):
+        profile["entries"].append(
+            {
+                "role": COMPONENT_ROLE,
+                "key_id": f"retired-{number}",
+                "key_version": 1,
+                "algorithm": SUPPORTED_ALGORITHMS[number % 3],
+                "not_before": "2020-01-01T00:00:00Z",
+                "not_after": "2030-01-01T00:00:00Z",
+                "status": REVOKED,
+                "public_key": f"TEST-ONLY-RETIRED-{number}",
+            }
+        )
+    return profile
+
+
+def lookups(revoked: int) -> list[dict[str, Any]]:
+    requests = []
+    for number in range(300):
+        kind = number % 3
+        if kind == 0:
+            key_id, algorithm = f"test-{COMPONENT_ROLE}-{ML_DSA}-v1", ML_DSA
+        elif kind == 1:
+            key_id, algorithm = f"retired-{number % revoked}", SUPPORTED_ALGORITHMS[number % revoked % 3]
+        else:
+            key_id, algorithm = f"unknown-{number}", ML_DSA
+        requests.append(
+            {
+                "key_id": key_id,
+                "key_version": 1,
+                "algorithm": algorithm,
+                "verification_time": "2026-06-21T00:01:00Z",
+                "artifact_not_before": "2026-06-21T00:00:00Z",
+                "artifact_not_after": "2026-06-21T00:05:00Z",
+            }
+        )
+    return requests
+
+
+def run(profile: Any, requests: list[dict[str, Any]], repeat: int) -> tuple[float, list[Any]]:
+    outcomes: list[Any] = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        outcomes.clear()
+        for request in requests:
+            try:
+                outcomes.append(find_trusted_key(profile, **request))
+            except ValueError as exc:
+                outcomes.append(str(exc))
+    return (time.perf_counter() - started) / (repeat * len(requests)), outcomes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--revoked", type=int, default=5_000)
+    args = parser.parse_args()
+
+    profile = registry(args.revoked, 1)
+    requests = lookups(args.revoked)
+    started = time.perf_counter()
+    index = TrustProfileIndex(profile)
+    build = time.perf_counter() - started
+    linear, expected = run(profile, requests, 1)
+    indexed, outcomes = run(index, requests, 50)
+    assert outcomes == expected
+
+    bumped = registry(args.revoked + 1, 2)
+    started = time.perf_counter()
+    rebuilt = index.rebuild(bumped)
+    incremental = time.perf_counter() - started
+    assert rebuilt.profile == TrustProfileIndex(bumped).profile
+    assert rebuilt.stats()["reused_entries"] == args.revoked + 3
+
+    print(f"registry: 3 active, {args.revoked} revoked; {index.stats()['bloom_bits']} Bloom bits")
+    print(f"linear find_trusted_key  {linear * 1e6:>10.1f} us/lookup")
+    print(f"indexed find_trusted_key {indexed * 1e6:>10.1f} us/lookup  ({linear / indexed:.0f}x)")
+    print(f"full index build         {build * 1e3:>10.1f} ms")
+    print(f"incremental rebuild      {incremental * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
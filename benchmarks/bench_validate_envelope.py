@@ -0,0 +1,109 @@
+"""Benchmark: QWG v4 envelope validation with the canonical in-place fast path.
+
+Compares the previous rebuild-then-hash flow against the fast path over growing
+metadata dictionaries. Run with ``PYTHONPATH=src python benchmarks/bench_validate_envelope.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES, SUPPORTED_REASON_IDS
+from qwg.v4.crypto_verdict import (
+    build_signed_crypto_verdict_envelope,
+    build_unsigned_crypto_verdict_payload,
+    canonical_unsigned_payload_and_hash,
+    validate_crypto_verdict_envelope,
+)
+from qwg.v4.signing import (
+    build_signature_bundle,
+    build_test_signature_entry,
+    signed_payload_hash,
+    verify_test_only_signature,
+)
+from qwg.v4.trust_profile import CLASSICAL_ED25519, ML_DSA, build_test_trust_profile
+
+
+def build_envelope(metadata_entries: int) -> dict:
+    payload = build_unsigned_crypto_verdict_payload(
+        request_id="bench-request",
+        context_hash="a" * 64,
+        freshness_nonce="bench-nonce",
+        not_before="2026-06-21T00:00:00Z",
+        not_after="2026-06-21T00:05:00Z",
+        decision="ALLOW",
+        reason_ids=list(SUPPORTED_REASON_IDS),
+        evidence_hash="b" * 64,
+        evidence_families=list(SUPPORTED_EVIDENCE_FAMILIES),
+        metadata={
+            f"segment_{index:06d}": {"label": f"cohort-{index}", "score_bp": index, "tags": ["x", "y"]}
+            for index in range(metadata_entries)
+        },
+        key_registry_version=1,
+    )
+    payload_hash = signed_payload_hash(payload=payload)
+    return build_signed_crypto_verdict_envelope(
+        unsigned_payload=payload,
+        signature_bundle=build_signature_bundle(
+            signatures=[build_test_signature_entry(algorithm=algorithm, signed_hash=payload_hash) for algorithm in (CLASSICAL_ED25519, ML_DSA)]
+        ),
+    )
+
+
+def rebuild_then_hash(verdict: dict) -> str:
+    unsigned = build_unsigned_crypto_verdict_payload(
+        request_id=verdict["request_id"],
+        context_hash=verdict["context_hash"],
+        freshness_nonce=verdict["freshness_nonce"],
+        not_before=verdict["not_before"],
+        not_after=verdict["not_after"],
+        decision=verdict["decision"],
+        reason_ids=verdict["reason_ids"],
+        evidence_hash=verdict["evidence_hash"],
+        evidence_families=verdict["evidence_families"],
+        metadata=verdict["metadata"],
+        key_registry_version=verdict["key_registry_version"],
+    )
+    return signed_payload_hash(payload=unsigned)
+
+
+def fast_path_hash(verdict: dict) -> str:
+    return canonical_unsigned_payload_and_hash(verdict)[1]
+
+
+def per_op_ms(func, verdict: dict, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func(verdict)
+    return (time.perf_counter() - started) / rounds * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 100, 10_000])
+    args = parser.parse_args()
+    trust_profile = build_test_trust_profile()
+
+    def full_validation(verdict: dict) -> dict:
+        return validate_crypto_verdict_envelope(
+            verdict,
+            expected_context_hash="a" * 64,
+            trust_profile=trust_profile,
+            verification_time="2026-06-21T00:01:00Z",
+            verifier=verify_test_only_signature,
+        )
+
+    print(f"{'metadata':>9} {'rebuild+hash ms':>16} {'fast path ms':>13} {'saved':>7} {'validate ms':>12}")
+    for size in args.sizes:
+        verdict = build_envelope(size)
+        assert rebuild_then_hash(verdict) == fast_path_hash(verdict) == verdict["signed_payload_hash"]
+        baseline = per_op_ms(rebuild_then_hash, verdict, args.rounds)
+        fast = per_op_ms(fast_path_hash, verdict, args.rounds)
+        validate = per_op_ms(full_validation, verdict, args.rounds)
+        print(f"{size:>9} {baseline:>16.4f} {fast:>13.4f} {1 - fast / baseline:>6.1%} {validate:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Benchmark: v3.2 verdict validation, batch API versus the original reference.
+
+The reference rebuilds the allowed-value sets on every call, checks hashes
+with ``int(value, 16)`` and always re-sorts. Both paths validate the same
+``--verdicts`` verdicts (one in ``--invalid-every`` is broken) and must give
+identical results before timing. Run with
+``PYTHONPATH=src python benchmarks/bench_validate_verdicts.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from qwg.v3.v3_2_lock import (
+    COMPONENT_ID,
+    CONTRACT_VERSION,
+    REQUIRED_VERDICT_FIELDS,
+    SUPPORTED_DECISIONS,
+    SUPPORTED_EVIDENCE_FAMILIES,
+    SUPPORTED_REASON_IDS,
+    VERDICT_SCHEMA_VERSION,
+    build_verdict,
+    validate_verdicts,
+)
+
+
+def reference_require_hash(value: str, *, field: str) -> str:
+    if not isinstance(value, str) or len(value) != 64:
+        raise ValueError(f"{field} must be 64-character sha256 hex")
+    try:
+        int(value, 16)
+    except ValueError as exc:
+        raise ValueError(f"{field} must be sha256 hex") from exc
+    return value.lower()
+
+
+def reference_known_tuple(values: Any, *, allowed: tuple[str, ...], field: str) -> tuple[str, ...]:
+    if not isinstance(values, (list, tuple)):
+        raise ValueError(f"{field} must be list or tuple")
+    if not values:
+        raise ValueError(f"{field} must not be empty")
+    out: list[str] = []
+    seen: set[str] = set()
+    allowed_set = set(allowed)
+    for item in values:
+        if not isinstance(item, str) or not item.strip():
+            raise ValueError(f"{field} entries must be non-empty strings")
+        clean = item.strip()
+        if clean in seen:
+            raise ValueError(f"{field} entries must be unique")
+        if clean not in allowed_set:
+            raise ValueError(f"unknown {field}: {clean}")
+        seen.add(clean)
+        out.append(clean)
+    return tuple(sorted(out))
+
+
+def reference_validate_verdict(verdict: Any, *, expected_context_hash: str | None = None) -> dict[str, Any]:
+    if not isinstance(verdict, dict):
+        raise ValueError("verdict must be dict")
+    if set(verdict.keys()) != REQUIRED_VERDICT_FIELDS:
+        raise ValueError("verdict fields must match canonical required fields")
+    if verdict["component_id"] != COMPONENT_ID:
+        raise ValueError("component_id mismatch")
+    if verdict["contract_version"] != CONTRACT_VERSION:
+        raise ValueError("contract_version mismatch")
+    if verdict["schema_version"] != VERDICT_SCHEMA_VERSION:
+        raise ValueError("schema_version mismatch")
+    if verdict["fail_closed"] is not True:
+        raise ValueError("fail_closed must be true")
+    request_id, decision, metadata = verdict["request_id"], verdict["decision"], verdict["metadata"]
+    if not isinstance(request_id, str) or not request_id.strip():
+        raise ValueError("request_id must be non-empty str")
+    if decision not in SUPPORTED_DECISIONS:
+        raise ValueError(f"unsupported decision: {decision}")
+    if metadata is not None and not isinstance(metadata, dict):
+        raise ValueError("metadata must be dict")
+    checked = {
+        "component_id": COMPONENT_ID,
+        "contract_version": CONTRACT_VERSION,
+        "schema_version": VERDICT_SCHEMA_VERSION,
+        "request_id": request_id.strip(),
+        "context_hash": reference_require_hash(verdict["context_hash"], field="context_hash"),
+        "decision": decision,
+        "reason_ids": list(reference_known_tuple(verdict["reason_ids"], allowed=SUPPORTED_REASON_IDS, field="reason_ids")),
+        "evidence_hash": reference_require_hash(verdict["evidence_hash"], field="evidence_hash"),
+        "evidence_families": list(
+            reference_known_tuple(verdict["evidence_families"], allowed=SUPPORTED_EVIDENCE_FAMILIES, field="evidence_families")
+        ),
+        "metadata": metadata or {},
+        "fail_closed": True,
+    }
+    if expected_context_hash is not None and checked["context_hash"] != reference_require_hash(
+        expected_context_hash, field="expected_context_hash"
+    ):
+        raise ValueError("context_hash mismatch")
+    return checked
+
+
+def reference_validate_verdicts(verdicts: list[Any], expected_context_hash: str) -> Iterator[dict[str, Any]]:
+    for index, verdict in enumerate(verdicts):
+        try:
+            checked = reference_validate_verdict(verdict, expected_context_hash=expected_context_hash)
+        except ValueError as exc:
+            yield {"index": index, "valid": False, "error": str(exc)}
+        else:
+            yield {"index": index, "valid": True, "verdict": checked}
+
+
+def build_verdicts(count: int, invalid_every: int) -> list[dict[str, Any]]:
+    verdicts = []
+    for number in range(count):
+        verdict = build_verdict(
+            request_id=f"request-{number}",
+            context_hash="a" * 64,
+            decision=SUPPORTED_DECISIONS[number % 3],
+            reason_ids=SUPPORTED_REASON_IDS[number % 3 : number % 3 + 2],
+            evidence_hash=f"{number:064x}",
+            evidence_families=SUPPORTED_EVIDENCE_FAMILIES[: 1 + number % 4],
+            metadata={"sequence": number},
+        )
+        if number % invalid_every == 0:
+            verdict["evidence_hash"] = "g" * 64
+        verdicts.append(verdict)
+    return verdicts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--verdicts", type=int, default=1_000_000)
+    parser.add_argument("--invalid-every", type=int, default=100)
+    args = parser.parse_args()
+
+    verdicts = build_verdicts(args.verdicts, args.invalid_every)
+    sample = verdicts[:10_000]
+    assert list(validate_verdicts(sample, expected_context_hash="a" * 64)) == list(reference_validate_verdicts(sample, "a" * 64))
+
+    started = time.perf_counter()
+    reference_invalid = sum(not result["valid"] for result in reference_validate_verdicts(verdicts, "a" * 64))
+    reference_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    invalid = sum(not result["valid"] for result in validate_verdicts(verdicts, expected_context_hash="a" * 64))
+    fast_seconds = time.perf_counter() - started
+    assert invalid == reference_invalid
+
+    print(f"{args.verdicts} verdicts, {invalid} invalid")
+    print(f"reference        {reference_seconds:7.2f} s  {args.verdicts / reference_seconds:>10.0f} verdicts/s")
+    print(f"validate_verdicts {fast_seconds:6.2f} s  {args.verdicts / fast_seconds:>10.0f} verdicts/s")
+    print(f"speedup {reference_seconds / fast_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,44 @@ DGB Quantum Wallet Guard (Layer 5)
 Universal security engine & SDK for DigiByte wallets.
 This package exposes a simple API that wallets can call
 to evaluate transactions using Sentinel AI, DQSN and ADN v2 signals.
+
+The public names are imported on first attribute access, so ``import qwg``
+and ``import qwg.v4...`` stay cheap for processes that never build an engine.
 """
 
-from .risk_context import RiskContext, RiskLevel
-from .decisions import Decision, DecisionResult
-from .engine import DecisionEngine
-from .policies import WalletPolicy
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .decisions import Decision, DecisionResult
+    from .engine import DecisionEngine
+    from .policies import WalletPolicy
+    from .risk_context import RiskContext, RiskLevel
+
+_LAZY_EXPORTS = {
+    "RiskContext": "qwg.risk_context",
+    "RiskLevel": "qwg.risk_context",
+    "Decision": "qwg.decisions",
+    "DecisionResult": "qwg.decisions",
+    "DecisionEngine": "qwg.engine",
+    "WalletPolicy": "qwg.policies",
+}
+
+__all__ = ["Decision", "DecisionEngine", "DecisionResult", "RiskContext", "RiskLevel", "WalletPolicy"]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
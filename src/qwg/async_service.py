@@ -0,0 +1,199 @@
+"""asyncio front end that micro-batches QWG decisions and v4 verdict validation."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any
+
+from qwg.decisions import DecisionResult
+from qwg.engine import DecisionEngine
+from qwg.risk_context import RiskContext
+from qwg.v3.verdict import QWGv3Verdict
+from qwg.v4.crypto_verdict import DEFAULT_METADATA_BUDGET, validate_crypto_verdict_envelope
+from qwg.v4.nonce_store import NonceStore
+from qwg.v4.signing import CanonicalBudget, SignatureVerifier
+from qwg.v4.trust_profile import TrustProfileIndex, require_positive_int
+
+DEFAULT_ASYNC_MAX_BATCH_SIZE = 64
+DEFAULT_ASYNC_MAX_WAIT_SECONDS = 0.001
+
+_Call = tuple[Callable[..., Any], tuple[Any, ...], dict[str, Any]]
+
+
+def _run_batch(calls: list[_Call]) -> list[tuple[bool, Any]]:
+    outcomes: list[tuple[bool, Any]] = []
+    for function, args, kwargs in calls:
+        try:
+            outcomes.append((True, function(*args, **kwargs)))
+        except Exception as exc:
+            outcomes.append((False, exc))
+    return outcomes
+
+
+class AsyncDecisionService:
+    """Awaitable QWG calls coalesced into micro-batches on an executor.
+
+    Concurrent callers append to one pending batch. The batch is handed to
+    ``executor`` as a single job when it reaches ``max_batch_size`` calls or
+    ``max_wait`` seconds after its first call, whichever comes first, so the
+    event loop pays one executor hop per batch instead of one per call and no
+    call waits longer than ``max_wait`` for its batch to be handed over. Each call inside a batch
+    succeeds or fails on its own: a ``ValueError`` from one envelope is
+    raised to its caller only. Callers that are cancelled before their batch
+    is handed over are dropped from it.
+
+    Without an ``executor`` the service owns a single worker thread, which
+    keeps the GIL-bound decision work off the loop without thread contention;
+    :meth:`aclose` shuts it down from a helper thread, so the loop keeps
+    running meanwhile. A caller-supplied executor is left running.
+    """
+
+    def __init__(
+        self,
+        engine: DecisionEngine | None = None,
+        *,
+        executor: Executor | None = None,
+        max_batch_size: int = DEFAULT_ASYNC_MAX_BATCH_SIZE,
+        max_wait: float = DEFAULT_ASYNC_MAX_WAIT_SECONDS,
+    ) -> None:
+        if engine is not None and not isinstance(engine, DecisionEngine):
+            raise ValueError("engine must be DecisionEngine")
+        if isinstance(max_wait, bool) or not isinstance(max_wait, int | float) or not 0 <= max_wait < math.inf:
+            raise ValueError("max_wait must be non-negative finite number")
+        self.engine = engine if engine is not None else DecisionEngine()
+        self.max_batch_size = require_positive_int(max_batch_size, field="max_batch_size")
+        self.max_wait = float(max_wait)
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="qwg-async-decisions")
+        self._pending: list[tuple[_Call, asyncio.Future[Any]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._in_flight: set[asyncio.Future[list[tuple[bool, Any]]]] = set()
+        self._closed = False
+        self._calls = 0
+        self._batches = 0
+        self._full_batches = 0
+        self._max_batch = 0
+
+    def _submit(self, call: _Call) -> asyncio.Future[Any]:
+        if self._closed:
+            raise ValueError("async decision service is closed")
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._pending.append((call, future))
+        self._calls += 1
+        if len(self._pending) >= self.max_batch_size:
+            self._full_batches += 1
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = [(call, future) for call, future in self._pending if not future.cancelled()]
+        self._pending = []
+        if not batch:
+            return
+        self._batches += 1
+        self._max_batch = max(self._max_batch, len(batch))
+        futures = [future for _, future in batch]
+        try:
+            running = asyncio.get_running_loop().run_in_executor(
+                self._executor, _run_batch, [call for call, _ in batch]
+            )
+        except RuntimeError as exc:
+            for future in futures:
+                future.set_exception(exc)
+            return
+        self._in_flight.add(running)
+        running.add_done_callback(functools.partial(self._resolve, futures))
+
+    def _resolve(self, futures: list[asyncio.Future[Any]], running: asyncio.Future[list[tuple[bool, Any]]]) -> None:
+        self._in_flight.discard(running)
+        try:
+            outcomes = running.result()
+        except Exception as exc:
+            outcomes = [(False, exc)] * len(futures)
+        for future, (succeeded, value) in zip(futures, outcomes, strict=True):
+            if future.done():
+                continue
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    async def evaluate_transaction(self, ctx: RiskContext) -> DecisionResult:
+        """Await :meth:`DecisionEngine.evaluate_transaction` for ``ctx``."""
+
+        result: DecisionResult = await self._submit((self.engine.evaluate_transaction, (ctx,), {}))
+        return result
+
+    async def evaluate_transaction_v3(self, ctx: RiskContext) -> QWGv3Verdict:
+        """Await :meth:`DecisionEngine.evaluate_transaction_v3` for ``ctx``."""
+
+        verdict: QWGv3Verdict = await self._submit((self.engine.evaluate_transaction_v3, (ctx,), {}))
+        return verdict
+
+    async def validate_crypto_verdict_envelope(
+        self,
+        verdict: dict[str, Any],
+        *,
+        expected_context_hash: str,
+        trust_profile: dict[str, Any] | TrustProfileIndex,
+        verification_time: str,
+        verifier: SignatureVerifier,
+        metadata_budget: CanonicalBudget = DEFAULT_METADATA_BUDGET,
+        nonce_store: NonceStore | None = None,
+    ) -> dict[str, Any]:
+        """Await :func:`qwg.v4.crypto_verdict.validate_crypto_verdict_envelope` for ``verdict``."""
+
+        checked: dict[str, Any] = await self._submit(
+            (
+                validate_crypto_verdict_envelope,
+                (verdict,),
+                {
+                    "expected_context_hash": expected_context_hash,
+                    "trust_profile": trust_profile,
+                    "verification_time": verification_time,
+                    "verifier": verifier,
+                    "metadata_budget": metadata_budget,
+                    "nonce_store": nonce_store,
+                },
+            )
+        )
+        return checked
+
+    def stats(self) -> dict[str, int]:
+        """Return calls accepted, batches run, batches cut at ``max_batch_size``, the largest batch and calls pending."""
+
+        return {
+            "calls": self._calls,
+            "batches": self._batches,
+            "full_batches": self._full_batches,
+            "max_batch": self._max_batch,
+            "pending": len(self._pending),
+        }
+
+    async def aclose(self) -> None:
+        """Run the pending batch, wait for in-flight batches and release an owned executor."""
+
+        if self._closed:
+            return
+        self._closed = True
+        self._flush()
+        if self._in_flight:
+            await asyncio.wait(set(self._in_flight))
+        if self._owns_executor:
+            await asyncio.to_thread(self._executor.shutdown, wait=True)
+
+    async def __aenter__(self) -> AsyncDecisionService:
+        return self
+
+    async def __aexit__(self, exc_type: object, exc: object, tb: object) -> None:
+        await self.aclose()
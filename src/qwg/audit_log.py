@@ -0,0 +1,472 @@
+"""Append-only, indexed segment log for QWG v3 verdicts and signed v4 envelopes."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import unicodedata
+import zlib
+from collections.abc import Iterator
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from qwg.v3.v3_2_lock import VERDICT_SCHEMA_VERSION as V3_2_VERDICT_SCHEMA_VERSION
+from qwg.v3.v3_2_lock import canonical_json
+from qwg.v3.verdict import QWGv3Verdict
+from qwg.v4 import VERDICT_SCHEMA_VERSION as V4_VERDICT_SCHEMA_VERSION
+from qwg.v4.signing import to_canonical_json
+from qwg.v4.trust_profile import require_non_empty_str, require_positive_int
+
+SEGMENT_MAGIC = b"QWGSEG\x00\x01"
+INDEX_MAGIC = b"QWGIDX\x00\x01"
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_AUDIT_QUEUE_SIZE = 1024
+DEFAULT_AUDIT_MAX_BATCH = 256
+MAX_SEGMENT_BYTES = 2**32 - 1
+
+_RECORD_HEADER = struct.Struct(">II")
+_INDEX_OFFSET = struct.Struct(">I")
+_INDEX_HEADER_BYTES = len(INDEX_MAGIC) + _INDEX_OFFSET.size
+_INDEX_KEY_BYTES = 33
+_INDEX_ENTRY_BYTES = _INDEX_KEY_BYTES + _INDEX_OFFSET.size
+_CONTEXT_HASH_FIELD = b"c"
+_REQUEST_ID_FIELD = b"r"
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class AuditRecordLocation:
+    """Position of one durable record: segment number and byte offset."""
+
+    segment: int
+    offset: int
+
+
+def _index_key(field: bytes, value: str) -> bytes:
+    # Stored records and lookups both go through here, so a value is indexed
+    # by its stripped NFC spelling whichever form the caller used.
+    clean = unicodedata.normalize("NFC", value.strip())
+    return field + hashlib.sha256(clean.encode("utf-8")).digest()
+
+
+def _record_payload(verdict: Any) -> tuple[bytes, tuple[bytes, ...]]:
+    if isinstance(verdict, QWGv3Verdict):
+        record: dict[str, Any] = {
+            "schema_version": verdict.schema_version,
+            "verdict_type": verdict.verdict_type.value,
+            "reason_id": verdict.reason_id,
+            "context_hash": verdict.context_hash,
+        }
+        if verdict.reasons is not None:
+            record["reasons"] = list(verdict.reasons)
+        text = canonical_json(record)
+    elif isinstance(verdict, dict) and verdict.get("schema_version") == V3_2_VERDICT_SCHEMA_VERSION:
+        record = verdict
+        text = canonical_json(record)
+    elif isinstance(verdict, dict) and verdict.get("schema_version") == V4_VERDICT_SCHEMA_VERSION:
+        record = verdict
+        text = to_canonical_json(record)
+    else:
+        raise ValueError("audit record must be QWGv3Verdict, v3.2 verdict dict, or v4 verdict envelope")
+    payload = text.encode("utf-8")
+    return payload, _record_keys(payload)
+
+
+def _record_keys(payload: bytes) -> tuple[bytes, ...]:
+    # Keys come from the stored bytes on append and on recovery alike, so a
+    # restart rebuilds exactly the index the live log had.
+    record = json.loads(payload)
+    keys = [_index_key(_CONTEXT_HASH_FIELD, require_non_empty_str(record.get("context_hash"), field="context_hash"))]
+    if "request_id" in record:
+        keys.append(_index_key(_REQUEST_ID_FIELD, require_non_empty_str(record["request_id"], field="request_id")))
+    return tuple(keys)
+
+
+class _SortedIndex:
+    """Bisectable view over a sealed segment's sorted ``key + offset`` entries."""
+
+    def __init__(self, data: mmap.mmap) -> None:
+        self._data = data
+        self.records = _INDEX_OFFSET.unpack_from(data, len(INDEX_MAGIC))[0]
+        self._count = (len(data) - _INDEX_HEADER_BYTES - 4) // _INDEX_ENTRY_BYTES
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> bytes:
+        start = _INDEX_HEADER_BYTES + position * _INDEX_ENTRY_BYTES
+        return self._data[start : start + _INDEX_KEY_BYTES]
+
+    def offsets(self, key: bytes) -> list[int]:
+        found: list[int] = []
+        position = bisect.bisect_left(self, key)
+        while position < self._count and self[position] == key:
+            start = _INDEX_HEADER_BYTES + position * _INDEX_ENTRY_BYTES + _INDEX_KEY_BYTES
+            found.append(_INDEX_OFFSET.unpack_from(self._data, start)[0])
+            position += 1
+        return found
+
+    def close(self) -> None:
+        self._data.close()
+
+
+class AuditLog:
+    """Local append-only log of QWG verdicts with a sidecar lookup index.
+
+    Records are appended to fixed-size segment files in ``directory`` as
+    ``length | crc32 | canonical JSON``. A single writer thread drains a
+    bounded queue, writes each batch sequentially and issues one fsync per
+    batch before resolving the callers' futures, so any number of threads may
+    call :meth:`append` concurrently. When a segment fills up it is sealed and
+    a sorted index of ``context_hash`` and ``request_id`` digests is written
+    next to it; lookups bisect those indexes, so they cost O(log n) per
+    segment instead of a scan. On open, a torn record at the end of the last
+    segment (from a crash mid-write) is truncated away; corruption anywhere
+    else fails closed.
+
+    ``QWGv3Verdict`` objects are stored as their field dict; v3.2 verdict
+    dicts and v4 envelopes are stored in canonical JSON, so signed envelopes
+    read back byte-identical. Index keys are taken from the stored bytes and
+    compared in stripped NFC form, so a lookup matches every spelling of a
+    value and answers the same before and after a restart.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        queue_size: int = DEFAULT_AUDIT_QUEUE_SIZE,
+        max_batch: int = DEFAULT_AUDIT_MAX_BATCH,
+        fsync: bool = True,
+    ) -> None:
+        self.segment_bytes = require_positive_int(segment_bytes, field="segment_bytes")
+        if self.segment_bytes <= len(SEGMENT_MAGIC) + _RECORD_HEADER.size:
+            raise ValueError("segment_bytes is too small for one record")
+        if self.segment_bytes > MAX_SEGMENT_BYTES:
+            raise ValueError("segment_bytes must fit 32-bit record offsets")
+        self.max_batch = require_positive_int(max_batch, field="max_batch")
+        self.fsync = fsync
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Held across the closed check and the enqueue, so nothing can be
+        # queued behind the writer's stop marker.
+        self._put_lock = threading.Lock()
+        self._lookups = 0
+        self._lookups_done = threading.Condition(self._lock)
+        self._sealed: list[_SortedIndex] = []
+        self._active_index: dict[bytes, list[int]] = {}
+        self._records = 0
+        self._batches = 0
+        self._failure: BaseException | None = None
+        self._closed = False
+        self._recover()
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=require_positive_int(queue_size, field="queue_size"))
+        self._writer = threading.Thread(target=self._run, name="qwg-audit-log-writer", daemon=True)
+        self._writer.start()
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{segment:08d}.seg"
+
+    def _index_path(self, segment: int) -> Path:
+        return self.directory / f"{segment:08d}.idx"
+
+    def _scan_segment(self, segment: int, *, allow_torn_tail: bool) -> tuple[dict[bytes, list[int]], int, int]:
+        data = self._segment_path(segment).read_bytes()
+        if not data.startswith(SEGMENT_MAGIC):
+            if allow_torn_tail and SEGMENT_MAGIC.startswith(data):
+                return {}, 0, 0
+            raise ValueError(f"audit segment {segment} has invalid header")
+        index: dict[bytes, list[int]] = {}
+        offset = len(SEGMENT_MAGIC)
+        records = 0
+        while offset < len(data):
+            end = offset + _RECORD_HEADER.size
+            if end <= len(data):
+                length, checksum = _RECORD_HEADER.unpack_from(data, offset)
+                payload = data[end : end + length]
+                if len(payload) == length and zlib.crc32(payload) == checksum:
+                    for key in _record_keys(payload):
+                        index.setdefault(key, []).append(offset)
+                    offset = end + length
+                    records += 1
+                    continue
+            if not allow_torn_tail:
+                raise ValueError(f"audit segment {segment} is corrupt")
+            break
+        return index, offset, records
+
+    def _sync_directory(self) -> None:
+        if self.fsync:
+            descriptor = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+
+    def _write_index(self, segment: int, index: dict[bytes, list[int]], records: int) -> None:
+        entries = sorted(key + _INDEX_OFFSET.pack(offset) for key, offsets in index.items() for offset in offsets)
+        body = INDEX_MAGIC + _INDEX_OFFSET.pack(records) + b"".join(entries)
+        temporary = self._index_path(segment).with_suffix(".tmp")
+        with open(temporary, "wb") as handle:
+            handle.write(body + zlib.crc32(body).to_bytes(4, "big"))
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+        os.replace(temporary, self._index_path(segment))
+        self._sync_directory()
+
+    def _map_index(self, segment: int) -> mmap.mmap:
+        with open(self._index_path(segment), "rb") as handle:
+            return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _open_index(self, segment: int) -> _SortedIndex | None:
+        path = self._index_path(segment)
+        if not path.exists() or path.stat().st_size < _INDEX_HEADER_BYTES + 4:
+            return None
+        mapped = self._map_index(segment)
+        body = mapped[:-4]
+        if not body.startswith(INDEX_MAGIC) or zlib.crc32(body) != int.from_bytes(mapped[-4:], "big"):
+            mapped.close()
+            return None
+        return _SortedIndex(mapped)
+
+    def _load_sealed_index(self, segment: int) -> _SortedIndex:
+        sealed = self._open_index(segment)
+        if sealed is not None:
+            return sealed
+        index, _, records = self._scan_segment(segment, allow_torn_tail=False)
+        self._write_index(segment, index, records)
+        return _SortedIndex(self._map_index(segment))
+
+    def _recover(self) -> None:
+        segments = sorted(int(path.stem) for path in self.directory.glob("*.seg"))
+        if segments != list(range(len(segments))):
+            raise ValueError("audit segments must be numbered contiguously from 0")
+        for segment in segments[:-1]:
+            sealed = self._load_sealed_index(segment)
+            self._sealed.append(sealed)
+            self._records += sealed.records
+        self._active_segment = segments[-1] if segments else 0
+        active_path = self._segment_path(self._active_segment)
+        if not segments:
+            self._start_segment()
+            return
+        self._active_index, size, self._active_records = self._scan_segment(
+            self._active_segment, allow_torn_tail=True
+        )
+        os.truncate(active_path, size)
+        if size == 0:
+            self._start_segment()
+            return
+        self._records += self._active_records
+        self._handle = open(active_path, "ab")
+        self._active_size = self._durable_size = size
+
+    def _start_segment(self) -> None:
+        self._handle = open(self._segment_path(self._active_segment), "ab")
+        self._handle.write(SEGMENT_MAGIC)
+        self._active_size = self._durable_size = len(SEGMENT_MAGIC)
+        self._active_index = {}
+        self._active_records = 0
+        self._sync_directory()
+
+    def _sync_active_segment(self) -> None:
+        self._handle.flush()
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+
+    def _seal_active_segment(self) -> None:
+        self._handle.close()
+        self._write_index(self._active_segment, self._active_index, self._active_records)
+        sealed = _SortedIndex(self._map_index(self._active_segment))
+        with self._lock:
+            self._sealed.append(sealed)
+            self._active_segment += 1
+            self._start_segment()
+
+    def append(self, verdict: Any) -> Future[AuditRecordLocation]:
+        """Queue ``verdict`` for writing; the future resolves once it is durable.
+
+        Blocks while the queue is full. Invalid records raise ``ValueError``
+        immediately; write failures are set on the returned future and close
+        the log for further appends.
+        """
+
+        payload, keys = _record_payload(verdict)
+        if len(SEGMENT_MAGIC) + _RECORD_HEADER.size + len(payload) > self.segment_bytes:
+            raise ValueError("audit record exceeds segment size")
+        future: Future[AuditRecordLocation] = Future()
+        self._put((payload, keys, future))
+        return future
+
+    def flush(self) -> None:
+        """Block until every record queued before this call is durable."""
+
+        future: Future[AuditRecordLocation] = Future()
+        self._put((None, (), future))
+        future.result()
+
+    def _put(self, item: Any) -> None:
+        with self._put_lock:
+            if self._closed or self._failure is not None:
+                raise ValueError("audit log is closed")
+            self._queue.put(item)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch([item for item in batch if item is not _STOP])
+            if batch[-1] is _STOP:
+                return
+
+    def _write_batch(self, batch: list[tuple[bytes | None, tuple[bytes, ...], Future[AuditRecordLocation]]]) -> None:
+        written: list[tuple[tuple[bytes, ...], AuditRecordLocation, Future[AuditRecordLocation]]] = []
+        barriers: list[Future[AuditRecordLocation]] = []
+        try:
+            if self._failure is not None:
+                raise self._failure
+            for payload, keys, future in batch:
+                if payload is None:
+                    barriers.append(future)
+                    continue
+                record = _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+                if self._active_size + len(record) > self.segment_bytes:
+                    self._sync_active_segment()
+                    self._publish(written)
+                    written = []
+                    self._seal_active_segment()
+                self._handle.write(record)
+                written.append((keys, AuditRecordLocation(self._active_segment, self._active_size), future))
+                self._active_size += len(record)
+            self._sync_active_segment()
+        except BaseException as exc:
+            self._failure = exc
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self._publish(written)
+        self._batches += 1
+        for future in barriers:
+            future.set_result(AuditRecordLocation(self._active_segment, self._active_size))
+
+    def _publish(
+        self, written: list[tuple[tuple[bytes, ...], AuditRecordLocation, Future[AuditRecordLocation]]]
+    ) -> None:
+        with self._lock:
+            for keys, location, _ in written:
+                for key in keys:
+                    self._active_index.setdefault(key, []).append(location.offset)
+            self._records += len(written)
+            self._active_records += len(written)
+            self._durable_size = self._active_size
+        for _, location, future in written:
+            future.set_result(location)
+
+    def read(self, location: AuditRecordLocation) -> dict[str, Any]:
+        """Read the record stored at ``location``."""
+
+        with open(self._segment_path(location.segment), "rb") as handle:
+            header = os.pread(handle.fileno(), _RECORD_HEADER.size, location.offset)
+            if len(header) != _RECORD_HEADER.size:
+                raise ValueError("audit record location is out of range")
+            length, checksum = _RECORD_HEADER.unpack(header)
+            payload = os.pread(handle.fileno(), length, location.offset + _RECORD_HEADER.size)
+        if len(payload) != length or zlib.crc32(payload) != checksum:
+            raise ValueError("audit record is corrupt")
+        record: dict[str, Any] = json.loads(payload)
+        return record
+
+    def _lookup(self, key: bytes) -> list[dict[str, Any]]:
+        with self._lock:
+            if self._closed:
+                raise ValueError("audit log is closed")
+            self._lookups += 1
+            sealed = list(self._sealed)
+            active_segment = self._active_segment
+            active = list(self._active_index.get(key, ()))
+        try:
+            locations = [
+                AuditRecordLocation(segment, offset)
+                for segment, index in enumerate(sealed)
+                for offset in index.offsets(key)
+            ]
+        finally:
+            with self._lock:
+                self._lookups -= 1
+                self._lookups_done.notify_all()
+        locations.extend(AuditRecordLocation(active_segment, offset) for offset in active)
+        return [self.read(location) for location in locations]
+
+    def find_by_context_hash(self, context_hash: str) -> list[dict[str, Any]]:
+        """Return every record with ``context_hash``, oldest first."""
+
+        return self._lookup(_index_key(_CONTEXT_HASH_FIELD, require_non_empty_str(context_hash, field="context_hash")))
+
+    def find_by_request_id(self, request_id: str) -> list[dict[str, Any]]:
+        """Return every record with ``request_id``, oldest first."""
+
+        return self._lookup(_index_key(_REQUEST_ID_FIELD, require_non_empty_str(request_id, field="request_id")))
+
+    def records(self) -> Iterator[tuple[AuditRecordLocation, dict[str, Any]]]:
+        """Yield every durable record in append order."""
+
+        with self._lock:
+            last_segment = self._active_segment
+            last_size = self._durable_size
+        for segment in range(last_segment + 1):
+            data = self._segment_path(segment).read_bytes()
+            end_of_segment = last_size if segment == last_segment else len(data)
+            offset = len(SEGMENT_MAGIC)
+            while offset < end_of_segment:
+                length, _ = _RECORD_HEADER.unpack_from(data, offset)
+                location = AuditRecordLocation(segment, offset)
+                yield location, self.read(location)
+                offset += _RECORD_HEADER.size + length
+
+    def stats(self) -> dict[str, int]:
+        """Return counters for durable records, segments and fsync batches."""
+
+        with self._lock:
+            return {"records": self._records, "segments": self._active_segment + 1, "batches": self._batches}
+
+    def close(self) -> None:
+        """Drain the queue, stop the writer thread and release file handles.
+
+        Appends racing ``close`` either land before the writer stops or raise
+        ``ValueError``; sealed indexes are unmapped once in-flight lookups
+        have left them, and later lookups raise ``ValueError``.
+        """
+
+        with self._put_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join()
+        self._handle.close()
+        with self._lock:
+            self._lookups_done.wait_for(lambda: self._lookups == 0)
+        for index in self._sealed:
+            index.close()
+
+    def __enter__(self) -> AuditLog:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
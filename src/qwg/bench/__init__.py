@@ -0,0 +1 @@
+"""Synthetic load tooling for exercising QWG end to end without production data."""
@@ -0,0 +1,318 @@
+"""Seeded synthetic ``RiskContext`` load for end-to-end QWG throughput testing.
+
+Run as ``python -m qwg.bench.loadgen --count 100000 --target v4`` to print a
+JSON report of throughput, p50/p95/p99 latency and the decisions and
+reason_ids the stream produced.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import random
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field, fields
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+from qwg.engine import DecisionEngine
+from qwg.policies import WalletPolicy
+from qwg.risk_context import RiskContext, RiskLevel
+from qwg.serve import latency_percentiles
+from qwg.v3.evidence import compute_evidence_hash
+from qwg.v4.crypto_verdict import (
+    build_signed_crypto_verdict_envelope,
+    build_unsigned_crypto_verdict_payload,
+    validate_crypto_verdict_envelope,
+)
+from qwg.v4.signing import (
+    build_signature_bundle,
+    build_test_signature_entry,
+    signed_payload_hash,
+    verify_test_only_signature,
+)
+from qwg.v4.trust_profile import (
+    REQUIRED_ALGORITHMS,
+    TrustProfileIndex,
+    build_test_trust_profile,
+    require_positive_int,
+)
+
+LOADGEN_TARGETS = ("engine", "v3", "v4")
+
+# The second policy tolerates only ELEVATED risk. Under one policy the
+# "risk exceeds policy" and "HIGH risk ratio" rules exclude each other, so
+# alternating the two lets a single stream reach every rule.
+DEFAULT_LOADGEN_POLICIES = (WalletPolicy(), WalletPolicy(max_allowed_risk=RiskLevel.ELEVATED))
+
+_LOADGEN_CREATED_AT = datetime(1970, 1, 1, tzinfo=UTC)
+_ADDRESS_AGES = (None, 1, 30, 400)
+_V4_NOT_BEFORE = "2026-06-21T00:00:00Z"
+_V4_NOT_AFTER = "2026-06-21T00:05:00Z"
+_V4_VERIFY_AT = "2026-06-21T00:01:00Z"
+_V4_OUTCOMES = {
+    "allow": ("ALLOW", "QWG_OK_POSTURE_ALLOW"),
+    "escalate": ("ESCALATE", "QWG_ESCALATE_QUANTUM_POSTURE"),
+    "deny": ("DENY", "QWG_DENY_KEY_RISK"),
+}
+
+_T = TypeVar("_T")
+
+
+def _default_levels() -> dict[str, float]:
+    return {"normal": 70.0, "elevated": 15.0, "high": 10.0, "critical": 5.0}
+
+
+def _require_rate(value: Any, *, field: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, int | float) or not 0 <= value <= 1:
+        raise ValueError(f"{field} must be number between 0 and 1")
+    return float(value)
+
+
+def _require_amount(value: Any, *, field: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, int | float) or not 0 <= value < math.inf:
+        raise ValueError(f"{field} must be non-negative finite number")
+    return float(value)
+
+
+def _cumulative(values: list[_T], weights: Iterable[Any], *, field: str) -> tuple[list[_T], list[float]]:
+    cumulative = list(itertools.accumulate(_require_amount(weight, field=f"{field} weight") for weight in weights))
+    if not cumulative or cumulative[-1] <= 0:
+        raise ValueError(f"{field} must have a positive total weight")
+    return values, cumulative
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """Weighted distributions that a synthetic ``RiskContext`` stream is drawn from.
+
+    ``sentinel_levels`` and ``adn_levels`` weight each ``RiskLevel`` value.
+    ``balances`` are ``(wallet_balance, weight)`` pairs. ``tx_ratios`` are
+    ``(low, high, weight)`` bands of ``tx_amount / wallet_balance``: a band
+    is picked by weight and the ratio drawn uniformly inside it. The two
+    rates are the shares of untrusted devices and of behaviour scores above
+    the 1.5 warning threshold. Weights need not sum to one.
+    """
+
+    sentinel_levels: Mapping[str, float] = field(default_factory=_default_levels)
+    adn_levels: Mapping[str, float] = field(default_factory=_default_levels)
+    balances: Sequence[tuple[float, float]] = ((0.0, 5.0), (100.0, 30.0), (5_000.0, 40.0), (50_000.0, 25.0))
+    tx_ratios: Sequence[tuple[float, float, float]] = (
+        (0.0, 0.1, 50.0),
+        (0.1, 0.5, 25.0),
+        (0.5, 0.99, 15.0),
+        (0.99, 1.0, 10.0),
+    )
+    untrusted_device_rate: float = 0.1
+    risky_behaviour_rate: float = 0.1
+
+    def __post_init__(self) -> None:
+        self.level_weights("sentinel_levels")
+        self.level_weights("adn_levels")
+        self.balance_weights()
+        self.tx_ratio_weights()
+        _require_rate(self.untrusted_device_rate, field="untrusted_device_rate")
+        _require_rate(self.risky_behaviour_rate, field="risky_behaviour_rate")
+
+    def level_weights(self, name: str) -> tuple[list[RiskLevel], list[float]]:
+        """Return the levels and cumulative weights of ``sentinel_levels`` or ``adn_levels``."""
+
+        weights = getattr(self, name)
+        if not isinstance(weights, Mapping):
+            raise ValueError(f"{name} must be mapping")
+        levels: list[RiskLevel] = []
+        for level in weights:
+            try:
+                levels.append(RiskLevel(level))
+            except ValueError:
+                raise ValueError(f"unsupported {name} level: {level}") from None
+        return _cumulative(levels, weights.values(), field=name)
+
+    def balance_weights(self) -> tuple[list[float], list[float]]:
+        """Return the balances and their cumulative weights."""
+
+        pairs = self._entries("balances", 2)
+        return _cumulative([_require_amount(pair[0], field="balance") for pair in pairs], (pair[1] for pair in pairs), field="balances")
+
+    def tx_ratio_weights(self) -> tuple[list[tuple[float, float]], list[float]]:
+        """Return the ``(low, high)`` ratio bands and their cumulative weights."""
+
+        bands: list[tuple[float, float]] = []
+        entries = self._entries("tx_ratios", 3)
+        for low, high, _ in entries:
+            band = (_require_amount(low, field="tx_ratio"), _require_amount(high, field="tx_ratio"))
+            if band[0] > band[1]:
+                raise ValueError("tx_ratio band low must not exceed high")
+            bands.append(band)
+        return _cumulative(bands, (entry[2] for entry in entries), field="tx_ratios")
+
+    def _entries(self, name: str, width: int) -> list[Sequence[Any]]:
+        entries = getattr(self, name)
+        if not isinstance(entries, Sequence) or not all(
+            isinstance(entry, Sequence) and not isinstance(entry, str) and len(entry) == width for entry in entries
+        ):
+            raise ValueError(f"{name} entries must be {width}-item sequences")
+        return list(entries)
+
+
+def load_profile(overrides: Any) -> LoadProfile:
+    """Build a :class:`LoadProfile` from a JSON object of field overrides."""
+
+    if not isinstance(overrides, dict):
+        raise ValueError("load profile must be JSON object")
+    unknown = sorted(set(overrides) - {item.name for item in fields(LoadProfile)})
+    if unknown:
+        raise ValueError(f"unknown load profile fields: {', '.join(unknown)}")
+    return LoadProfile(**overrides)
+
+
+def generate_contexts(count: int, *, seed: int = 0, profile: LoadProfile | None = None) -> Iterator[RiskContext]:
+    """Yield ``count`` contexts drawn from ``profile``; the same seed yields the same stream.
+
+    ``created_at`` is pinned to the epoch so that generated contexts compare
+    equal across runs.
+    """
+
+    count = require_positive_int(count, field="count")
+    profile = profile if profile is not None else LoadProfile()
+    rng = random.Random(seed)
+    sentinel_levels, sentinel_weights = profile.level_weights("sentinel_levels")
+    adn_levels, adn_weights = profile.level_weights("adn_levels")
+    balances, balance_weights = profile.balance_weights()
+    bands, band_weights = profile.tx_ratio_weights()
+    for _ in range(count):
+        balance = rng.choices(balances, cum_weights=balance_weights)[0]
+        low, high = rng.choices(bands, cum_weights=band_weights)[0]
+        risky = rng.random() < profile.risky_behaviour_rate
+        yield RiskContext(
+            sentinel_level=rng.choices(sentinel_levels, cum_weights=sentinel_weights)[0],
+            dqs_network_score=rng.random(),
+            adn_level=rng.choices(adn_levels, cum_weights=adn_weights)[0],
+            wallet_balance=balance,
+            tx_amount=balance * rng.uniform(low, high),
+            address_age_days=rng.choice(_ADDRESS_AGES),
+            behaviour_score=rng.uniform(1.6, 3.0) if risky else rng.uniform(0.5, 1.4),
+            device_id=f"device-{rng.randrange(1_000)}",
+            trusted_device=rng.random() >= profile.untrusted_device_rate,
+            created_at=_LOADGEN_CREATED_AT,
+        )
+
+
+def _sign_and_verify(index: int, verdict: Any, trust_profile: TrustProfileIndex) -> dict[str, Any]:
+    decision, reason_id = _V4_OUTCOMES[verdict.verdict_type.value]
+    evidence_hash = compute_evidence_hash({"wallet_posture": {"reason_id": verdict.reason_id, "decision": decision}})
+    payload = build_unsigned_crypto_verdict_payload(
+        request_id=f"loadgen-{index}",
+        context_hash=verdict.context_hash,
+        freshness_nonce=f"loadgen-nonce-{index}",
+        not_before=_V4_NOT_BEFORE,
+        not_after=_V4_NOT_AFTER,
+        decision=decision,
+        reason_ids=[reason_id],
+        evidence_hash=evidence_hash,
+        evidence_families=["wallet_posture"],
+        metadata={"v3_reason_id": verdict.reason_id},
+        key_registry_version=trust_profile.registry_version,
+    )
+    payload_hash = signed_payload_hash(payload=payload)
+    bundle = build_signature_bundle(
+        signatures=[build_test_signature_entry(algorithm=algorithm, signed_hash=payload_hash) for algorithm in REQUIRED_ALGORITHMS]
+    )
+    return validate_crypto_verdict_envelope(
+        build_signed_crypto_verdict_envelope(unsigned_payload=payload, signature_bundle=bundle),
+        expected_context_hash=verdict.context_hash,
+        trust_profile=trust_profile,
+        verification_time=_V4_VERIFY_AT,
+        verifier=verify_test_only_signature,
+    )
+
+
+def run_load(
+    contexts: Iterable[RiskContext],
+    *,
+    target: str = "engine",
+    policies: Sequence[WalletPolicy] = DEFAULT_LOADGEN_POLICIES,
+) -> dict[str, Any]:
+    """Drive ``contexts`` through ``target`` and report throughput and latency.
+
+    ``engine`` times ``evaluate_transaction``, ``v3`` times
+    ``evaluate_transaction_v3``, and ``v4`` additionally wraps each v3
+    verdict in a v4 envelope, signs it with the test-only stub signatures for
+    every required algorithm and validates it. The v4 decision and reason_id
+    are picked by verdict type purely to exercise signing and verification;
+    they are not a production mapping. Context ``i`` is decided under
+    ``policies[i % len(policies)]``.
+    """
+
+    if target not in LOADGEN_TARGETS:
+        raise ValueError(f"unsupported target: {target}")
+    if not isinstance(policies, Sequence) or not policies or not all(isinstance(policy, WalletPolicy) for policy in policies):
+        raise ValueError("policies must be non-empty sequence of WalletPolicy")
+    engines = [DecisionEngine(policy) for policy in policies]
+    trust_profile = TrustProfileIndex(build_test_trust_profile())
+    decisions: Counter[str] = Counter()
+    reason_ids: Counter[str] = Counter()
+    latencies: list[int] = []
+    perf_counter_ns = time.perf_counter_ns
+    started = time.perf_counter()
+    for index, ctx in enumerate(contexts):
+        engine = engines[index % len(engines)]
+        begun = perf_counter_ns()
+        if target == "engine":
+            result = engine.evaluate_transaction(ctx)
+            outcome, reason_id = result.decision.value, result.reason_id or ""
+        else:
+            verdict = engine.evaluate_transaction_v3(ctx)
+            if target == "v4":
+                _sign_and_verify(index, verdict, trust_profile)
+            outcome, reason_id = verdict.verdict_type.value, verdict.reason_id
+        latencies.append(perf_counter_ns() - begun)
+        decisions[outcome] += 1
+        reason_ids[reason_id] += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "target": target,
+        "contexts": len(latencies),
+        "seconds": round(elapsed, 6),
+        "throughput_per_second": round(len(latencies) / elapsed, 1) if latencies else 0.0,
+        "latency_ms": latency_percentiles(latencies),
+        "decisions": dict(sorted(decisions.items())),
+        "reason_ids": dict(sorted(reason_ids.items())),
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m qwg.bench.loadgen",
+        description="Drive a seeded synthetic RiskContext stream through QWG and report throughput and latency.",
+    )
+    parser.add_argument("--count", type=int, default=100_000, help="contexts to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", choices=LOADGEN_TARGETS, default="engine")
+    parser.add_argument("--profile", type=Path, help="JSON file with LoadProfile field overrides")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the CLI; prints the JSON report."""
+
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    try:
+        profile = None
+        if args.profile is not None:
+            profile = load_profile(json.loads(args.profile.read_text(encoding="utf-8")))
+        contexts = list(generate_contexts(args.count, seed=args.seed, profile=profile))
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    print(json.dumps(run_load(contexts, target=args.target), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
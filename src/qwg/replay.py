@@ -0,0 +1,324 @@
+"""Deterministic replay of recorded v3 context snapshots against candidate wallet policies.
+
+Run as ``python -m qwg.replay SNAPSHOTS.ndjson --policy current --policy
+strict=strict.json`` to print a JSON diff summary of how every candidate
+policy would have decided the recorded traffic relative to the first one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+from collections import Counter, deque
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from qwg.engine import DecisionEngine
+from qwg.policies import WalletPolicy
+from qwg.risk_context import RiskContext, RiskLevel
+from qwg.v4.trust_profile import require_non_empty_str, require_positive_int
+
+DEFAULT_REPLAY_CHUNK_BYTES = 4 * 1024 * 1024
+
+SNAPSHOT_FIELDS = frozenset(
+    {
+        "sentinel_level",
+        "dqs_network_score",
+        "adn_level",
+        "wallet_balance",
+        "tx_amount",
+        "address_age_days",
+        "behaviour_score",
+        "device_id",
+        "trusted_device",
+    }
+)
+
+_WALLET_POLICY_TYPES = {item.name: item.type for item in fields(WalletPolicy)}
+_REPLAY_CREATED_AT = datetime(1970, 1, 1, tzinfo=UTC)
+_WORKER_ENGINES: tuple[DecisionEngine, ...] = ()
+
+Outcome = tuple[str, str]
+
+
+def _require_number(value: Any, *, field: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{field} must be number")
+    return float(value)
+
+
+def _require_risk_level(value: Any, *, field: str) -> RiskLevel:
+    try:
+        return RiskLevel(value)
+    except ValueError:
+        raise ValueError(f"unsupported {field}: {value}") from None
+
+
+def snapshot_to_risk_context(snapshot: Any) -> RiskContext:
+    """Rebuild a :class:`RiskContext` from its recorded ``_build_v3_context`` form.
+
+    The snapshot must carry exactly the v3 context fields. ``created_at`` is
+    pinned to the epoch because no decision rule reads it.
+    """
+
+    if not isinstance(snapshot, dict):
+        raise ValueError("snapshot must be dict")
+    if snapshot.keys() != SNAPSHOT_FIELDS:
+        raise ValueError("snapshot fields must match the v3 context form")
+    address_age_days = snapshot["address_age_days"]
+    if address_age_days is not None and (isinstance(address_age_days, bool) or not isinstance(address_age_days, int)):
+        raise ValueError("address_age_days must be integer or null")
+    device_id = snapshot["device_id"]
+    if device_id is not None and not isinstance(device_id, str):
+        raise ValueError("device_id must be string or null")
+    if not isinstance(snapshot["trusted_device"], bool):
+        raise ValueError("trusted_device must be bool")
+    return RiskContext(
+        sentinel_level=_require_risk_level(snapshot["sentinel_level"], field="sentinel_level"),
+        dqs_network_score=_require_number(snapshot["dqs_network_score"], field="dqs_network_score"),
+        adn_level=_require_risk_level(snapshot["adn_level"], field="adn_level"),
+        wallet_balance=_require_number(snapshot["wallet_balance"], field="wallet_balance"),
+        tx_amount=_require_number(snapshot["tx_amount"], field="tx_amount"),
+        address_age_days=address_age_days,
+        behaviour_score=_require_number(snapshot["behaviour_score"], field="behaviour_score"),
+        device_id=device_id,
+        trusted_device=snapshot["trusted_device"],
+        created_at=_REPLAY_CREATED_AT,
+    )
+
+
+def load_wallet_policy(overrides: Any) -> WalletPolicy:
+    """Build a :class:`WalletPolicy` from a JSON object of field overrides."""
+
+    if not isinstance(overrides, dict):
+        raise ValueError("wallet policy must be JSON object")
+    unknown = sorted(set(overrides) - _WALLET_POLICY_TYPES.keys())
+    if unknown:
+        raise ValueError(f"unknown wallet policy fields: {', '.join(unknown)}")
+    values: dict[str, Any] = {}
+    for name, value in overrides.items():
+        expected: Any = _WALLET_POLICY_TYPES[name]
+        if expected is RiskLevel:
+            values[name] = _require_risk_level(value, field=name)
+        elif expected is float:
+            values[name] = _require_number(value, field=name)
+        elif isinstance(value, bool) is (expected is bool) and isinstance(value, expected):
+            values[name] = value
+        else:
+            raise ValueError(f"{name} must be {expected.__name__}")
+    return WalletPolicy(**values)
+
+
+@dataclass
+class _ReplayTally:
+    """Joint outcome counts for one chunk of snapshots, mergeable across workers."""
+
+    outcomes: Counter[tuple[Outcome, ...]] = field(default_factory=Counter)
+    invalid: int = 0
+    first_invalid: tuple[int, str] | None = None
+
+    def merge(self, other: _ReplayTally) -> None:
+        self.outcomes.update(other.outcomes)
+        self.invalid += other.invalid
+        if other.first_invalid is not None and (
+            self.first_invalid is None or other.first_invalid[0] < self.first_invalid[0]
+        ):
+            self.first_invalid = other.first_invalid
+
+
+def _replay_chunk(engines: tuple[DecisionEngine, ...], first_line: int, chunk: bytes) -> _ReplayTally:
+    tally = _ReplayTally()
+    outcomes = tally.outcomes
+    for line_number, line in enumerate(chunk.split(b"\n"), first_line):
+        if not line.strip():
+            continue
+        try:
+            ctx = snapshot_to_risk_context(json.loads(line))
+        except (TypeError, ValueError, RecursionError) as exc:
+            tally.invalid += 1
+            if tally.first_invalid is None:
+                error = "snapshot JSON is nested too deeply" if isinstance(exc, RecursionError) else str(exc)
+                tally.first_invalid = (line_number, error)
+            continue
+        results = [engine.evaluate_transaction(ctx) for engine in engines]
+        outcomes[tuple((result.decision.value, result.reason_id or "") for result in results)] += 1
+    return tally
+
+
+def _worker_initialize(policies: tuple[WalletPolicy, ...]) -> None:
+    global _WORKER_ENGINES
+    _WORKER_ENGINES = tuple(DecisionEngine(policy) for policy in policies)
+
+
+def _worker_replay_chunk(first_line: int, chunk: bytes) -> _ReplayTally:
+    return _replay_chunk(_WORKER_ENGINES, first_line, chunk)
+
+
+def iter_snapshot_chunks(path: str | os.PathLike[str], chunk_bytes: int) -> Iterator[tuple[int, bytes]]:
+    """Yield ``(first_line_number, chunk)`` blocks of whole lines from ``path``."""
+
+    line_number = 1
+    carry = b""
+    with open(path, "rb") as handle:
+        while block := handle.read(chunk_bytes):
+            block = carry + block
+            cut = block.rfind(b"\n") + 1
+            chunk, carry = block[:cut], block[cut:]
+            if chunk:
+                yield line_number, chunk
+                line_number += chunk.count(b"\n")
+    if carry:
+        yield line_number, carry
+
+
+def _counts(counter: Counter[str]) -> dict[str, int]:
+    return dict(sorted(counter.items()))
+
+
+def _summary(names: tuple[str, ...], tally: _ReplayTally) -> dict[str, Any]:
+    decisions = [Counter[str]() for _ in names]
+    reason_ids = [Counter[str]() for _ in names]
+    changed = [0 for _ in names]
+    decision_changes = [Counter[str]() for _ in names]
+    reason_id_changes = [Counter[str]() for _ in names]
+    for outcome, count in tally.outcomes.items():
+        baseline_decision, baseline_reason_id = outcome[0]
+        for position, (decision, reason_id) in enumerate(outcome):
+            decisions[position][decision] += count
+            reason_ids[position][reason_id] += count
+            if outcome[position] != outcome[0]:
+                changed[position] += count
+                if decision != baseline_decision:
+                    decision_changes[position][f"{baseline_decision} -> {decision}"] += count
+                if reason_id != baseline_reason_id:
+                    reason_id_changes[position][f"{baseline_reason_id} -> {reason_id}"] += count
+    summary: dict[str, Any] = {
+        "baseline": names[0],
+        "records": sum(tally.outcomes.values()),
+        "invalid": tally.invalid,
+        "policies": {
+            name: {"decisions": _counts(decisions[position]), "reason_ids": _counts(reason_ids[position])}
+            for position, name in enumerate(names)
+        },
+        "diff": {
+            name: {
+                "changed": changed[position],
+                "decisions": _counts(decision_changes[position]),
+                "reason_ids": _counts(reason_id_changes[position]),
+            }
+            for position, name in enumerate(names)
+            if position
+        },
+    }
+    if tally.first_invalid is not None:
+        summary["first_invalid"] = {"line_number": tally.first_invalid[0], "error": tally.first_invalid[1]}
+    return summary
+
+
+def replay_snapshots(
+    path: str | os.PathLike[str],
+    policies: Mapping[str, WalletPolicy],
+    *,
+    processes: int = 1,
+    chunk_bytes: int = DEFAULT_REPLAY_CHUNK_BYTES,
+    start_method: str = "spawn",
+) -> dict[str, Any]:
+    """Re-decide every snapshot of an NDJSON file under each policy in ``policies``.
+
+    The first policy is the baseline. The returned summary counts decisions
+    and reason_ids per policy, and for every other policy how many records
+    changed and which ``baseline -> candidate`` transitions occurred. The file
+    is read in ``chunk_bytes`` blocks and at most two blocks per worker are in
+    flight, so memory stays bounded for arbitrarily large inputs. With
+    ``processes`` above 1 the blocks are evaluated in worker processes; the
+    summary is identical either way. Malformed lines are counted as
+    ``invalid`` and the first one is reported.
+    """
+
+    names = tuple(policies)
+    if not names:
+        raise ValueError("policies must be non-empty mapping")
+    for name in names:
+        require_non_empty_str(name, field="policy name")
+        if not isinstance(policies[name], WalletPolicy):
+            raise ValueError(f"policy {name} must be WalletPolicy")
+    processes = require_positive_int(processes, field="processes")
+    chunks = iter_snapshot_chunks(path, require_positive_int(chunk_bytes, field="chunk_bytes"))
+    ordered = tuple(policies[name] for name in names)
+    tally = _ReplayTally()
+    if processes == 1:
+        engines = tuple(DecisionEngine(policy) for policy in ordered)
+        for first_line, chunk in chunks:
+            tally.merge(_replay_chunk(engines, first_line, chunk))
+        return _summary(names, tally)
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=_worker_initialize,
+        initargs=(ordered,),
+    ) as executor:
+        pending: deque[Future[_ReplayTally]] = deque()
+        for first_line, chunk in chunks:
+            pending.append(executor.submit(_worker_replay_chunk, first_line, chunk))
+            if len(pending) >= 2 * processes:
+                tally.merge(pending.popleft().result())
+        while pending:
+            tally.merge(pending.popleft().result())
+    return _summary(names, tally)
+
+
+def _policy_spec(spec: str) -> tuple[str, WalletPolicy]:
+    name, separator, path = spec.partition("=")
+    name = require_non_empty_str(name, field="policy name")
+    if not separator:
+        return name, WalletPolicy()
+    return name, load_wallet_policy(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m qwg.replay",
+        description="Replay recorded v3 context snapshots against candidate wallet policies.",
+    )
+    parser.add_argument("snapshots", type=Path, help="NDJSON file with one v3 context snapshot per line")
+    parser.add_argument(
+        "--policy",
+        action="append",
+        required=True,
+        help="NAME for the default WalletPolicy or NAME=PATH for JSON field overrides; the first is the baseline",
+    )
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk-mib", type=int, default=DEFAULT_REPLAY_CHUNK_BYTES // (1024 * 1024))
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the CLI; prints the JSON summary and returns 1 if any line was invalid."""
+
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    try:
+        policies: dict[str, WalletPolicy] = {}
+        for spec in args.policy:
+            name, policy = _policy_spec(spec)
+            if name in policies:
+                raise ValueError(f"duplicate policy name: {name}")
+            policies[name] = policy
+        summary = replay_snapshots(
+            args.snapshots, policies, processes=args.processes, chunk_bytes=args.chunk_mib * 1024 * 1024
+        )
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    print(json.dumps(summary, indent=2, sort_keys=True))
+    return 1 if summary["invalid"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
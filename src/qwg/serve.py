@@ -0,0 +1,444 @@
+"""Warm local QWG decision service over a Unix domain socket.
+
+Run as ``python -m qwg.serve --socket /run/qwg/decision.sock`` so that wallet
+frontends written in any language can ask a long-lived ``DecisionEngine`` for
+decisions instead of starting a Python interpreter per transaction.
+
+Every message in either direction is one frame: a 4-byte big-endian length
+followed by that many bytes of UTF-8 JSON. A request is an object::
+
+    {"id": 7, "op": "evaluate", "context": {...}}
+    {"id": 8, "op": "evaluate_v3", "contexts": [{...}, {...}]}
+    {"id": 9, "op": "stats"}
+
+``context`` uses the v3 context form read by
+:func:`qwg.replay.snapshot_to_risk_context`. ``id`` is optional and echoed
+back. A single context is answered with ``{"id", "result"}``, a ``contexts``
+batch with ``{"id", "results"}`` holding ``{"index", "valid", "result" |
+"error"}`` per context, and a malformed request with ``{"id", "error"}``.
+Requests may be pipelined: responses come back in request order on the same
+connection.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, cast
+
+from qwg.decisions import DecisionResult
+from qwg.engine import DecisionEngine
+from qwg.policies import WalletPolicy
+from qwg.replay import load_wallet_policy, snapshot_to_risk_context
+from qwg.v4.trust_profile import require_positive_int
+
+DEFAULT_MAX_FRAME_BYTES = 1024 * 1024
+DEFAULT_LATENCY_WINDOW = 10_000
+
+SERVE_OPERATIONS = ("evaluate", "evaluate_v3", "stats")
+REQUEST_FIELDS = frozenset({"id", "op", "context", "contexts"})
+
+_FRAME_HEADER = struct.Struct(">I")
+_PERCENTILES = (50, 95, 99)
+
+
+def _reject_constant(name: str) -> Any:
+    raise ValueError(f"non-finite number not allowed: {name}")
+
+
+def _finite_float(text: str) -> float:
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"non-finite number not allowed: {text}")
+    return value
+
+
+def encode_frame(message: Any) -> bytes:
+    """Return ``message`` as one length-prefixed compact JSON frame."""
+
+    body = json.dumps(message, separators=(",", ":"), allow_nan=False).encode("utf-8")
+    return _FRAME_HEADER.pack(len(body)) + body
+
+
+def latency_percentiles(samples_ns: Iterable[int]) -> dict[str, Any]:
+    """Return nearest-rank p50/p95/p99 and max of nanosecond samples, in milliseconds."""
+
+    ordered = sorted(samples_ns)
+    if not ordered:
+        return {"samples": 0}
+    summary: dict[str, Any] = {"samples": len(ordered)}
+    for percentile in _PERCENTILES:
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        summary[f"p{percentile}"] = round(ordered[rank - 1] / 1e6, 3)
+    summary["max"] = round(ordered[-1] / 1e6, 3)
+    return summary
+
+
+def _decision_result(result: DecisionResult) -> dict[str, Any]:
+    encoded: dict[str, Any] = {
+        "decision": result.decision.value,
+        "reason": result.reason,
+        "require_confirmation": result.require_confirmation,
+        "require_second_factor": result.require_second_factor,
+    }
+    if result.reason_id is not None:
+        encoded["reason_id"] = result.reason_id
+    if result.cooldown_seconds is not None:
+        encoded["cooldown_seconds"] = result.cooldown_seconds
+    if result.suggested_limit is not None:
+        encoded["suggested_limit"] = result.suggested_limit
+    return encoded
+
+
+def _bind_owner_only_socket(path: Path) -> socket.socket:
+    # A leftover socket file is only replaced when nothing answers on it, and
+    # the socket is created under a 0o177 umask so it is never reachable by
+    # other users, not even between bind and a later chmod.
+    if path.is_socket():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(os.fspath(path))
+        except ConnectionRefusedError:
+            path.unlink()
+        else:
+            raise ValueError(f"a decision server is already listening on {path}")
+        finally:
+            probe.close()
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    previous_umask = os.umask(0o177)
+    try:
+        listener.bind(os.fspath(path))
+    except BaseException:
+        listener.close()
+        raise
+    finally:
+        os.umask(previous_umask)
+    return listener
+
+
+class _DecisionProtocol(asyncio.Protocol):
+    """One client connection: splits frames and answers each read in one write."""
+
+    _transport: asyncio.Transport
+
+    def __init__(self, server: DecisionServer) -> None:
+        self._server = server
+        self._buffer = bytearray()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = cast(asyncio.Transport, transport)
+        self._server._connections.add(self._transport)
+        self._server._accepted += 1
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._server._connections.discard(self._transport)
+
+    def pause_writing(self) -> None:
+        self._server._write_pauses += 1
+        self._transport.pause_reading()
+
+    def resume_writing(self) -> None:
+        self._transport.resume_reading()
+
+    def data_received(self, data: bytes) -> None:
+        server = self._server
+        buffer = self._buffer
+        buffer += data
+        started = time.perf_counter_ns()
+        responses: list[bytes] = []
+        offset = 0
+        while len(buffer) - offset >= _FRAME_HEADER.size:
+            (length,) = _FRAME_HEADER.unpack_from(buffer, offset)
+            if not 0 < length <= server.max_frame_bytes:
+                server._errors += 1
+                responses.append(
+                    encode_frame({"error": f"frame length must be between 1 and {server.max_frame_bytes} bytes"})
+                )
+                self._transport.write(b"".join(responses))
+                self._transport.close()
+                buffer.clear()
+                return
+            end = offset + _FRAME_HEADER.size + length
+            if end > len(buffer):
+                break
+            responses.append(server._respond(bytes(buffer[offset + _FRAME_HEADER.size : end])))
+            server._latencies.append(time.perf_counter_ns() - started)
+            offset = end
+        if responses:
+            del buffer[:offset]
+            server._batches += 1
+            server._max_batch = max(server._max_batch, len(responses))
+            self._transport.write(b"".join(responses))
+
+
+class DecisionServer:
+    """Unix socket server answering decision requests from one warm engine.
+
+    The socket is bound, restricted to its owner and served from a background
+    event loop thread as soon as the server is constructed. A stale socket
+    file at ``path`` is replaced, but a live server there is refused with
+    ``ValueError``. All frames that
+    arrive in one read are decoded, evaluated in order and answered with a
+    single write, so pipelined clients are served in batches without a
+    round trip per request. When a client stops reading, the server stops
+    reading from it too. Per-request latency, from the read that completed
+    the frame to its encoded response, is kept for the last
+    ``latency_window`` requests and reported by :meth:`stats`.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        policy: WalletPolicy | None = None,
+        max_frame_bytes: int = DEFAULT_MAX_FRAME_BYTES,
+        latency_window: int = DEFAULT_LATENCY_WINDOW,
+    ) -> None:
+        if policy is not None and not isinstance(policy, WalletPolicy):
+            raise ValueError("policy must be WalletPolicy")
+        self.path = Path(path)
+        self.max_frame_bytes = require_positive_int(max_frame_bytes, field="max_frame_bytes")
+        self._engine = DecisionEngine(policy)
+        self._latencies: deque[int] = deque(maxlen=require_positive_int(latency_window, field="latency_window"))
+        self._connections: set[asyncio.Transport] = set()
+        self._accepted = 0
+        self._requests = 0
+        self._contexts = 0
+        self._errors = 0
+        self._batches = 0
+        self._max_batch = 0
+        self._write_pauses = 0
+        listener = _bind_owner_only_socket(self.path)
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._server = self._loop.run_until_complete(
+                self._loop.create_unix_server(lambda: _DecisionProtocol(self), sock=listener)
+            )
+        except BaseException:
+            listener.close()
+            self._loop.close()
+            self.path.unlink(missing_ok=True)
+            raise
+        self._thread = threading.Thread(target=self._loop.run_forever, name="qwg-decision-server", daemon=True)
+        self._thread.start()
+
+    def _evaluate(self, op: str, snapshot: Any) -> dict[str, Any]:
+        ctx = snapshot_to_risk_context(snapshot)
+        self._contexts += 1
+        if op == "evaluate":
+            return _decision_result(self._engine.evaluate_transaction(ctx))
+        verdict = self._engine.evaluate_transaction_v3(ctx)
+        return {
+            "schema_version": verdict.schema_version,
+            "verdict_type": verdict.verdict_type.value,
+            "reason_id": verdict.reason_id,
+            "context_hash": verdict.context_hash,
+        }
+
+    def _evaluate_batch(self, op: str, snapshots: Any) -> list[dict[str, Any]]:
+        if not isinstance(snapshots, list) or not snapshots:
+            raise ValueError("contexts must be non-empty list")
+        results: list[dict[str, Any]] = []
+        for index, snapshot in enumerate(snapshots):
+            try:
+                results.append({"index": index, "valid": True, "result": self._evaluate(op, snapshot)})
+            except ValueError as exc:
+                self._errors += 1
+                results.append({"index": index, "valid": False, "error": str(exc)})
+        return results
+
+    def _respond(self, body: bytes) -> bytes:
+        self._requests += 1
+        response: dict[str, Any] = {}
+        try:
+            request = json.loads(body, parse_float=_finite_float, parse_constant=_reject_constant)
+            if not isinstance(request, dict):
+                raise ValueError("request must be JSON object")
+            if "id" in request:
+                response["id"] = request["id"]
+            unknown = sorted(request.keys() - REQUEST_FIELDS)
+            if unknown:
+                raise ValueError(f"unknown request fields: {', '.join(unknown)}")
+            op = request.get("op")
+            if op not in SERVE_OPERATIONS:
+                raise ValueError(f"unsupported op: {op}")
+            payloads = [name for name in ("context", "contexts") if name in request]
+            if op == "stats":
+                if payloads:
+                    raise ValueError("stats takes no context")
+                response["result"] = self._stats()
+            elif payloads == ["context"]:
+                response["result"] = self._evaluate(op, request["context"])
+            elif payloads == ["contexts"]:
+                response["results"] = self._evaluate_batch(op, request["contexts"])
+            else:
+                raise ValueError("request must carry exactly one of context or contexts")
+        except RecursionError:
+            self._errors += 1
+            response["error"] = "request JSON is nested too deeply"
+        except ValueError as exc:
+            self._errors += 1
+            response["error"] = str(exc)
+        return encode_frame(response)
+
+    def _stats(self) -> dict[str, Any]:
+        return {
+            "connections": len(self._connections),
+            "accepted": self._accepted,
+            "requests": self._requests,
+            "contexts": self._contexts,
+            "errors": self._errors,
+            "batches": self._batches,
+            "max_batch": self._max_batch,
+            "write_pauses": self._write_pauses,
+            "latency_ms": latency_percentiles(self._latencies),
+        }
+
+    async def _collect_stats(self) -> dict[str, Any]:
+        return self._stats()
+
+    def stats(self) -> dict[str, Any]:
+        """Return connection, request, batch and error counters plus latency percentiles."""
+
+        return asyncio.run_coroutine_threadsafe(self._collect_stats(), self._loop).result()
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        for transport in list(self._connections):
+            transport.close()
+        await self._server.wait_closed()
+
+    def close(self) -> None:
+        """Stop accepting, drop open connections and remove the socket file."""
+
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> DecisionServer:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+
+class DecisionClient:
+    """Blocking client for :class:`DecisionServer`, mainly for tools and tests."""
+
+    def __init__(self, path: str | os.PathLike[str], *, timeout: float | None = None) -> None:
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._socket.settimeout(timeout)
+            self._socket.connect(os.fspath(path))
+        except BaseException:
+            self._socket.close()
+            raise
+        self._reader = self._socket.makefile("rb")
+
+    def _read_frame(self) -> Any:
+        header = self._reader.read(_FRAME_HEADER.size)
+        if len(header) < _FRAME_HEADER.size:
+            raise ConnectionError("decision server closed the connection")
+        (length,) = _FRAME_HEADER.unpack(header)
+        body = self._reader.read(length)
+        if len(body) < length:
+            raise ConnectionError("decision server closed the connection")
+        return json.loads(body)
+
+    def request(self, message: Any) -> Any:
+        """Send one request and return its response."""
+
+        self._socket.sendall(encode_frame(message))
+        return self._read_frame()
+
+    def pipeline(self, messages: Sequence[Any]) -> list[Any]:
+        """Send every request before reading, then return the responses in order.
+
+        The requests are written from a helper thread while responses are
+        read, so a pipeline larger than the socket buffers cannot deadlock.
+        """
+
+        data = b"".join(encode_frame(message) for message in messages)
+        sender = threading.Thread(target=self._send_quietly, args=(data,), name="qwg-decision-client-sender")
+        sender.start()
+        try:
+            return [self._read_frame() for _ in messages]
+        finally:
+            sender.join()
+
+    def _send_quietly(self, data: bytes) -> None:
+        try:
+            self._socket.sendall(data)
+        except OSError:
+            return
+
+    def close(self) -> None:
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self) -> DecisionClient:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m qwg.serve",
+        description="Serve QWG decisions from a warm engine over a Unix domain socket.",
+    )
+    parser.add_argument("--socket", type=Path, required=True, help="Unix socket path to listen on")
+    parser.add_argument("--policy", type=Path, help="JSON file with WalletPolicy field overrides")
+    parser.add_argument("--max-frame-bytes", type=int, default=DEFAULT_MAX_FRAME_BYTES)
+    parser.add_argument("--latency-window", type=int, default=DEFAULT_LATENCY_WINDOW)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Serve until SIGINT or SIGTERM, then print the final stats as JSON."""
+
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    stop = threading.Event()
+    previous = {signum: signal.signal(signum, lambda *_: stop.set()) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        try:
+            policy = None
+            if args.policy is not None:
+                policy = load_wallet_policy(json.loads(args.policy.read_text(encoding="utf-8")))
+            server = DecisionServer(
+                args.socket,
+                policy=policy,
+                max_frame_bytes=args.max_frame_bytes,
+                latency_window=args.latency_window,
+            )
+        except (OSError, ValueError) as exc:
+            parser.error(str(exc))
+        with server:
+            stop.wait()
+            stats = server.stats()
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+    print(json.dumps(stats, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,156 @@
+"""Incremental, Merkle-style ``evidence_hash`` over the v3.2 evidence families."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Hashable
+from typing import Any
+
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES
+
+EVIDENCE_LEAF_PREFIX = b"QWG-EVIDENCE-LEAF:v1\n"
+EVIDENCE_NODE_PREFIX = b"QWG-EVIDENCE-NODE:v1\n"
+
+_SUPPORTED_EVIDENCE_FAMILY_SET = frozenset(SUPPORTED_EVIDENCE_FAMILIES)
+
+
+def _require_family(family: Any) -> str:
+    if not isinstance(family, str) or family not in _SUPPORTED_EVIDENCE_FAMILY_SET:
+        raise ValueError(f"unknown evidence_families: {family}")
+    return family
+
+
+def _canonical_evidence(evidence: dict[str, Any]) -> str:
+    # ``canonical_json`` with non-finite floats rejected: NaN and Infinity are
+    # not JSON and would otherwise be hashed as bare tokens.
+    try:
+        return json.dumps(evidence, sort_keys=True, separators=(",", ":"), ensure_ascii=False, allow_nan=False)
+    except ValueError as exc:
+        raise ValueError(f"evidence is not canonical JSON: {exc}") from None
+
+
+def evidence_family_digest(family: str, canonical_evidence: str) -> bytes:
+    """Return the leaf digest binding ``family`` to its canonical evidence JSON."""
+
+    hasher = hashlib.sha256(EVIDENCE_LEAF_PREFIX)
+    hasher.update(family.encode("utf-8"))
+    hasher.update(b"\n")
+    hasher.update(canonical_evidence.encode("utf-8"))
+    return hasher.digest()
+
+
+def combine_evidence_digests(leaves: list[bytes]) -> str:
+    """Fold leaf digests, in family order, into a Merkle root hex digest.
+
+    Nodes are hashed in pairs under their own domain prefix; an odd node is
+    carried up unchanged rather than duplicated, which would give
+    ``[a, b, c]`` and ``[a, b, c, c]`` the same root.
+    """
+
+    if not leaves:
+        raise ValueError("evidence must include at least one family")
+    level = leaves
+    while len(level) > 1:
+        parents = [
+            hashlib.sha256(EVIDENCE_NODE_PREFIX + level[index] + level[index + 1]).digest()
+            for index in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            parents.append(level[-1])
+        level = parents
+    return level[0].hex()
+
+
+def compute_evidence_hash(evidence: dict[str, dict[str, Any]]) -> str:
+    """One-shot ``evidence_hash`` for a mapping of family name to evidence dict."""
+
+    accumulator = EvidenceAccumulator()
+    for family, family_evidence in evidence.items():
+        accumulator.update(family, family_evidence)
+    return accumulator.evidence_hash()
+
+
+class EvidenceAccumulator:
+    """Per-family evidence digests combined into one ``evidence_hash``.
+
+    Each family is canonical-hashed on its own and the leaf digests are
+    combined in ``SUPPORTED_EVIDENCE_FAMILIES`` sorted order, the same order
+    :func:`qwg.v3.v3_2_lock.build_verdict` gives ``evidence_families``. A
+    family whose canonical JSON is unchanged keeps its cached digest and
+    leaves the root alone, so rebuilding a verdict after one family changes
+    rehashes only that family's data plus the few interior nodes. A caller
+    that tracks changes itself can pass a ``version`` with each update; an
+    update repeating a family's last version is skipped without serializing.
+    """
+
+    def __init__(self) -> None:
+        self._canonical: dict[str, str] = {}
+        self._versions: dict[str, Hashable] = {}
+        self._digests: dict[str, bytes] = {}
+        self._root: str | None = None
+        self._family_hashes = 0
+        self._cache_hits = 0
+
+    def update(self, family: str, evidence: dict[str, Any], *, version: Hashable | None = None) -> bool:
+        """Set the evidence for ``family``; return whether its digest changed.
+
+        ``version`` identifies this content of ``evidence``: if it equals the
+        version of the family's previous update, the evidence is trusted to be
+        unchanged and is not serialized again.
+        """
+
+        clean_family = _require_family(family)
+        if not isinstance(evidence, dict):
+            raise ValueError("evidence must be dict")
+        if version is not None and clean_family in self._versions and self._versions[clean_family] == version:
+            self._cache_hits += 1
+            return False
+        canonical = _canonical_evidence(evidence)
+        if version is None:
+            self._versions.pop(clean_family, None)
+        else:
+            self._versions[clean_family] = version
+        if self._canonical.get(clean_family) == canonical:
+            self._cache_hits += 1
+            return False
+        self._canonical[clean_family] = canonical
+        self._digests[clean_family] = evidence_family_digest(clean_family, canonical)
+        self._family_hashes += 1
+        self._root = None
+        return True
+
+    def remove(self, family: str) -> None:
+        """Drop ``family`` from the evidence set."""
+
+        clean_family = _require_family(family)
+        if clean_family not in self._digests:
+            raise ValueError(f"evidence family not present: {clean_family}")
+        del self._canonical[clean_family], self._digests[clean_family]
+        self._versions.pop(clean_family, None)
+        self._root = None
+
+    def families(self) -> list[str]:
+        """Return the present families, sorted, ready for ``evidence_families``."""
+
+        return sorted(self._digests)
+
+    def family_digest(self, family: str) -> str:
+        """Return the leaf digest hex for one present family."""
+
+        clean_family = _require_family(family)
+        if clean_family not in self._digests:
+            raise ValueError(f"evidence family not present: {clean_family}")
+        return self._digests[clean_family].hex()
+
+    def evidence_hash(self) -> str:
+        """Return the Merkle root over the present families."""
+
+        if self._root is None:
+            self._root = combine_evidence_digests([self._digests[family] for family in self.families()])
+        return self._root
+
+    def stats(self) -> dict[str, int]:
+        """Return present families, leaf hashes computed and unchanged-input hits."""
+
+        return {"families": len(self._digests), "family_hashes": self._family_hashes, "cache_hits": self._cache_hits}
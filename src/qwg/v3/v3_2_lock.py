@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any
 
 CONTRACT_VERSION = 3
@@ -30,6 +34,10 @@ SUPPORTED_EVIDENCE_FAMILIES = ('wallet_posture', 'quantum_risk_context', 'key_ag
 SUPPORTED_MODES = ("shield_v3_2",)
 OUTPUT_SCHEMA_VERSION = VERDICT_SCHEMA_VERSION
 
+_SUPPORTED_DECISION_SET = frozenset(SUPPORTED_DECISIONS)
+_SUPPORTED_REASON_ID_SET = frozenset(SUPPORTED_REASON_IDS)
+_SUPPORTED_EVIDENCE_FAMILY_SET = frozenset(SUPPORTED_EVIDENCE_FAMILIES)
+
 
 def canonical_json(payload: dict[str, Any]) -> str:
     if not isinstance(payload, dict):
@@ -45,31 +53,31 @@ def _require_hash(value: str, *, field: str) -> str:
     if not isinstance(value, str) or len(value) != 64:
         raise ValueError(f"{field} must be 64-character sha256 hex")
     try:
-        int(value, 16)
+        decoded = bytes.fromhex(value)
     except ValueError as exc:
         raise ValueError(f"{field} must be sha256 hex") from exc
+    if len(decoded) != 32:
+        raise ValueError(f"{field} must be sha256 hex")
     return value.lower()
 
 
-def _canonical_known_tuple(values: Any, *, allowed: tuple[str, ...], field: str) -> tuple[str, ...]:
+def _canonical_known_list(values: Any, *, allowed: frozenset[str], field: str) -> list[str]:
     if not isinstance(values, (list, tuple)):
         raise ValueError(f"{field} must be list or tuple")
     if not values:
         raise ValueError(f"{field} must not be empty")
     out: list[str] = []
-    seen: set[str] = set()
-    allowed_set = set(allowed)
     for item in values:
-        if not isinstance(item, str) or not item.strip():
+        clean = item.strip() if isinstance(item, str) else ""
+        if not clean:
             raise ValueError(f"{field} entries must be non-empty strings")
-        clean = item.strip()
-        if clean in seen:
+        if clean in out:
             raise ValueError(f"{field} entries must be unique")
-        if clean not in allowed_set:
+        if clean not in allowed:
             raise ValueError(f"unknown {field}: {clean}")
-        seen.add(clean)
         out.append(clean)
-    return tuple(sorted(out))
+    out.sort()
+    return out
 
 
 def build_manifest() -> dict[str, Any]:
@@ -92,19 +100,56 @@ def build_manifest() -> dict[str, Any]:
     }
 
 
-def build_verdict(
-    *,
-    request_id: str,
-    context_hash: str,
-    decision: str,
-    reason_ids: tuple[str, ...] | list[str],
-    evidence_hash: str,
-    evidence_families: tuple[str, ...] | list[str],
-    metadata: dict[str, Any] | None = None,
+def _read_only(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _read_only(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_read_only(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class CachedManifest:
+    """Read-only component manifest with its canonical JSON bytes and SHA-256.
+
+    ``manifest`` is a read-only view: mappings are ``MappingProxyType`` and
+    lists are tuples. :meth:`to_dict` returns a fresh mutable copy.
+    """
+
+    manifest: Mapping[str, Any]
+    canonical_bytes: bytes
+    sha256: str
+
+    @classmethod
+    def from_manifest(cls, manifest: dict[str, Any], canonical_text: str) -> CachedManifest:
+        canonical_bytes = canonical_text.encode("utf-8")
+        return cls(_read_only(manifest), canonical_bytes, hashlib.sha256(canonical_bytes).hexdigest())
+
+    def to_dict(self) -> dict[str, Any]:
+        manifest: dict[str, Any] = json.loads(self.canonical_bytes)
+        return manifest
+
+
+@functools.cache
+def cached_manifest() -> CachedManifest:
+    """Return the v3.2 manifest, canonicalized and hashed once per process."""
+
+    manifest = build_manifest()
+    return CachedManifest.from_manifest(manifest, canonical_json(manifest))
+
+
+def _checked_verdict(
+    request_id: Any,
+    context_hash: Any,
+    decision: Any,
+    reason_ids: Any,
+    evidence_hash: Any,
+    evidence_families: Any,
+    metadata: Any,
 ) -> dict[str, Any]:
     if not isinstance(request_id, str) or not request_id.strip():
         raise ValueError("request_id must be non-empty str")
-    if decision not in SUPPORTED_DECISIONS:
+    if not isinstance(decision, str) or decision not in _SUPPORTED_DECISION_SET:
         raise ValueError(f"unsupported decision: {decision}")
     if metadata is not None and not isinstance(metadata, dict):
         raise ValueError("metadata must be dict")
@@ -115,18 +160,31 @@ def build_verdict(
         "request_id": request_id.strip(),
         "context_hash": _require_hash(context_hash, field="context_hash"),
         "decision": decision,
-        "reason_ids": list(_canonical_known_tuple(reason_ids, allowed=SUPPORTED_REASON_IDS, field="reason_ids")),
+        "reason_ids": _canonical_known_list(reason_ids, allowed=_SUPPORTED_REASON_ID_SET, field="reason_ids"),
         "evidence_hash": _require_hash(evidence_hash, field="evidence_hash"),
-        "evidence_families": list(_canonical_known_tuple(evidence_families, allowed=SUPPORTED_EVIDENCE_FAMILIES, field="evidence_families")),
+        "evidence_families": _canonical_known_list(evidence_families, allowed=_SUPPORTED_EVIDENCE_FAMILY_SET, field="evidence_families"),
         "metadata": metadata or {},
         "fail_closed": True,
     }
 
 
-def validate_verdict(verdict: dict[str, Any], *, expected_context_hash: str | None = None) -> dict[str, Any]:
+def build_verdict(
+    *,
+    request_id: str,
+    context_hash: str,
+    decision: str,
+    reason_ids: tuple[str, ...] | list[str],
+    evidence_hash: str,
+    evidence_families: tuple[str, ...] | list[str],
+    metadata: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    return _checked_verdict(request_id, context_hash, decision, reason_ids, evidence_hash, evidence_families, metadata)
+
+
+def _validate_verdict_fields(verdict: Any) -> dict[str, Any]:
     if not isinstance(verdict, dict):
         raise ValueError("verdict must be dict")
-    if set(verdict.keys()) != REQUIRED_VERDICT_FIELDS:
+    if verdict.keys() != REQUIRED_VERDICT_FIELDS:
         raise ValueError("verdict fields must match canonical required fields")
     if verdict["component_id"] != COMPONENT_ID:
         raise ValueError("component_id mismatch")
@@ -136,15 +194,48 @@ def validate_verdict(verdict: dict[str, Any], *, expected_context_hash: str | No
         raise ValueError("schema_version mismatch")
     if verdict["fail_closed"] is not True:
         raise ValueError("fail_closed must be true")
-    checked = build_verdict(
-        request_id=verdict["request_id"],
-        context_hash=verdict["context_hash"],
-        decision=verdict["decision"],
-        reason_ids=verdict["reason_ids"],
-        evidence_hash=verdict["evidence_hash"],
-        evidence_families=verdict["evidence_families"],
-        metadata=verdict["metadata"],
+    return _checked_verdict(
+        verdict["request_id"],
+        verdict["context_hash"],
+        verdict["decision"],
+        verdict["reason_ids"],
+        verdict["evidence_hash"],
+        verdict["evidence_families"],
+        verdict["metadata"],
     )
+
+
+def validate_verdict(verdict: dict[str, Any], *, expected_context_hash: str | None = None) -> dict[str, Any]:
+    checked = _validate_verdict_fields(verdict)
     if expected_context_hash is not None and checked["context_hash"] != _require_hash(expected_context_hash, field="expected_context_hash"):
         raise ValueError("context_hash mismatch")
     return checked
+
+
+def validate_verdicts(
+    verdicts: Iterable[Any], *, expected_context_hash: str | None = None
+) -> Iterator[dict[str, Any]]:
+    """Validate many verdicts, yielding one result per item in input order.
+
+    Each result carries the item ``index`` and ``valid``; valid items add the
+    checked ``verdict`` and invalid items the fail-closed ``error`` message,
+    so one bad verdict does not stop the batch. A malformed
+    ``expected_context_hash`` raises here, before any item is read.
+    """
+
+    expected = None
+    if expected_context_hash is not None:
+        expected = _require_hash(expected_context_hash, field="expected_context_hash")
+    return _iter_verdict_results(verdicts, expected)
+
+
+def _iter_verdict_results(verdicts: Iterable[Any], expected: str | None) -> Iterator[dict[str, Any]]:
+    for index, verdict in enumerate(verdicts):
+        try:
+            checked = _validate_verdict_fields(verdict)
+            if expected is not None and checked["context_hash"] != expected:
+                raise ValueError("context_hash mismatch")
+        except ValueError as exc:
+            yield {"index": index, "valid": False, "error": str(exc)}
+        else:
+            yield {"index": index, "valid": True, "verdict": checked}
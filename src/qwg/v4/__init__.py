@@ -1,7 +1,15 @@
-"""QWG Shield v4 PQC-ready component verdict primitives."""
+"""QWG Shield v4 PQC-ready component verdict primitives.
+
+The contract constants below are plain values. The main entry points are
+re-exported lazily: they are imported from their modules on first
+attribute access, so importing a single v4 module does not load the rest.
+"""
 
 from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING
+
 CANONICALIZATION_PROFILE = "shield-v4-canon.v1"
 POLICY_VERSION = "policy.v1"
 VERDICT_SCHEMA_VERSION = "shield.verdict.v2"
@@ -10,3 +18,63 @@ KEY_REGISTRY_SCHEMA_VERSION = "shield.key_registry.v1"
 COMPONENT_ID = "qwg"
 COMPONENT_ROLE = "shield_component_qwg"
 CONTRACT_VERSION = 4
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from qwg.v4.crypto_verdict import (
+        build_signed_crypto_verdict_envelope,
+        build_unsigned_crypto_verdict_payload,
+        validate_crypto_verdict_envelope,
+    )
+    from qwg.v4.nonce_store import NonceStore
+    from qwg.v4.signing import build_signature_bundle, verify_signature_bundle
+    from qwg.v4.trust_profile import TrustProfileIndex, find_trusted_key, validate_trust_profile
+    from qwg.v4.trust_profile_provider import TrustProfileProvider
+
+_LAZY_EXPORTS = {
+    "build_signed_crypto_verdict_envelope": "qwg.v4.crypto_verdict",
+    "build_unsigned_crypto_verdict_payload": "qwg.v4.crypto_verdict",
+    "validate_crypto_verdict_envelope": "qwg.v4.crypto_verdict",
+    "NonceStore": "qwg.v4.nonce_store",
+    "build_signature_bundle": "qwg.v4.signing",
+    "verify_signature_bundle": "qwg.v4.signing",
+    "TrustProfileIndex": "qwg.v4.trust_profile",
+    "find_trusted_key": "qwg.v4.trust_profile",
+    "validate_trust_profile": "qwg.v4.trust_profile",
+    "TrustProfileProvider": "qwg.v4.trust_profile_provider",
+}
+
+__all__ = [
+    "CANONICALIZATION_PROFILE",
+    "COMPONENT_ID",
+    "COMPONENT_ROLE",
+    "CONTRACT_VERSION",
+    "KEY_REGISTRY_SCHEMA_VERSION",
+    "POLICY_VERSION",
+    "SIGNATURE_BUNDLE_SCHEMA_VERSION",
+    "VERDICT_SCHEMA_VERSION",
+    "NonceStore",
+    "TrustProfileIndex",
+    "TrustProfileProvider",
+    "build_signature_bundle",
+    "build_signed_crypto_verdict_envelope",
+    "build_unsigned_crypto_verdict_payload",
+    "find_trusted_key",
+    "validate_crypto_verdict_envelope",
+    "validate_trust_profile",
+    "verify_signature_bundle",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
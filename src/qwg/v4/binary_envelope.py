@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import binascii
+import re
+import unicodedata
+from typing import Any
+
+from qwg.v4.crypto_verdict import REQUIRED_SIGNED_VERDICT_FIELDS
+from qwg.v4.real_crypto_backend import REAL_SIGNATURE_ENCODING_PREFIX
+from qwg.v4.signing import DEFAULT_CANONICAL_BUDGET, CanonicalBudget, to_canonical_json
+
+BINARY_ENVELOPE_MAGIC = b"QWGB\x01"
+BASE64URL_TAG = 21
+BASE16_TAG = 23
+
+_UINT, _NEGINT, _BYTES, _TEXT, _ARRAY, _MAP, _TAG, _SIMPLE = range(8)
+_FALSE = 0xF4
+_TRUE = 0xF5
+_MAX_UINT64 = (1 << 64) - 1
+_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+_BASE64URL_BODY = re.compile(r"[A-Za-z0-9_-]+")
+_BASE64URL_TO_STANDARD = str.maketrans("-_", "+/")
+_STANDARD_TO_BASE64URL = bytes.maketrans(b"+/", b"-_")
+_B64U_PREFIX_LENGTH = len(REAL_SIGNATURE_ENCODING_PREFIX)
+
+
+def _head(major: int, value: int) -> bytes:
+    if value < 24:
+        return bytes((major << 5 | value,))
+    if value < 0x100:
+        return bytes((major << 5 | 24, value))
+    if value < 0x10000:
+        return bytes((major << 5 | 25,)) + value.to_bytes(2, "big")
+    if value < 0x100000000:
+        return bytes((major << 5 | 26,)) + value.to_bytes(4, "big")
+    return bytes((major << 5 | 27,)) + value.to_bytes(8, "big")
+
+
+def _b64u_to_bytes(value: str) -> bytes | None:
+    body = value[_B64U_PREFIX_LENGTH:]
+    if len(body) % 4 == 1 or _BASE64URL_BODY.fullmatch(body) is None:
+        return None
+    raw = binascii.a2b_base64(body.translate(_BASE64URL_TO_STANDARD) + "=" * (-len(body) % 4))
+    return raw if _bytes_to_b64u(raw) == value else None
+
+
+def _bytes_to_b64u(raw: bytes) -> str:
+    encoded = binascii.b2a_base64(raw, newline=False).translate(_STANDARD_TO_BASE64URL).rstrip(b"=")
+    return REAL_SIGNATURE_ENCODING_PREFIX + encoded.decode("ascii")
+
+
+def _is_taggable_text(value: str) -> bool:
+    if value.startswith(REAL_SIGNATURE_ENCODING_PREFIX):
+        return _b64u_to_bytes(value) is not None
+    return len(value) == 64 and _SHA256_HEX.fullmatch(value) is not None
+
+
+def _encode_text(value: str, out: bytearray) -> None:
+    if value.startswith(REAL_SIGNATURE_ENCODING_PREFIX):
+        raw = _b64u_to_bytes(value)
+        if raw is not None:
+            out += _head(_TAG, BASE64URL_TAG) + _head(_BYTES, len(raw)) + raw
+            return
+    elif len(value) == 64 and _SHA256_HEX.fullmatch(value) is not None:
+        out += _head(_TAG, BASE16_TAG) + _head(_BYTES, 32) + bytes.fromhex(value)
+        return
+    encoded = value.encode("utf-8")
+    out += _head(_TEXT, len(encoded)) + encoded
+
+
+def _format_path(path: Any) -> str:
+    segments: list[str] = []
+    while isinstance(path, tuple):
+        path, segment = path
+        segments.append(f"[{segment}]" if isinstance(segment, int) else f".{segment}")
+    root: str = path
+    return root + "".join(reversed(segments))
+
+
+class _BudgetedWalk:
+    """Depth and member-count bookkeeping shared by the encoder and decoder."""
+
+    def __init__(self, budget: CanonicalBudget) -> None:
+        self.max_depth = budget.max_depth
+        self.remaining = budget.max_nodes
+
+    def enter(self, members: int, depth: int, path: Any) -> None:
+        if depth > self.max_depth:
+            raise ValueError(f"{_format_path(path)} exceeds canonical nesting depth budget")
+        if self.remaining is not None:
+            self.remaining -= members
+            if self.remaining < 0:
+                raise ValueError(f"{_format_path(path)} exceeds canonical size budget")
+
+
+def _encode_item(value: Any, out: bytearray, path: Any, depth: int, walk: _BudgetedWalk) -> None:
+    if isinstance(value, str):
+        _encode_text(value if value.isascii() else unicodedata.normalize("NFC", value), out)
+    elif isinstance(value, bool):
+        out.append(_TRUE if value else _FALSE)
+    elif isinstance(value, int):
+        if value > _MAX_UINT64 or value < -1 - _MAX_UINT64:
+            raise ValueError(f"{_format_path(path)} integer is out of binary envelope range")
+        out += _head(_UINT, value) if value >= 0 else _head(_NEGINT, -1 - value)
+    elif isinstance(value, (list, tuple)):
+        walk.enter(len(value), depth, path)
+        out += _head(_ARRAY, len(value))
+        for index, item in enumerate(value):
+            _encode_item(item, out, (path, index), depth + 1, walk)
+    elif isinstance(value, dict):
+        walk.enter(len(value), depth, path)
+        entries: dict[bytes, tuple[str, Any]] = {}
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise ValueError(f"{_format_path(path)} object keys must be strings")
+            clean_key = key if key.isascii() else unicodedata.normalize("NFC", key)
+            raw_key = clean_key.encode("utf-8")
+            encoded_key = _head(_TEXT, len(raw_key)) + raw_key
+            if encoded_key in entries:
+                raise ValueError(f"{_format_path(path)} contains duplicate key after Unicode normalization")
+            entries[encoded_key] = (clean_key, item)
+        out += _head(_MAP, len(entries))
+        for encoded_key in sorted(entries):
+            clean_key, item = entries[encoded_key]
+            out += encoded_key
+            _encode_item(item, out, (path, clean_key), depth + 1, walk)
+    elif value is None:
+        raise ValueError(f"{_format_path(path)} must omit absent fields instead of using null")
+    elif isinstance(value, float):
+        raise ValueError(f"{_format_path(path)} must not contain floats")
+    else:
+        raise ValueError(f"{_format_path(path)} contains unsupported type {type(value).__name__}")
+
+
+def encode_binary_crypto_verdict_envelope(
+    envelope: dict[str, Any], *, budget: CanonicalBudget = DEFAULT_CANONICAL_BUDGET
+) -> bytes:
+    """Encode a signed QWG v4 verdict envelope in the compact binary wire format.
+
+    The format is ``BINARY_ENVELOPE_MAGIC`` followed by one item of a
+    deterministic CBOR subset (RFC 8949 core deterministic encoding): unsigned
+    and negative 64-bit integers, UTF-8 text, arrays, maps with text keys, and
+    ``true``/``false``. Canonical ``b64u:`` strings travel as raw bytes under
+    tag 21 and lowercase SHA-256 hex strings as 32 bytes under tag 23, so
+    signatures and hashes are not inflated by their text encoding.
+
+    Text is NFC-normalized exactly as for canonical JSON, so decoding yields the
+    canonical JSON form of ``envelope`` and its signed payload hash is unchanged.
+    ``budget`` bounds nesting and size as in ``to_canonical_json``.
+    """
+
+    if not isinstance(envelope, dict) or set(envelope.keys()) != REQUIRED_SIGNED_VERDICT_FIELDS:
+        raise ValueError("QWG v4 verdict fields must match required schema")
+    out = bytearray(BINARY_ENVELOPE_MAGIC)
+    _encode_item(envelope, out, "$", 0, _BudgetedWalk(budget))
+    return bytes(out)
+
+
+def _read_argument(data: bytes, offset: int, info: int) -> tuple[int, int]:
+    if info < 24:
+        return info, offset
+    if info > 27:
+        raise ValueError("binary envelope uses unsupported length encoding")
+    width = 1 << (info - 24)
+    end = offset + width
+    if end > len(data):
+        raise ValueError("binary envelope is truncated")
+    value = int.from_bytes(data[offset:end], "big")
+    if value < (24 if width == 1 else 1 << (4 * width)):
+        raise ValueError("binary envelope integer is not minimally encoded")
+    return value, end
+
+
+def _read_text(data: bytes, offset: int, length: int) -> tuple[str, int]:
+    end = offset + length
+    if end > len(data):
+        raise ValueError("binary envelope is truncated")
+    try:
+        text = data[offset:end].decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise ValueError("binary envelope text must be valid UTF-8") from exc
+    if not text.isascii() and not unicodedata.is_normalized("NFC", text):
+        raise ValueError("binary envelope text must be NFC normalized")
+    return text, end
+
+
+def _decode_item(data: bytes, offset: int, path: Any, depth: int, walk: _BudgetedWalk) -> tuple[Any, int]:
+    # ``path`` is a lazily formatted (parent, segment) chain; it is only rendered for error messages.
+    if offset >= len(data):
+        raise ValueError("binary envelope is truncated")
+    initial = data[offset]
+    major = initial >> 5
+    if major == _SIMPLE:
+        if initial == _TRUE:
+            return True, offset + 1
+        if initial == _FALSE:
+            return False, offset + 1
+        raise ValueError("binary envelope contains unsupported simple value")
+    info = initial & 0x1F
+    if info < 24:
+        argument, offset = info, offset + 1
+    else:
+        argument, offset = _read_argument(data, offset + 1, info)
+    if major == _TEXT:
+        text, offset = _read_text(data, offset, argument)
+        if _is_taggable_text(text):
+            raise ValueError("binary envelope text must use its deterministic tag")
+        return text, offset
+    if major == _UINT:
+        return argument, offset
+    if major == _NEGINT:
+        return -1 - argument, offset
+    if major == _TAG:
+        if offset >= len(data) or data[offset] >> 5 != _BYTES:
+            raise ValueError("binary envelope tag must wrap a byte string")
+        length, start = _read_argument(data, offset + 1, data[offset] & 0x1F)
+        end = start + length
+        if end > len(data):
+            raise ValueError("binary envelope is truncated")
+        raw = data[start:end]
+        if argument == BASE64URL_TAG and raw:
+            return _bytes_to_b64u(raw), end
+        if argument == BASE16_TAG and length == 32:
+            return raw.hex(), end
+        raise ValueError("binary envelope contains unsupported tag")
+    if major == _BYTES:
+        raise ValueError("binary envelope byte strings must be tagged")
+    if argument > len(data) - offset:
+        raise ValueError("binary envelope is truncated")
+    walk.enter(argument, depth, path)
+    depth += 1
+    if major == _ARRAY:
+        items = []
+        for index in range(argument):
+            item, offset = _decode_item(data, offset, (path, index), depth, walk)
+            items.append(item)
+        return items, offset
+    result: dict[str, Any] = {}
+    previous_key = b""
+    for _ in range(argument):
+        key_start = offset
+        if offset >= len(data) or data[offset] >> 5 != _TEXT:
+            raise ValueError("binary envelope map keys must be text")
+        length, offset = _read_argument(data, offset + 1, data[offset] & 0x1F)
+        key, offset = _read_text(data, offset, length)
+        encoded_key = data[key_start:offset]
+        if encoded_key <= previous_key:
+            raise ValueError("binary envelope map keys must be unique and in deterministic order")
+        previous_key = encoded_key
+        result[key], offset = _decode_item(data, offset, (path, key), depth, walk)
+    return result, offset
+
+
+def decode_binary_crypto_verdict_envelope(
+    data: bytes, *, budget: CanonicalBudget = DEFAULT_CANONICAL_BUDGET
+) -> dict[str, Any]:
+    """Decode :func:`encode_binary_crypto_verdict_envelope` output into the canonical envelope dict.
+
+    Decoding is strict and fails closed with ``ValueError`` on anything the
+    encoder would not emit: wrong magic, truncation, trailing bytes,
+    non-minimal or indefinite lengths, unsorted or duplicate map keys, untagged
+    byte strings, unsupported tags or simple values, invalid UTF-8, non-NFC
+    text, or nesting and size beyond ``budget``. The result still has to pass
+    ``validate_crypto_verdict_envelope``.
+    """
+
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        raise ValueError("binary envelope must be bytes")
+    data = bytes(data)
+    if not data.startswith(BINARY_ENVELOPE_MAGIC):
+        raise ValueError("binary envelope magic mismatch")
+    envelope, offset = _decode_item(data, len(BINARY_ENVELOPE_MAGIC), "$", 0, _BudgetedWalk(budget))
+    if offset != len(data):
+        raise ValueError("binary envelope has trailing bytes")
+    if not isinstance(envelope, dict) or set(envelope.keys()) != REQUIRED_SIGNED_VERDICT_FIELDS:
+        raise ValueError("QWG v4 verdict fields must match required schema")
+    return envelope
+
+
+def binary_envelope_to_canonical_json(data: bytes, *, budget: CanonicalBudget = DEFAULT_CANONICAL_BUDGET) -> str:
+    """Return the canonical JSON text of a binary envelope."""
+
+    return to_canonical_json(decode_binary_crypto_verdict_envelope(data, budget=budget), budget=budget)
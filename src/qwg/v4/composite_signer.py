@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from qwg.v4.crypto_verdict import REQUIRED_UNSIGNED_VERDICT_FIELDS
+from qwg.v4.real_crypto_backend import (
+    QwgV4RealCryptoBackend,
+    QwgV4RealCryptoBackendError,
+    QwgV4RealCryptoBackendUnavailable,
+    build_real_crypto_signature_input,
+    decode_binary_signature_material,
+    reject_test_only_private_key_reference,
+)
+from qwg.v4.signing import COMPONENT_VERDICT_DOMAIN, build_signature_bundle, signed_payload_hash
+from qwg.v4.trust_profile import (
+    REQUIRED_ALGORITHMS,
+    SUPPORTED_ALGORITHMS,
+    default_standard_profile_for_algorithm,
+    require_positive_int,
+)
+
+_VALIDATION_HASH = "0" * 64
+
+
+@dataclass(frozen=True)
+class CompositeSigningKey:
+    """One algorithm slot of a :class:`CompositeVerdictSigner`.
+
+    ``standard_profile`` defaults to the policy.v1 profile for ``algorithm``.
+    """
+
+    algorithm: str
+    key_id: str
+    key_version: int
+    private_key_reference: str
+    backend: QwgV4RealCryptoBackend
+    standard_profile: str | None = None
+
+
+def _prepare_signing_key(key: Any) -> CompositeSigningKey:
+    if not isinstance(key, CompositeSigningKey):
+        raise QwgV4RealCryptoBackendError("signing key must be CompositeSigningKey")
+    if key.algorithm not in SUPPORTED_ALGORITHMS:
+        raise QwgV4RealCryptoBackendError("algorithm must be supported")
+    standard_profile = key.standard_profile
+    if standard_profile is None:
+        standard_profile = default_standard_profile_for_algorithm(key.algorithm)
+    # Validates profile, key id and key version exactly as every signing call will.
+    build_real_crypto_signature_input(
+        algorithm=key.algorithm,
+        standard_profile=standard_profile,
+        domain_tag=COMPONENT_VERDICT_DOMAIN,
+        signed_payload_hash=_VALIDATION_HASH,
+        key_id=key.key_id,
+        key_version=key.key_version,
+    )
+    reject_test_only_private_key_reference(key.private_key_reference)
+    try:
+        supported = tuple(getattr(key.backend, "supported_algorithms", ()))
+    except Exception as exc:
+        raise QwgV4RealCryptoBackendError("real crypto backend algorithm discovery failed closed") from exc
+    if key.algorithm not in supported:
+        raise QwgV4RealCryptoBackendUnavailable("real crypto backend does not support required algorithm")
+    return dataclasses.replace(key, standard_profile=standard_profile)
+
+
+class CompositeVerdictSigner:
+    """Sign a QWG v4 unsigned verdict payload under every configured algorithm at once.
+
+    Keys are validated once at construction. Each ``sign`` call hashes the
+    payload once, signs all algorithms concurrently on a private thread pool and
+    returns the canonical signature bundle together with the signed envelope.
+    Any algorithm failure fails the whole call closed; no partial bundle is
+    returned.
+    """
+
+    def __init__(
+        self,
+        *,
+        signing_keys: list[CompositeSigningKey] | tuple[CompositeSigningKey, ...],
+        max_workers: int | None = None,
+    ) -> None:
+        if not isinstance(signing_keys, (list, tuple)) or not signing_keys:
+            raise QwgV4RealCryptoBackendError("signing_keys must be non-empty list")
+        prepared: dict[str, CompositeSigningKey] = {}
+        for key in signing_keys:
+            clean = _prepare_signing_key(key)
+            if clean.algorithm in prepared:
+                raise QwgV4RealCryptoBackendError("duplicate signing algorithm")
+            prepared[clean.algorithm] = clean
+        missing = [algorithm for algorithm in REQUIRED_ALGORITHMS if algorithm not in prepared]
+        if missing:
+            raise QwgV4RealCryptoBackendUnavailable(f"composite signer missing required algorithms: {', '.join(missing)}")
+        self.signing_keys = tuple(prepared[algorithm] for algorithm in SUPPORTED_ALGORITHMS if algorithm in prepared)
+        self.algorithms = tuple(key.algorithm for key in self.signing_keys)
+        if max_workers is not None:
+            require_positive_int(max_workers, field="max_workers")
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.signing_keys) if max_workers is None else max_workers,
+            thread_name_prefix="qwg-v4-composite-signer",
+        )
+
+    def _sign_entry(self, key: CompositeSigningKey, payload_hash: str) -> dict[str, Any]:
+        message = build_real_crypto_signature_input(
+            algorithm=key.algorithm,
+            standard_profile=str(key.standard_profile),
+            domain_tag=COMPONENT_VERDICT_DOMAIN,
+            signed_payload_hash=payload_hash,
+            key_id=key.key_id,
+            key_version=key.key_version,
+        )
+        try:
+            signature = key.backend.sign_message(
+                algorithm=key.algorithm,
+                private_key_reference=key.private_key_reference,
+                message=message,
+            )
+        except QwgV4RealCryptoBackendError:
+            raise
+        except Exception as exc:
+            raise QwgV4RealCryptoBackendError(f"real crypto backend {key.algorithm} sign failed closed") from exc
+        decode_binary_signature_material(signature, field="signature")
+        return {
+            "algorithm": key.algorithm,
+            "standard_profile": key.standard_profile,
+            "key_id": key.key_id,
+            "key_version": key.key_version,
+            "signed_payload_hash": payload_hash,
+            "domain_tag": COMPONENT_VERDICT_DOMAIN,
+            "signature": signature,
+        }
+
+    def sign(self, unsigned_payload: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Return ``(signature_bundle, signed_envelope)`` for ``unsigned_payload``."""
+
+        if not isinstance(unsigned_payload, dict) or set(unsigned_payload.keys()) != REQUIRED_UNSIGNED_VERDICT_FIELDS:
+            raise ValueError("unsigned QWG v4 verdict payload fields must match required schema")
+        payload_hash = signed_payload_hash(payload=unsigned_payload)
+        futures = [self._executor.submit(self._sign_entry, key, payload_hash) for key in self.signing_keys]
+        wait(futures)
+        bundle = build_signature_bundle(signatures=[future.result() for future in futures])
+        envelope = {
+            **unsigned_payload,
+            "signed_payload_hash": payload_hash,
+            "signature_bundle": bundle,
+        }
+        return bundle, envelope
+
+    def close(self) -> None:
+        """Shut down the signing thread pool."""
+
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> CompositeVerdictSigner:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
-from typing import Any
+import re
+from typing import TYPE_CHECKING, Any
 
 from qwg.v3.v3_2_lock import SUPPORTED_DECISIONS, SUPPORTED_EVIDENCE_FAMILIES, SUPPORTED_REASON_IDS
 from qwg.v4 import CANONICALIZATION_PROFILE, COMPONENT_ID, CONTRACT_VERSION, POLICY_VERSION, VERDICT_SCHEMA_VERSION
-from qwg.v4.signing import SignatureVerifier, signed_payload_hash, verify_signature_bundle
-from qwg.v4.trust_profile import require_non_empty_str, require_positive_int, validate_freshness_window
+from qwg.v4.signing import CanonicalBudget, SignatureVerifier, signed_payload_hash, verify_signature_bundle
+from qwg.v4.trust_profile import (
+    TrustProfileIndex,
+    require_non_empty_str,
+    require_positive_int,
+    validate_freshness_window,
+)
+
+if TYPE_CHECKING:
+    from qwg.v4.nonce_store import NonceStore
+
+_CANONICAL_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+_SUPPORTED_REASON_ID_SET = frozenset(SUPPORTED_REASON_IDS)
+_SUPPORTED_EVIDENCE_FAMILY_SET = frozenset(SUPPORTED_EVIDENCE_FAMILIES)
 
 REQUIRED_UNSIGNED_VERDICT_FIELDS = frozenset(
     {
@@ -29,6 +42,7 @@ REQUIRED_UNSIGNED_VERDICT_FIELDS = frozenset(
     }
 )
 REQUIRED_SIGNED_VERDICT_FIELDS = REQUIRED_UNSIGNED_VERDICT_FIELDS | {"signed_payload_hash", "signature_bundle"}
+DEFAULT_METADATA_BUDGET = CanonicalBudget(max_depth=32, max_nodes=100_000)
 FORBIDDEN_METADATA_AUTHORITY_KEYS = frozenset(
     {
         "allow",
@@ -82,13 +96,39 @@ def canonical_known_list(values: Any, *, allowed: tuple[str, ...], field: str) -
     return sorted(out)
 
 
-def contains_forbidden_metadata_authority(value: Any) -> bool:
-    if isinstance(value, dict):
-        if set(value) & FORBIDDEN_METADATA_AUTHORITY_KEYS:
-            return True
-        return any(contains_forbidden_metadata_authority(item) for item in value.values())
-    if isinstance(value, list):
-        return any(contains_forbidden_metadata_authority(item) for item in value)
+def contains_forbidden_metadata_authority(
+    value: Any, *, budget: CanonicalBudget | None = DEFAULT_METADATA_BUDGET
+) -> bool:
+    """Return True when any object nested in ``value`` carries an authority key.
+
+    The scan is iterative and stops at the first offending object. Nesting
+    deeper than ``budget.max_depth`` or more than ``budget.max_nodes`` members
+    fails closed with ``ValueError`` instead of exhausting the interpreter;
+    ``budget=None`` scans without bounds.
+    """
+
+    if not isinstance(value, (dict, list, tuple)):
+        return False
+    max_depth = None if budget is None else budget.max_depth
+    remaining = None if budget is None else budget.max_nodes
+    stack: list[tuple[Any, int]] = [(value, 0)]
+    while stack:
+        current, depth = stack.pop()
+        if isinstance(current, dict):
+            if not FORBIDDEN_METADATA_AUTHORITY_KEYS.isdisjoint(current):
+                return True
+            children = current.values()
+        else:
+            children = current
+        if remaining is not None:
+            remaining -= len(children)
+            if remaining < 0:
+                raise ValueError("metadata exceeds size budget")
+        for child in children:
+            if isinstance(child, (dict, list, tuple)):
+                if max_depth is not None and depth >= max_depth:
+                    raise ValueError("metadata exceeds nesting depth budget")
+                stack.append((child, depth + 1))
     return False
 
 
@@ -105,13 +145,20 @@ def build_unsigned_crypto_verdict_payload(
     evidence_families: tuple[str, ...] | list[str],
     key_registry_version: int,
     metadata: dict[str, Any] | None = None,
+    metadata_budget: CanonicalBudget | None = None,
 ) -> dict[str, Any]:
+    """Build the unsigned payload of a QWG v4 crypto verdict.
+
+    ``metadata`` is scanned for authority keys without bounds unless
+    ``metadata_budget`` is given; validators pass ``DEFAULT_METADATA_BUDGET``.
+    """
+
     if decision not in SUPPORTED_DECISIONS:
         raise ValueError("unsupported decision")
     checked_metadata = {} if metadata is None else metadata
     if not isinstance(checked_metadata, dict):
         raise ValueError("metadata must be dict")
-    if contains_forbidden_metadata_authority(checked_metadata):
+    if contains_forbidden_metadata_authority(checked_metadata, budget=metadata_budget):
         raise ValueError("metadata contains forbidden authority field")
     checked_not_before, checked_not_after = validate_freshness_window(not_before=not_before, not_after=not_after)
     return {
@@ -145,13 +192,115 @@ def build_signed_crypto_verdict_envelope(*, unsigned_payload: dict[str, Any], si
     }
 
 
+def _is_canonical_known_list(values: Any, *, allowed: frozenset[str]) -> bool:
+    if type(values) is not list or not values:
+        return False
+    if not all(isinstance(item, str) and item in allowed for item in values):
+        return False
+    return all(left < right for left, right in zip(values, values[1:], strict=False))
+
+
+def _is_canonical_unsigned_payload(payload: dict[str, Any]) -> bool:
+    """Return True when ``payload`` already equals its rebuilt canonical form.
+
+    This is the schema equality check for the validation fast path: every value
+    must pass the builder's checks *and* already be in the form the builder would
+    emit (stripped strings, lowercase hashes, sorted unique lists). The metadata
+    authority scan is left to the canonicalization walk that hashes the payload.
+    """
+
+    if payload["decision"] not in SUPPORTED_DECISIONS:
+        return False
+    for field in ("request_id", "freshness_nonce"):
+        value = payload[field]
+        if type(value) is not str or not value or value != value.strip():
+            return False
+    for field in ("context_hash", "evidence_hash"):
+        value = payload[field]
+        if type(value) is not str or _CANONICAL_SHA256_HEX.fullmatch(value) is None:
+            return False
+    if not _is_canonical_known_list(payload["reason_ids"], allowed=_SUPPORTED_REASON_ID_SET):
+        return False
+    if not _is_canonical_known_list(payload["evidence_families"], allowed=_SUPPORTED_EVIDENCE_FAMILY_SET):
+        return False
+    version = payload["key_registry_version"]
+    if type(version) is not int or version <= 0:
+        return False
+    if type(payload["metadata"]) is not dict:
+        return False
+    try:
+        validate_freshness_window(not_before=payload["not_before"], not_after=payload["not_after"])
+    except ValueError:
+        return False
+    return True
+
+
+def _payload_budget_for_metadata(payload: dict[str, Any], metadata_budget: CanonicalBudget) -> CanonicalBudget:
+    # The canonical walk starts at the payload root: metadata sits one level
+    # down, and the root members plus both id lists are visited besides it.
+    if metadata_budget.max_nodes is None:
+        max_nodes = None
+    else:
+        max_nodes = (
+            metadata_budget.max_nodes
+            + len(payload)
+            + len(payload["reason_ids"])
+            + len(payload["evidence_families"])
+        )
+    return CanonicalBudget(max_depth=metadata_budget.max_depth + 1, max_nodes=max_nodes)
+
+
+def canonical_unsigned_payload_and_hash(
+    verdict: dict[str, Any], *, metadata_budget: CanonicalBudget = DEFAULT_METADATA_BUDGET
+) -> tuple[dict[str, Any], str]:
+    """Return the validated unsigned payload of a signed QWG v4 envelope and its hash.
+
+    Envelopes emitted by ``build_signed_crypto_verdict_envelope`` already hold
+    canonical values, so they are checked in place and canonicalized once: the
+    walk that produces the signed payload hash also enforces the metadata
+    authority boundary. Anything else, including every rejection, goes through
+    ``build_unsigned_crypto_verdict_payload`` so accepted inputs and fail-closed
+    errors are unchanged.
+    """
+
+    unsigned_payload = {field: verdict[field] for field in REQUIRED_UNSIGNED_VERDICT_FIELDS}
+    if _is_canonical_unsigned_payload(unsigned_payload):
+        try:
+            payload_hash = signed_payload_hash(
+                payload=unsigned_payload,
+                nested_forbidden_keys=FORBIDDEN_METADATA_AUTHORITY_KEYS,
+                budget=_payload_budget_for_metadata(unsigned_payload, metadata_budget),
+            )
+        except ValueError:
+            pass
+        else:
+            return unsigned_payload, payload_hash
+    unsigned_payload = build_unsigned_crypto_verdict_payload(
+        request_id=verdict["request_id"],
+        context_hash=verdict["context_hash"],
+        freshness_nonce=verdict["freshness_nonce"],
+        not_before=verdict["not_before"],
+        not_after=verdict["not_after"],
+        decision=verdict["decision"],
+        reason_ids=verdict["reason_ids"],
+        evidence_hash=verdict["evidence_hash"],
+        evidence_families=verdict["evidence_families"],
+        metadata=verdict["metadata"],
+        key_registry_version=verdict["key_registry_version"],
+        metadata_budget=metadata_budget,
+    )
+    return unsigned_payload, signed_payload_hash(payload=unsigned_payload)
+
+
 def validate_crypto_verdict_envelope(
     verdict: dict[str, Any],
     *,
     expected_context_hash: str,
-    trust_profile: dict[str, Any],
+    trust_profile: dict[str, Any] | TrustProfileIndex,
     verification_time: str,
     verifier: SignatureVerifier,
+    metadata_budget: CanonicalBudget = DEFAULT_METADATA_BUDGET,
+    nonce_store: NonceStore | None = None,
 ) -> dict[str, Any]:
     if not isinstance(verdict, dict):
         raise ValueError("QWG v4 verdict must be dict")
@@ -169,22 +318,11 @@ def validate_crypto_verdict_envelope(
         raise ValueError("signature policy mismatch")
     if verdict["fail_closed"] is not True:
         raise ValueError("fail_closed must be true")
-    unsigned_payload = build_unsigned_crypto_verdict_payload(
-        request_id=verdict["request_id"],
-        context_hash=verdict["context_hash"],
-        freshness_nonce=verdict["freshness_nonce"],
-        not_before=verdict["not_before"],
-        not_after=verdict["not_after"],
-        decision=verdict["decision"],
-        reason_ids=verdict["reason_ids"],
-        evidence_hash=verdict["evidence_hash"],
-        evidence_families=verdict["evidence_families"],
-        metadata=verdict["metadata"],
-        key_registry_version=verdict["key_registry_version"],
+    unsigned_payload, expected_payload_hash = canonical_unsigned_payload_and_hash(
+        verdict, metadata_budget=metadata_budget
     )
     if unsigned_payload["context_hash"] != require_hash(expected_context_hash, field="expected_context_hash"):
         raise ValueError("context_hash mismatch")
-    expected_payload_hash = signed_payload_hash(payload=unsigned_payload)
     if require_hash(verdict["signed_payload_hash"], field="signed_payload_hash") != expected_payload_hash:
         raise ValueError("signed payload hash mismatch")
     verification = verify_signature_bundle(
@@ -196,4 +334,11 @@ def validate_crypto_verdict_envelope(
         artifact_not_after=verdict["not_after"],
         verifier=verifier,
     )
+    if nonce_store is not None:
+        nonce_store.check_and_record(
+            request_id=unsigned_payload["request_id"],
+            freshness_nonce=unsigned_payload["freshness_nonce"],
+            not_after=unsigned_payload["not_after"],
+            verification_time=verification_time,
+        )
     return {**verdict, "verification_summary": verification}
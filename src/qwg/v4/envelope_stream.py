@@ -0,0 +1,254 @@
+"""Streaming validation of newline-delimited QWG v4 verdict envelope files.
+
+Run as ``python -m qwg.v4.envelope_stream ENVELOPES.ndjson --trust-profile
+PROFILE.json --verifier module:attribute --bind-to-recorded-context`` for audit
+replay, or with ``--expected-context-hash`` and ``--verification-time`` to
+check every envelope against one context, with progress and throughput
+reporting on stderr.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import mmap
+import os
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from qwg.v4.crypto_verdict import DEFAULT_METADATA_BUDGET, validate_crypto_verdict_envelope
+from qwg.v4.signing import CanonicalBudget, SignatureVerifier, parse_json_no_duplicate_keys
+from qwg.v4.trust_profile import TrustProfileIndex
+
+_MIB = 1024 * 1024
+_RESIDENT_WINDOW = 16 * _MIB
+
+
+def iter_ndjson_envelope_slices(path: str | os.PathLike[str]) -> Iterator[tuple[int, int, memoryview]]:
+    """Yield ``(line_number, offset, view)`` for every non-empty line of ``path``.
+
+    The file is memory-mapped and each ``view`` is a zero-copy slice of the
+    mapping without its line terminator. A view is released when the next
+    line is requested, so callers must copy anything they keep. Where the
+    platform supports ``madvise``, pages behind the read position are dropped
+    from the process every ``_RESIDENT_WINDOW`` bytes, so resident memory
+    stays flat.
+    """
+
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            drop_pages = hasattr(mmap, "MADV_DONTNEED")
+            size = len(mapped)
+            with memoryview(mapped) as whole:
+                start = 0
+                line_number = 0
+                resident_from = 0
+                while start < size:
+                    if drop_pages and start - resident_from >= _RESIDENT_WINDOW:
+                        resident_from = start - start % mmap.PAGESIZE
+                        mapped.madvise(mmap.MADV_DONTNEED, 0, resident_from)
+                    line_number += 1
+                    newline = mapped.find(b"\n", start)
+                    end = size if newline < 0 else newline
+                    stop = end - 1 if end > start and whole[end - 1] == 0x0D else end
+                    if stop > start:
+                        view = whole[start:stop]
+                        try:
+                            yield line_number, start, view
+                        finally:
+                            view.release()
+                    start = end + 1
+
+
+def stream_validate_crypto_verdict_envelopes(
+    path: str | os.PathLike[str],
+    *,
+    trust_profile: dict[str, Any] | TrustProfileIndex,
+    verifier: SignatureVerifier,
+    expected_context_hash: str | None = None,
+    verification_time: str | None = None,
+    bind_to_recorded_context: bool = False,
+    metadata_budget: CanonicalBudget = DEFAULT_METADATA_BUDGET,
+) -> Iterator[dict[str, Any]]:
+    """Validate every envelope of an NDJSON file, yielding one result per line.
+
+    Each result carries ``line_number``, ``offset``, ``length`` and ``valid``;
+    valid lines add the checked ``verdict`` and invalid lines the fail-closed
+    ``error`` message. Nothing is retained between lines, so memory use does
+    not grow with the file.
+
+    Every envelope is bound to ``expected_context_hash`` and verified at
+    ``verification_time``; both are required. For audit replay of envelopes
+    with different contexts, ``bind_to_recorded_context=True`` instead binds
+    each envelope to its own recorded ``context_hash`` and, when
+    ``verification_time`` is omitted, verifies it as of its recorded
+    ``not_before``. That mode only proves the signatures, not that an
+    envelope belongs to a particular context.
+    """
+
+    if bind_to_recorded_context:
+        if expected_context_hash is not None:
+            raise ValueError("expected_context_hash cannot be combined with bind_to_recorded_context")
+    elif expected_context_hash is None or verification_time is None:
+        raise ValueError("expected_context_hash and verification_time are required unless bind_to_recorded_context is set")
+    return _stream_validate(
+        path,
+        trust_profile=trust_profile,
+        verifier=verifier,
+        expected_context_hash=expected_context_hash,
+        verification_time=verification_time,
+        metadata_budget=metadata_budget,
+    )
+
+
+def _stream_validate(
+    path: str | os.PathLike[str],
+    *,
+    trust_profile: dict[str, Any] | TrustProfileIndex,
+    verifier: SignatureVerifier,
+    expected_context_hash: str | None,
+    verification_time: str | None,
+    metadata_budget: CanonicalBudget,
+) -> Iterator[dict[str, Any]]:
+    for line_number, offset, view in iter_ndjson_envelope_slices(path):
+        result: dict[str, Any] = {"line_number": line_number, "offset": offset, "length": len(view)}
+        try:
+            verdict = parse_json_no_duplicate_keys(str(view, "utf-8"))
+            checked = validate_crypto_verdict_envelope(
+                verdict,
+                expected_context_hash=(
+                    verdict.get("context_hash", "") if expected_context_hash is None else expected_context_hash
+                ),
+                trust_profile=trust_profile,
+                verification_time=verdict.get("not_before", "") if verification_time is None else verification_time,
+                verifier=verifier,
+                metadata_budget=metadata_budget,
+            )
+        except (ValueError, RecursionError) as exc:
+            result["valid"] = False
+            result["error"] = str(exc)
+        else:
+            result["valid"] = True
+            result["verdict"] = checked
+        yield result
+
+
+def load_verifier(spec: str) -> SignatureVerifier:
+    """Resolve a ``module:attribute`` spec to a signature verifier callable."""
+
+    module_name, separator, attribute = spec.partition(":")
+    if not separator or not module_name or not attribute:
+        raise ValueError("verifier must be module:attribute")
+    try:
+        verifier = getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(f"verifier {spec} could not be imported") from exc
+    if not callable(verifier):
+        raise ValueError(f"verifier {spec} is not callable")
+    return verifier  # type: ignore[no-any-return]
+
+
+def _progress_line(*, envelopes: int, valid: int, processed: int, total: int, elapsed: float) -> str:
+    rate = processed / _MIB / elapsed if elapsed > 0 else 0.0
+    percent = 100.0 * processed / total if total else 100.0
+    return (
+        f"{percent:5.1f}% {envelopes} envelopes ({valid} valid, {envelopes - valid} invalid) "
+        f"{processed / _MIB:.1f}/{total / _MIB:.1f} MiB {rate:.1f} MiB/s"
+    )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m qwg.v4.envelope_stream",
+        description="Validate a newline-delimited file of signed QWG v4 verdict envelopes.",
+    )
+    parser.add_argument("envelopes", type=Path, help="NDJSON file with one signed envelope per line")
+    parser.add_argument("--trust-profile", type=Path, required=True, help="QWG trust-profile JSON file")
+    parser.add_argument("--verifier", required=True, help="signature verifier as module:attribute")
+    binding = parser.add_mutually_exclusive_group(required=True)
+    binding.add_argument("--expected-context-hash", help="require this context_hash for every envelope")
+    binding.add_argument(
+        "--bind-to-recorded-context",
+        action="store_true",
+        help="audit replay: bind each envelope to its own recorded context_hash",
+    )
+    parser.add_argument(
+        "--verification-time",
+        help="verify at this UTC time; required unless --bind-to-recorded-context, which defaults to each not_before",
+    )
+    parser.add_argument(
+        "--progress-interval", type=float, default=1.0, help="seconds between progress lines, 0 disables"
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the CLI; returns 0 when every envelope validates and 1 otherwise.
+
+    Invalid envelopes and the final summary are written to stdout as JSON
+    lines; the summary names the ``context_binding`` and
+    ``verification_time`` used. Progress lines go to stderr.
+    """
+
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.verification_time is None and not args.bind_to_recorded_context:
+        parser.error("--verification-time is required with --expected-context-hash")
+    try:
+        verifier = load_verifier(args.verifier)
+        trust_profile = parse_json_no_duplicate_keys(args.trust_profile.read_text(encoding="utf-8"))
+        total = args.envelopes.stat().st_size
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+
+    started = time.monotonic()
+    next_report = started + args.progress_interval
+    envelopes = valid = processed = 0
+    for result in stream_validate_crypto_verdict_envelopes(
+        args.envelopes,
+        trust_profile=trust_profile,
+        verifier=verifier,
+        expected_context_hash=args.expected_context_hash,
+        verification_time=args.verification_time,
+        bind_to_recorded_context=args.bind_to_recorded_context,
+    ):
+        envelopes += 1
+        processed = result["offset"] + result["length"]
+        if result["valid"]:
+            valid += 1
+        else:
+            print(json.dumps({key: result[key] for key in ("line_number", "offset", "error")}))
+        now = time.monotonic()
+        if args.progress_interval > 0 and now >= next_report:
+            progress = _progress_line(
+                envelopes=envelopes, valid=valid, processed=processed, total=total, elapsed=now - started
+            )
+            print(progress, file=sys.stderr, flush=True)
+            next_report = now + args.progress_interval
+
+    elapsed = time.monotonic() - started
+    summary = {
+        "bytes": total,
+        "context_binding": "recorded" if args.bind_to_recorded_context else "expected",
+        "envelopes": envelopes,
+        "envelopes_per_second": round(envelopes / elapsed, 1) if elapsed > 0 else 0.0,
+        "invalid": envelopes - valid,
+        "mib_per_second": round(total / _MIB / elapsed, 2) if elapsed > 0 else 0.0,
+        "seconds": round(elapsed, 3),
+        "valid": valid,
+        "verification_time": args.verification_time or "recorded_not_before",
+    }
+    print(json.dumps(summary, sort_keys=True))
+    return 0 if valid == envelopes else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+"""QWG Shield v4 component manifest drawn from the ``qwg.v4`` contract constants."""
+
+from __future__ import annotations
+
+import functools
+from typing import Any
+
+from qwg.v3.v3_2_lock import (
+    COMPONENT_NAME,
+    SUPPORTED_DECISIONS,
+    SUPPORTED_EVIDENCE_FAMILIES,
+    SUPPORTED_REASON_IDS,
+    CachedManifest,
+)
+from qwg.v4 import (
+    CANONICALIZATION_PROFILE,
+    COMPONENT_ID,
+    COMPONENT_ROLE,
+    CONTRACT_VERSION,
+    KEY_REGISTRY_SCHEMA_VERSION,
+    POLICY_VERSION,
+    SIGNATURE_BUNDLE_SCHEMA_VERSION,
+    VERDICT_SCHEMA_VERSION,
+)
+from qwg.v4.signing import COMPONENT_VERDICT_DOMAIN, to_canonical_json
+from qwg.v4.trust_profile import (
+    ALGORITHM_STANDARD_PROFILES,
+    OPTIONAL_ALGORITHMS,
+    REQUIRED_ALGORITHMS,
+)
+
+
+def build_manifest() -> dict[str, Any]:
+    return {
+        "component_id": COMPONENT_ID,
+        "component_name": COMPONENT_NAME,
+        "component_role": COMPONENT_ROLE,
+        "contract_version": CONTRACT_VERSION,
+        "schema_version": VERDICT_SCHEMA_VERSION,
+        "canonicalization_profile": CANONICALIZATION_PROFILE,
+        "signature_policy": POLICY_VERSION,
+        "signature_bundle_schema_version": SIGNATURE_BUNDLE_SCHEMA_VERSION,
+        "key_registry_schema_version": KEY_REGISTRY_SCHEMA_VERSION,
+        "signed_payload_domain": COMPONENT_VERDICT_DOMAIN,
+        "required_algorithms": list(REQUIRED_ALGORITHMS),
+        "optional_algorithms": list(OPTIONAL_ALGORITHMS),
+        "standard_profiles": {
+            algorithm: list(profiles) for algorithm, profiles in ALGORITHM_STANDARD_PROFILES.items()
+        },
+        "supported_decisions": list(SUPPORTED_DECISIONS),
+        "supported_reason_ids": list(SUPPORTED_REASON_IDS),
+        "supported_evidence_families": list(SUPPORTED_EVIDENCE_FAMILIES),
+        "authority_boundary": "produces cryptographically verifiable component decision evidence only; does not sign or broadcast DigiByte transactions, change consensus, or approve AdamantineOS execution",
+        "orchestrator_role": "the Shield Orchestrator verifies component evidence before producing a Shield receipt",
+        "adamantineos_visibility": "AdamantineOS remains the final execution boundary and consumes this component only through the Orchestrator receipt",
+    }
+
+
+@functools.cache
+def cached_manifest() -> CachedManifest:
+    """Return the v4 manifest, canonicalized under ``shield-v4-canon.v1`` and hashed once per process."""
+
+    manifest = build_manifest()
+    return CachedManifest.from_manifest(manifest, to_canonical_json(manifest))
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import unicodedata
+from typing import Any
+
+from qwg.v4.trust_profile import parse_utc_timestamp, require_non_empty_str, require_positive_int
+
+DEFAULT_NONCE_BUCKET_SECONDS = 60
+DEFAULT_NONCE_BUCKETS = 60
+DEFAULT_MAX_NONCES_PER_BUCKET = 65_536
+
+NONCE_STORE_MAGIC = b"QWGNON\x00\x01"
+_STORE_HEADER = struct.Struct(">8s16sIIIq")
+_BUCKET_HEADER = struct.Struct(">qI")
+_DIGEST_BYTES = 16
+_EMPTY_SLOT = bytes(_DIGEST_BYTES)
+
+
+class NonceStore:
+    """Replay-protection store for ``(request_id, freshness_nonce)`` pairs.
+
+    Time is cut into ``bucket_seconds`` buckets and each accepted nonce is
+    filed under the bucket holding its ``not_after``. The ring keeps
+    ``buckets`` consecutive buckets starting at the newest verification time
+    seen; once time moves past a bucket, its slot is cleared and reused for a
+    future one, so expiry costs nothing per entry and memory is fixed at
+    ``buckets * max_nonces_per_bucket`` entries. A nonce is remembered until
+    the end of its ``not_after`` bucket, never less.
+
+    Each bucket is an open-addressing table of 16-byte keyed BLAKE2b digests.
+    By default the tables live in anonymous memory. With ``path`` they are
+    memory-mapped from that file, so accepted nonces survive a restart; the
+    file holds the hashing key and the ring parameters, and reopening it with
+    different parameters fails closed. A file must be used by one process at
+    a time.
+    """
+
+    def __init__(
+        self,
+        *,
+        bucket_seconds: int = DEFAULT_NONCE_BUCKET_SECONDS,
+        buckets: int = DEFAULT_NONCE_BUCKETS,
+        max_nonces_per_bucket: int = DEFAULT_MAX_NONCES_PER_BUCKET,
+        path: str | os.PathLike[str] | None = None,
+    ) -> None:
+        self.bucket_seconds = require_positive_int(bucket_seconds, field="bucket_seconds")
+        self.buckets = require_positive_int(buckets, field="buckets")
+        self.max_nonces_per_bucket = require_positive_int(max_nonces_per_bucket, field="max_nonces_per_bucket")
+        self._slots = 1 << (2 * self.max_nonces_per_bucket - 1).bit_length()
+        self._bucket_bytes = _BUCKET_HEADER.size + self._slots * _DIGEST_BYTES
+        size = _STORE_HEADER.size + self.buckets * self._bucket_bytes
+        self._lock = threading.Lock()
+        self._zero_table = bytes(self._slots * _DIGEST_BYTES)
+        if path is None:
+            self._mapped, created = mmap.mmap(-1, size), True
+        else:
+            self._mapped, created = self._map_file(os.fspath(path), size)
+        if created:
+            self._key = os.urandom(16)
+            self._current_epoch = 0
+            self._write_header()
+        else:
+            self._read_header()
+        self._epochs: list[int] = []
+        self._counts: list[int] = []
+        for index in range(self.buckets):
+            epoch, count = _BUCKET_HEADER.unpack_from(self._mapped, self._bucket_offset(index))
+            self._epochs.append(epoch)
+            self._counts.append(count)
+        self._occupied = {index for index, count in enumerate(self._counts) if count}
+
+    @staticmethod
+    def _map_file(path: str, size: int) -> tuple[mmap.mmap, bool]:
+        descriptor = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            existing = os.fstat(descriptor).st_size
+            if existing not in (0, size):
+                raise ValueError("nonce store file parameters do not match")
+            if existing == 0:
+                os.ftruncate(descriptor, size)
+            return mmap.mmap(descriptor, size), existing == 0
+        finally:
+            os.close(descriptor)
+
+    def _read_header(self) -> None:
+        magic, key, buckets, slots, bucket_seconds, current_epoch = _STORE_HEADER.unpack_from(self._mapped)
+        if magic != NONCE_STORE_MAGIC or (buckets, slots, bucket_seconds) != (
+            self.buckets,
+            self._slots,
+            self.bucket_seconds,
+        ):
+            self._mapped.close()
+            raise ValueError("nonce store file parameters do not match")
+        self._key = key
+        self._current_epoch = current_epoch
+
+    def _write_header(self) -> None:
+        _STORE_HEADER.pack_into(
+            self._mapped,
+            0,
+            NONCE_STORE_MAGIC,
+            self._key,
+            self.buckets,
+            self._slots,
+            self.bucket_seconds,
+            self._current_epoch,
+        )
+
+    def _digest(self, request_id: str, freshness_nonce: str) -> bytes:
+        # Signatures cover the NFC form, so every spelling of a signed pair
+        # must land on the same digest.
+        encoded_request_id = unicodedata.normalize("NFC", request_id).encode("utf-8")
+        hasher = hashlib.blake2b(key=self._key, digest_size=_DIGEST_BYTES)
+        hasher.update(len(encoded_request_id).to_bytes(4, "big"))
+        hasher.update(encoded_request_id)
+        hasher.update(unicodedata.normalize("NFC", freshness_nonce).encode("utf-8"))
+        return hasher.digest()
+
+    def _epoch(self, value: str, *, field: str) -> int:
+        return math.floor(parse_utc_timestamp(value, field=field).timestamp() / self.bucket_seconds)
+
+    def _bucket_offset(self, index: int) -> int:
+        return _STORE_HEADER.size + index * self._bucket_bytes
+
+    def _probe(self, table: int, digest: bytes) -> tuple[int, bool]:
+        mask = self._slots - 1
+        slot = int.from_bytes(digest[:8], "big") & mask
+        mapped = self._mapped
+        while True:
+            start = table + slot * _DIGEST_BYTES
+            stored = mapped[start : start + _DIGEST_BYTES]
+            if stored == digest:
+                return start, True
+            if stored == _EMPTY_SLOT:
+                return start, False
+            slot = (slot + 1) & mask
+
+    def check_and_record(self, *, request_id: str, freshness_nonce: str, not_after: str, verification_time: str) -> None:
+        """Record the pair, or raise ``ValueError`` if it is already live.
+
+        The pair is compared after stripping and NFC normalization, the form
+        the verdict signature covers.
+
+        ``verification_time`` advances the ring; a ``not_after`` before the
+        current bucket or beyond the ring fails closed, as does a full bucket.
+        """
+
+        clean_request_id = require_non_empty_str(request_id, field="request_id")
+        clean_nonce = require_non_empty_str(freshness_nonce, field="freshness_nonce")
+        expires = self._epoch(not_after, field="not_after")
+        now = self._epoch(verification_time, field="verification_time")
+        digest = self._digest(clean_request_id, clean_nonce)
+        with self._lock:
+            if now > self._current_epoch:
+                self._current_epoch = now
+                self._write_header()
+            current = self._current_epoch
+            if not current <= expires < current + self.buckets:
+                raise ValueError("not_after is outside nonce store window")
+            for index in list(self._occupied):
+                if self._epochs[index] < current:
+                    self._occupied.discard(index)
+                elif self._probe(self._bucket_offset(index) + _BUCKET_HEADER.size, digest)[1]:
+                    raise ValueError("freshness_nonce replay detected")
+            index = expires % self.buckets
+            offset = self._bucket_offset(index)
+            if self._epochs[index] != expires:
+                if self._counts[index]:
+                    self._mapped[offset + _BUCKET_HEADER.size : offset + self._bucket_bytes] = self._zero_table
+                self._epochs[index] = expires
+                self._counts[index] = 0
+            if self._counts[index] >= self.max_nonces_per_bucket:
+                raise ValueError("nonce store bucket is full")
+            start, _ = self._probe(offset + _BUCKET_HEADER.size, digest)
+            self._mapped[start : start + _DIGEST_BYTES] = digest
+            self._counts[index] += 1
+            self._occupied.add(index)
+            _BUCKET_HEADER.pack_into(self._mapped, offset, expires, self._counts[index])
+
+    def stats(self) -> dict[str, Any]:
+        """Return live nonce count, ring geometry and capacity."""
+
+        with self._lock:
+            return {
+                "live_nonces": sum(
+                    self._counts[index] for index in self._occupied if self._epochs[index] >= self._current_epoch
+                ),
+                "buckets": self.buckets,
+                "bucket_seconds": self.bucket_seconds,
+                "capacity": self.buckets * self.max_nonces_per_bucket,
+            }
+
+    def flush(self) -> None:
+        """Write the mapped tables back to the file, if any."""
+
+        with self._lock:
+            self._mapped.flush()
+
+    def close(self) -> None:
+        """Flush and unmap the tables."""
+
+        with self._lock:
+            if not self._mapped.closed:
+                self._mapped.flush()
+                self._mapped.close()
+
+    def __enter__(self) -> NonceStore:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
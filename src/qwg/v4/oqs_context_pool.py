@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import hmac
+import os
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+from qwg.v4.trust_profile import require_non_empty_str, require_positive_int
+
+DEFAULT_MAX_IDLE_SIGNERS = 4
+DEFAULT_MAX_IDLE_VERIFIERS = 4
+
+
+def _open_signature_context(context: Any) -> Any:
+    # Mirrors entering the ``with oqs.Signature(...)`` block the backends used
+    # before pooling.
+    enter_context = getattr(context, "__enter__", None)
+    return enter_context() if callable(enter_context) else context
+
+
+def _free_signature_context(context: Any) -> None:
+    # Mirrors leaving that block. A failing native free must not mask the
+    # caller's error.
+    exit_context = getattr(context, "__exit__", None)
+    if callable(exit_context):
+        with contextlib.suppress(Exception):
+            exit_context(None, None, None)
+
+
+class OqsSignatureContextPool:
+    """Reusable liboqs ``Signature`` contexts for one OQS mechanism.
+
+    Every context is entered when it is built and exited when it is freed,
+    as the ``with oqs.Signature(...)`` blocks before pooling did. Contexts are
+    checked out exclusively under the pool lock and only idle contexts are
+    ever freed by the pool: :meth:`close` and :meth:`release_signers` free the
+    idle ones at once and any checked out at the time when they come back, so
+    no context is freed while a caller is using it. A context whose caller
+    raised is freed rather than reused.
+
+    Verifier contexts hold no secret material and are shared by all threads.
+    Signer contexts hold a secret key, so they are pooled per private key
+    reference. The pool itself keeps only a keyed digest of that key: an
+    idle signer is reused when the freshly resolved key has the same digest.
+    Backends wire :meth:`release_signers` to their ``PrivateKeyCache`` so
+    pooled signers never outlive the cached key; without a cache, idle
+    signers live until :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        *,
+        mechanism: str,
+        max_idle_signers: int = DEFAULT_MAX_IDLE_SIGNERS,
+        max_idle_verifiers: int = DEFAULT_MAX_IDLE_VERIFIERS,
+    ) -> None:
+        self.mechanism = require_non_empty_str(mechanism, field="mechanism")
+        self.max_idle_signers = require_positive_int(max_idle_signers, field="max_idle_signers")
+        self.max_idle_verifiers = require_positive_int(max_idle_verifiers, field="max_idle_verifiers")
+        self._lock = threading.Lock()
+        self._fingerprint_key = os.urandom(32)
+        self._generation = 0
+        self._idle_verifiers: list[Any] = []
+        self._idle_signers: dict[str, tuple[bytes, list[Any]]] = {}
+        self._released: dict[str, int] = {}
+
+    def _fingerprint(self, secret_key: bytes) -> bytes:
+        return hashlib.blake2b(secret_key, key=self._fingerprint_key, digest_size=32).digest()
+
+    @contextlib.contextmanager
+    def verifier(self, signature_cls: Any) -> Iterator[Any]:
+        """Check out a verifier context; failed verifiers are never reused."""
+
+        with self._lock:
+            context = self._idle_verifiers.pop() if self._idle_verifiers else None
+            generation = self._generation
+        if context is None:
+            context = _open_signature_context(signature_cls(self.mechanism))
+        try:
+            yield context
+        except BaseException:
+            _free_signature_context(context)
+            raise
+        with self._lock:
+            if generation == self._generation and len(self._idle_verifiers) < self.max_idle_verifiers:
+                self._idle_verifiers.append(context)
+                return
+        _free_signature_context(context)
+
+    @contextlib.contextmanager
+    def signer(self, signature_cls: Any, *, private_key_reference: str, secret_key: bytes) -> Iterator[Any]:
+        """Check out a signer context for ``secret_key``; failed signers are never reused."""
+
+        fingerprint = self._fingerprint(secret_key)
+        context, generation = self._checkout_signer(private_key_reference, fingerprint)
+        if context is None:
+            context = _open_signature_context(signature_cls(self.mechanism, secret_key))
+        try:
+            yield context
+        except BaseException:
+            _free_signature_context(context)
+            raise
+        self._checkin_signer(private_key_reference, fingerprint, generation, context)
+
+    def _checkout_signer(self, private_key_reference: str, fingerprint: bytes) -> tuple[Any, tuple[int, int]]:
+        stale: list[Any] = []
+        context = None
+        with self._lock:
+            generation = (self._generation, self._released.get(private_key_reference, 0))
+            entry = self._idle_signers.get(private_key_reference)
+            if entry is not None:
+                pooled_fingerprint, contexts = entry
+                if hmac.compare_digest(pooled_fingerprint, fingerprint):
+                    if contexts:
+                        context = contexts.pop()
+                else:
+                    stale = self._idle_signers.pop(private_key_reference)[1]
+        for stale_context in stale:
+            _free_signature_context(stale_context)
+        return context, generation
+
+    def _checkin_signer(
+        self, private_key_reference: str, fingerprint: bytes, generation: tuple[int, int], context: Any
+    ) -> None:
+        with self._lock:
+            if generation == (self._generation, self._released.get(private_key_reference, 0)):
+                entry = self._idle_signers.setdefault(private_key_reference, (fingerprint, []))
+                pooled_fingerprint, contexts = entry
+                if hmac.compare_digest(pooled_fingerprint, fingerprint) and len(contexts) < self.max_idle_signers:
+                    contexts.append(context)
+                    return
+        _free_signature_context(context)
+
+    def release_signers(self, private_key_reference: str) -> None:
+        """Free the idle signers for ``private_key_reference``; signers checked out now are freed on return."""
+
+        with self._lock:
+            self._released[private_key_reference] = self._released.get(private_key_reference, 0) + 1
+            entry = self._idle_signers.pop(private_key_reference, None)
+        for context in entry[1] if entry is not None else ():
+            _free_signature_context(context)
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of idle verifier and signer contexts."""
+
+        with self._lock:
+            return {
+                "idle_verifiers": len(self._idle_verifiers),
+                "idle_signers": sum(len(contexts) for _, contexts in self._idle_signers.values()),
+            }
+
+    def close(self) -> None:
+        """Free every idle context; checked-out contexts are freed when they come back.
+
+        The pool stays usable and refills on demand.
+        """
+
+        with self._lock:
+            self._generation += 1
+            contexts = list(self._idle_verifiers)
+            for _, signers in self._idle_signers.values():
+                contexts.extend(signers)
+            self._idle_verifiers.clear()
+            self._idle_signers.clear()
+        for context in contexts:
+            _free_signature_context(context)
@@ -5,6 +5,8 @@ from collections.abc import Callable
 from types import ModuleType
 from typing import Any, NoReturn
 
+from qwg.v4.oqs_context_pool import DEFAULT_MAX_IDLE_SIGNERS, OqsSignatureContextPool
+from qwg.v4.private_key_cache import PrivateKeyCache
 from qwg.v4.real_crypto_backend import (
     QwgV4RealCryptoBackendError,
     QwgV4RealCryptoBackendUnavailable,
@@ -18,6 +20,7 @@ OQS_FALCON_MECHANISM = "Falcon-1024"
 OQS_BACKEND_NAME = "open-quantum-safe-liboqs-python"
 
 PrivateKeyResolver = Callable[[str], bytes]
+_UNDISCOVERED = object()
 
 
 class OqsFalcon1024Backend:
@@ -38,15 +41,29 @@ class OqsFalcon1024Backend:
         private_key_resolver: PrivateKeyResolver,
         oqs_module: ModuleType | Any | None = None,
         mechanism: str = OQS_FALCON_MECHANISM,
+        max_idle_signers: int = DEFAULT_MAX_IDLE_SIGNERS,
+        private_key_cache: PrivateKeyCache | None = None,
     ) -> None:
         if not callable(private_key_resolver):
             raise QwgV4RealCryptoBackendError("private_key_resolver must be callable")
+        if private_key_cache is not None and not isinstance(private_key_cache, PrivateKeyCache):
+            raise QwgV4RealCryptoBackendError("private_key_cache must be PrivateKeyCache")
         if mechanism != OQS_FALCON_MECHANISM:
             raise QwgV4RealCryptoBackendError("Shield v4.8H requires OQS Falcon-1024 for draft FN-DSA evidence")
         self._private_key_resolver = private_key_resolver
+        self._private_key_cache = private_key_cache
         self._oqs_module = oqs_module
         self.mechanism = mechanism
         self.backend_name = OQS_BACKEND_NAME
+        self._contexts = OqsSignatureContextPool(mechanism=mechanism, max_idle_signers=max_idle_signers)
+        if private_key_cache is not None:
+            try:
+                private_key_cache.bind(self)
+            except ValueError as exc:
+                raise QwgV4RealCryptoBackendError(str(exc)) from None
+            private_key_cache.add_discard_hook(self._contexts.release_signers)
+        self._enabled_oqs: Any = None
+        self._verifier_details: Any = _UNDISCOVERED
 
     @property
     def backend_version(self) -> str:
@@ -72,6 +89,8 @@ class OqsFalcon1024Backend:
         raise QwgV4RealCryptoBackendError(f"OQS Falcon-1024 {operation} failed closed") from exc
 
     def _require_mechanism_enabled(self) -> Any:
+        if self._enabled_oqs is not None:
+            return self._enabled_oqs
         oqs = self._load_oqs()
         try:
             enabled = tuple(getattr(oqs, "get_enabled_sig_mechanisms", lambda: ())())
@@ -79,6 +98,7 @@ class OqsFalcon1024Backend:
             self._raise_oqs_error("mechanism discovery", exc)
         if self.mechanism not in enabled:
             raise QwgV4RealCryptoBackendUnavailable("OQS Falcon-1024 mechanism is not enabled")
+        self._enabled_oqs = oqs
         return oqs
 
     def _require_bytes(self, value: Any, *, field: str) -> bytes:
@@ -112,10 +132,12 @@ class OqsFalcon1024Backend:
         if actual != expected:
             raise QwgV4RealCryptoBackendError(f"{field} byte length must be {expected} for OQS Falcon-1024")
 
-    def _resolve_private_key(self, private_key_reference: str) -> bytes:
-        clean_reference = reject_test_only_private_key_reference(private_key_reference)
+    def _resolve_private_key(self, clean_reference: str) -> bytes:
         try:
-            secret_key = self._private_key_resolver(clean_reference)
+            if self._private_key_cache is None:
+                secret_key = self._private_key_resolver(clean_reference)
+            else:
+                secret_key = self._private_key_cache.resolve(clean_reference, self._private_key_resolver)
         except Exception as exc:
             self._raise_oqs_error("private key resolution", exc)
         return self._require_bytes(secret_key, field="secret_key")
@@ -126,10 +148,15 @@ class OqsFalcon1024Backend:
         if algorithm != OQS_FALCON_ALGORITHM:
             raise QwgV4RealCryptoBackendUnavailable("OQS Falcon backend only supports Shield v4 fn-dsa")
         message_bytes = self._require_bytes(message, field="message")
-        secret_key = self._resolve_private_key(private_key_reference)
+        clean_reference = reject_test_only_private_key_reference(private_key_reference)
+        secret_key = self._resolve_private_key(clean_reference)
         oqs = self._require_mechanism_enabled()
         try:
-            with oqs.Signature(self.mechanism, secret_key) as signer:
+            with self._contexts.signer(
+                oqs.Signature,
+                private_key_reference=clean_reference,
+                secret_key=secret_key,
+            ) as signer:
                 signature = signer.sign(message_bytes)
         except Exception as exc:
             self._raise_oqs_error("sign", exc)
@@ -146,15 +173,34 @@ class OqsFalcon1024Backend:
     ) -> bool:
         """Verify a Shield v4 FN-DSA/Falcon-1024 signature using liboqs."""
 
+        return self.verify_decoded_signature(
+            algorithm=algorithm,
+            public_key=decode_binary_signature_material(public_key, field="public_key"),
+            message=message,
+            signature=decode_binary_signature_material(signature, field="signature"),
+        )
+
+    def verify_decoded_signature(
+        self,
+        *,
+        algorithm: str,
+        public_key: bytes,
+        message: bytes,
+        signature: bytes,
+    ) -> bool:
+        """Verify already-decoded public key and signature bytes."""
+
         if algorithm != OQS_FALCON_ALGORITHM:
             raise QwgV4RealCryptoBackendUnavailable("OQS Falcon backend only supports Shield v4 fn-dsa")
         message_bytes = self._require_bytes(message, field="message")
-        public_key_bytes = decode_binary_signature_material(public_key, field="public_key")
-        signature_bytes = decode_binary_signature_material(signature, field="signature")
+        public_key_bytes = self._require_bytes(public_key, field="public_key")
+        signature_bytes = self._require_bytes(signature, field="signature")
         oqs = self._require_mechanism_enabled()
         try:
-            with oqs.Signature(self.mechanism) as verifier:
-                details = getattr(verifier, "details", None)
+            with self._contexts.verifier(oqs.Signature) as verifier:
+                details = self._verifier_details
+                if details is _UNDISCOVERED:
+                    details = self._verifier_details = getattr(verifier, "details", None)
                 self._require_expected_binary_length(
                     public_key_bytes,
                     details=details,
@@ -177,3 +223,8 @@ class OqsFalcon1024Backend:
             if not isinstance(verified, bool):
                 raise QwgV4RealCryptoBackendError("OQS Falcon-1024 verify must return bool")
             return verified
+
+    def close(self) -> None:
+        """Free pooled OQS signer and verifier contexts held by this backend."""
+
+        self._contexts.close()
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from qwg.v4.trust_profile import require_positive_int
+
+DEFAULT_PRIVATE_KEY_CACHE_TTL_SECONDS = 300.0
+DEFAULT_PRIVATE_KEY_CACHE_MAX_ENTRIES = 16
+
+
+def _zeroize(material: bytearray) -> None:
+    material[:] = bytes(len(material))
+
+
+class PrivateKeyCache:
+    """Optional in-memory cache of resolved OQS private keys.
+
+    Entries expire ``ttl_seconds`` after resolution (never when it is ``None``)
+    and the least recently used entry is evicted beyond ``max_entries``. Expired entries are dropped on
+    every :meth:`resolve` and by :meth:`purge_expired`, so a process that stops
+    signing should call the latter periodically. The cache keeps its copy of
+    each key in a ``bytearray`` and overwrites it with zeros on expiry,
+    eviction, invalidation and ``clear()``, then calls every hook registered
+    with :meth:`add_discard_hook` with the dropped reference. The OQS backends
+    register their signer pools that way, so no pooled signer context outlives
+    the cached key. Copies handed to liboqs are immutable ``bytes``, so
+    zeroization is best effort for the cache-owned copy only.
+
+    Only non-empty ``bytes`` results are cached; anything else is returned
+    unchanged so the backend rejects it exactly as it would without a cache.
+    Entries are keyed by reference alone, so a cache serves one backend: the
+    OQS backends :meth:`bind` it on construction and a second backend is
+    refused rather than handed keys resolved for another algorithm.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float | None = DEFAULT_PRIVATE_KEY_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_PRIVATE_KEY_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl_seconds is not None and (
+            isinstance(ttl_seconds, bool)
+            or not isinstance(ttl_seconds, (int, float))
+            or not math.isfinite(ttl_seconds)
+            or ttl_seconds <= 0
+        ):
+            raise ValueError("ttl_seconds must be positive finite number or None")
+        self.ttl_seconds = None if ttl_seconds is None else float(ttl_seconds)
+        self.max_entries = require_positive_int(max_entries, field="max_entries")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytearray]] = OrderedDict()
+        self._discard_hooks: list[Callable[[str], None]] = []
+        self._owner: object | None = None
+        self._hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._evictions = 0
+
+    def bind(self, owner: object) -> None:
+        """Reserve this cache for ``owner``; binding it to anyone else raises ``ValueError``."""
+
+        with self._lock:
+            if self._owner is not None and self._owner is not owner:
+                raise ValueError("private key cache is already bound to another backend")
+            self._owner = owner
+
+    def add_discard_hook(self, hook: Callable[[str], None]) -> None:
+        """Call ``hook(private_key_reference)`` after each cached key is dropped and zeroized."""
+
+        if not callable(hook):
+            raise ValueError("discard hook must be callable")
+        with self._lock:
+            self._discard_hooks.append(hook)
+
+    def _pop_expired(self) -> list[tuple[str, bytearray]]:
+        now = self._clock()
+        expired = [reference for reference, (expires_at, _) in self._entries.items() if now >= expires_at]
+        self._expirations += len(expired)
+        return [(reference, self._entries.pop(reference)[1]) for reference in expired]
+
+    def _discard(self, dropped: list[tuple[str, bytearray]]) -> None:
+        for _, material in dropped:
+            _zeroize(material)
+        if dropped:
+            with self._lock:
+                hooks = list(self._discard_hooks)
+            for reference, _ in dropped:
+                for hook in hooks:
+                    hook(reference)
+
+    def resolve(self, private_key_reference: str, resolver: Callable[[str], Any]) -> Any:
+        """Return the cached key for ``private_key_reference`` or resolve and cache it."""
+
+        with self._lock:
+            expired = self._pop_expired()
+            entry = self._entries.get(private_key_reference)
+            if entry is not None:
+                self._entries.move_to_end(private_key_reference)
+                self._hits += 1
+                cached = bytes(entry[1])
+            else:
+                self._misses += 1
+        self._discard(expired)
+        if entry is not None:
+            return cached
+
+        secret_key = resolver(private_key_reference)
+        if isinstance(secret_key, bytes) and secret_key:
+            self._store(private_key_reference, secret_key)
+        return secret_key
+
+    def _store(self, private_key_reference: str, secret_key: bytes) -> None:
+        dropped: list[tuple[str, bytearray]] = []
+        with self._lock:
+            previous = self._entries.pop(private_key_reference, None)
+            if previous is not None:
+                dropped.append((private_key_reference, previous[1]))
+            expires_at = math.inf if self.ttl_seconds is None else self._clock() + self.ttl_seconds
+            self._entries[private_key_reference] = (expires_at, bytearray(secret_key))
+            while len(self._entries) > self.max_entries:
+                reference, (_, material) = self._entries.popitem(last=False)
+                dropped.append((reference, material))
+                self._evictions += 1
+        self._discard(dropped)
+
+    def purge_expired(self) -> int:
+        """Drop and zeroize every expired key; return how many were dropped."""
+
+        with self._lock:
+            expired = self._pop_expired()
+        self._discard(expired)
+        return len(expired)
+
+    def invalidate(self, private_key_reference: str) -> bool:
+        """Drop and zeroize one cached key; return whether it was cached."""
+
+        with self._lock:
+            entry = self._entries.pop(private_key_reference, None)
+        if entry is None:
+            return False
+        self._discard([(private_key_reference, entry[1])])
+        return True
+
+    def clear(self) -> None:
+        """Drop and zeroize every cached key."""
+
+        with self._lock:
+            dropped = [(reference, material) for reference, (_, material) in self._entries.items()]
+            self._entries.clear()
+        self._discard(dropped)
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters; ``resolver_calls_saved`` counts cache hits."""
+
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "expirations": self._expirations,
+                "evictions": self._evictions,
+                "resolver_calls_saved": self._hits,
+            }
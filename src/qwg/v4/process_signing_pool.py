@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+from qwg.v4.private_key_cache import PrivateKeyCache
+from qwg.v4.real_crypto_backend import (
+    QwgV4RealCryptoBackend,
+    QwgV4RealCryptoBackendError,
+    QwgV4RealCryptoBackendUnavailable,
+    reject_test_only_private_key_reference,
+)
+from qwg.v4.trust_profile import require_positive_int
+
+PROCESS_SIGNING_POOL_BACKEND_NAME = "qwg-v4-process-signing-pool"
+DEFAULT_SIGNING_BATCH_SIZE = 16
+
+_WORKER_BACKENDS: dict[str, QwgV4RealCryptoBackend] = {}
+
+
+@dataclass(frozen=True)
+class OqsWorkerBackendFactory:
+    """Picklable recipe that builds one OQS backend inside each worker process.
+
+    ``backend_cls`` is ``OqsMlDsaBackend`` or ``OqsFalcon1024Backend`` (or any
+    class with the same constructor). ``oqs_module_name`` is imported in the
+    worker, so production uses ``"oqs"`` and tests can name a pure-Python stub.
+    ``private_key_resolver`` must be picklable, e.g. a module-level function.
+    References in ``preload_private_key_references`` are resolved once at worker
+    start-up into the worker's :class:`PrivateKeyCache`. Its entries live as
+    long as the worker unless ``private_key_cache_ttl_seconds`` sets a TTL.
+    """
+
+    backend_cls: Callable[..., QwgV4RealCryptoBackend]
+    private_key_resolver: Callable[[str], bytes]
+    oqs_module_name: str = "oqs"
+    preload_private_key_references: tuple[str, ...] = ()
+    private_key_cache_ttl_seconds: float | None = None
+
+    @property
+    def supported_algorithms(self) -> tuple[str, ...]:
+        return tuple(getattr(self.backend_cls, "supported_algorithms", ()))
+
+    def __call__(self) -> QwgV4RealCryptoBackend:
+        oqs_module = importlib.import_module(self.oqs_module_name)
+        cache = PrivateKeyCache(
+            ttl_seconds=self.private_key_cache_ttl_seconds,
+            max_entries=max(len(self.preload_private_key_references), 1),
+        )
+        backend = self.backend_cls(
+            private_key_resolver=self.private_key_resolver,
+            oqs_module=oqs_module,
+            private_key_cache=cache,
+        )
+        for reference in self.preload_private_key_references:
+            cache.resolve(reject_test_only_private_key_reference(reference), self.private_key_resolver)
+        return backend
+
+
+def _worker_initialize(factories: tuple[OqsWorkerBackendFactory, ...]) -> None:
+    _WORKER_BACKENDS.clear()
+    for factory in factories:
+        backend = factory()
+        for algorithm in factory.supported_algorithms:
+            _WORKER_BACKENDS[algorithm] = backend
+
+
+def _worker_backend(algorithm: str) -> QwgV4RealCryptoBackend:
+    backend = _WORKER_BACKENDS.get(algorithm)
+    if backend is None:
+        raise QwgV4RealCryptoBackendUnavailable("process signing pool does not support required algorithm")
+    return backend
+
+
+def _worker_sign_batch(requests: list[tuple[str, str, bytes]]) -> list[str]:
+    return [
+        _worker_backend(algorithm).sign_message(
+            algorithm=algorithm,
+            private_key_reference=private_key_reference,
+            message=message,
+        )
+        for algorithm, private_key_reference, message in requests
+    ]
+
+
+def _worker_verify(algorithm: str, public_key: str, message: bytes, signature: str) -> bool:
+    return _worker_backend(algorithm).verify_signature(
+        algorithm=algorithm,
+        public_key=public_key,
+        message=message,
+        signature=signature,
+    )
+
+
+def _worker_backend_versions() -> list[str]:
+    return sorted({backend.backend_version for backend in _WORKER_BACKENDS.values()})
+
+
+class ProcessSigningPool:
+    """QWG v4 real-crypto backend that signs in a pool of worker processes.
+
+    Each worker builds its OQS backends once from the supplied factories, so
+    liboqs, mechanism discovery, signer contexts and preloaded keys stay warm
+    across calls. The pool satisfies :class:`QwgV4RealCryptoBackend`, so it can
+    replace a single backend anywhere, and adds :meth:`sign_messages` for
+    batched requests. Fail-closed errors raised inside a worker are re-raised
+    with their original QWG error type and message; a crashed worker pool fails
+    closed as :class:`QwgV4RealCryptoBackendError`.
+    """
+
+    def __init__(
+        self,
+        *,
+        backend_factories: Sequence[OqsWorkerBackendFactory],
+        processes: int = 2,
+        batch_size: int = DEFAULT_SIGNING_BATCH_SIZE,
+        start_method: str = "spawn",
+    ) -> None:
+        factories = tuple(backend_factories)
+        if not factories or not all(isinstance(factory, OqsWorkerBackendFactory) for factory in factories):
+            raise QwgV4RealCryptoBackendError("backend_factories must be non-empty OqsWorkerBackendFactory list")
+        algorithms = [algorithm for factory in factories for algorithm in factory.supported_algorithms]
+        if not algorithms or len(set(algorithms)) != len(algorithms):
+            raise QwgV4RealCryptoBackendError("backend_factories must cover distinct algorithms")
+        self.processes = require_positive_int(processes, field="processes")
+        self.batch_size = require_positive_int(batch_size, field="batch_size")
+        self.backend_name = PROCESS_SIGNING_POOL_BACKEND_NAME
+        self.supported_algorithms = tuple(algorithms)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_worker_initialize,
+            initargs=(factories,),
+        )
+        self._backend_versions = self._submit(_worker_backend_versions)
+
+    @property
+    def backend_version(self) -> str:
+        """Worker backend versions, fetched once when the pool starts."""
+
+        versions = self._result(self._backend_versions)
+        return f"processes={self.processes};" + "|".join(versions)
+
+    def _submit(self, function: Callable[..., Any], *args: Any) -> Future[Any]:
+        try:
+            return self._executor.submit(function, *args)
+        except (BrokenProcessPool, RuntimeError) as exc:
+            raise QwgV4RealCryptoBackendError("process signing pool failed closed") from exc
+
+    def _result(self, future: Future[Any]) -> Any:
+        try:
+            return future.result()
+        except QwgV4RealCryptoBackendError:
+            raise
+        except Exception as exc:
+            raise QwgV4RealCryptoBackendError("process signing pool failed closed") from exc
+
+    def sign_messages(self, requests: Sequence[tuple[str, str, bytes]]) -> list[str]:
+        """Sign ``(algorithm, private_key_reference, message)`` requests across the workers.
+
+        Signatures are returned in request order. If any request fails, the whole
+        batch fails closed with the first failure in request order.
+        """
+
+        batch = [(algorithm, reference, message) for algorithm, reference, message in requests]
+        futures = [
+            self._submit(_worker_sign_batch, batch[start : start + self.batch_size])
+            for start in range(0, len(batch), self.batch_size)
+        ]
+        wait(futures)
+        signatures: list[str] = []
+        for future in futures:
+            signatures.extend(self._result(future))
+        return signatures
+
+    def sign_message(self, *, algorithm: str, private_key_reference: str, message: bytes) -> str:
+        """Sign one message in a worker process."""
+
+        signatures = self._result(self._submit(_worker_sign_batch, [(algorithm, private_key_reference, message)]))
+        return signatures[0]  # type: ignore[no-any-return]
+
+    def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> bool:
+        """Verify one signature in a worker process."""
+
+        return self._result(self._submit(_worker_verify, algorithm, public_key, message, signature))  # type: ignore[no-any-return]
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> ProcessSigningPool:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import binascii
-from collections.abc import Callable
+import functools
+import math
+import re
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from typing import Any, Protocol, TypeVar
 
 from qwg.v4 import COMPONENT_ROLE
@@ -16,7 +23,10 @@ from qwg.v4.trust_profile import (
 
 REAL_CRYPTO_SIGNATURE_INPUT_PREFIX = "DGB-SHIELD-V4-REAL-CRYPTO-SIGNATURE-INPUT"
 REAL_SIGNATURE_ENCODING_PREFIX = "b64u:"
-_BASE64URL_ALPHABET = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+_BASE64URL_BODY = re.compile(r"[A-Za-z0-9_-]+")
+_BASE64URL_TO_STANDARD = str.maketrans("-_", "+/")
+_LOWERCASE_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+_SIGNATURE_INPUT_TEMPLATE_CACHE_SIZE = 1024
 _TEST_ONLY_MARKERS = ("test-only",)
 _TEST_ONLY_PREFIXES = ("test-",)
 _ALLOWED_DOMAIN_TAGS = frozenset({COMPONENT_VERDICT_DOMAIN})
@@ -41,6 +51,11 @@ class QwgV4RealCryptoBackend(Protocol):
     Implementations may wrap liboqs, an HSM, a FIPS-validated module, or another
     deployment-controlled backend. This protocol intentionally avoids importing a
     concrete PQC library so CI cannot silently depend on local machine crypto state.
+
+    A backend may also define ``verify_decoded_signature`` taking the decoded
+    ``public_key`` and ``signature`` bytes; the verification helpers then call
+    it with the material they already decoded (or took from a
+    :class:`DecodedPublicKeyCache`) instead of ``verify_signature``.
     """
 
     backend_name: str
@@ -54,7 +69,26 @@ class QwgV4RealCryptoBackend(Protocol):
         """Return True only when the signature verifies under the supplied public key."""
 
 
+class AsyncRealCryptoBackend(Protocol):
+    """Asyncio-native variant of :class:`QwgV4RealCryptoBackend`.
+
+    Wrap a synchronous backend with :class:`ExecutorAsyncRealCryptoBackend` to
+    offload its blocking calls instead of running them on the event loop.
+    """
+
+    backend_name: str
+    backend_version: str
+    supported_algorithms: tuple[str, ...]
+
+    async def sign_message(self, *, algorithm: str, private_key_reference: str, message: bytes) -> str:
+        """Return a real signature encoding for the supplied message."""
+
+    async def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> bool:
+        """Return True only when the signature verifies under the supplied public key."""
+
+
 RealCryptoSignatureVerifier = Callable[[dict[str, Any], dict[str, Any]], bool]
+AsyncRealCryptoSignatureVerifier = Callable[[dict[str, Any], dict[str, Any]], Awaitable[bool]]
 _SIGNATURE_ENTRY_FIELDS = frozenset(
     {
         "algorithm",
@@ -142,17 +176,64 @@ def decode_binary_signature_material(encoded: Any, *, field: str = "signature")
         raise QwgV4RealCryptoBackendError(f"{field} b64u payload must be non-empty")
     if "=" in body:
         raise QwgV4RealCryptoBackendError(f"{field} b64u payload must be unpadded")
-    if set(body) - _BASE64URL_ALPHABET:
+    if _BASE64URL_BODY.fullmatch(body) is None:
         raise QwgV4RealCryptoBackendError(f"{field} b64u payload is invalid")
     try:
-        decoded = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
-    except (binascii.Error, ValueError) as exc:
+        decoded = binascii.a2b_base64(body.translate(_BASE64URL_TO_STANDARD) + "=" * (-len(body) % 4))
+    except binascii.Error as exc:
         raise QwgV4RealCryptoBackendError(f"{field} b64u payload is invalid") from exc
     if not decoded:  # pragma: no cover - base64url cannot reach this after the body check.
         raise QwgV4RealCryptoBackendError(f"{field} b64u payload must decode to non-empty bytes")
     return decoded
 
 
+class DecodedPublicKeyCache:
+    """Decoded registry public keys for the lifetime of one trust-profile snapshot.
+
+    Entries are keyed by ``(algorithm, key_id, key_version)`` and hold the
+    ``b64u:`` string they were decoded from, so a key whose material differs
+    from the cached string is re-validated and re-decoded instead of trusted.
+    Create one cache per registry snapshot, or ``clear()`` it when the registry
+    is replaced. Public keys are not secret, so no zeroization is performed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str, int], tuple[str, bytes]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def resolve(self, *, algorithm: str, key_id: str, key_version: int, public_key: str) -> bytes:
+        """Return the decoded bytes of a real registry ``public_key``, decoding it once."""
+
+        identity = (algorithm, key_id, key_version)
+        with self._lock:
+            cached = self._entries.get(identity)
+            if cached is not None and cached[0] == public_key:
+                self._hits += 1
+                return cached[1]
+            self._misses += 1
+        _reject_test_only_text(public_key, field="public_key")
+        decoded = decode_binary_signature_material(public_key, field="public_key")
+        with self._lock:
+            self._entries[identity] = (public_key, decoded)
+        return decoded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+
+def _require_public_key_cache(public_key_cache: Any) -> DecodedPublicKeyCache | None:
+    if public_key_cache is not None and not isinstance(public_key_cache, DecodedPublicKeyCache):
+        raise QwgV4RealCryptoBackendError("public_key_cache must be DecodedPublicKeyCache")
+    return public_key_cache
+
+
 def reject_test_only_private_key_reference(private_key_reference: str) -> str:
     clean = _require_real_non_empty_str(private_key_reference, field="private_key_reference")
     _reject_test_only_text(clean, field="private_key_reference")
@@ -169,6 +250,96 @@ def reject_test_only_key_material(key: dict[str, Any]) -> None:
     )
 
 
+@dataclass(frozen=True)
+class RealCryptoSignatureInputTemplate:
+    """Pre-encoded real-signature input for one key, missing only the payload hash.
+
+    ``prefix`` holds the input prefix and domain tag, ``suffix`` the algorithm,
+    standard profile, key id and key version, each already validated and UTF-8
+    encoded with their LF separators.
+    """
+
+    prefix: bytes
+    suffix: bytes
+
+    def render(self, signed_payload_hash: str) -> bytes:
+        """Return the exact signature input bytes for ``signed_payload_hash``."""
+
+        if type(signed_payload_hash) is not str or _LOWERCASE_SHA256_HEX.fullmatch(signed_payload_hash) is None:
+            signed_payload_hash = _require_hash(signed_payload_hash, field="signed_payload_hash")
+        return self.prefix + signed_payload_hash.encode("ascii") + self.suffix
+
+
+def _build_signature_input_template(
+    *,
+    algorithm: Any,
+    standard_profile: Any,
+    domain_tag: Any,
+    key_id: Any,
+    key_version: Any,
+) -> RealCryptoSignatureInputTemplate:
+    clean_algorithm = _require_real_supported_algorithm(algorithm)
+    clean_domain = _require_real_non_empty_str(domain_tag, field="domain_tag")
+    if clean_domain not in _ALLOWED_DOMAIN_TAGS:
+        raise QwgV4RealCryptoBackendError(
+            "domain_tag must be the QWG Shield v4 component signing domain"
+        )
+    clean_profile = _require_real_supported_standard_profile(
+        algorithm=clean_algorithm,
+        standard_profile=standard_profile,
+    )
+    clean_key_id = _require_real_non_empty_str(key_id, field="key_id")
+    clean_key_version = _require_real_positive_int(key_version, field="key_version")
+    return RealCryptoSignatureInputTemplate(
+        prefix=f"{REAL_CRYPTO_SIGNATURE_INPUT_PREFIX}\n{clean_domain}\n".encode(),
+        suffix=f"\n{clean_algorithm}\n{clean_profile}\n{clean_key_id}\n{clean_key_version}".encode(),
+    )
+
+
+@functools.lru_cache(maxsize=_SIGNATURE_INPUT_TEMPLATE_CACHE_SIZE)
+def _cached_signature_input_template(
+    algorithm: str,
+    standard_profile: str,
+    domain_tag: str,
+    key_id: str,
+    key_version: int,
+) -> RealCryptoSignatureInputTemplate:
+    return _build_signature_input_template(
+        algorithm=algorithm,
+        standard_profile=standard_profile,
+        domain_tag=domain_tag,
+        key_id=key_id,
+        key_version=key_version,
+    )
+
+
+def real_crypto_signature_input_template(
+    *,
+    algorithm: str,
+    standard_profile: str,
+    domain_tag: str,
+    key_id: str,
+    key_version: int,
+) -> RealCryptoSignatureInputTemplate:
+    """Return the validated signature-input template for one signing key.
+
+    Templates are memoised per exact ``(algorithm, standard_profile,
+    domain_tag, key_id, key_version)``; invalid values always raise and are
+    never cached.
+    """
+
+    identity = (algorithm, standard_profile, domain_tag, key_id)
+    if type(key_version) is int and all(type(value) is str for value in identity):
+        return _cached_signature_input_template(algorithm, standard_profile, domain_tag, key_id, key_version)
+    return _build_signature_input_template(
+        algorithm=algorithm,
+        standard_profile=standard_profile,
+        domain_tag=domain_tag,
+        key_id=key_id,
+        key_version=key_version,
+    )
+
+
 def build_real_crypto_signature_input(
     *,
     algorithm: str,
@@ -187,33 +358,19 @@ def build_real_crypto_signature_input(
     FN-DSA/Falcon profile.
     """
 
-    clean_algorithm = _require_real_supported_algorithm(algorithm)
-    clean_domain = _require_real_non_empty_str(domain_tag, field="domain_tag")
-    if clean_domain not in _ALLOWED_DOMAIN_TAGS:
-        raise QwgV4RealCryptoBackendError(
-            "domain_tag must be the QWG Shield v4 component signing domain"
-        )
-    clean_profile = _require_real_supported_standard_profile(
-        algorithm=clean_algorithm,
+    template = real_crypto_signature_input_template(
+        algorithm=algorithm,
         standard_profile=standard_profile,
+        domain_tag=domain_tag,
+        key_id=key_id,
+        key_version=key_version,
     )
-    clean_hash = _require_hash(signed_payload_hash, field="signed_payload_hash")
-    clean_key_id = _require_real_non_empty_str(key_id, field="key_id")
-    clean_key_version = _require_real_positive_int(key_version, field="key_version")
-    return "\n".join(
-        (
-            REAL_CRYPTO_SIGNATURE_INPUT_PREFIX,
-            clean_domain,
-            clean_hash,
-            clean_algorithm,
-            clean_profile,
-            clean_key_id,
-            str(clean_key_version),
-        )
-    ).encode("utf-8")
+    return template.render(signed_payload_hash)
 
 
-def _require_backend_supports_algorithm(backend: QwgV4RealCryptoBackend, algorithm: str) -> None:
+def _require_backend_supports_algorithm(
+    backend: QwgV4RealCryptoBackend | AsyncRealCryptoBackend, algorithm: str
+) -> None:
     try:
         supported = tuple(getattr(backend, "supported_algorithms", ()))
     except Exception as exc:
@@ -248,14 +405,24 @@ def _call_backend_verify(
     public_key: str,
     message: bytes,
     signature: str,
+    decoded: tuple[bytes, bytes] | None = None,
 ) -> bool:
+    verify_decoded = getattr(backend, "verify_decoded_signature", None)
     try:
-        verified = backend.verify_signature(
-            algorithm=algorithm,
-            public_key=public_key,
-            message=message,
-            signature=signature,
-        )
+        if decoded is not None and verify_decoded is not None:
+            verified = verify_decoded(
+                algorithm=algorithm,
+                public_key=decoded[0],
+                message=message,
+                signature=decoded[1],
+            )
+        else:
+            verified = backend.verify_signature(
+                algorithm=algorithm,
+                public_key=public_key,
+                message=message,
+                signature=signature,
+            )
     except QwgV4RealCryptoBackendError:
         raise
     except Exception as exc:
@@ -316,7 +483,14 @@ def build_signature_entry_with_real_backend(
     }
 
 
-def _validated_key_fields(key: dict[str, Any], *, algorithm: str, key_id: str, key_version: int) -> dict[str, Any]:
+def _validated_key_fields(
+    key: dict[str, Any],
+    *,
+    algorithm: str,
+    key_id: str,
+    key_version: int,
+    public_key_cache: DecodedPublicKeyCache | None,
+) -> dict[str, Any]:
     if not isinstance(key, dict):
         raise QwgV4RealCryptoBackendError("registry key must be dict")
     if set(key.keys()) != _REGISTRY_KEY_FIELDS:
@@ -330,25 +504,34 @@ def _validated_key_fields(key: dict[str, Any], *, algorithm: str, key_id: str, k
     if (key_algorithm, key_key_id, key_key_version) != (algorithm, key_id, key_version):
         raise QwgV4RealCryptoBackendError("signature entry does not match registry key")
     public_key = _require_real_non_empty_str(key.get("public_key"), field="public_key")
-    reject_test_only_key_material(key)
-    decode_binary_signature_material(public_key, field="public_key")
+    if public_key_cache is None:
+        reject_test_only_key_material(key)
+        public_key_bytes = decode_binary_signature_material(public_key, field="public_key")
+    else:
+        _reject_test_only_text(key_key_id, field="key_id")
+        public_key_bytes = public_key_cache.resolve(
+            algorithm=key_algorithm,
+            key_id=key_key_id,
+            key_version=key_key_version,
+            public_key=public_key,
+        )
     return {
         "role": role,
         "algorithm": key_algorithm,
         "key_id": key_key_id,
         "key_version": key_key_version,
         "public_key": public_key,
+        "public_key_bytes": public_key_bytes,
     }
 
 
-def verify_signature_entry_with_real_backend(
+def _prepare_real_backend_verification(
     entry: dict[str, Any],
     key: dict[str, Any],
     *,
-    backend: QwgV4RealCryptoBackend,
-) -> bool:
-    """Verify one QWG Shield v4 signature entry with a production backend."""
-
+    backend: QwgV4RealCryptoBackend | AsyncRealCryptoBackend,
+    public_key_cache: DecodedPublicKeyCache | None,
+) -> tuple[str, str, bytes, str, tuple[bytes, bytes]]:
     if not isinstance(entry, dict):
         raise QwgV4RealCryptoBackendError("signature entry must be dict")
     if set(entry.keys()) != _SIGNATURE_ENTRY_FIELDS:
@@ -360,7 +543,13 @@ def verify_signature_entry_with_real_backend(
     )
     key_id = _require_real_non_empty_str(entry.get("key_id"), field="key_id")
     key_version = _require_real_positive_int(entry.get("key_version"), field="key_version")
-    checked_key = _validated_key_fields(key, algorithm=algorithm, key_id=key_id, key_version=key_version)
+    checked_key = _validated_key_fields(
+        key,
+        algorithm=algorithm,
+        key_id=key_id,
+        key_version=key_version,
+        public_key_cache=_require_public_key_cache(public_key_cache),
+    )
     _require_backend_supports_algorithm(backend, algorithm)
     message = build_real_crypto_signature_input(
         algorithm=algorithm,
@@ -371,22 +560,220 @@ def verify_signature_entry_with_real_backend(
         key_version=key_version,
     )
     signature = _require_real_non_empty_str(entry.get("signature"), field="signature")
-    decode_binary_signature_material(signature, field="signature")
+    decoded = (checked_key["public_key_bytes"], decode_binary_signature_material(signature, field="signature"))
+    return algorithm, checked_key["public_key"], message, signature, decoded
+
+
+def verify_signature_entry_with_real_backend(
+    entry: dict[str, Any],
+    key: dict[str, Any],
+    *,
+    backend: QwgV4RealCryptoBackend,
+    public_key_cache: DecodedPublicKeyCache | None = None,
+) -> bool:
+    """Verify one QWG Shield v4 signature entry with a production backend.
+
+    Pass a :class:`DecodedPublicKeyCache` to validate and decode each registry
+    public key once per trust-profile snapshot instead of once per signature.
+    """
+
+    algorithm, public_key, message, signature, decoded = _prepare_real_backend_verification(
+        entry,
+        key,
+        backend=backend,
+        public_key_cache=public_key_cache,
+    )
     return _call_backend_verify(
         backend,
         algorithm=algorithm,
-        public_key=checked_key["public_key"],
+        public_key=public_key,
         message=message,
         signature=signature,
+        decoded=decoded,
     )
 
 
 def make_real_crypto_signature_verifier(
     backend: QwgV4RealCryptoBackend,
+    *,
+    public_key_cache: DecodedPublicKeyCache | None = None,
 ) -> RealCryptoSignatureVerifier:
     """Adapt a real crypto backend to the existing QWG bundle verifier callback."""
 
+    clean_cache = _require_public_key_cache(public_key_cache)
+
     def _verify(entry: dict[str, Any], key: dict[str, Any]) -> bool:
-        return verify_signature_entry_with_real_backend(entry, key, backend=backend)
+        return verify_signature_entry_with_real_backend(entry, key, backend=backend, public_key_cache=clean_cache)
+
+    return _verify
+
+
+def _require_timeout_seconds(timeout_seconds: Any) -> float | None:
+    if timeout_seconds is None:
+        return None
+    if (
+        isinstance(timeout_seconds, bool)
+        or not isinstance(timeout_seconds, (int, float))
+        or not math.isfinite(timeout_seconds)
+        or timeout_seconds <= 0
+    ):
+        raise QwgV4RealCryptoBackendError("timeout_seconds must be positive finite number")
+    return float(timeout_seconds)
+
+
+async def _await_backend_call(operation: str, call: Awaitable[_T], timeout_seconds: float | None) -> _T:
+    try:
+        return await asyncio.wait_for(call, timeout_seconds)
+    except TimeoutError as exc:
+        raise QwgV4RealCryptoBackendError(f"real crypto backend {operation} timed out failed closed") from exc
+
+
+class ExecutorAsyncRealCryptoBackend:
+    """Expose a synchronous real backend as an :class:`AsyncRealCryptoBackend`.
+
+    Blocking ``sign_message``/``verify_signature`` calls run on ``executor``
+    (the event loop's default executor when ``None``). A call that exceeds
+    ``timeout_seconds`` fails closed; the abandoned executor job finishes in the
+    background and its result is discarded. Cancelling the awaiting task has
+    the same effect.
+    """
+
+    def __init__(
+        self,
+        backend: QwgV4RealCryptoBackend,
+        *,
+        executor: Executor | None = None,
+        timeout_seconds: float | None = None,
+    ) -> None:
+        self._backend = backend
+        self._executor = executor
+        self.timeout_seconds = _require_timeout_seconds(timeout_seconds)
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend.backend_name
+
+    @property
+    def backend_version(self) -> str:
+        return self._backend.backend_version
+
+    @property
+    def supported_algorithms(self) -> tuple[str, ...]:
+        return tuple(self._backend.supported_algorithms)
+
+    def _offload(self, operation: str, call: Callable[[], _T]) -> Awaitable[_T]:
+        future = asyncio.get_running_loop().run_in_executor(self._executor, call)
+        return _await_backend_call(operation, future, self.timeout_seconds)
+
+    async def sign_message(self, *, algorithm: str, private_key_reference: str, message: bytes) -> str:
+        return await self._offload(
+            "sign",
+            functools.partial(
+                _call_backend_sign,
+                self._backend,
+                algorithm=algorithm,
+                private_key_reference=private_key_reference,
+                message=message,
+            ),
+        )
+
+    async def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> bool:
+        return await self._offload(
+            "verify",
+            functools.partial(
+                _call_backend_verify,
+                self._backend,
+                algorithm=algorithm,
+                public_key=public_key,
+                message=message,
+                signature=signature,
+            ),
+        )
+
+    def _verify_decoded(
+        self,
+        *,
+        algorithm: str,
+        public_key: str,
+        message: bytes,
+        signature: str,
+        decoded: tuple[bytes, bytes],
+    ) -> Awaitable[bool]:
+        return self._offload(
+            "verify",
+            functools.partial(
+                _call_backend_verify,
+                self._backend,
+                algorithm=algorithm,
+                public_key=public_key,
+                message=message,
+                signature=signature,
+                decoded=decoded,
+            ),
+        )
+
+
+async def verify_signature_entry_with_async_backend(
+    entry: dict[str, Any],
+    key: dict[str, Any],
+    *,
+    backend: AsyncRealCryptoBackend,
+    timeout_seconds: float | None = None,
+    public_key_cache: DecodedPublicKeyCache | None = None,
+) -> bool:
+    """Async :func:`verify_signature_entry_with_real_backend` with an optional per-call timeout."""
+
+    clean_timeout = _require_timeout_seconds(timeout_seconds)
+    algorithm, public_key, message, signature, decoded = _prepare_real_backend_verification(
+        entry,
+        key,
+        backend=backend,
+        public_key_cache=public_key_cache,
+    )
+    try:
+        if isinstance(backend, ExecutorAsyncRealCryptoBackend):
+            call = backend._verify_decoded(
+                algorithm=algorithm,
+                public_key=public_key,
+                message=message,
+                signature=signature,
+                decoded=decoded,
+            )
+        else:
+            call = backend.verify_signature(
+                algorithm=algorithm,
+                public_key=public_key,
+                message=message,
+                signature=signature,
+            )
+        verified = await _await_backend_call("verify", call, clean_timeout)
+    except QwgV4RealCryptoBackendError:
+        raise
+    except Exception as exc:
+        raise QwgV4RealCryptoBackendError("real crypto backend verify failed closed") from exc
+    if not isinstance(verified, bool):
+        raise QwgV4RealCryptoBackendError("real crypto backend verify must return bool")
+    return verified
+
+
+def make_async_real_crypto_signature_verifier(
+    backend: AsyncRealCryptoBackend,
+    *,
+    timeout_seconds: float | None = None,
+    public_key_cache: DecodedPublicKeyCache | None = None,
+) -> AsyncRealCryptoSignatureVerifier:
+    """Adapt an async real backend to the ``verify_signature_bundle_async`` callback."""
+
+    clean_timeout = _require_timeout_seconds(timeout_seconds)
+    clean_cache = _require_public_key_cache(public_key_cache)
+
+    async def _verify(entry: dict[str, Any], key: dict[str, Any]) -> bool:
+        return await verify_signature_entry_with_async_backend(
+            entry,
+            key,
+            backend=backend,
+            timeout_seconds=clean_timeout,
+            public_key_cache=clean_cache,
+        )
 
     return _verify
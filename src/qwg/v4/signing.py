@@ -2,14 +2,18 @@ from __future__ import annotations
 
 import hashlib
 import json
+import sys
 import unicodedata
-from collections.abc import Callable, Iterable
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from itertools import islice
 from typing import Any, TypeAlias
 
 from qwg.v4 import COMPONENT_ROLE, POLICY_VERSION, SIGNATURE_BUNDLE_SCHEMA_VERSION, VERDICT_SCHEMA_VERSION
 from qwg.v4.trust_profile import (
     REQUIRED_ALGORITHMS,
     SUPPORTED_ALGORITHMS,
+    TrustProfileIndex,
     default_standard_profile_for_algorithm,
     find_trusted_key,
     require_non_empty_str,
@@ -32,6 +36,7 @@ SIGNATURE_ENTRY_FIELDS = frozenset(
     }
 )
 SignatureVerifier: TypeAlias = Callable[[dict[str, Any], dict[str, Any]], bool]
+AsyncSignatureVerifier: TypeAlias = Callable[[dict[str, Any], dict[str, Any]], Awaitable[bool]]
 
 
 def normalise_for_signing(value: Any, *, path: str) -> Any:
@@ -58,11 +63,172 @@ def normalise_for_signing(value: Any, *, path: str) -> Any:
     raise ValueError(f"{path} contains unsupported type {type(value).__name__}")
 
 
-def to_canonical_json(payload: dict[str, Any]) -> str:
+_NO_FORBIDDEN_KEYS: frozenset[str] = frozenset()
+_EXHAUSTED = object()
+
+
+@dataclass(frozen=True)
+class CanonicalBudget:
+    """Upper bounds for one canonicalization walk.
+
+    ``max_depth`` bounds container nesting below the root and ``max_nodes`` the
+    total number of container members visited; ``None`` disables the size bound.
+    Exceeding either bound fails closed with ``ValueError``. The canonical JSON
+    and hash producers are unbounded unless given a budget; validators of
+    untrusted input pass one explicitly.
+    """
+
+    max_depth: int = 64
+    max_nodes: int | None = None
+
+    def __post_init__(self) -> None:
+        require_positive_int(self.max_depth, field="max_depth")
+        if self.max_nodes is not None:
+            require_positive_int(self.max_nodes, field="max_nodes")
+
+
+DEFAULT_CANONICAL_BUDGET = CanonicalBudget()
+_UNBOUNDED_CANONICAL_BUDGET = CanonicalBudget(max_depth=sys.maxsize)
+
+
+def _canonical_scalar(item: Any, path: str) -> Any:
+    if item is None:
+        raise ValueError(f"{path} must omit absent fields instead of using null")
+    if isinstance(item, str):
+        return unicodedata.normalize("NFC", item)
+    if isinstance(item, int):
+        return item
+    if isinstance(item, float):
+        raise ValueError(f"{path} must not contain floats")
+    raise ValueError(f"{path} contains unsupported type {type(item).__name__}")
+
+
+def _normalise_copy_on_write(
+    payload: dict[str, Any],
+    *,
+    nested_forbidden_keys: frozenset[str],
+    budget: CanonicalBudget,
+) -> Any:
+    """Validate and NFC-normalize ``payload`` in one iterative walk.
+
+    Accepts and rejects what :func:`normalise_for_signing` does, but uses an
+    explicit stack bounded by ``budget`` instead of recursion, and returns the
+    caller's containers untouched when they are already canonical, so the
+    common all-ASCII payload is never deep-copied. Objects below the root that
+    hold any of ``nested_forbidden_keys`` are rejected during the same walk.
+    """
+
+    max_depth = budget.max_depth
+    remaining = budget.max_nodes
+    if remaining is not None:
+        remaining -= len(payload)
+        if remaining < 0:
+            raise ValueError("$ exceeds canonical size budget")
+    # Suspended parents: (source, entries, path, out, index, key, clean_key, item).
+    stack: list[tuple[Any, ...]] = []
+    source: Any = payload
+    entries: Any = enumerate(payload.items())
+    path = "$"
+    out: Any = None
+    resumed: tuple[Any, ...] | None = None
+    while True:
+        descend: tuple[Any, ...] | None = None
+        if isinstance(source, dict):
+            if resumed is not None:
+                index, key, clean_key, item, clean_item = resumed
+                if out is None and (clean_item is not item or clean_key is not key):
+                    out = dict(islice(source.items(), index))
+                if out is not None:
+                    if clean_key in out:
+                        raise ValueError(f"{path} contains duplicate key after Unicode normalization")
+                    out[clean_key] = clean_item
+            for index, (key, item) in entries:
+                if not isinstance(key, str):
+                    raise ValueError(f"{path} object keys must be strings")
+                # NFC is the identity on ASCII, so skip the normalization table lookup.
+                clean_key = key if key.isascii() else unicodedata.normalize("NFC", key)
+                cls = type(item)
+                if cls is str:
+                    clean_item = item if item.isascii() else unicodedata.normalize("NFC", item)
+                elif cls is int or cls is bool:
+                    clean_item = item
+                elif isinstance(item, (dict, list, tuple)):
+                    descend = (index, key, clean_key, item, f"{path}.{clean_key}")
+                    break
+                else:
+                    clean_item = _canonical_scalar(item, f"{path}.{clean_key}")
+                if out is None and (clean_item is not item or clean_key is not key):
+                    out = dict(islice(source.items(), index))
+                if out is not None:
+                    if clean_key in out:
+                        raise ValueError(f"{path} contains duplicate key after Unicode normalization")
+                    out[clean_key] = clean_item
+        else:
+            if resumed is not None:
+                index, _, _, item, clean_item = resumed
+                if out is None and clean_item is not item:
+                    out = list(source[:index])
+                if out is not None:
+                    out.append(clean_item)
+            for index, item in entries:
+                cls = type(item)
+                if cls is str:
+                    clean_item = item if item.isascii() else unicodedata.normalize("NFC", item)
+                elif cls is int or cls is bool:
+                    clean_item = item
+                elif isinstance(item, (dict, list, tuple)):
+                    descend = (index, None, None, item, f"{path}[{index}]")
+                    break
+                else:
+                    clean_item = _canonical_scalar(item, f"{path}[{index}]")
+                if out is None and clean_item is not item:
+                    out = list(source[:index])
+                if out is not None:
+                    out.append(clean_item)
+        resumed = None
+        if descend is not None:
+            index, key, clean_key, item, child_path = descend
+            if len(stack) >= max_depth:
+                raise ValueError(f"{child_path} exceeds canonical nesting depth budget")
+            if remaining is not None:
+                remaining -= len(item)
+                if remaining < 0:
+                    raise ValueError(f"{child_path} exceeds canonical size budget")
+            if nested_forbidden_keys and isinstance(item, dict) and not nested_forbidden_keys.isdisjoint(item):
+                raise ValueError(f"{child_path} contains forbidden key")
+            stack.append((source, entries, path, out, index, key, clean_key, item))
+            source, path, out = item, child_path, None
+            entries = enumerate(item.items() if isinstance(item, dict) else item)
+            continue
+        result = source if out is None else out
+        if not stack:
+            return result
+        source, entries, path, out, index, key, clean_key, item = stack.pop()
+        resumed = (index, key, clean_key, item, result)
+
+
+def to_canonical_json(
+    payload: dict[str, Any],
+    *,
+    nested_forbidden_keys: frozenset[str] = _NO_FORBIDDEN_KEYS,
+    budget: CanonicalBudget | None = None,
+) -> str:
+    """Return canonical JSON for ``payload``.
+
+    ``nested_forbidden_keys`` rejects those keys in any object below the root
+    during the canonicalization walk, so callers that must police nested
+    metadata do not traverse it a second time. ``budget`` bounds the walk;
+    without one, nesting is limited only as it was by the recursive walk.
+    """
+
     if not isinstance(payload, dict):
         raise ValueError("payload must be dict")
     return json.dumps(
-        normalise_for_signing(payload, path="$"),
+        _normalise_copy_on_write(
+            payload,
+            nested_forbidden_keys=nested_forbidden_keys,
+            budget=_UNBOUNDED_CANONICAL_BUDGET if budget is None else budget,
+        ),
         sort_keys=True,
         separators=(",", ":"),
         ensure_ascii=False,
@@ -70,6 +236,25 @@ def to_canonical_json(payload: dict[str, Any]) -> str:
     )
 
 
+def update_hash_with_canonical_json(
+    hasher: Any,
+    payload: dict[str, Any],
+    *,
+    nested_forbidden_keys: frozenset[str] = _NO_FORBIDDEN_KEYS,
+    budget: CanonicalBudget | None = None,
+) -> Any:
+    """Feed the canonical JSON bytes of ``payload`` into ``hasher``.
+
+    ``hasher`` is any ``hashlib``-style object exposing ``update``; it is
+    returned so callers can chain ``.hexdigest()``.
+    """
+
+    hasher.update(
+        to_canonical_json(payload, nested_forbidden_keys=nested_forbidden_keys, budget=budget).encode("utf-8")
+    )
+    return hasher
+
+
 def reject_duplicate_json_keys(pairs: Iterable[tuple[str, Any]]) -> dict[str, Any]:
     result: dict[str, Any] = {}
     for key, value in pairs:
@@ -80,21 +265,52 @@ def reject_duplicate_json_keys(pairs: Iterable[tuple[str, Any]]) -> dict[str, An
     return result
 
 
+def _reject_duplicate_ascii_json_keys(pairs: list[tuple[str, Any]]) -> dict[str, Any]:
+    # Only used for ASCII text without escapes, where NFC normalization of keys is the identity.
+    result = dict(pairs)
+    if len(result) != len(pairs):
+        raise ValueError("json contains duplicate key")
+    return result
+
+
+_ASCII_JSON_DECODER = json.JSONDecoder(object_pairs_hook=_reject_duplicate_ascii_json_keys)
+
+
 def parse_json_no_duplicate_keys(raw_json: str) -> dict[str, Any]:
-    parsed = json.loads(raw_json, object_pairs_hook=reject_duplicate_json_keys)
+    """Parse a JSON object, rejecting keys that repeat after NFC normalization.
+
+    ASCII text without backslash escapes cannot contain keys that NFC changes,
+    so it takes a fast path that detects duplicates by comparing the pair count
+    with the size of the dict built in C. Any other input goes through
+    ``reject_duplicate_json_keys``; both paths accept and reject the same
+    documents with the same errors.
+    """
+
+    if isinstance(raw_json, str) and raw_json.isascii() and "\\" not in raw_json:
+        parsed = _ASCII_JSON_DECODER.decode(raw_json)
+    else:
+        parsed = json.loads(raw_json, object_pairs_hook=reject_duplicate_json_keys)
     if not isinstance(parsed, dict):
         raise ValueError("json root must be object")
     return parsed
 
 
+_DOMAIN_SEPARATION_PREFIX_BYTES = f"{SIGNED_PAYLOAD_HASH_PREFIX}\n{COMPONENT_VERDICT_DOMAIN}\n".encode("utf-8")
+
+
 def domain_separated_payload_bytes(*, payload: dict[str, Any]) -> bytes:
-    return f"{SIGNED_PAYLOAD_HASH_PREFIX}\n{COMPONENT_VERDICT_DOMAIN}\n".encode(
-        "utf-8"
-    ) + to_canonical_json(payload).encode("utf-8")
+    return _DOMAIN_SEPARATION_PREFIX_BYTES + to_canonical_json(payload).encode("utf-8")
 
 
-def signed_payload_hash(*, payload: dict[str, Any]) -> str:
-    return hashlib.sha256(domain_separated_payload_bytes(payload=payload)).hexdigest()
+def signed_payload_hash(
+    *,
+    payload: dict[str, Any],
+    nested_forbidden_keys: frozenset[str] = _NO_FORBIDDEN_KEYS,
+    budget: CanonicalBudget | None = None,
+) -> str:
+    hasher = hashlib.sha256(_DOMAIN_SEPARATION_PREFIX_BYTES)
+    update_hash_with_canonical_json(hasher, payload, nested_forbidden_keys=nested_forbidden_keys, budget=budget)
+    return hasher.hexdigest()
 
 
 def require_hash(value: Any, *, field: str) -> str:
@@ -186,16 +402,15 @@ def verify_test_only_signature(entry: dict[str, Any], key: dict[str, Any]) -> bo
     return entry["signature"] == expected
 
 
-def verify_signature_bundle(
+def _prepare_signature_bundle_verification(
     bundle: dict[str, Any],
     *,
     expected_signed_payload_hash: str,
-    trust_profile: dict[str, Any],
+    trust_profile: dict[str, Any] | TrustProfileIndex,
     verification_time: str,
     artifact_not_before: str,
     artifact_not_after: str,
-    verifier: SignatureVerifier,
-) -> dict[str, Any]:
+) -> list[tuple[dict[str, Any], str, str, dict[str, Any]]]:
     if not isinstance(bundle, dict):
         raise ValueError("signature bundle must be dict")
     if set(bundle.keys()) != {"schema_version", "policy_version", "signatures"}:
@@ -210,7 +425,6 @@ def verify_signature_bundle(
     seen_algorithms: set[str] = set()
     prepared_entries: list[tuple[dict[str, Any], str, str, str, int]] = []
     algorithm_sequence: list[str] = []
-    results: list[dict[str, Any]] = []
     for entry in bundle["signatures"]:
         if not isinstance(entry, dict):
             raise ValueError("signature entry must be dict")
@@ -242,6 +456,7 @@ def verify_signature_bundle(
     if missing:
         raise ValueError("signature policy requirements not satisfied")
 
+    checks: list[tuple[dict[str, Any], str, str, dict[str, Any]]] = []
     for entry, algorithm, standard_profile, key_id, key_version in prepared_entries:
         key = find_trusted_key(
             trust_profile,
@@ -252,23 +467,28 @@ def verify_signature_bundle(
             artifact_not_before=artifact_not_before,
             artifact_not_after=artifact_not_after,
         )
-        try:
-            verified = verifier(entry, key)
-        except Exception as exc:
-            raise ValueError("signature verifier failed closed") from exc
-        if not isinstance(verified, bool):
-            raise ValueError("signature verifier must return bool")
-        if not verified:
-            raise ValueError("signature verification failed")
-        results.append(
-            {
-                "algorithm": algorithm,
-                "standard_profile": standard_profile,
-                "key_id": key["key_id"],
-                "key_version": key["key_version"],
-                "verified": True,
-            }
-        )
+        checks.append((entry, algorithm, standard_profile, key))
+    return checks
+
+
+def _require_verified(verified: Any) -> None:
+    if not isinstance(verified, bool):
+        raise ValueError("signature verifier must return bool")
+    if not verified:
+        raise ValueError("signature verification failed")
+
+
+def _signature_bundle_summary(checks: list[tuple[dict[str, Any], str, str, dict[str, Any]]]) -> dict[str, Any]:
+    results = [
+        {
+            "algorithm": algorithm,
+            "standard_profile": standard_profile,
+            "key_id": key["key_id"],
+            "key_version": key["key_version"],
+            "verified": True,
+        }
+        for _, algorithm, standard_profile, key in checks
+    ]
     return {
         "policy_version": POLICY_VERSION,
         "required_algorithms": list(REQUIRED_ALGORITHMS),
@@ -278,3 +498,75 @@ def verify_signature_bundle(
         "required_role": COMPONENT_ROLE,
         "results": results,
     }
+
+
+def verify_signature_bundle(
+    bundle: dict[str, Any],
+    *,
+    expected_signed_payload_hash: str,
+    trust_profile: dict[str, Any] | TrustProfileIndex,
+    verification_time: str,
+    artifact_not_before: str,
+    artifact_not_after: str,
+    verifier: SignatureVerifier,
+) -> dict[str, Any]:
+    checks = _prepare_signature_bundle_verification(
+        bundle,
+        expected_signed_payload_hash=expected_signed_payload_hash,
+        trust_profile=trust_profile,
+        verification_time=verification_time,
+        artifact_not_before=artifact_not_before,
+        artifact_not_after=artifact_not_after,
+    )
+    for entry, _, _, key in checks:
+        try:
+            verified = verifier(entry, key)
+        except Exception as exc:
+            raise ValueError("signature verifier failed closed") from exc
+        _require_verified(verified)
+    return _signature_bundle_summary(checks)
+
+
+async def _await_verifier(verifier: AsyncSignatureVerifier, entry: dict[str, Any], key: dict[str, Any]) -> Any:
+    return await verifier(entry, key)
+
+
+async def verify_signature_bundle_async(
+    bundle: dict[str, Any],
+    *,
+    expected_signed_payload_hash: str,
+    trust_profile: dict[str, Any] | TrustProfileIndex,
+    verification_time: str,
+    artifact_not_before: str,
+    artifact_not_after: str,
+    verifier: AsyncSignatureVerifier,
+) -> dict[str, Any]:
+    """Async :func:`verify_signature_bundle` that verifies all entries concurrently.
+
+    Bundle, policy and trust-profile checks are identical to the synchronous
+    path and run before any verifier is awaited. Verifier errors, timeouts and
+    non-bool results fail closed with the same ``ValueError`` messages.
+    Cancelling the caller cancels every outstanding entry verification.
+    """
+
+    checks = _prepare_signature_bundle_verification(
+        bundle,
+        expected_signed_payload_hash=expected_signed_payload_hash,
+        trust_profile=trust_profile,
+        verification_time=verification_time,
+        artifact_not_before=artifact_not_before,
+        artifact_not_after=artifact_not_after,
+    )
+    import asyncio  # Already loaded by the running loop; kept off the synchronous import path.
+
+    outcomes = await asyncio.gather(
+        *(_await_verifier(verifier, entry, key) for entry, _, _, key in checks),
+        return_exceptions=True,
+    )
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            raise ValueError("signature verifier failed closed") from outcome
+        if isinstance(outcome, BaseException):
+            raise outcome
+        _require_verified(outcome)
+    return _signature_bundle_summary(checks)
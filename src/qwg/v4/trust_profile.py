@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import hashlib
+import math
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
@@ -27,6 +30,7 @@ ALGORITHM_STANDARD_PROFILES = {
 DEFAULT_STANDARD_PROFILE_BY_ALGORITHM = {
     algorithm: profiles[0] for algorithm, profiles in ALGORITHM_STANDARD_PROFILES.items()
 }
+DEFAULT_REVOCATION_BLOOM_BITS_PER_KEY = 10
 
 
 def require_non_empty_str(value: Any, *, field: str) -> str:
@@ -96,7 +100,12 @@ def build_test_trust_profile() -> dict[str, Any]:
     }
 
 
-def validate_trust_profile(profile: dict[str, Any]) -> dict[str, Any]:
+_TRUST_PROFILE_ENTRY_FIELDS = frozenset(
+    {"role", "key_id", "key_version", "algorithm", "not_before", "not_after", "status", "public_key"}
+)
+
+
+def _validate_trust_profile_header(profile: Any) -> int:
     if not isinstance(profile, dict):
         raise ValueError("trust profile must be dict")
     if set(profile.keys()) != {"schema_version", "registry_version", "entries"}:
@@ -106,51 +115,54 @@ def validate_trust_profile(profile: dict[str, Any]) -> dict[str, Any]:
     registry_version = require_positive_int(profile["registry_version"], field="registry_version")
     if not isinstance(profile["entries"], list) or not profile["entries"]:
         raise ValueError("trust profile entries must be non-empty list")
+    return registry_version
+
+
+def _validate_trust_profile_entry(entry: Any) -> dict[str, Any]:
+    if not isinstance(entry, dict):
+        raise ValueError("trust profile entry must be dict")
+    if set(entry.keys()) != _TRUST_PROFILE_ENTRY_FIELDS:
+        raise ValueError("trust profile entry fields must match required schema")
+    role = require_non_empty_str(entry["role"], field="role")
+    if role not in SUPPORTED_ROLES:
+        raise ValueError("unsupported key role")
+    key_id = require_non_empty_str(entry["key_id"], field="key_id")
+    key_version = require_positive_int(entry["key_version"], field="key_version")
+    algorithm = require_supported_algorithm(entry["algorithm"])
+    not_before, not_after = validate_freshness_window(
+        not_before=entry["not_before"], not_after=entry["not_after"]
+    )
+    status = require_non_empty_str(entry["status"], field="status")
+    if status not in {ACTIVE, REVOKED}:
+        raise ValueError("unsupported key status")
+    public_key = require_non_empty_str(entry["public_key"], field="public_key")
+    return {
+        "role": role,
+        "key_id": key_id,
+        "key_version": key_version,
+        "algorithm": algorithm,
+        "not_before": not_before,
+        "not_after": not_after,
+        "status": status,
+        "public_key": public_key,
+    }
+
+
+def _key_identity(entry: dict[str, Any]) -> tuple[str, int, str, str]:
+    return (entry["role"], entry["key_version"], entry["algorithm"], entry["key_id"])
+
+
+def validate_trust_profile(profile: dict[str, Any]) -> dict[str, Any]:
+    registry_version = _validate_trust_profile_header(profile)
     checked_entries: list[dict[str, Any]] = []
     seen: set[tuple[str, int, str, str]] = set()
     for entry in profile["entries"]:
-        if not isinstance(entry, dict):
-            raise ValueError("trust profile entry must be dict")
-        if set(entry.keys()) != {
-            "role",
-            "key_id",
-            "key_version",
-            "algorithm",
-            "not_before",
-            "not_after",
-            "status",
-            "public_key",
-        }:
-            raise ValueError("trust profile entry fields must match required schema")
-        role = require_non_empty_str(entry["role"], field="role")
-        if role not in SUPPORTED_ROLES:
-            raise ValueError("unsupported key role")
-        key_id = require_non_empty_str(entry["key_id"], field="key_id")
-        key_version = require_positive_int(entry["key_version"], field="key_version")
-        algorithm = require_supported_algorithm(entry["algorithm"])
-        not_before, not_after = validate_freshness_window(
-            not_before=entry["not_before"], not_after=entry["not_after"]
-        )
-        status = require_non_empty_str(entry["status"], field="status")
-        if status not in {ACTIVE, REVOKED}:
-            raise ValueError("unsupported key status")
-        public_key = require_non_empty_str(entry["public_key"], field="public_key")
-        identity = (role, key_version, algorithm, key_id)
+        checked = _validate_trust_profile_entry(entry)
+        identity = _key_identity(checked)
         if identity in seen:
             raise ValueError("duplicate trust profile entry")
         seen.add(identity)
-        checked_entries.append(
-            {
-                "role": role,
-                "key_id": key_id,
-                "key_version": key_version,
-                "algorithm": algorithm,
-                "not_before": not_before,
-                "not_after": not_after,
-                "status": status,
-                "public_key": public_key,
-            }
-        )
+        checked_entries.append(checked)
     return {
         "schema_version": KEY_REGISTRY_SCHEMA_VERSION,
         "registry_version": registry_version,
@@ -158,8 +170,7 @@ def validate_trust_profile(profile: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def find_trusted_key(
-    profile: dict[str, Any],
+def _parse_key_request(
     *,
     key_id: str,
     key_version: int,
@@ -167,8 +178,7 @@ def find_trusted_key(
     verification_time: str,
     artifact_not_before: str,
     artifact_not_after: str,
-) -> dict[str, Any]:
-    checked_profile = validate_trust_profile(profile)
+) -> tuple[datetime, datetime, datetime, tuple[str, int, str, str]]:
     verification_dt = parse_utc_timestamp(verification_time, field="verification_time")
     artifact_start = parse_utc_timestamp(artifact_not_before, field="artifact_not_before")
     artifact_end = parse_utc_timestamp(artifact_not_after, field="artifact_not_after")
@@ -177,20 +187,262 @@ def find_trusted_key(
     clean_key_id = require_non_empty_str(key_id, field="key_id")
     clean_key_version = require_positive_int(key_version, field="key_version")
     clean_algorithm = require_supported_algorithm(algorithm)
+    return verification_dt, artifact_start, artifact_end, (COMPONENT_ROLE, clean_key_version, clean_algorithm, clean_key_id)
+
+
+def _require_key_window(
+    key_start: datetime, key_end: datetime, verification_dt: datetime, artifact_start: datetime, artifact_end: datetime
+) -> None:
+    if not (key_start <= verification_dt <= key_end):
+        raise ValueError("key is not valid at verification time")
+    if not (key_start <= artifact_start <= key_end and key_start <= artifact_end <= key_end):
+        raise ValueError("artifact was produced outside key validity window")
+
+
+def find_trusted_key(
+    profile: dict[str, Any] | TrustProfileIndex,
+    *,
+    key_id: str,
+    key_version: int,
+    algorithm: str,
+    verification_time: str,
+    artifact_not_before: str,
+    artifact_not_after: str,
+) -> dict[str, Any]:
+    if isinstance(profile, TrustProfileIndex):
+        return profile.find_key(
+            key_id=key_id,
+            key_version=key_version,
+            algorithm=algorithm,
+            verification_time=verification_time,
+            artifact_not_before=artifact_not_before,
+            artifact_not_after=artifact_not_after,
+        )
+    checked_profile = validate_trust_profile(profile)
+    verification_dt, artifact_start, artifact_end, identity = _parse_key_request(
+        key_id=key_id,
+        key_version=key_version,
+        algorithm=algorithm,
+        verification_time=verification_time,
+        artifact_not_before=artifact_not_before,
+        artifact_not_after=artifact_not_after,
+    )
     for entry in checked_profile["entries"]:
-        if (
-            entry["role"] == COMPONENT_ROLE
-            and entry["key_id"] == clean_key_id
-            and entry["key_version"] == clean_key_version
-            and entry["algorithm"] == clean_algorithm
-        ):
+        if _key_identity(entry) == identity:
             if entry["status"] != ACTIVE:
                 raise ValueError("key is revoked")
-            key_start = parse_utc_timestamp(entry["not_before"], field="key_not_before")
-            key_end = parse_utc_timestamp(entry["not_after"], field="key_not_after")
-            if not (key_start <= verification_dt <= key_end):
-                raise ValueError("key is not valid at verification time")
-            if not (key_start <= artifact_start <= key_end and key_start <= artifact_end <= key_end):
-                raise ValueError("artifact was produced outside key validity window")
+            _require_key_window(
+                parse_utc_timestamp(entry["not_before"], field="key_not_before"),
+                parse_utc_timestamp(entry["not_after"], field="key_not_after"),
+                verification_dt,
+                artifact_start,
+                artifact_end,
+            )
             return entry
     raise ValueError("trusted QWG key not found")
+
+
+def _identity_bytes(identity: tuple[str, int, str, str]) -> bytes:
+    role, key_version, algorithm, key_id = identity
+    return f"{role}\x00{key_version}\x00{algorithm}\x00{key_id}".encode()
+
+
+class _RevocationBloomFilter:
+    """Bloom filter over revoked key identities using double hashing."""
+
+    def __init__(self, *, capacity: int, bits_per_key: int) -> None:
+        self.capacity = capacity
+        self.bits_per_key = bits_per_key
+        self.bits = max(64, capacity * bits_per_key)
+        self.hashes = max(1, round(bits_per_key * math.log(2)))
+        self.data = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, identity: tuple[str, int, str, str]) -> list[int]:
+        digest = hashlib.blake2b(_identity_bytes(identity), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        step = int.from_bytes(digest[8:], "big") | 1
+        return [(first + index * step) % self.bits for index in range(self.hashes)]
+
+    def add(self, identity: tuple[str, int, str, str]) -> None:
+        for position in self._positions(identity):
+            self.data[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, identity: tuple[str, int, str, str]) -> bool:
+        data = self.data
+        return all(data[position >> 3] & (1 << (position & 7)) for position in self._positions(identity))
+
+    def copy(self) -> _RevocationBloomFilter:
+        clone = _RevocationBloomFilter(capacity=self.capacity, bits_per_key=self.bits_per_key)
+        clone.data[:] = self.data
+        return clone
+
+
+@dataclass(frozen=True)
+class _IndexedKey:
+    entry: dict[str, Any]
+    not_before: datetime
+    not_after: datetime
+
+
+def _entry_cache_key(entry: Any) -> tuple[Any, ...] | None:
+    if not isinstance(entry, dict):
+        return None
+    key = tuple(sorted((name, type(value), value) for name, value in entry.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class TrustProfileIndex:
+    """Validated trust profile with constant-time key and revocation lookups.
+
+    Built once when a profile is loaded, the index keeps active keys in a
+    dict and revoked identities in a set fronted by a Bloom filter of
+    ``bloom_bits_per_key`` bits per revoked key (``0`` disables it), so a
+    revoked or unknown key is rejected without scanning or re-validating the
+    registry. Pass the index anywhere a trust profile is accepted;
+    :func:`find_trusted_key` returns the same entries and raises the same
+    errors as the linear path. :meth:`rebuild` reuses every entry that is
+    unchanged since the previous ``registry_version`` and, when keys were only
+    added to the revocation list, extends a copy of the previous Bloom filter.
+    """
+
+    registry_version: int
+    profile: dict[str, Any]
+    _entries_by_content: dict[tuple[Any, ...], _IndexedKey]
+    _active: dict[tuple[str, int, str, str], _IndexedKey]
+    _revoked: set[tuple[str, int, str, str]]
+    _reused_entries: int
+    _bloom: _RevocationBloomFilter | None
+
+    def __init__(
+        self, profile: dict[str, Any], *, bloom_bits_per_key: int = DEFAULT_REVOCATION_BLOOM_BITS_PER_KEY
+    ) -> None:
+        if isinstance(bloom_bits_per_key, bool) or not isinstance(bloom_bits_per_key, int) or bloom_bits_per_key < 0:
+            raise ValueError("bloom_bits_per_key must be non-negative integer")
+        self.bloom_bits_per_key = bloom_bits_per_key
+        self._build(profile, previous=None)
+
+    def _build(self, profile: dict[str, Any], *, previous: TrustProfileIndex | None) -> None:
+        registry_version = _validate_trust_profile_header(profile)
+        previous_entries = {} if previous is None else previous._entries_by_content
+        entries_by_content: dict[tuple[Any, ...], _IndexedKey] = {}
+        active: dict[tuple[str, int, str, str], _IndexedKey] = {}
+        revoked: set[tuple[str, int, str, str]] = set()
+        checked_entries: list[dict[str, Any]] = []
+        reused = 0
+        for entry in profile["entries"]:
+            content = _entry_cache_key(entry)
+            indexed = None if content is None else previous_entries.get(content)
+            if indexed is None:
+                checked = _validate_trust_profile_entry(entry)
+                indexed = _IndexedKey(
+                    checked,
+                    parse_utc_timestamp(checked["not_before"], field="key_not_before"),
+                    parse_utc_timestamp(checked["not_after"], field="key_not_after"),
+                )
+            else:
+                reused += 1
+            identity = _key_identity(indexed.entry)
+            if identity in active or identity in revoked:
+                raise ValueError("duplicate trust profile entry")
+            if indexed.entry["status"] == ACTIVE:
+                active[identity] = indexed
+            else:
+                revoked.add(identity)
+            if content is not None:
+                entries_by_content[content] = indexed
+            checked_entries.append(indexed.entry)
+
+        self.registry_version = registry_version
+        self.profile = {
+            "schema_version": KEY_REGISTRY_SCHEMA_VERSION,
+            "registry_version": registry_version,
+            "entries": checked_entries,
+        }
+        self._entries_by_content = entries_by_content
+        self._active = active
+        self._revoked = revoked
+        self._reused_entries = reused
+        self._bloom = self._build_bloom(previous)
+
+    def _build_bloom(self, previous: TrustProfileIndex | None) -> _RevocationBloomFilter | None:
+        if not self.bloom_bits_per_key or not self._revoked:
+            return None
+        if (
+            previous is not None
+            and previous._bloom is not None
+            and previous._revoked <= self._revoked
+            and len(self._revoked) <= previous._bloom.capacity
+        ):
+            bloom = previous._bloom.copy()
+            for identity in self._revoked - previous._revoked:
+                bloom.add(identity)
+            return bloom
+        bloom = _RevocationBloomFilter(capacity=2 * len(self._revoked), bits_per_key=self.bloom_bits_per_key)
+        for identity in self._revoked:
+            bloom.add(identity)
+        return bloom
+
+    def rebuild(self, profile: dict[str, Any]) -> TrustProfileIndex:
+        """Return an index for ``profile``, a newer version of this registry."""
+
+        registry_version = _validate_trust_profile_header(profile)
+        if registry_version < self.registry_version:
+            raise ValueError("registry_version must not decrease")
+        index = TrustProfileIndex.__new__(TrustProfileIndex)
+        index.bloom_bits_per_key = self.bloom_bits_per_key
+        index._build(profile, previous=self)
+        if registry_version == self.registry_version and index.profile != self.profile:
+            raise ValueError("registry_version must increase when entries change")
+        return index
+
+    def is_revoked(self, *, key_id: str, key_version: int, algorithm: str) -> bool:
+        """Return whether the component key is listed as revoked."""
+
+        identity = (COMPONENT_ROLE, key_version, algorithm, key_id)
+        if self._bloom is not None and identity not in self._bloom:
+            return False
+        return identity in self._revoked
+
+    def find_key(
+        self,
+        *,
+        key_id: str,
+        key_version: int,
+        algorithm: str,
+        verification_time: str,
+        artifact_not_before: str,
+        artifact_not_after: str,
+    ) -> dict[str, Any]:
+        """Indexed :func:`find_trusted_key`; returns a copy of the trusted entry."""
+
+        verification_dt, artifact_start, artifact_end, identity = _parse_key_request(
+            key_id=key_id,
+            key_version=key_version,
+            algorithm=algorithm,
+            verification_time=verification_time,
+            artifact_not_before=artifact_not_before,
+            artifact_not_after=artifact_not_after,
+        )
+        indexed = self._active.get(identity)
+        if indexed is None:
+            if self.is_revoked(key_id=identity[3], key_version=identity[1], algorithm=identity[2]):
+                raise ValueError("key is revoked")
+            raise ValueError("trusted QWG key not found")
+        _require_key_window(indexed.not_before, indexed.not_after, verification_dt, artifact_start, artifact_end)
+        return dict(indexed.entry)
+
+    def stats(self) -> dict[str, int]:
+        """Return entry, revocation, reuse and Bloom filter sizes."""
+
+        return {
+            "registry_version": self.registry_version,
+            "entries": len(self.profile["entries"]),
+            "active": len(self._active),
+            "revoked": len(self._revoked),
+            "reused_entries": self._reused_entries,
+            "bloom_bits": 0 if self._bloom is None else self._bloom.bits,
+        }
@@ -0,0 +1,129 @@
+"""Hot-reloadable QWG v4 trust profile backed by immutable indexed snapshots."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from qwg.v4.signing import parse_json_no_duplicate_keys
+from qwg.v4.trust_profile import DEFAULT_REVOCATION_BLOOM_BITS_PER_KEY, TrustProfileIndex
+
+DEFAULT_TRUST_PROFILE_POLL_SECONDS = 1.0
+
+
+class TrustProfileProvider:
+    """Trust profile file that is re-read when it changes, without restarts.
+
+    The file is loaded and validated once into a :class:`TrustProfileIndex`.
+    A daemon thread then polls ``os.stat`` every ``poll_interval`` seconds
+    (``None`` disables polling; call :meth:`refresh` instead). When the stat
+    signature changes, the new profile is parsed and indexed off the hot path
+    through :meth:`TrustProfileIndex.rebuild`, then published with a single
+    reference assignment. :meth:`current` takes no lock, and a snapshot is
+    never mutated after it is published, so a verifier that reads it once
+    per envelope sees one consistent registry for every signature in it.
+
+    A new file that is unreadable, malformed, or breaks the ``registry_version``
+    rules fails closed: the previous snapshot stays current and the error is
+    reported by :meth:`stats`. Replacing the file with ``os.replace`` gives
+    readers of the file itself the same atomicity.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        poll_interval: float | None = DEFAULT_TRUST_PROFILE_POLL_SECONDS,
+        bloom_bits_per_key: int = DEFAULT_REVOCATION_BLOOM_BITS_PER_KEY,
+    ) -> None:
+        if poll_interval is not None and (
+            isinstance(poll_interval, bool) or not isinstance(poll_interval, int | float) or not poll_interval > 0
+        ):
+            raise ValueError("poll_interval must be positive number or None")
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reloads = 0
+        self._failed_reloads = 0
+        self._last_error: str | None = None
+        self._signature = self._stat()
+        self._snapshot = TrustProfileIndex(self._read(), bloom_bits_per_key=bloom_bits_per_key)
+        self._poller: threading.Thread | None = None
+        if poll_interval is not None:
+            self._poller = threading.Thread(
+                target=self._poll, args=(poll_interval,), name="qwg-trust-profile-poller", daemon=True
+            )
+            self._poller.start()
+
+    def _stat(self) -> tuple[int, int, int]:
+        status = os.stat(self.path)
+        return (status.st_ino, status.st_size, status.st_mtime_ns)
+
+    def _read(self) -> dict[str, Any]:
+        return parse_json_no_duplicate_keys(self.path.read_text(encoding="utf-8"))
+
+    def _poll(self, poll_interval: float) -> None:
+        while not self._stop.wait(poll_interval):
+            try:
+                self.refresh()
+            except (OSError, ValueError):
+                continue
+
+    def current(self) -> TrustProfileIndex:
+        """Return the current snapshot; pass it as ``trust_profile``."""
+
+        return self._snapshot
+
+    def refresh(self) -> bool:
+        """Reload the file if it changed; return whether a new snapshot was published.
+
+        Raises ``OSError`` or ``ValueError`` for a file that cannot be loaded;
+        the same file is not retried until it changes again.
+        """
+
+        with self._reload_lock:
+            try:
+                signature = self._stat()
+                if signature == self._signature:
+                    return False
+                self._signature = signature
+                snapshot = self._snapshot.rebuild(self._read())
+            except (OSError, ValueError) as exc:
+                self._failed_reloads += 1
+                self._last_error = str(exc)
+                raise
+            if snapshot.profile == self._snapshot.profile:
+                return False
+            self._snapshot = snapshot
+            self._reloads += 1
+            self._last_error = None
+            return True
+
+    def stats(self) -> dict[str, Any]:
+        """Return the published registry version and reload counters."""
+
+        with self._reload_lock:
+            stats: dict[str, Any] = {
+                "registry_version": self._snapshot.registry_version,
+                "reloads": self._reloads,
+                "failed_reloads": self._failed_reloads,
+            }
+            if self._last_error is not None:
+                stats["last_error"] = self._last_error
+            return stats
+
+    def close(self) -> None:
+        """Stop the polling thread."""
+
+        self._stop.set()
+        if self._poller is not None:
+            self._poller.join()
+
+    def __enter__(self) -> TrustProfileProvider:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from qwg.async_service import AsyncDecisionService
+from qwg.engine import DecisionEngine
+from qwg.replay import snapshot_to_risk_context
+from qwg.risk_context import RiskContext
+from qwg.v4.crypto_verdict import validate_crypto_verdict_envelope
+from qwg.v4.nonce_store import NonceStore
+from qwg.v4.signing import verify_test_only_signature
+from qwg.v4.trust_profile import build_test_trust_profile
+from tests.test_replay import STRICT, recorded_snapshots
+from tests.test_v4_crypto_verdict_contract import HASH_A, HASH_B, VERIFY_AT, signed_verdict
+
+ARGUMENTS = {
+    "expected_context_hash": HASH_A,
+    "trust_profile": build_test_trust_profile(),
+    "verification_time": VERIFY_AT,
+    "verifier": verify_test_only_signature,
+}
+
+
+def contexts(count: int) -> list[RiskContext]:
+    return [snapshot_to_risk_context(snapshot) for snapshot in recorded_snapshots(count)]
+
+
+def test_async_service_coalesces_concurrent_decisions_into_batches() -> None:
+    engine = DecisionEngine(STRICT)
+    batch = contexts(100)
+
+    async def run() -> tuple[list[Any], list[Any], dict[str, int]]:
+        async with AsyncDecisionService(engine, max_batch_size=16, max_wait=0.01) as service:
+            verdicts = await asyncio.gather(*(service.evaluate_transaction_v3(ctx) for ctx in batch))
+            results = await asyncio.gather(*(service.evaluate_transaction(ctx) for ctx in batch[:10]))
+            return verdicts, results, service.stats()
+
+    verdicts, results, stats = asyncio.run(run())
+    assert verdicts == [engine.evaluate_transaction_v3(ctx) for ctx in batch]
+    assert results == [engine.evaluate_transaction(ctx) for ctx in batch[:10]]
+    assert stats == {"calls": 110, "batches": 8, "full_batches": 6, "max_batch": 16, "pending": 0}
+
+
+def test_async_service_fails_each_envelope_on_its_own() -> None:
+    tampered = signed_verdict()
+    tampered["context_hash"] = HASH_B
+    envelopes = [signed_verdict(), tampered, "verdict", signed_verdict()]
+    expected = validate_crypto_verdict_envelope(signed_verdict(), **ARGUMENTS)
+
+    async def run() -> list[Any]:
+        async with AsyncDecisionService(max_batch_size=8, max_wait=0) as service:
+            return await asyncio.gather(
+                *(service.validate_crypto_verdict_envelope(envelope, **ARGUMENTS) for envelope in envelopes),
+                return_exceptions=True,
+            )
+
+    outcomes = asyncio.run(run())
+    assert outcomes[0] == outcomes[3] == expected
+    assert isinstance(outcomes[1], ValueError) and str(outcomes[1]) == "context_hash mismatch"
+    assert isinstance(outcomes[2], ValueError) and str(outcomes[2]) == "QWG v4 verdict must be dict"
+
+
+def test_async_service_records_nonces_once_across_a_batch() -> None:
+    async def run(store: NonceStore) -> list[Any]:
+        async with AsyncDecisionService(max_batch_size=4, max_wait=60) as service:
+            return await asyncio.gather(
+                *(service.validate_crypto_verdict_envelope(signed_verdict(), nonce_store=store, **ARGUMENTS) for _ in range(4)),
+                return_exceptions=True,
+            )
+
+    with NonceStore() as store:
+        started = time.monotonic()
+        outcomes = asyncio.run(run(store))
+        assert time.monotonic() - started < 30
+    assert isinstance(outcomes[0], dict)
+    assert all(isinstance(outcome, ValueError) and "replay detected" in str(outcome) for outcome in outcomes[1:])
+
+
+def test_async_service_drops_cancelled_callers() -> None:
+    release = threading.Event()
+
+    def blocking_verifier(entry: dict[str, Any], key: dict[str, Any]) -> bool:
+        release.wait(10)
+        return verify_test_only_signature(entry, key)
+
+    async def run() -> tuple[dict[str, int], Any]:
+        service = AsyncDecisionService(max_batch_size=1, max_wait=60)
+        arguments = dict(ARGUMENTS, verifier=blocking_verifier)
+        running = asyncio.ensure_future(service.validate_crypto_verdict_envelope(signed_verdict(), **arguments))
+        await asyncio.sleep(0)
+        running.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+
+        waiting = AsyncDecisionService(max_batch_size=2, max_wait=60)
+        dropped = asyncio.ensure_future(waiting.evaluate_transaction(RiskContext()))
+        await asyncio.sleep(0)
+        dropped.cancel()
+        await waiting.aclose()
+        await service.aclose()
+        return waiting.stats(), dropped
+
+    stats, dropped = asyncio.run(run())
+    assert dropped.cancelled()
+    assert stats == {"calls": 1, "batches": 0, "full_batches": 0, "max_batch": 0, "pending": 0}
+
+
+class FailingExecutor(ThreadPoolExecutor):
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future[Any]:
+        future: Future[Any] = Future()
+        future.set_exception(OSError("worker lost"))
+        return future
+
+
+def test_async_service_fails_callers_when_the_executor_fails() -> None:
+    async def run(executor: ThreadPoolExecutor) -> list[Any]:
+        service = AsyncDecisionService(executor=executor, max_batch_size=2, max_wait=0)
+        outcomes = await asyncio.gather(*(service.evaluate_transaction(RiskContext()) for _ in range(3)), return_exceptions=True)
+        await service.aclose()
+        return outcomes
+
+    with FailingExecutor() as failing:
+        assert [str(outcome) for outcome in asyncio.run(run(failing))] == ["worker lost"] * 3
+
+    stopped = ThreadPoolExecutor()
+    stopped.shutdown()
+    outcomes = asyncio.run(run(stopped))
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+
+
+def test_async_service_closes_once_and_leaves_supplied_executors_running() -> None:
+    async def run(executor: ThreadPoolExecutor) -> None:
+        service = AsyncDecisionService(executor=executor)
+        assert (await service.evaluate_transaction_v3(RiskContext())).verdict_type.value == "allow"
+        await service.aclose()
+        await service.aclose()
+        with pytest.raises(ValueError, match="async decision service is closed"):
+            await service.evaluate_transaction_v3(RiskContext())
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        asyncio.run(run(executor))
+        assert executor.submit(int, "7").result() == 7
+
+
+def test_async_service_shuts_an_owned_executor_down_off_the_event_loop() -> None:
+    release = threading.Event()
+
+    class SlowEngine(DecisionEngine):
+        def evaluate_transaction(self, ctx: RiskContext) -> Any:
+            release.wait(5)
+            return super().evaluate_transaction(ctx)
+
+    async def run() -> list[threading.Thread]:
+        service = AsyncDecisionService(SlowEngine(), max_wait=0)
+        shutdown_threads: list[threading.Thread] = []
+        shutdown = service._executor.shutdown
+
+        def recording_shutdown(*args: Any, **kwargs: Any) -> None:
+            shutdown_threads.append(threading.current_thread())
+            shutdown(*args, **kwargs)
+
+        service._executor.shutdown = recording_shutdown  # type: ignore[method-assign]
+        call = asyncio.ensure_future(service.evaluate_transaction(RiskContext()))
+        await asyncio.sleep(0.01)
+        closing = asyncio.ensure_future(service.aclose())
+        await asyncio.sleep(0.01)
+        assert not closing.done() and not shutdown_threads
+        release.set()
+        await closing
+        assert call.result().decision.value == "allow"
+        return shutdown_threads
+
+    shutdown_threads = asyncio.run(run())
+    assert len(shutdown_threads) == 1 and shutdown_threads[0] is not threading.main_thread()
+
+
+@pytest.mark.parametrize(
+    ("options", "match"),
+    [
+        ({"engine": object()}, "engine must be DecisionEngine"),
+        ({"max_batch_size": 0}, "max_batch_size must be positive integer"),
+        ({"max_wait": -1}, "max_wait must be non-negative finite number"),
+        ({"max_wait": float("inf")}, "max_wait must be non-negative finite number"),
+        ({"max_wait": True}, "max_wait must be non-negative finite number"),
+        ({"max_wait": "0"}, "max_wait must be non-negative finite number"),
+    ],
+)
+def test_async_service_rejects_bad_configuration(options: dict[str, Any], match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        AsyncDecisionService(**options)
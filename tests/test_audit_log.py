@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import os
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import qwg.audit_log as audit_log
+from qwg.audit_log import SEGMENT_MAGIC, AuditLog, AuditRecordLocation
+from qwg.v3.v3_2_lock import (
+    SUPPORTED_EVIDENCE_FAMILIES,
+    SUPPORTED_REASON_IDS,
+    build_verdict,
+    canonical_json,
+)
+from qwg.v3.verdict import QWGv3Verdict, VerdictType
+from qwg.v4.signing import to_canonical_json
+from tests.test_v4_crypto_verdict_contract import HASH_A, HASH_B, signed_verdict
+
+
+def v3_2_verdict(number: int, *, context_hash: str = HASH_A) -> dict[str, Any]:
+    return build_verdict(
+        request_id=f"req-{number}",
+        context_hash=context_hash,
+        decision="ALLOW",
+        reason_ids=(SUPPORTED_REASON_IDS[0],),
+        evidence_hash=HASH_B,
+        evidence_families=(SUPPORTED_EVIDENCE_FAMILIES[0],),
+    )
+
+
+def record_size(verdict: dict[str, Any]) -> int:
+    return 8 + len(canonical_json(verdict).encode("utf-8"))
+
+
+def small_log(directory: Path, records_per_segment: int = 3, **options: Any) -> AuditLog:
+    segment_bytes = len(SEGMENT_MAGIC) + records_per_segment * record_size(v3_2_verdict(0)) + 4
+    return AuditLog(directory, segment_bytes=segment_bytes, **options)
+
+
+def fill(log: AuditLog, count: int, *, context_hash: str = HASH_A) -> list[AuditRecordLocation]:
+    futures = [log.append(v3_2_verdict(number, context_hash=context_hash)) for number in range(count)]
+    return [future.result() for future in futures]
+
+
+def test_audit_log_stores_v3_v3_2_and_v4_records_and_indexes_them(tmp_path: Path) -> None:
+    envelope = signed_verdict()
+    with AuditLog(tmp_path) as log:
+        legacy = log.append(QWGv3Verdict("v3", VerdictType.DENY, "QWG_TEST", HASH_B, ["late"])).result()
+        bare = log.append(QWGv3Verdict("v3", VerdictType.ALLOW, "QWG_OK", HASH_B)).result()
+        v3_2 = log.append(v3_2_verdict(1)).result()
+        v4 = log.append(envelope).result()
+        assert log.read(legacy) == {
+            "context_hash": HASH_B, "reason_id": "QWG_TEST", "reasons": ["late"], "schema_version": "v3", "verdict_type": "deny"
+        }
+        assert "reasons" not in log.read(bare)
+        assert log.read(v3_2) == v3_2_verdict(1)
+        assert log.read(v4) == envelope
+        raw = (tmp_path / "00000000.seg").read_bytes()
+        assert raw[v4.offset + 8 :] == to_canonical_json(envelope).encode("utf-8")
+        assert [record["schema_version"] for record in log.find_by_context_hash(HASH_A)] == ["shield.verdict.v1", "shield.verdict.v2"]
+        assert log.find_by_context_hash(HASH_B) == [log.read(legacy), log.read(bare)]
+        assert log.find_by_request_id("req-1") == [v3_2_verdict(1)]
+        assert log.find_by_request_id(envelope["request_id"]) == [envelope]
+        assert log.find_by_request_id("missing") == []
+        assert log.stats() == {"records": 4, "segments": 1, "batches": 4}
+
+
+def test_audit_log_rolls_segments_and_bisects_sealed_indexes(tmp_path: Path) -> None:
+    with small_log(tmp_path) as log:
+        locations = fill(log, 8)
+        fill(log, 2, context_hash=HASH_B)
+        assert [location.segment for location in locations] == [0, 0, 0, 1, 1, 1, 2, 2]
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "00000000.idx", "00000000.seg", "00000001.idx", "00000001.seg", "00000002.idx", "00000002.seg", "00000003.seg"
+        ]
+        assert [record["request_id"] for record in log.find_by_context_hash(HASH_A)] == [f"req-{n}" for n in range(8)]
+        assert log.find_by_request_id("req-4") == [v3_2_verdict(4)]
+        assert [record["request_id"] for record in log.find_by_request_id("req-1")] == ["req-1", "req-1"]
+        assert [location for location, _ in log.records()][:8] == locations
+        assert log.stats()["segments"] == 4
+
+    with small_log(tmp_path) as reopened:
+        assert reopened.stats() == {"records": 10, "segments": 4, "batches": 0}
+        assert len(reopened.find_by_context_hash(HASH_A)) == 8
+        assert reopened.append(v3_2_verdict(9)).result().segment == 3
+        assert len(reopened.find_by_request_id("req-9")) == 1
+
+
+def test_audit_log_batches_concurrent_writers_into_fewer_fsyncs(tmp_path: Path) -> None:
+    with AuditLog(tmp_path, max_batch=64) as log:
+        results: list[AuditRecordLocation] = []
+        lock = threading.Lock()
+
+        def writer(thread: int) -> None:
+            futures = [log.append(v3_2_verdict(thread * 100 + number)) for number in range(50)]
+            with lock:
+                results.extend(future.result() for future in futures)
+
+        threads = [threading.Thread(target=writer, args=(thread,)) for thread in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log.flush()
+        assert len(set(results)) == 400
+        stats = log.stats()
+        assert stats["records"] == 400 and stats["batches"] < 400
+        assert len(log.find_by_context_hash(HASH_A)) == 400
+        assert len(list(log.records())) == 400
+
+
+def test_audit_log_truncates_a_torn_tail_and_rebuilds_missing_or_corrupt_indexes(tmp_path: Path) -> None:
+    with small_log(tmp_path, fsync=False) as log:
+        fill(log, 7)
+    (tmp_path / "00000000.idx").unlink()
+    index = tmp_path / "00000001.idx"
+    index.write_bytes(index.read_bytes()[:-1] + b"\x00")
+    last = tmp_path / "00000002.seg"
+    intact = last.stat().st_size
+    with last.open("ab") as handle:
+        handle.write(b"\x00\x00\x01\x00torn")
+
+    with small_log(tmp_path, fsync=False) as log:
+        assert last.stat().st_size == intact
+        assert (tmp_path / "00000000.idx").exists()
+        assert len(log.find_by_context_hash(HASH_A)) == 7
+        log.append(v3_2_verdict(7)).result()
+        assert [record["request_id"] for _, record in log.records()] == [f"req-{n}" for n in range(8)]
+
+    (tmp_path / "00000000.idx").write_bytes(b"short")
+    with small_log(tmp_path, fsync=False) as log:
+        assert log.stats()["records"] == 8
+
+
+def test_audit_log_restarts_a_segment_torn_inside_its_header(tmp_path: Path) -> None:
+    with small_log(tmp_path) as log:
+        fill(log, 3)
+        fill(log, 1)
+    (tmp_path / "00000001.seg").write_bytes(SEGMENT_MAGIC[:3])
+    with small_log(tmp_path) as log:
+        assert log.stats() == {"records": 3, "segments": 2, "batches": 0}
+        assert log.append(v3_2_verdict(5)).result() == AuditRecordLocation(1, len(SEGMENT_MAGIC))
+
+
+@pytest.mark.parametrize(
+    ("damage", "match"),
+    [
+        (lambda data: data[:-3], "segment 0 is corrupt"),
+        (lambda data: data[:20] + b"\xff" + data[21:], "segment 0 is corrupt"),
+        (lambda data: b"NOTASEG!" + data[8:], "segment 0 has invalid header"),
+    ],
+)
+def test_audit_log_fails_closed_on_corrupt_sealed_segments(tmp_path: Path, damage: Any, match: str) -> None:
+    with small_log(tmp_path) as log:
+        fill(log, 4)
+    segment = tmp_path / "00000000.seg"
+    segment.write_bytes(damage(segment.read_bytes()))
+    (tmp_path / "00000000.idx").unlink()
+    with pytest.raises(ValueError, match=match):
+        small_log(tmp_path)
+
+
+def test_audit_log_requires_contiguous_segments(tmp_path: Path) -> None:
+    (tmp_path / "00000001.seg").write_bytes(SEGMENT_MAGIC)
+    with pytest.raises(ValueError, match="contiguously"):
+        AuditLog(tmp_path)
+
+
+def test_audit_log_read_fails_closed(tmp_path: Path) -> None:
+    with AuditLog(tmp_path, fsync=False) as log:
+        location = log.append(v3_2_verdict(1)).result()
+        with pytest.raises(ValueError, match="out of range"):
+            log.read(AuditRecordLocation(0, location.offset + 10_000))
+        with open(tmp_path / "00000000.seg", "r+b") as handle:
+            os.pwrite(handle.fileno(), b"X", location.offset + 12)
+        with pytest.raises(ValueError, match="corrupt"):
+            log.read(location)
+
+
+@pytest.mark.parametrize(
+    ("options", "match"),
+    [
+        ({"segment_bytes": 16}, "too small"),
+        ({"segment_bytes": 0}, "segment_bytes"),
+        ({"segment_bytes": audit_log.MAX_SEGMENT_BYTES + 1}, "32-bit record offsets"),
+        ({"max_batch": 0}, "max_batch"),
+        ({"queue_size": True}, "queue_size"),
+    ],
+)
+def test_audit_log_rejects_bad_configuration(tmp_path: Path, options: dict[str, Any], match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        AuditLog(tmp_path, **options)
+
+
+def test_audit_log_rejects_bad_records_and_appends_after_close(tmp_path: Path) -> None:
+    log = small_log(tmp_path, records_per_segment=1)
+    for bad in ({"schema_version": "other"}, ["not", "a", "verdict"]):
+        with pytest.raises(ValueError, match="QWGv3Verdict, v3.2 verdict dict, or v4 verdict envelope"):
+            log.append(bad)
+    with pytest.raises(ValueError, match="context_hash must be non-empty"):
+        log.append(QWGv3Verdict("v3", VerdictType.ALLOW, "QWG_OK", ""))
+    with pytest.raises(ValueError, match="request_id must be non-empty"):
+        log.append({**v3_2_verdict(1), "request_id": " "})
+    with pytest.raises(ValueError, match="exceeds segment size"):
+        log.append({**v3_2_verdict(1), "metadata": {"note": "x" * 100}})
+    with pytest.raises(ValueError, match="context_hash must be non-empty"):
+        log.find_by_context_hash("")
+    log.close()
+    log.close()
+    with pytest.raises(ValueError, match="closed"):
+        log.append(v3_2_verdict(1))
+    with pytest.raises(ValueError, match="closed"):
+        log.flush()
+
+
+def test_audit_log_write_failure_fails_pending_and_later_appends(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    log = AuditLog(tmp_path, max_batch=1)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def failing_fsync(descriptor: int) -> None:
+        entered.set()
+        release.wait()
+        raise OSError("disk gone")
+
+    monkeypatch.setattr(audit_log.os, "fsync", failing_fsync)
+    first = log.append(v3_2_verdict(1))
+    entered.wait()
+    second = log.append(v3_2_verdict(2))
+    release.set()
+    for future in (first, second):
+        with pytest.raises(OSError, match="disk gone"):
+            future.result()
+    with pytest.raises(ValueError, match="closed"):
+        log.append(v3_2_verdict(3))
+    log.close()
+
+
+def test_audit_log_lookups_match_any_spelling_before_and_after_reopen(tmp_path: Path) -> None:
+    decomposed = unicodedata.normalize("NFD", "req-café")
+    verdict = {**v3_2_verdict(1), "request_id": decomposed}
+    spellings = ("req-café", decomposed, f" {decomposed} ")
+    with AuditLog(tmp_path) as log:
+        log.append(verdict).result()
+        assert [len(log.find_by_request_id(spelling)) for spelling in spellings] == [1, 1, 1]
+    with AuditLog(tmp_path) as reopened:
+        assert [len(reopened.find_by_request_id(spelling)) for spelling in spellings] == [1, 1, 1]
+        assert reopened.find_by_request_id("req-café") == [verdict]
+
+
+def test_audit_log_close_never_strands_an_append_blocked_on_a_full_queue(tmp_path: Path) -> None:
+    log = AuditLog(tmp_path, queue_size=1, max_batch=1, fsync=False)
+    entered = threading.Event()
+    release = threading.Event()
+    write_batch = log._write_batch
+
+    def stalled_write_batch(batch: Any) -> None:
+        entered.set()
+        release.wait()
+        write_batch(batch)
+
+    log._write_batch = stalled_write_batch  # type: ignore[method-assign]
+    first = log.append(v3_2_verdict(1))
+    entered.wait()
+    log.append(v3_2_verdict(2))
+    outcomes: list[Any] = []
+
+    def late_append() -> None:
+        try:
+            outcomes.append(log.append(v3_2_verdict(3)))
+        except ValueError as exc:
+            outcomes.append(exc)
+
+    appender = threading.Thread(target=late_append, daemon=True)
+    appender.start()
+    appender.join(0.05)
+    closer = threading.Thread(target=log.close, daemon=True)
+    closer.start()
+    closer.join(0.05)
+    release.set()
+    appender.join(5)
+    closer.join(5)
+    assert not appender.is_alive() and not closer.is_alive()
+    assert first.result(timeout=1).offset == len(SEGMENT_MAGIC)
+    assert [future.result(timeout=1).segment for future in outcomes] == [0]
+
+
+def test_audit_log_close_waits_for_lookups_before_unmapping_sealed_indexes(tmp_path: Path) -> None:
+    log = small_log(tmp_path)
+    fill(log, 4)
+    sealed = log._sealed[0]
+    entered = threading.Event()
+    release = threading.Event()
+    offsets = sealed.offsets
+
+    def slow_offsets(key: bytes) -> list[int]:
+        entered.set()
+        release.wait()
+        return offsets(key)
+
+    sealed.offsets = slow_offsets  # type: ignore[method-assign]
+    found: list[list[dict[str, Any]]] = []
+    reader = threading.Thread(target=lambda: found.append(log.find_by_context_hash(HASH_A)))
+    reader.start()
+    entered.wait()
+    closer = threading.Thread(target=log.close)
+    closer.start()
+    closer.join(0.05)
+    assert closer.is_alive()
+    release.set()
+    reader.join()
+    closer.join()
+    assert len(found[0]) == 4
+    with pytest.raises(ValueError, match="closed"):
+        log.find_by_request_id("req-1")
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import runpy
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from qwg.bench.loadgen import (
+    DEFAULT_LOADGEN_POLICIES,
+    LoadProfile,
+    generate_contexts,
+    load_profile,
+    main,
+    run_load,
+)
+from qwg.engine import DecisionEngine
+from qwg.policies import WalletPolicy
+from qwg.risk_context import RiskLevel
+
+ENGINE_REASON_IDS = [
+    "QWG_V3_BEHAVIOUR_OR_DEVICE_RISK",
+    "QWG_V3_CRITICAL_CHAIN_OR_NODE_RISK",
+    "QWG_V3_EXTRA_AUTH_THRESHOLD_EXCEEDED",
+    "QWG_V3_FULL_BALANCE_WIPE_ATTEMPT",
+    "QWG_V3_HEALTHY_ALLOW",
+    "QWG_V3_POLICY_MAX_RISK_EXCEEDED",
+    "QWG_V3_RATIO_EXCEEDS_HIGH_RISK_LIMIT",
+    "QWG_V3_RATIO_EXCEEDS_NORMAL_LIMIT",
+]
+
+
+def test_loadgen_streams_are_seeded() -> None:
+    first = list(generate_contexts(200, seed=4))
+    assert first == list(generate_contexts(200, seed=4))
+    assert first != list(generate_contexts(200, seed=5))
+    assert {ctx.created_at for ctx in first} == {first[0].created_at}
+
+
+def test_loadgen_default_stream_reaches_every_engine_rule() -> None:
+    contexts = list(generate_contexts(2_000, seed=1))
+    report = run_load(contexts)
+    assert list(report["reason_ids"]) == ENGINE_REASON_IDS
+    assert all(count > 0 for count in report["reason_ids"].values())
+
+    engines = [DecisionEngine(policy) for policy in DEFAULT_LOADGEN_POLICIES]
+    expected: dict[str, int] = {}
+    for index, ctx in enumerate(contexts):
+        decision = engines[index % 2].evaluate_transaction(ctx).decision.value
+        expected[decision] = expected.get(decision, 0) + 1
+    assert report["decisions"] == dict(sorted(expected.items()))
+    assert report["target"] == "engine" and report["contexts"] == 2_000
+    assert report["throughput_per_second"] > 0
+    latency = report["latency_ms"]
+    assert latency["samples"] == 2_000 and latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+
+
+def test_loadgen_drives_the_v3_wrapper_and_v4_sign_verify() -> None:
+    contexts = list(generate_contexts(300, seed=2))
+    v3 = run_load(contexts, target="v3")
+    v4 = run_load(contexts, target="v4")
+    assert v3["reason_ids"] == v4["reason_ids"] == run_load(contexts)["reason_ids"]
+    assert v3["decisions"] == v4["decisions"]
+    assert set(v4["decisions"]) == {"allow", "deny", "escalate"}
+    assert v4["target"] == "v4" and v4["latency_ms"]["samples"] == 300
+
+
+def test_loadgen_profiles_shape_the_stream() -> None:
+    profile = LoadProfile(
+        sentinel_levels={"high": 1},
+        adn_levels={"normal": 3, "elevated": 0},
+        balances=[(5_000, 1)],
+        tx_ratios=[(0.2, 0.3, 1)],
+        untrusted_device_rate=1,
+        risky_behaviour_rate=0,
+    )
+    contexts = list(generate_contexts(100, profile=profile))
+    assert {ctx.sentinel_level for ctx in contexts} == {RiskLevel.HIGH}
+    assert {ctx.adn_level for ctx in contexts} == {RiskLevel.NORMAL}
+    assert all(1_000 <= ctx.tx_amount <= 1_500 and not ctx.trusted_device and ctx.behaviour_score < 1.5 for ctx in contexts)
+    report = run_load(contexts, policies=[WalletPolicy()])
+    assert report["reason_ids"] == {"QWG_V3_RATIO_EXCEEDS_HIGH_RISK_LIMIT": 100}
+    empty = run_load([], target="v3")
+    assert empty.pop("seconds") >= 0
+    assert empty == {
+        "target": "v3",
+        "contexts": 0,
+        "throughput_per_second": 0.0,
+        "latency_ms": {"samples": 0},
+        "decisions": {},
+        "reason_ids": {},
+    }
+
+
+@pytest.mark.parametrize(
+    ("overrides", "match"),
+    [
+        ({"sentinel_levels": [("high", 1)]}, "sentinel_levels must be mapping"),
+        ({"adn_levels": {"severe": 1}}, "unsupported adn_levels level: severe"),
+        ({"adn_levels": {"high": 0}}, "adn_levels must have a positive total weight"),
+        ({"adn_levels": {}}, "adn_levels must have a positive total weight"),
+        ({"sentinel_levels": {"high": -1}}, "sentinel_levels weight must be non-negative finite number"),
+        ({"sentinel_levels": {"high": True}}, "sentinel_levels weight must be non-negative finite number"),
+        ({"balances": [(100, 1, 2)]}, "balances entries must be 2-item sequences"),
+        ({"balances": "ab"}, "balances entries must be 2-item sequences"),
+        ({"balances": ["ab"]}, "balances entries must be 2-item sequences"),
+        ({"balances": [(float("inf"), 1)]}, "balance must be non-negative finite number"),
+        ({"tx_ratios": [(0.5, 0.1, 1)]}, "tx_ratio band low must not exceed high"),
+        ({"tx_ratios": [(-0.1, 0.1, 1)]}, "tx_ratio must be non-negative finite number"),
+        ({"untrusted_device_rate": 1.5}, "untrusted_device_rate must be number between 0 and 1"),
+        ({"risky_behaviour_rate": "0.1"}, "risky_behaviour_rate must be number between 0 and 1"),
+    ],
+)
+def test_loadgen_rejects_bad_profiles(overrides: dict[str, Any], match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        LoadProfile(**overrides)
+
+
+def test_loadgen_rejects_bad_arguments() -> None:
+    assert load_profile({"risky_behaviour_rate": 0.5}) == LoadProfile(risky_behaviour_rate=0.5)
+    with pytest.raises(ValueError, match="load profile must be JSON object"):
+        load_profile([])
+    with pytest.raises(ValueError, match="unknown load profile fields: seed"):
+        load_profile({"seed": 1})
+    with pytest.raises(ValueError, match="count must be positive integer"):
+        next(generate_contexts(0))
+    with pytest.raises(ValueError, match="unsupported target: v5"):
+        run_load([], target="v5")
+    for policies in ([], [object()], WalletPolicy()):
+        with pytest.raises(ValueError, match="policies must be non-empty sequence of WalletPolicy"):
+            run_load([], policies=policies)  # type: ignore[arg-type]
+
+
+def test_loadgen_cli_prints_the_report(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    profile = tmp_path / "profile.json"
+    profile.write_text(json.dumps({"sentinel_levels": {"critical": 1}}), encoding="utf-8")
+    assert main(["--count", "50", "--target", "v4", "--profile", str(profile)]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["contexts"] == 50 and report["reason_ids"] == {"QWG_V3_CRITICAL_CHAIN_OR_NODE_RISK": 50}
+
+
+def test_loadgen_cli_rejects_bad_setup(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"balances": []}), encoding="utf-8")
+    for argv, message in (
+        (["--count", "0"], "count must be positive integer"),
+        (["--profile", str(tmp_path / "missing.json")], "No such file"),
+        (["--profile", str(bad)], "balances must have a positive total weight"),
+    ):
+        with pytest.raises(SystemExit) as excinfo:
+            main(argv)
+        assert excinfo.value.code == 2
+        assert message in capsys.readouterr().err
+
+
+def test_loadgen_runs_as_module(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.setattr(sys, "argv", ["qwg.bench.loadgen", "--count", "10", "--seed", "3"])
+    monkeypatch.delitem(sys.modules, "qwg.bench.loadgen")
+    with pytest.raises(SystemExit) as excinfo:
+        runpy.run_module("qwg.bench.loadgen", run_name="__main__")
+    assert excinfo.value.code == 0
+    assert json.loads(capsys.readouterr().out)["contexts"] == 10
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import qwg
+import qwg.v4
+from qwg.engine import DecisionEngine
+from qwg.v4.crypto_verdict import validate_crypto_verdict_envelope
+from qwg.v4.trust_profile_provider import TrustProfileProvider
+
+SOURCE_ROOT = Path(__file__).resolve().parents[1] / "src"
+
+
+def modules_loaded_by(module: str) -> set[str]:
+    environment = {**os.environ, "PYTHONPATH": os.pathsep.join([str(SOURCE_ROOT), os.environ.get("PYTHONPATH", "")])}
+    script = f"import sys; before = set(sys.modules); import {module}; print(*sorted(set(sys.modules) - before))"
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        env=environment,
+        text=True,
+    )
+    return set(completed.stdout.split())
+
+
+def test_import_qwg_is_lazy() -> None:
+    loaded = modules_loaded_by("qwg")
+    assert "qwg" in loaded
+    for heavy in (
+        "qwg.engine",
+        "qwg.risk_context",
+        "qwg.adapters",
+        "qwg.v3.verdict",
+        "qwg.v4.signing",
+        "asyncio",
+        "mmap",
+        "datetime",
+        "dataclasses",
+    ):
+        assert heavy not in loaded
+
+
+def test_v4_validation_import_skips_decision_and_async_stacks() -> None:
+    loaded = modules_loaded_by("qwg.v4.crypto_verdict")
+    assert "qwg.v4.crypto_verdict" in loaded
+    for heavy in ("qwg.engine", "qwg.risk_context", "qwg.v4.nonce_store", "asyncio", "mmap"):
+        assert heavy not in loaded
+
+
+def test_lazy_exports_resolve_to_their_home_modules() -> None:
+    assert qwg.DecisionEngine is DecisionEngine
+    assert qwg.v4.validate_crypto_verdict_envelope is validate_crypto_verdict_envelope
+    assert qwg.v4.TrustProfileProvider is TrustProfileProvider
+    assert set(qwg.__all__) <= set(dir(qwg))
+    assert set(qwg.v4.__all__) <= set(dir(qwg.v4))
+    for package in (qwg, qwg.v4):
+        with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+            package.missing  # noqa: B018
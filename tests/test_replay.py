@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import json
+import random
+import runpy
+import sys
+import warnings
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import qwg.replay as replay
+from qwg.engine import DecisionEngine
+from qwg.policies import WalletPolicy
+from qwg.replay import (
+    iter_snapshot_chunks,
+    load_wallet_policy,
+    main,
+    replay_snapshots,
+    snapshot_to_risk_context,
+)
+from qwg.risk_context import RiskContext, RiskLevel
+
+STRICT = WalletPolicy(max_tx_ratio_normal=0.2, threshold_extra_auth=500.0, max_allowed_risk=RiskLevel.ELEVATED)
+
+
+def recorded_snapshots(count: int, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    levels = list(RiskLevel)
+    engine = DecisionEngine()
+    snapshots = []
+    for _ in range(count):
+        ctx = RiskContext(
+            sentinel_level=rng.choice(levels),
+            dqs_network_score=rng.random(),
+            adn_level=rng.choice(levels[:3]),
+            wallet_balance=rng.choice([0.0, 100.0, 5_000.0, 50_000.0]),
+            tx_amount=rng.uniform(0, 20_000),
+            address_age_days=rng.choice([None, 3, 400]),
+            behaviour_score=rng.uniform(0.5, 2.0),
+            device_id=rng.choice([None, "device-1"]),
+            trusted_device=rng.random() > 0.2,
+        )
+        snapshots.append(engine._build_v3_context(ctx))
+    return snapshots
+
+
+def write_snapshots(path: Path, snapshots: list[Any], *extra: bytes) -> Path:
+    path.write_bytes(b"".join(json.dumps(item).encode("utf-8") + b"\n" for item in snapshots) + b"".join(extra))
+    return path
+
+
+def reference_outcomes(snapshots: list[dict[str, Any]], policies: list[WalletPolicy]) -> Counter[tuple[tuple[str, str], ...]]:
+    outcomes: Counter[tuple[tuple[str, str], ...]] = Counter()
+    for snapshot in snapshots:
+        ctx = snapshot_to_risk_context(snapshot)
+        outcomes[tuple((r.decision.value, r.reason_id or "") for r in (DecisionEngine(p).evaluate_transaction(ctx) for p in policies))] += 1
+    return outcomes
+
+
+def test_replay_snapshot_round_trips_the_v3_context_form() -> None:
+    engine = DecisionEngine()
+    for snapshot in recorded_snapshots(200):
+        ctx = snapshot_to_risk_context(snapshot)
+        assert engine._build_v3_context(ctx) == snapshot
+        assert ctx.created_at == snapshot_to_risk_context(snapshot).created_at
+
+
+def test_replay_summarises_decisions_reason_ids_and_diffs(tmp_path: Path) -> None:
+    snapshots = recorded_snapshots(2_000)
+    path = write_snapshots(tmp_path / "snapshots.ndjson", snapshots)
+    summary = replay_snapshots(path, {"current": WalletPolicy(), "strict": STRICT}, chunk_bytes=4096)
+
+    outcomes = reference_outcomes(snapshots, [WalletPolicy(), STRICT])
+    assert summary["baseline"] == "current"
+    assert (summary["records"], summary["invalid"]) == (2_000, 0)
+    assert "first_invalid" not in summary
+    for position, name in enumerate(("current", "strict")):
+        decisions: Counter[str] = Counter()
+        for outcome, count in outcomes.items():
+            decisions[outcome[position][0]] += count
+        assert summary["policies"][name]["decisions"] == dict(sorted(decisions.items()))
+        assert sum(summary["policies"][name]["reason_ids"].values()) == 2_000
+    changed = sum(count for outcome, count in outcomes.items() if outcome[0] != outcome[1])
+    assert summary["diff"]["strict"]["changed"] == changed > 0
+    assert list(summary["diff"]) == ["strict"]
+    assert summary["diff"]["strict"]["decisions"]["allow -> require_extra_auth"] > 0
+    assert summary["diff"]["strict"]["reason_ids"]["QWG_V3_HEALTHY_ALLOW -> QWG_V3_EXTRA_AUTH_THRESHOLD_EXCEEDED"] > 0
+
+    assert replay_snapshots(path, {"current": WalletPolicy(), "same": WalletPolicy()})["diff"]["same"] == {
+        "changed": 0, "decisions": {}, "reason_ids": {}
+    }
+
+
+def test_replay_is_identical_across_worker_processes(tmp_path: Path) -> None:
+    path = write_snapshots(tmp_path / "snapshots.ndjson", recorded_snapshots(3_000), b"{broken\n")
+    policies = {"current": WalletPolicy(), "strict": STRICT}
+    inline = replay_snapshots(path, policies, chunk_bytes=8192)
+    assert replay_snapshots(path, policies, processes=2, chunk_bytes=8192) == inline
+    assert inline["first_invalid"]["line_number"] == 3_001
+
+
+def test_replay_worker_entry_points_use_initialized_engines(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(replay, "_WORKER_ENGINES", ())
+    replay._worker_initialize((WalletPolicy(), STRICT))
+    line = json.dumps(recorded_snapshots(1)[0]).encode("utf-8")
+    tally = replay._worker_replay_chunk(1, line)
+    assert sum(tally.outcomes.values()) == 1
+    assert len(next(iter(tally.outcomes))) == 2
+
+
+def test_replay_chunks_hold_whole_lines(tmp_path: Path) -> None:
+    path = tmp_path / "snapshots.ndjson"
+    path.write_bytes(b"aaaa\nbb\n\ncccccccc\ndd")
+    chunks = list(iter_snapshot_chunks(path, 3))
+    assert b"".join(chunk for _, chunk in chunks) == path.read_bytes()
+    assert [(first, chunk) for first, chunk in chunks] == [(1, b"aaaa\n"), (2, b"bb\n\n"), (4, b"cccccccc\n"), (5, b"dd")]
+    path.write_bytes(b"")
+    assert list(iter_snapshot_chunks(path, 3)) == []
+
+
+def test_replay_counts_invalid_snapshots_and_reports_the_first(tmp_path: Path) -> None:
+    good = recorded_snapshots(1)[0]
+    invalid: list[tuple[Any, str]] = [
+        ("not-an-object", "snapshot must be dict"),
+        ({**good, "extra": 1}, "fields must match"),
+        ({key: value for key, value in good.items() if key != "device_id"}, "fields must match"),
+        ({**good, "sentinel_level": "severe"}, "unsupported sentinel_level: severe"),
+        ({**good, "tx_amount": True}, "tx_amount must be number"),
+        ({**good, "wallet_balance": "1"}, "wallet_balance must be number"),
+        ({**good, "address_age_days": 1.5}, "address_age_days must be integer or null"),
+        ({**good, "address_age_days": False}, "address_age_days must be integer or null"),
+        ({**good, "device_id": 7}, "device_id must be string or null"),
+        ({**good, "trusted_device": 1}, "trusted_device must be bool"),
+    ]
+    for snapshot, match in invalid:
+        with pytest.raises(ValueError, match=match):
+            snapshot_to_risk_context(snapshot)
+    path = write_snapshots(tmp_path / "snapshots.ndjson", [good, *[item for item, _ in invalid], good], b"\r\n{bad json")
+    summary = replay_snapshots(path, {"current": WalletPolicy()}, chunk_bytes=64)
+    assert (summary["records"], summary["invalid"]) == (2, 11)
+    assert summary["first_invalid"] == {"line_number": 2, "error": "snapshot must be dict"}
+    assert summary["diff"] == {}
+
+
+def test_replay_counts_deeply_nested_lines_as_invalid_instead_of_aborting(tmp_path: Path) -> None:
+    good = recorded_snapshots(1)[0]
+    nested = b"[" * 100_000 + b"]" * 100_000 + b"\n"
+    path = write_snapshots(tmp_path / "snapshots.ndjson", [good], nested, json.dumps(good).encode("utf-8"))
+    summary = replay_snapshots(path, {"current": WalletPolicy()}, chunk_bytes=64)
+    assert (summary["records"], summary["invalid"]) == (2, 1)
+    assert summary["first_invalid"] == {"line_number": 2, "error": "snapshot JSON is nested too deeply"}
+
+
+def test_replay_loads_wallet_policy_overrides() -> None:
+    policy = load_wallet_policy(
+        {"max_allowed_risk": "elevated", "max_tx_ratio_high": 1, "cooldown_seconds_warn": 5, "block_full_balance_tx": False}
+    )
+    assert policy == WalletPolicy(
+        max_allowed_risk=RiskLevel.ELEVATED, max_tx_ratio_high=1.0, cooldown_seconds_warn=5, block_full_balance_tx=False
+    )
+    for overrides, match in (
+        ([], "JSON object"),
+        ({"max_tx_ratio": 0.1, "colour": "red"}, "unknown wallet policy fields: colour, max_tx_ratio"),
+        ({"max_allowed_risk": "extreme"}, "unsupported max_allowed_risk"),
+        ({"max_tx_ratio_normal": "0.5"}, "max_tx_ratio_normal must be number"),
+        ({"cooldown_seconds_delay": 1.5}, "cooldown_seconds_delay must be int"),
+        ({"cooldown_seconds_delay": True}, "cooldown_seconds_delay must be int"),
+        ({"require_trusted_device": 1}, "require_trusted_device must be bool"),
+    ):
+        with pytest.raises(ValueError, match=match):
+            load_wallet_policy(overrides)
+
+
+@pytest.mark.parametrize(
+    ("policies", "options", "match"),
+    [
+        ({}, {}, "non-empty mapping"),
+        ({" ": WalletPolicy()}, {}, "policy name must be non-empty"),
+        ({"current": {"max_tx_ratio_normal": 0.1}}, {}, "policy current must be WalletPolicy"),
+        ({"current": WalletPolicy()}, {"processes": 0}, "processes must be positive"),
+        ({"current": WalletPolicy()}, {"chunk_bytes": 0}, "chunk_bytes must be positive"),
+    ],
+)
+def test_replay_rejects_bad_arguments(tmp_path: Path, policies: dict[str, Any], options: dict[str, Any], match: str) -> None:
+    path = write_snapshots(tmp_path / "snapshots.ndjson", [])
+    with pytest.raises(ValueError, match=match):
+        replay_snapshots(path, policies, **options)
+
+
+def cli_args(tmp_path: Path, *extra: bytes) -> list[str]:
+    strict = tmp_path / "strict.json"
+    strict.write_text(json.dumps({"max_tx_ratio_normal": 0.2, "threshold_extra_auth": 500.0}), encoding="utf-8")
+    path = write_snapshots(tmp_path / "snapshots.ndjson", recorded_snapshots(50), *extra)
+    return [str(path), "--policy", "current", "--policy", f"strict={strict}", "--processes", "1"]
+
+
+def test_replay_cli_prints_summary_and_fails_on_invalid_lines(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(cli_args(tmp_path)) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["records"] == 50 and summary["baseline"] == "current" and "strict" in summary["diff"]
+    assert main([*cli_args(tmp_path, b"[]\n"), "--chunk-mib", "1"]) == 1
+    assert json.loads(capsys.readouterr().out)["invalid"] == 1
+
+
+def test_replay_cli_rejects_bad_setup(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    args = cli_args(tmp_path)
+    for bad_args in (
+        [*args, "--policy", "current"],
+        [*args, "--policy", f"other={tmp_path / 'missing.json'}"],
+        [*args, "--policy", "=x"],
+        [*args, "--chunk-mib", "0"],
+        [str(tmp_path / "missing.ndjson"), *args[1:]],
+    ):
+        with pytest.raises(SystemExit) as excinfo:
+            main(bad_args)
+        assert excinfo.value.code == 2
+    assert "duplicate policy name: current" in capsys.readouterr().err
+
+
+def test_replay_runs_as_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.setattr(sys, "argv", ["replay", *cli_args(tmp_path)])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        with pytest.raises(SystemExit) as excinfo:
+            runpy.run_module("qwg.replay", run_name="__main__")
+    assert excinfo.value.code == 0
+    assert json.loads(capsys.readouterr().out)["records"] == 50
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import runpy
+import signal
+import socket
+import stat
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from qwg.engine import DecisionEngine
+from qwg.replay import snapshot_to_risk_context
+from qwg.serve import DecisionClient, DecisionServer, encode_frame, latency_percentiles, main
+from tests.test_replay import STRICT, recorded_snapshots
+
+
+def expected_result(engine: DecisionEngine, snapshot: dict[str, Any]) -> dict[str, Any]:
+    result = engine.evaluate_transaction(snapshot_to_risk_context(snapshot))
+    expected = {
+        "decision": result.decision.value,
+        "reason": result.reason,
+        "reason_id": result.reason_id,
+        "cooldown_seconds": result.cooldown_seconds,
+        "suggested_limit": result.suggested_limit,
+        "require_confirmation": result.require_confirmation,
+        "require_second_factor": result.require_second_factor,
+    }
+    return {name: value for name, value in expected.items() if value is not None}
+
+
+def expected_verdict(engine: DecisionEngine, snapshot: dict[str, Any]) -> dict[str, Any]:
+    verdict = engine.evaluate_transaction_v3(snapshot_to_risk_context(snapshot))
+    return {
+        "schema_version": "v3",
+        "verdict_type": verdict.verdict_type.value,
+        "reason_id": verdict.reason_id,
+        "context_hash": verdict.context_hash,
+    }
+
+
+def wait_for(condition: Any) -> None:
+    deadline = time.monotonic() + 10
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_serve_answers_pipelined_requests_like_the_engine(tmp_path: Path) -> None:
+    snapshots = recorded_snapshots(300)
+    engine = DecisionEngine(STRICT)
+    path = tmp_path / "qwg.sock"
+    with DecisionServer(path, policy=STRICT) as server, DecisionClient(path, timeout=10) as client:
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        first = client.request({"id": "a", "op": "evaluate", "context": snapshots[0]})
+        assert first == {"id": "a", "result": expected_result(engine, snapshots[0])}
+
+        requests = [
+            {"id": index, "op": ("evaluate", "evaluate_v3")[index % 2], "context": snapshot}
+            for index, snapshot in enumerate(snapshots)
+        ]
+        responses = client.pipeline(requests)
+        assert [response["id"] for response in responses] == list(range(300))
+        for index, (response, snapshot) in enumerate(zip(responses, snapshots, strict=True)):
+            expected = (expected_result, expected_verdict)[index % 2](engine, snapshot)
+            assert response == {"id": index, "result": expected}
+
+        batch = client.request({"op": "evaluate_v3", "contexts": [snapshots[0], {"tx_amount": 1}, snapshots[1]]})
+        assert batch == {
+            "results": [
+                {"index": 0, "valid": True, "result": expected_verdict(engine, snapshots[0])},
+                {"index": 1, "valid": False, "error": "snapshot fields must match the v3 context form"},
+                {"index": 2, "valid": True, "result": expected_verdict(engine, snapshots[1])},
+            ]
+        }
+
+        stats = client.request({"id": None, "op": "stats"})["result"]
+        assert stats["connections"] == 1 and stats["accepted"] == 1
+        assert stats["requests"] == 303 and stats["contexts"] == 303 and stats["errors"] == 1
+        assert stats["batches"] < stats["requests"] and stats["max_batch"] > 1
+        latency = stats["latency_ms"]
+        assert latency["samples"] == 302
+        assert 0 <= latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+        assert server.stats()["latency_ms"]["samples"] == 303
+    assert not path.exists()
+
+
+@pytest.mark.parametrize(
+    ("body", "error"),
+    [
+        (b"{", "Expecting property name"),
+        (b"\xff", "codec can't decode"),
+        (b"[]", "request must be JSON object"),
+        (b'{"id": 1, "op": "evaluate", "extra": 1}', "unknown request fields: extra"),
+        (b'{"id": 1, "op": "sign"}', "unsupported op: sign"),
+        (b'{"id": 1}', "unsupported op: None"),
+        (b'{"id": 1, "op": "stats", "context": {}}', "stats takes no context"),
+        (b'{"id": 1, "op": "evaluate"}', "exactly one of context or contexts"),
+        (b'{"id": 1, "op": "evaluate", "context": {}, "contexts": []}', "exactly one of context or contexts"),
+        (b'{"id": 1, "op": "evaluate", "contexts": []}', "contexts must be non-empty list"),
+        (b'{"id": 1, "op": "evaluate", "contexts": {}}', "contexts must be non-empty list"),
+        (b'{"id": 1, "op": "evaluate", "context": []}', "snapshot must be dict"),
+        (b'{"op": "evaluate", "context": {"tx_amount": NaN}}', "non-finite number not allowed: NaN"),
+        (b'{"op": "evaluate", "context": {"tx_amount": 1e999}}', "non-finite number not allowed: 1e999"),
+        pytest.param(b"[" * 100_000 + b"]" * 100_000, "request JSON is nested too deeply", id="deeply-nested"),
+    ],
+)
+def test_serve_reports_malformed_requests_and_keeps_the_connection(tmp_path: Path, body: bytes, error: str) -> None:
+    path = tmp_path / "qwg.sock"
+    with DecisionServer(path) as server, DecisionClient(path, timeout=10) as client:
+        client._socket.sendall(struct.pack(">I", len(body)) + body)
+        response = client._read_frame()
+        assert error in response.pop("error")
+        assert response == ({"id": 1} if b'"id"' in body else {})
+        assert client.request({"op": "stats"})["result"]["errors"] == 1
+        assert server.stats()["connections"] == 1
+
+
+@pytest.mark.parametrize("length", [0, 65])
+def test_serve_drops_connections_with_bad_frame_lengths(tmp_path: Path, length: int) -> None:
+    path = tmp_path / "qwg.sock"
+    with DecisionServer(path, max_frame_bytes=64) as server, DecisionClient(path, timeout=10) as client:
+        client._socket.sendall(struct.pack(">I", length))
+        assert client._read_frame() == {"error": "frame length must be between 1 and 64 bytes"}
+        with pytest.raises(ConnectionError, match="closed the connection"):
+            client._read_frame()
+        wait_for(lambda: server.stats()["connections"] == 0)
+
+        with DecisionClient(path, timeout=10) as flooding:
+            responses: list[Any] = []
+            with pytest.raises(ConnectionError):
+                responses.extend(flooding.pipeline([{"op": "stats", "pad": "x" * 4096}] * 2048))
+        assert server.stats()["errors"] == 2
+
+
+def test_serve_stops_reading_from_clients_that_stop_reading(tmp_path: Path) -> None:
+    batch = {"op": "evaluate", "contexts": recorded_snapshots(50)}
+    frame = encode_frame(batch)
+    count = 200
+    path = tmp_path / "qwg.sock"
+    with DecisionServer(path) as server, DecisionClient(path, timeout=30) as client:
+        sender = threading.Thread(target=client._socket.sendall, args=(frame * count,))
+        sender.start()
+        wait_for(lambda: server.stats()["write_pauses"] >= 1)
+        responses = [client._read_frame() for _ in range(count)]
+        sender.join()
+        assert all(len(response["results"]) == 50 for response in responses)
+        assert server.stats()["contexts"] == 50 * count
+
+
+def test_serve_client_reports_truncated_frames(tmp_path: Path) -> None:
+    path = tmp_path / "fake.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(os.fspath(path))
+    listener.listen()
+
+    def answer_partially() -> None:
+        connection, _ = listener.accept()
+        connection.recv(4096)
+        connection.sendall(struct.pack(">I", 10) + b"{}")
+        connection.close()
+
+    peer = threading.Thread(target=answer_partially)
+    peer.start()
+    with DecisionClient(path, timeout=10) as client, pytest.raises(ConnectionError, match="closed the connection"):
+        client.request({"op": "stats"})
+    peer.join()
+    listener.close()
+    with pytest.raises(FileNotFoundError):
+        DecisionClient(tmp_path / "missing.sock")
+
+
+def test_serve_rejects_bad_configuration(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="policy must be WalletPolicy"):
+        DecisionServer(tmp_path / "qwg.sock", policy={})  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="max_frame_bytes must be positive integer"):
+        DecisionServer(tmp_path / "qwg.sock", max_frame_bytes=0)
+    with pytest.raises(ValueError, match="latency_window must be positive integer"):
+        DecisionServer(tmp_path / "qwg.sock", latency_window=True)
+    with pytest.raises(FileNotFoundError):
+        DecisionServer(tmp_path / "missing" / "qwg.sock")
+    server = DecisionServer(tmp_path / "qwg.sock")
+    server.close()
+    server.close()
+
+
+def test_serve_binds_owner_only_and_refuses_a_live_socket(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "qwg.sock"
+    previous_umask = os.umask(0)
+    try:
+        server = DecisionServer(path)
+        assert os.umask(0) == 0
+    finally:
+        os.umask(previous_umask)
+    with server:
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        with pytest.raises(ValueError, match="already listening"):
+            DecisionServer(path)
+        with DecisionClient(path, timeout=10) as client:
+            assert "result" in client.request({"op": "stats"})
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(os.fspath(path))
+    stale.close()
+    with DecisionServer(path), DecisionClient(path, timeout=10) as client:
+        assert "result" in client.request({"op": "stats"})
+
+    class FailingLoop(type(asyncio.new_event_loop())):  # type: ignore[misc]
+        async def create_unix_server(self, *args: Any, **kwargs: Any) -> Any:
+            raise OSError("no listener")
+
+    monkeypatch.setattr(asyncio, "new_event_loop", FailingLoop)
+    with pytest.raises(OSError, match="no listener"):
+        DecisionServer(path)
+    assert not path.exists()
+
+
+def test_serve_latency_percentiles_use_nearest_rank() -> None:
+    assert latency_percentiles([]) == {"samples": 0}
+    assert latency_percentiles([3_000_000]) == {"samples": 1, "p50": 3.0, "p95": 3.0, "p99": 3.0, "max": 3.0}
+    summary = latency_percentiles(reversed(range(1_000, 100_001, 1_000)))
+    assert summary == {"samples": 100, "p50": 0.05, "p95": 0.095, "p99": 0.099, "max": 0.1}
+
+
+def run_until_signalled(path: Path, run: Callable[[], Any]) -> Any:
+    def stop_when_serving() -> None:
+        wait_for(path.exists)
+        with DecisionClient(path, timeout=10) as client:
+            response = client.request({"op": "evaluate", "context": recorded_snapshots(1)[0]})
+            assert response["result"]["decision"]
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    stopper = threading.Thread(target=stop_when_serving)
+    stopper.start()
+    try:
+        return run()
+    finally:
+        stopper.join()
+
+
+def test_serve_cli_serves_until_signalled(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "qwg.sock"
+    policy = tmp_path / "policy.json"
+    policy.write_text(json.dumps({"max_allowed_risk": "elevated"}), encoding="utf-8")
+    handler = signal.getsignal(signal.SIGTERM)
+    argv = ["--socket", str(path), "--policy", str(policy), "--latency-window", "5"]
+    assert run_until_signalled(path, lambda: main(argv)) == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["requests"] == 1 and stats["contexts"] == 1 and stats["latency_ms"]["samples"] == 1
+    assert signal.getsignal(signal.SIGTERM) is handler
+    assert not path.exists()
+
+
+def test_serve_cli_rejects_bad_setup(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    for argv, message in (
+        (["--socket", str(tmp_path / "qwg.sock"), "--policy", str(tmp_path / "missing.json")], "No such file"),
+        (["--socket", str(tmp_path / "qwg.sock"), "--max-frame-bytes", "0"], "max_frame_bytes"),
+        (["--socket", str(tmp_path / "missing" / "qwg.sock")], "No such file"),
+    ):
+        with pytest.raises(SystemExit) as excinfo:
+            main(argv)
+        assert excinfo.value.code == 2
+        assert message in capsys.readouterr().err
+    assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+
+
+def test_serve_runs_as_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "qwg.sock"
+    monkeypatch.setattr(sys, "argv", ["qwg.serve", "--socket", str(path)])
+    monkeypatch.delitem(sys.modules, "qwg.serve")
+    with pytest.raises(SystemExit) as excinfo:
+        run_until_signalled(path, lambda: runpy.run_module("qwg.serve", run_name="__main__"))
+    assert excinfo.value.code == 0
+    assert json.loads(capsys.readouterr().out)["requests"] == 1
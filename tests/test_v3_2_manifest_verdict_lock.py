@@ -9,8 +9,11 @@ from qwg.v3.v3_2_lock import (
     SUPPORTED_REASON_IDS,
     build_manifest,
     build_verdict,
+    cached_manifest,
+    canonical_json,
     canonical_sha256,
     validate_verdict,
+    validate_verdicts,
 )
 
 HASH_A = "a" * 64
@@ -29,6 +32,19 @@ def test_v3_2_manifest_declares_boundary_and_registries():
     assert "Orchestrator receipt" in manifest["adamantineos_visibility"]
 
 
+def test_v3_2_cached_manifest_matches_a_fresh_build():
+    cached = cached_manifest()
+    assert cached is cached_manifest()
+    assert cached.sha256 == canonical_sha256(build_manifest())
+    assert cached.canonical_bytes == canonical_json(build_manifest()).encode("utf-8")
+    assert cached.to_dict() == build_manifest()
+    assert cached.manifest["supported_reason_ids"] == SUPPORTED_REASON_IDS
+    with pytest.raises(TypeError):
+        cached.manifest["component_id"] = "other"  # type: ignore[index]
+    cached.to_dict()["supported_decisions"].append("MAYBE")
+    assert cached.to_dict() == build_manifest()
+
+
 def test_v3_2_verdict_is_canonical_and_deterministic():
     verdict = build_verdict(
         request_id="req-1",
@@ -91,3 +107,36 @@ def test_v3_2_builder_negative_paths_fail_closed():
         validate_verdict(build_verdict(request_id="req", context_hash=HASH_A, decision="ALLOW", reason_ids=(SUPPORTED_REASON_IDS[0],), evidence_hash=HASH_B, evidence_families=(SUPPORTED_EVIDENCE_FAMILIES[0],)), expected_context_hash=HASH_B)
     with pytest.raises(ValueError):
         canonical_sha256("bad")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["0x" + "a" * 62, " " + "a" * 63, " " + "a" * 62 + " ", "+" + "a" * 63, "-" + "a" * 63, "a_" + "a" * 62, "\u0663" * 64],
+)
+def test_v3_2_hash_check_accepts_only_hex_digits(value):
+    with pytest.raises(ValueError, match="context_hash must be sha256 hex"):
+        build_verdict(request_id="req", context_hash=value, decision="ALLOW", reason_ids=(SUPPORTED_REASON_IDS[0],), evidence_hash=HASH_B, evidence_families=(SUPPORTED_EVIDENCE_FAMILIES[0],))
+    verdict = build_verdict(request_id="req", context_hash="A" * 64, decision="ALLOW", reason_ids=(SUPPORTED_REASON_IDS[0],), evidence_hash=HASH_B, evidence_families=(SUPPORTED_EVIDENCE_FAMILIES[0],))
+    assert verdict["context_hash"] == HASH_A
+    with pytest.raises(ValueError, match="unsupported decision"):
+        build_verdict(request_id="req", context_hash=HASH_A, decision=["ALLOW"], reason_ids=(SUPPORTED_REASON_IDS[0],), evidence_hash=HASH_B, evidence_families=(SUPPORTED_EVIDENCE_FAMILIES[0],))  # type: ignore[arg-type]
+
+
+def test_v3_2_validate_verdicts_reports_each_item():
+    good = build_verdict(request_id="req-1", context_hash=HASH_A, decision="ALLOW", reason_ids=(SUPPORTED_REASON_IDS[0],), evidence_hash=HASH_B, evidence_families=list(SUPPORTED_EVIDENCE_FAMILIES))
+    wrong_context = dict(good, context_hash=HASH_B)
+    unknown_reason = dict(good, reason_ids=["UNKNOWN_REASON"])
+    results = list(validate_verdicts(iter([good, "bad", wrong_context, unknown_reason, good]), expected_context_hash=HASH_A))
+    assert results == [
+        {"index": 0, "valid": True, "verdict": good},
+        {"index": 1, "valid": False, "error": "verdict must be dict"},
+        {"index": 2, "valid": False, "error": "context_hash mismatch"},
+        {"index": 3, "valid": False, "error": "unknown reason_ids: UNKNOWN_REASON"},
+        {"index": 4, "valid": True, "verdict": good},
+    ]
+    assert [result["valid"] for result in validate_verdicts([good, wrong_context])] == [True, True]
+    with pytest.raises(ValueError, match="expected_context_hash must be sha256 hex"):
+        validate_verdicts([good], expected_context_hash="z" * 64)
+    with pytest.raises(ValueError, match="expected_context_hash must be sha256 hex"):
+        validate_verdicts([], expected_context_hash="z" * 64)
+    assert list(validate_verdicts([], expected_context_hash=HASH_A)) == []
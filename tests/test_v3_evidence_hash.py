@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+import qwg.v3.evidence as evidence_module
+from qwg.v3.evidence import (
+    EVIDENCE_LEAF_PREFIX,
+    EVIDENCE_NODE_PREFIX,
+    EvidenceAccumulator,
+    combine_evidence_digests,
+    compute_evidence_hash,
+)
+from qwg.v3.v3_2_lock import SUPPORTED_REASON_IDS, build_verdict, canonical_json
+from qwg.v4.crypto_verdict import build_unsigned_crypto_verdict_payload
+
+EVIDENCE = {
+    "wallet_posture": {"address_type": "p2wpkh", "reused_addresses": 3},
+    "key_age_context": {"oldest_key_days": 900, "rotations": []},
+    "dormancy_context": {"dormant_days": 400, "flags": [True, False]},
+    "quantum_risk_context": {"exposed_public_keys": 2, "score_bp": 1250},
+}
+
+
+def leaf(family: str, evidence: dict) -> bytes:
+    return hashlib.sha256(EVIDENCE_LEAF_PREFIX + family.encode() + b"\n" + canonical_json(evidence).encode()).digest()
+
+
+def node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(EVIDENCE_NODE_PREFIX + left + right).digest()
+
+
+def test_v3_evidence_hash_is_a_merkle_root_over_sorted_families() -> None:
+    dormancy, key_age, quantum, wallet = (leaf(family, EVIDENCE[family]) for family in sorted(EVIDENCE))
+    expected = node(node(dormancy, key_age), node(quantum, wallet)).hex()
+    assert compute_evidence_hash(EVIDENCE) == expected
+    assert compute_evidence_hash(dict(reversed(list(EVIDENCE.items())))) == expected
+    assert compute_evidence_hash({"wallet_posture": EVIDENCE["wallet_posture"]}) == wallet.hex()
+    three = {family: EVIDENCE[family] for family in ("dormancy_context", "key_age_context", "wallet_posture")}
+    assert compute_evidence_hash(three) == node(node(dormancy, key_age), wallet).hex()
+    assert combine_evidence_digests([dormancy, key_age, wallet]) != combine_evidence_digests(
+        [dormancy, key_age, wallet, wallet]
+    )
+
+
+def test_v3_evidence_accumulator_rehashes_only_changed_families() -> None:
+    accumulator = EvidenceAccumulator()
+    for family, evidence in EVIDENCE.items():
+        assert accumulator.update(family, evidence) is True
+    first = accumulator.evidence_hash()
+    assert accumulator.evidence_hash() is first
+    assert accumulator.update("wallet_posture", {"reused_addresses": 3, "address_type": "p2wpkh"}) is False
+    assert accumulator.update("key_age_context", {"oldest_key_days": 900, "rotations": ()}) is False
+    assert accumulator.evidence_hash() is first
+    assert accumulator.stats() == {"families": 4, "family_hashes": 4, "cache_hits": 2}
+
+    assert accumulator.update("dormancy_context", {"dormant_days": 400, "flags": [1, 0]}) is True
+    changed = accumulator.evidence_hash()
+    assert changed != first
+    assert accumulator.family_digest("dormancy_context") == leaf("dormancy_context", {"dormant_days": 400, "flags": [1, 0]}).hex()
+    assert accumulator.stats() == {"families": 4, "family_hashes": 5, "cache_hits": 2}
+    assert accumulator.update("dormancy_context", EVIDENCE["dormancy_context"]) is True
+    assert accumulator.evidence_hash() == first
+
+    accumulator.remove("quantum_risk_context")
+    assert accumulator.families() == ["dormancy_context", "key_age_context", "wallet_posture"]
+    assert accumulator.evidence_hash() == compute_evidence_hash(
+        {family: EVIDENCE[family] for family in accumulator.families()}
+    )
+
+
+def test_v3_evidence_accumulator_skips_repeated_versions_without_serializing(monkeypatch: pytest.MonkeyPatch) -> None:
+    accumulator = EvidenceAccumulator()
+    dormancy = dict(EVIDENCE["dormancy_context"])
+    assert accumulator.update("dormancy_context", dormancy, version=1) is True
+    first = accumulator.evidence_hash()
+
+    def no_serializing(*args: object, **kwargs: object) -> str:
+        raise AssertionError("unchanged version must not be serialized")
+
+    monkeypatch.setattr(evidence_module.json, "dumps", no_serializing)
+    dormancy["dormant_days"] = 0
+    assert accumulator.update("dormancy_context", dormancy, version=1) is False
+    assert accumulator.evidence_hash() is first
+    monkeypatch.undo()
+
+    assert accumulator.update("dormancy_context", dormancy, version=2) is True
+    assert accumulator.update("dormancy_context", dict(dormancy), version=3) is False
+    assert accumulator.stats() == {"families": 1, "family_hashes": 2, "cache_hits": 2}
+    assert accumulator.update("dormancy_context", EVIDENCE["dormancy_context"]) is True
+    assert accumulator.update("dormancy_context", dormancy, version=3) is True
+    accumulator.remove("dormancy_context")
+    assert accumulator.update("dormancy_context", EVIDENCE["dormancy_context"], version=3) is True
+    assert accumulator.evidence_hash() == first
+
+
+def test_v3_evidence_accumulator_feeds_v3_and_v4_verdict_builders() -> None:
+    accumulator = EvidenceAccumulator()
+    for family, evidence in EVIDENCE.items():
+        accumulator.update(family, evidence)
+    arguments = {
+        "request_id": "req-evidence",
+        "context_hash": "a" * 64,
+        "decision": "ALLOW",
+        "reason_ids": (SUPPORTED_REASON_IDS[0],),
+        "evidence_hash": accumulator.evidence_hash(),
+        "evidence_families": accumulator.families(),
+    }
+    verdict = build_verdict(**arguments)
+    assert verdict["evidence_families"] == accumulator.families()
+    payload = build_unsigned_crypto_verdict_payload(
+        **arguments,
+        freshness_nonce="nonce-evidence",
+        not_before="2026-06-21T00:00:00Z",
+        not_after="2026-06-21T00:05:00Z",
+        key_registry_version=1,
+    )
+    assert payload["evidence_hash"] == verdict["evidence_hash"]
+
+
+def test_v3_evidence_accumulator_fails_closed() -> None:
+    accumulator = EvidenceAccumulator()
+    with pytest.raises(ValueError, match="at least one family"):
+        accumulator.evidence_hash()
+    for family in ("unknown_family", None):
+        with pytest.raises(ValueError, match="unknown evidence_families"):
+            accumulator.update(family, {})  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="evidence must be dict"):
+        accumulator.update("wallet_posture", [])  # type: ignore[arg-type]
+    for value in (float("nan"), float("inf"), -float("inf")):
+        with pytest.raises(ValueError, match="evidence is not canonical JSON: Out of range float"):
+            accumulator.update("wallet_posture", {"score": [value]}, version=1)
+    assert accumulator.stats() == {"families": 0, "family_hashes": 0, "cache_hits": 0}
+    for method in (accumulator.remove, accumulator.family_digest):
+        with pytest.raises(ValueError, match="evidence family not present: wallet_posture"):
+            method("wallet_posture")
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from qwg.v4.real_crypto_backend import (
+    ExecutorAsyncRealCryptoBackend,
+    QwgV4RealCryptoBackendError,
+    QwgV4RealCryptoBackendUnavailable,
+    QwgV4RealCryptoMaterialError,
+    encode_binary_signature_material,
+    make_async_real_crypto_signature_verifier,
+    make_real_crypto_signature_verifier,
+    verify_signature_entry_with_async_backend,
+)
+from qwg.v4.signing import (
+    build_signature_bundle,
+    verify_signature_bundle,
+    verify_signature_bundle_async,
+)
+from qwg.v4.trust_profile import REQUIRED_ALGORITHMS
+from tests.test_v4_real_crypto_backend_contract import (
+    PAYLOAD_HASH,
+    FakeRealBackend,
+    HierarchyVerifyFailureBackend,
+    NativeBackendError,
+    NonBoolVerifyBackend,
+    real_key,
+    signature_for_key,
+)
+
+VERIFY_WINDOW = {
+    "verification_time": "2026-06-21T00:03:00Z",
+    "artifact_not_before": "2026-06-21T00:01:00Z",
+    "artifact_not_after": "2026-06-21T00:02:00Z",
+}
+
+
+class NativeAsyncBackend:
+    backend_name = "native-async-backend"
+    backend_version = "test-vector-only"
+    supported_algorithms = ("classical-ed25519", "ml-dsa", "fn-dsa")
+
+    def __init__(self, *, delay: float = 0.0, result: object = None, error: Exception | None = None) -> None:
+        self.delay = delay
+        self.result = result
+        self.error = error
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.cancelled = 0
+        self._sync = FakeRealBackend()
+
+    async def sign_message(self, *, algorithm: str, private_key_reference: str, message: bytes) -> str:
+        return self._sync.sign_message(algorithm=algorithm, private_key_reference=private_key_reference, message=message)
+
+    async def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> Any:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        if self.error is not None:
+            raise self.error
+        if self.result is not None:
+            return self.result
+        return self._sync.verify_signature(algorithm=algorithm, public_key=public_key, message=message, signature=signature)
+
+
+class BlockingBackend(FakeRealBackend):
+    release = threading.Event()
+
+    def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> bool:
+        self.release.wait(5)
+        return super().verify_signature(algorithm=algorithm, public_key=public_key, message=message, signature=signature)
+
+
+def trust_profile() -> dict[str, Any]:
+    return {
+        "schema_version": "shield.key_registry.v1",
+        "registry_version": 1,
+        "entries": [real_key(algorithm=algorithm) for algorithm in REQUIRED_ALGORITHMS],
+    }
+
+
+def signed_bundle() -> dict[str, Any]:
+    return build_signature_bundle(signatures=[signature_for_key(real_key(algorithm=algorithm)) for algorithm in REQUIRED_ALGORITHMS])
+
+
+def verify_bundle_async(bundle: dict[str, Any], verifier: Any) -> dict[str, Any]:
+    return asyncio.run(
+        verify_signature_bundle_async(
+            bundle,
+            expected_signed_payload_hash=PAYLOAD_HASH,
+            trust_profile=trust_profile(),
+            verifier=verifier,
+            **VERIFY_WINDOW,
+        )
+    )
+
+
+def test_v4_async_bundle_verification_matches_sync_summary() -> None:
+    backend = FakeRealBackend()
+    expected = verify_signature_bundle(
+        signed_bundle(),
+        expected_signed_payload_hash=PAYLOAD_HASH,
+        trust_profile=trust_profile(),
+        verifier=make_real_crypto_signature_verifier(backend),
+        **VERIFY_WINDOW,
+    )
+
+    executor_backend = ExecutorAsyncRealCryptoBackend(backend)
+    assert verify_bundle_async(signed_bundle(), make_async_real_crypto_signature_verifier(executor_backend)) == expected
+    assert verify_bundle_async(signed_bundle(), make_async_real_crypto_signature_verifier(NativeAsyncBackend())) == expected
+    assert (executor_backend.backend_name, executor_backend.backend_version) == ("fake-real-backend", "test-vector-only")
+    assert executor_backend.supported_algorithms == backend.supported_algorithms
+
+    tampered = signed_bundle()
+    tampered["signatures"][1]["signature"] = encode_binary_signature_material(b"wrong-signature", field="signature")
+    with pytest.raises(ValueError, match="signature verification failed"):
+        verify_bundle_async(tampered, make_async_real_crypto_signature_verifier(executor_backend))
+
+
+def test_v4_async_bundle_verification_fails_closed_on_verifier_errors_and_non_bool() -> None:
+    with pytest.raises(ValueError, match="signature verifier failed closed") as error:
+        verify_bundle_async(signed_bundle(), make_async_real_crypto_signature_verifier(NativeAsyncBackend(error=NativeBackendError("boom"))))
+    assert isinstance(error.value.__cause__, QwgV4RealCryptoBackendError)
+    assert isinstance(error.value.__cause__.__cause__, NativeBackendError)
+
+    async def non_bool_verifier(entry: dict[str, Any], key: dict[str, Any]) -> object:
+        return "yes"
+
+    with pytest.raises(ValueError, match="signature verifier must return bool"):
+        verify_bundle_async(signed_bundle(), non_bool_verifier)
+
+    with pytest.raises(ValueError, match="signature policy requirements not satisfied"):
+        verify_bundle_async(build_signature_bundle(signatures=[signature_for_key(real_key())]), non_bool_verifier)
+
+
+def test_v4_async_backend_verify_fails_closed_like_the_sync_adapter() -> None:
+    key = real_key()
+    entry = signature_for_key(key)
+
+    async def verify(backend: Any, **kwargs: Any) -> bool:
+        return await verify_signature_entry_with_async_backend(entry, key, backend=backend, **kwargs)
+
+    assert asyncio.run(verify(ExecutorAsyncRealCryptoBackend(FakeRealBackend()))) is True
+    with pytest.raises(QwgV4RealCryptoBackendError, match="verify failed closed"):
+        asyncio.run(verify(ExecutorAsyncRealCryptoBackend(FakeRealBackend(fail_verify=True))))
+    with pytest.raises(QwgV4RealCryptoBackendError, match="verify failed closed"):
+        asyncio.run(verify(NativeAsyncBackend(error=NativeBackendError("boom"))))
+    with pytest.raises(QwgV4RealCryptoBackendError, match="verify must return bool"):
+        asyncio.run(verify(ExecutorAsyncRealCryptoBackend(NonBoolVerifyBackend())))
+    with pytest.raises(QwgV4RealCryptoBackendError, match="verify must return bool"):
+        asyncio.run(verify(NativeAsyncBackend(result="yes")))
+    with pytest.raises(QwgV4RealCryptoBackendUnavailable, match="hierarchy verify failure"):
+        asyncio.run(verify(ExecutorAsyncRealCryptoBackend(HierarchyVerifyFailureBackend())))
+    with pytest.raises(QwgV4RealCryptoMaterialError, match="test-only"):
+        asyncio.run(
+            verify_signature_entry_with_async_backend(
+                entry,
+                real_key(public_key="TEST-ONLY-PUBLIC-shield_component_qwg-ml-dsa-v1"),
+                backend=NativeAsyncBackend(),
+            )
+        )
+
+
+def test_v4_async_backend_sign_offloads_to_the_configured_executor() -> None:
+    backend = FakeRealBackend()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="qwg-test-async-backend") as executor:
+        async_backend = ExecutorAsyncRealCryptoBackend(backend, executor=executor, timeout_seconds=5)
+        signature = asyncio.run(
+            async_backend.sign_message(algorithm="ml-dsa", private_key_reference="hsm://qwg/ml-dsa/v1", message=b"message")
+        )
+    assert signature == backend.sign_message(algorithm="ml-dsa", private_key_reference="hsm://qwg/ml-dsa/v1", message=b"message")
+    assert async_backend.timeout_seconds == 5.0
+
+    with pytest.raises(QwgV4RealCryptoBackendError, match="sign failed closed"):
+        asyncio.run(
+            ExecutorAsyncRealCryptoBackend(FakeRealBackend(fail_sign=True)).sign_message(
+                algorithm="ml-dsa", private_key_reference="hsm://qwg/ml-dsa/v1", message=b"message"
+            )
+        )
+
+
+def test_v4_async_verification_times_out_failed_closed() -> None:
+    key = real_key()
+    entry = signature_for_key(key)
+    BlockingBackend.release.clear()
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            slow_backend = ExecutorAsyncRealCryptoBackend(BlockingBackend(), executor=executor, timeout_seconds=0.01)
+            with pytest.raises(QwgV4RealCryptoBackendError, match="verify timed out failed closed"):
+                asyncio.run(slow_backend.verify_signature(algorithm="ml-dsa", public_key=key["public_key"], message=b"m", signature="b64u:AA"))
+            BlockingBackend.release.set()
+    finally:
+        BlockingBackend.release.set()
+
+    with pytest.raises(QwgV4RealCryptoBackendError, match="verify timed out failed closed"):
+        asyncio.run(verify_signature_entry_with_async_backend(entry, key, backend=NativeAsyncBackend(delay=5), timeout_seconds=0.01))
+    with pytest.raises(ValueError, match="signature verifier failed closed") as error:
+        verify_bundle_async(signed_bundle(), make_async_real_crypto_signature_verifier(NativeAsyncBackend(delay=5), timeout_seconds=0.01))
+    assert "timed out" in str(error.value.__cause__)
+
+
+def test_v4_async_bundle_verification_propagates_cancellation() -> None:
+    backend = NativeAsyncBackend(delay=5)
+
+    async def cancel_mid_flight() -> None:
+        task = asyncio.create_task(
+            verify_signature_bundle_async(
+                signed_bundle(),
+                expected_signed_payload_hash=PAYLOAD_HASH,
+                trust_profile=trust_profile(),
+                verifier=make_async_real_crypto_signature_verifier(backend),
+                **VERIFY_WINDOW,
+            )
+        )
+        while backend.in_flight < len(REQUIRED_ALGORITHMS):
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_mid_flight())
+    assert backend.cancelled == len(REQUIRED_ALGORITHMS)
+    assert backend.in_flight == 0
+
+    async def cancelled_verifier(entry: dict[str, Any], key: dict[str, Any]) -> bool:
+        raise asyncio.CancelledError
+
+    with pytest.raises(asyncio.CancelledError):
+        verify_bundle_async(signed_bundle(), cancelled_verifier)
+
+
+def test_v4_async_verification_sustains_thousands_in_flight() -> None:
+    backend = NativeAsyncBackend(delay=0.01)
+    verifier = make_async_real_crypto_signature_verifier(backend, timeout_seconds=30)
+    bundle = signed_bundle()
+    profile = trust_profile()
+
+    async def verify_many(count: int) -> list[dict[str, Any]]:
+        return await asyncio.gather(
+            *(
+                verify_signature_bundle_async(
+                    bundle,
+                    expected_signed_payload_hash=PAYLOAD_HASH,
+                    trust_profile=profile,
+                    verifier=verifier,
+                    **VERIFY_WINDOW,
+                )
+                for _ in range(count)
+            )
+        )
+
+    summaries = asyncio.run(verify_many(1_500))
+    assert len(summaries) == 1_500
+    assert all(summary["verified_algorithms"] == list(REQUIRED_ALGORITHMS) for summary in summaries)
+    assert backend.peak_in_flight == 1_500 * len(REQUIRED_ALGORITHMS)
+
+
+@pytest.mark.parametrize("timeout_seconds", [0, -1, float("inf"), float("nan"), True, "1"])
+def test_v4_async_backend_rejects_invalid_timeouts(timeout_seconds: object) -> None:
+    with pytest.raises(QwgV4RealCryptoBackendError, match="timeout_seconds must be positive finite number"):
+        ExecutorAsyncRealCryptoBackend(FakeRealBackend(), timeout_seconds=timeout_seconds)  # type: ignore[arg-type]
+    with pytest.raises(QwgV4RealCryptoBackendError, match="timeout_seconds must be positive finite number"):
+        make_async_real_crypto_signature_verifier(NativeAsyncBackend(), timeout_seconds=timeout_seconds)  # type: ignore[arg-type]
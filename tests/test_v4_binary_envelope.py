@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import copy
+import json
+import random
+from typing import Any
+
+import pytest
+
+from qwg.v4.binary_envelope import (
+    BINARY_ENVELOPE_MAGIC,
+    binary_envelope_to_canonical_json,
+    decode_binary_crypto_verdict_envelope,
+    encode_binary_crypto_verdict_envelope,
+)
+from qwg.v4.crypto_verdict import REQUIRED_UNSIGNED_VERDICT_FIELDS, validate_crypto_verdict_envelope
+from qwg.v4.real_crypto_backend import encode_binary_signature_material
+from qwg.v4.signing import (
+    CanonicalBudget,
+    signed_payload_hash,
+    to_canonical_json,
+    verify_test_only_signature,
+)
+from qwg.v4.trust_profile import CLASSICAL_ED25519, FN_DSA, ML_DSA, build_test_trust_profile
+from tests.test_v4_crypto_verdict_contract import HASH_A, VERIFY_AT, signed_verdict
+
+
+def real_sized_verdict() -> dict[str, Any]:
+    rng = random.Random(36)
+    verdict = signed_verdict(algorithms=(CLASSICAL_ED25519, ML_DSA, FN_DSA))
+    sizes = {CLASSICAL_ED25519: 64, ML_DSA: 3309, FN_DSA: 1280}
+    for entry in verdict["signature_bundle"]["signatures"]:
+        entry["signature"] = encode_binary_signature_material(rng.randbytes(sizes[entry["algorithm"]]), field="signature")
+    return verdict
+
+
+def canonical(envelope: dict[str, Any]) -> dict[str, Any]:
+    return json.loads(to_canonical_json(envelope))
+
+
+def envelope_with(metadata: Any) -> dict[str, Any]:
+    verdict = signed_verdict()
+    verdict["metadata"] = metadata
+    return verdict
+
+
+def test_v4_binary_envelope_round_trips_to_the_canonical_json_form() -> None:
+    for verdict in (signed_verdict(), real_sized_verdict()):
+        encoded = encode_binary_crypto_verdict_envelope(verdict)
+        decoded = decode_binary_crypto_verdict_envelope(encoded)
+        assert decoded == canonical(verdict)
+        assert binary_envelope_to_canonical_json(encoded) == to_canonical_json(verdict)
+        unsigned = {field: decoded[field] for field in REQUIRED_UNSIGNED_VERDICT_FIELDS}
+        assert signed_payload_hash(payload=unsigned) == verdict["signed_payload_hash"]
+        assert encode_binary_crypto_verdict_envelope(decoded) == encoded
+
+    real_verdict = real_sized_verdict()
+    assert len(encode_binary_crypto_verdict_envelope(real_verdict)) < 0.8 * len(to_canonical_json(real_verdict).encode())
+
+
+def test_v4_binary_envelope_decoded_form_still_validates() -> None:
+    verdict = signed_verdict(algorithms=(CLASSICAL_ED25519, ML_DSA, FN_DSA))
+    decoded = decode_binary_crypto_verdict_envelope(encode_binary_crypto_verdict_envelope(verdict))
+    checked = validate_crypto_verdict_envelope(
+        decoded,
+        expected_context_hash=HASH_A,
+        trust_profile=build_test_trust_profile(),
+        verification_time=VERIFY_AT,
+        verifier=verify_test_only_signature,
+    )
+    assert checked["signed_payload_hash"] == verdict["signed_payload_hash"]
+
+
+def test_v4_binary_envelope_is_deterministic_and_normalizes_like_canonical_json() -> None:
+    metadata = {
+        "zeta": [1, -1, 23, 24, 255, 256, 65_535, 65_536, 2**32, 2**64 - 1, -(2**64)],
+        "cafe\u0301": "e\u0301",
+        "alpha": ("tuple", True, False),
+        "hex-ish": "A" * 64,
+        "short-hex": "ab" * 16,
+        "b64u-padded": "b64u:AA==",
+        "b64u-loose": "b64u:AB",
+        "b64u-bad": "b64u:*",
+        "b64u-good": "b64u:AA",
+    }
+    reordered = dict(reversed(list(metadata.items())))
+    encoded = encode_binary_crypto_verdict_envelope(envelope_with(metadata))
+    assert encoded == encode_binary_crypto_verdict_envelope(envelope_with(reordered))
+    assert decode_binary_crypto_verdict_envelope(encoded) == canonical(envelope_with(metadata))
+
+
+def random_json_value(rng: random.Random, depth: int) -> Any:
+    choice = rng.randrange(8 if depth < 4 else 5)
+    if choice == 0:
+        return rng.randint(-(2**64), 2**64 - 1)
+    if choice == 1:
+        return rng.random() < 0.5
+    if choice == 2:
+        return "".join(rng.choice("ab\u00e9e\u0301\u212b\U0001f600-_:=") for _ in range(rng.randrange(6)))
+    if choice == 3:
+        return rng.choice([rng.randbytes(32).hex(), encode_binary_signature_material(rng.randbytes(rng.randint(1, 40)))])
+    if choice == 4:
+        return "b64u:" + "".join(rng.choice("AZaz09-_=") for _ in range(rng.randrange(1, 6)))
+    if choice in (5, 6):
+        return {f"k{rng.randrange(50)}": random_json_value(rng, depth + 1) for _ in range(rng.randrange(4))}
+    return [random_json_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+
+
+def test_v4_binary_envelope_fuzzed_metadata_round_trips() -> None:
+    rng = random.Random(360)
+    for _ in range(300):
+        verdict = envelope_with({"fuzz": random_json_value(rng, 0)})
+        encoded = encode_binary_crypto_verdict_envelope(verdict)
+        assert decode_binary_crypto_verdict_envelope(encoded) == canonical(verdict)
+        assert binary_envelope_to_canonical_json(encoded) == to_canonical_json(verdict)
+
+
+@pytest.mark.parametrize(
+    ("metadata", "match"),
+    [
+        ({"big": 2**64}, "out of binary envelope range"),
+        ({"small": -(2**64) - 1}, "out of binary envelope range"),
+        ({"absent": None}, "must omit absent fields"),
+        ({"ratio": 0.5}, "must not contain floats"),
+        ({"nested": [1, {"ratio": 0.5}]}, r"^\$\.metadata\.nested\[1\]\.ratio must not contain floats$"),
+        ({"raw": b"bytes"}, "unsupported type bytes"),
+        ({1: "key"}, "object keys must be strings"),
+        ({"e\u0301": 1, "\u00e9": 2}, "duplicate key after Unicode normalization"),
+    ],
+)
+def test_v4_binary_envelope_encoder_rejects_non_canonical_values(metadata: dict[Any, Any], match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        encode_binary_crypto_verdict_envelope(envelope_with(metadata))
+
+
+def test_v4_binary_envelope_encoder_enforces_schema_and_budget() -> None:
+    with pytest.raises(ValueError, match="fields must match required schema"):
+        encode_binary_crypto_verdict_envelope({"metadata": {}})
+    with pytest.raises(ValueError, match="fields must match required schema"):
+        encode_binary_crypto_verdict_envelope([])  # type: ignore[arg-type]
+    deep: dict[str, Any] = {}
+    cursor = deep
+    for _ in range(5):
+        cursor["next"] = {}
+        cursor = cursor["next"]
+    with pytest.raises(ValueError, match="nesting depth budget"):
+        encode_binary_crypto_verdict_envelope(envelope_with(deep), budget=CanonicalBudget(max_depth=4))
+    with pytest.raises(ValueError, match="size budget"):
+        encode_binary_crypto_verdict_envelope(envelope_with({"items": list(range(100))}), budget=CanonicalBudget(max_nodes=50))
+
+
+def mutate(encoded: bytes, old: bytes, new: bytes) -> bytes:
+    assert encoded.count(old) == 1
+    return encoded.replace(old, new)
+
+
+def test_v4_binary_envelope_decoder_fails_closed_on_malformed_frames() -> None:
+    encoded = encode_binary_crypto_verdict_envelope(envelope_with({"k": "v"}))
+    metadata_item = b"\x68metadata\xa1\x61k\x61v"
+    cases = {
+        "binary envelope must be bytes": "not-bytes",
+        "binary envelope magic mismatch": b"QWGB\x02" + encoded[len(BINARY_ENVELOPE_MAGIC) :],
+        "binary envelope is truncated": encoded[:-1],
+        "binary envelope has trailing bytes": encoded + b"\x00",
+        "not minimally encoded": mutate(encoded, metadata_item, b"\x68metadata\xb8\x01\x61k\x61v"),
+        "unsupported length encoding": mutate(encoded, metadata_item, b"\x68metadata\xbf\x61k\x61v\xff"),
+        "unique and in deterministic order": mutate(encoded, b"\x68metadata", b"\x68aetadata"),
+        "map keys must be text": mutate(encoded, metadata_item, b"\x68metadata\xa1\x01\x61v"),
+        "byte strings must be tagged": mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\x41v"),
+        "unsupported tag": mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\xd6\x41v"),
+        "tag must wrap a byte string": mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\xd5\x61v"),
+        "unsupported simple value": mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\xf6"),
+        "valid UTF-8": mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\x61\xff"),
+        "NFC normalized": mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\x63e\xcc\x81"),
+        "deterministic tag": mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\x67b64u:AA"),
+    }
+    for match, data in cases.items():
+        with pytest.raises(ValueError, match=match):
+            decode_binary_crypto_verdict_envelope(data)  # type: ignore[arg-type]
+
+    for data in (
+        mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\xd5\x40"),
+        mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\xd7\x41\x00"),
+    ):
+        with pytest.raises(ValueError, match="unsupported tag"):
+            decode_binary_crypto_verdict_envelope(data)
+    for data in (
+        mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\xd5\x5a\xff\xff\xff\xff"),
+        mutate(encoded, metadata_item, b"\x68metadata\xa1\x61k\x9a\x00\x01\x00\x00"),
+        BINARY_ENVELOPE_MAGIC + b"\xa1\x79\x01\x00k",
+        BINARY_ENVELOPE_MAGIC,
+        BINARY_ENVELOPE_MAGIC + b"\xa1\xd5",
+        BINARY_ENVELOPE_MAGIC + b"\xa1\x78",
+    ):
+        with pytest.raises(ValueError, match="truncated|map keys must be text"):
+            decode_binary_crypto_verdict_envelope(data)
+
+    with pytest.raises(ValueError, match="fields must match required schema"):
+        decode_binary_crypto_verdict_envelope(BINARY_ENVELOPE_MAGIC + b"\x80")
+    assert decode_binary_crypto_verdict_envelope(bytearray(encoded)) == decode_binary_crypto_verdict_envelope(memoryview(encoded))
+
+
+def test_v4_binary_envelope_decoder_enforces_budget() -> None:
+    verdict = envelope_with({"items": [[[]]]})
+    encoded = encode_binary_crypto_verdict_envelope(verdict)
+    assert decode_binary_crypto_verdict_envelope(encoded, budget=CanonicalBudget(max_depth=4))["metadata"] == {"items": [[[]]]}
+    to_canonical_json(verdict, budget=CanonicalBudget(max_depth=4))
+    for encode in (encode_binary_crypto_verdict_envelope, to_canonical_json):
+        with pytest.raises(ValueError, match="nesting depth budget"):
+            encode(verdict, budget=CanonicalBudget(max_depth=3))
+    with pytest.raises(ValueError, match="nesting depth budget"):
+        decode_binary_crypto_verdict_envelope(encoded, budget=CanonicalBudget(max_depth=3))
+    with pytest.raises(ValueError, match="size budget"):
+        decode_binary_crypto_verdict_envelope(encoded, budget=CanonicalBudget(max_nodes=5))
+    tampered = copy.deepcopy(verdict)
+    tampered["metadata"] = {"items": list(range(10))}
+    assert decode_binary_crypto_verdict_envelope(encode_binary_crypto_verdict_envelope(tampered)) == canonical(tampered)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from enum import IntEnum, StrEnum
+
+import pytest
+
+from qwg.v4.signing import (
+    domain_separated_payload_bytes,
+    normalise_for_signing,
+    signed_payload_hash,
+    to_canonical_json,
+    update_hash_with_canonical_json,
+)
+
+_ALPHABET = ("a", "Z", "0", " ", '"', "\\", "\n", "\t", "\x00", "\x1f", "\x7f", "\u00e9", "e\u0301", "\u00a0", "\U0001f6e1")
+
+
+class Level(IntEnum):
+    HIGH = 2
+
+
+class Label(StrEnum):
+    CAFE = "cafe\u0301"
+
+
+def reference_canonical_json(payload: dict) -> str:
+    return json.dumps(
+        normalise_for_signing(payload, path="$"),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        allow_nan=False,
+    )
+
+
+def random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 6)))
+
+
+def random_value(rng: random.Random, depth: int) -> object:
+    kind = rng.randint(0, 5 if depth < 4 else 2)
+    if kind == 0:
+        return random_text(rng)
+    if kind == 1:
+        return rng.choice((True, False, 0, -1, 2**70, rng.randint(-1000, 1000)))
+    if kind == 2:
+        return rng.choice(("", "plain-ascii", "caf\u00e9", "cafe\u0301"))
+    if kind == 3:
+        items = [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+        return tuple(items) if rng.random() < 0.3 else items
+    members: dict[str, object] = {}
+    for _ in range(rng.randint(0, 4)):
+        key = random_text(rng)
+        if key not in members and all(
+            normalise_for_signing(key, path="$") != normalise_for_signing(existing, path="$") for existing in members
+        ):
+            members[key] = random_value(rng, depth + 1)
+    return members
+
+
+def test_single_pass_canonical_json_is_byte_identical_to_reference_encoder() -> None:
+    rng = random.Random(20260621)
+    for _ in range(500):
+        payload = {"root": random_value(rng, 0), random_text(rng): random_value(rng, 1)}
+        expected = reference_canonical_json(payload)
+        assert to_canonical_json(payload) == expected
+        assert signed_payload_hash(payload=payload) == hashlib.sha256(
+            domain_separated_payload_bytes(payload=payload)
+        ).hexdigest()
+        streamed = update_hash_with_canonical_json(hashlib.sha256(), payload)
+        assert streamed.hexdigest() == hashlib.sha256(expected.encode("utf-8")).hexdigest()
+
+
+def test_canonical_hash_feeds_caller_hasher_without_mutating_payload() -> None:
+    class RecordingHasher:
+        def __init__(self) -> None:
+            self.inner = hashlib.sha256()
+            self.updates = 0
+
+        def update(self, data: bytes) -> None:
+            self.updates += 1
+            self.inner.update(data)
+
+    nested = {"cafe\u0301": ["e\u0301", 1, True], "ascii": ("x", {"y": "e\u0301"}), "level": Level.HIGH, "label": [Label.CAFE]}
+    payload = {"metadata": {f"k{index:05d}": [index, f"v{index}", {"n": True}] for index in range(2000)}, "mixed": nested}
+    before = repr(payload)
+    recorder = RecordingHasher()
+
+    assert update_hash_with_canonical_json(recorder, payload) is recorder
+    assert recorder.updates == 1
+    assert recorder.inner.hexdigest() == hashlib.sha256(reference_canonical_json(payload).encode("utf-8")).hexdigest()
+    assert repr(payload) == before
+    assert "caf\u00e9" in to_canonical_json(payload)
+
+
+def test_single_pass_canonical_hash_preserves_fail_closed_rejections() -> None:
+    with pytest.raises(ValueError, match="payload must be dict"):
+        update_hash_with_canonical_json(hashlib.sha256(), ["not", "dict"])  # type: ignore[arg-type]
+    for payload, message in (
+        ({"metadata": {"bad": None}}, r"\$\.metadata\.bad must omit absent fields"),
+        ({"metadata": [1, 1.5]}, r"\$\.metadata\[1\] must not contain floats"),
+        ({"metadata": {1: "bad"}}, r"\$\.metadata object keys must be strings"),
+        ({"metadata": {"\u00e9": 1, "e\u0301": 2}}, "duplicate key after Unicode normalization"),
+        ({"metadata": {"\u00e9": 1, "e\u0301": {"nested": 2}}}, "duplicate key after Unicode normalization"),
+        ({"metadata": {"bad": b"bytes"}}, "unsupported type bytes"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            normalise_for_signing(payload, path="$")
+        with pytest.raises(ValueError, match=message):
+            to_canonical_json(payload)
+        with pytest.raises(ValueError, match=message):
+            signed_payload_hash(payload=payload)
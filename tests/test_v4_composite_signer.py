@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Any
+
+import pytest
+
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES, SUPPORTED_REASON_IDS
+from qwg.v4 import COMPONENT_ROLE
+from qwg.v4.composite_signer import CompositeSigningKey, CompositeVerdictSigner
+from qwg.v4.crypto_verdict import (
+    build_signed_crypto_verdict_envelope,
+    build_unsigned_crypto_verdict_payload,
+    validate_crypto_verdict_envelope,
+)
+from qwg.v4.real_crypto_backend import (
+    QwgV4RealCryptoBackendError,
+    QwgV4RealCryptoBackendUnavailable,
+    QwgV4RealCryptoMaterialError,
+    build_signature_entry_with_real_backend,
+    decode_binary_signature_material,
+    encode_binary_signature_material,
+    make_real_crypto_signature_verifier,
+)
+from qwg.v4.signing import COMPONENT_VERDICT_DOMAIN, build_signature_bundle, signed_payload_hash
+from qwg.v4.trust_profile import (
+    CLASSICAL_ED25519,
+    FN_DSA,
+    ML_DSA,
+    SUPPORTED_ALGORITHMS,
+    default_standard_profile_for_algorithm,
+)
+
+HASH_A = "a" * 64
+HASH_B = "b" * 64
+
+
+class NativeBackendError(RuntimeError):
+    pass
+
+
+class FakeBackend:
+    backend_name = "fake-composite-backend"
+    backend_version = "test-vector-only"
+    supported_algorithms = SUPPORTED_ALGORITHMS
+
+    def __init__(self) -> None:
+        self.threads: set[str] = set()
+
+    def sign_message(self, *, algorithm: str, private_key_reference: str, message: bytes) -> str:
+        self.threads.add(threading.current_thread().name)
+        digest = hashlib.sha256(f"{algorithm}|{public_key_for(private_key_reference)}|".encode() + message).digest()
+        return encode_binary_signature_material(digest, field="signature")
+
+    def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> bool:
+        decode_binary_signature_material(public_key, field="public_key")
+        digest = hashlib.sha256(f"{algorithm}|{public_key}|".encode() + message).digest()
+        return signature == encode_binary_signature_material(digest, field="signature")
+
+
+class BarrierBackend(FakeBackend):
+    def __init__(self, parties: int) -> None:
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def sign_message(self, *, algorithm: str, private_key_reference: str, message: bytes) -> str:
+        self.barrier.wait()
+        return super().sign_message(algorithm=algorithm, private_key_reference=private_key_reference, message=message)
+
+
+class FailingBackend(FakeBackend):
+    def __init__(self, error: Exception) -> None:
+        super().__init__()
+        self.error = error
+
+    def sign_message(self, *, algorithm: str, private_key_reference: str, message: bytes) -> str:
+        raise self.error
+
+
+class MalformedBackend(FakeBackend):
+    def sign_message(self, *, algorithm: str, private_key_reference: str, message: bytes) -> str:
+        return hashlib.sha256(message).hexdigest()
+
+
+class ExplodingDiscoveryBackend(FakeBackend):
+    @property
+    def supported_algorithms(self) -> tuple[str, ...]:  # type: ignore[override]
+        raise NativeBackendError("algorithm discovery exploded")
+
+
+def public_key_for(private_key_reference: str) -> str:
+    return encode_binary_signature_material(f"public|{private_key_reference}".encode(), field="public_key")
+
+
+def signing_key(algorithm: str, backend: Any, **overrides: Any) -> CompositeSigningKey:
+    fields: dict[str, Any] = {
+        "algorithm": algorithm,
+        "key_id": f"prod-{COMPONENT_ROLE}-{algorithm}-v1",
+        "key_version": 1,
+        "private_key_reference": f"hsm://qwg/{algorithm}/v1",
+        "backend": backend,
+    }
+    fields.update(overrides)
+    return CompositeSigningKey(**fields)
+
+
+def trust_profile(algorithms: tuple[str, ...]) -> dict[str, Any]:
+    return {
+        "schema_version": "shield.key_registry.v1",
+        "registry_version": 1,
+        "entries": [
+            {
+                "role": COMPONENT_ROLE,
+                "key_id": f"prod-{COMPONENT_ROLE}-{algorithm}-v1",
+                "key_version": 1,
+                "algorithm": algorithm,
+                "not_before": "2026-06-21T00:00:00Z",
+                "not_after": "2026-06-21T00:05:00Z",
+                "status": "active",
+                "public_key": public_key_for(f"hsm://qwg/{algorithm}/v1"),
+            }
+            for algorithm in algorithms
+        ],
+    }
+
+
+def unsigned_payload() -> dict[str, Any]:
+    return build_unsigned_crypto_verdict_payload(
+        request_id="req-qwg-composite",
+        context_hash=HASH_A,
+        freshness_nonce="nonce-qwg-composite",
+        not_before="2026-06-21T00:01:00Z",
+        not_after="2026-06-21T00:02:00Z",
+        decision="ALLOW",
+        reason_ids=list(SUPPORTED_REASON_IDS[:2]),
+        evidence_hash=HASH_B,
+        evidence_families=list(SUPPORTED_EVIDENCE_FAMILIES),
+        key_registry_version=1,
+        metadata={"enrichment": {"segment": "retail"}},
+    )
+
+
+def test_v4_composite_signer_matches_sequential_signing_and_validates() -> None:
+    backend = FakeBackend()
+    algorithms = (FN_DSA, ML_DSA, CLASSICAL_ED25519)
+    payload = unsigned_payload()
+    with CompositeVerdictSigner(signing_keys=[signing_key(algorithm, backend) for algorithm in algorithms]) as signer:
+        assert signer.algorithms == SUPPORTED_ALGORITHMS
+        bundle, envelope = signer.sign(payload)
+
+    payload_hash = signed_payload_hash(payload=payload)
+    sequential = build_signature_bundle(
+        signatures=[
+            build_signature_entry_with_real_backend(
+                algorithm=algorithm,
+                standard_profile=default_standard_profile_for_algorithm(algorithm),
+                domain_tag=COMPONENT_VERDICT_DOMAIN,
+                signed_payload_hash=payload_hash,
+                key_id=f"prod-{COMPONENT_ROLE}-{algorithm}-v1",
+                key_version=1,
+                private_key_reference=f"hsm://qwg/{algorithm}/v1",
+                backend=backend,
+            )
+            for algorithm in algorithms
+        ]
+    )
+    assert bundle == sequential
+    assert envelope == build_signed_crypto_verdict_envelope(unsigned_payload=payload, signature_bundle=sequential)
+    assert envelope["signature_bundle"] is bundle
+
+    summary = validate_crypto_verdict_envelope(
+        envelope,
+        expected_context_hash=HASH_A,
+        trust_profile=trust_profile(SUPPORTED_ALGORITHMS),
+        verification_time="2026-06-21T00:03:00Z",
+        verifier=make_real_crypto_signature_verifier(backend),
+    )["verification_summary"]
+    assert summary["verified_algorithms"] == list(SUPPORTED_ALGORITHMS)
+
+
+def test_v4_composite_signer_signs_algorithms_concurrently() -> None:
+    backend = BarrierBackend(parties=len(SUPPORTED_ALGORITHMS))
+    signer = CompositeVerdictSigner(signing_keys=[signing_key(algorithm, backend) for algorithm in SUPPORTED_ALGORITHMS])
+    for _ in range(3):
+        bundle, _ = signer.sign(unsigned_payload())
+        assert [entry["algorithm"] for entry in bundle["signatures"]] == list(SUPPORTED_ALGORITHMS)
+    signer.close()
+    assert len(backend.threads) == len(SUPPORTED_ALGORITHMS)
+    assert all(name.startswith("qwg-v4-composite-signer") for name in backend.threads)
+
+
+@pytest.mark.parametrize(
+    ("backend", "error", "message"),
+    [
+        (FailingBackend(NativeBackendError("native sign exploded")), QwgV4RealCryptoBackendError, "ml-dsa sign failed closed"),
+        (FailingBackend(QwgV4RealCryptoBackendUnavailable("hsm offline")), QwgV4RealCryptoBackendUnavailable, "hsm offline"),
+        (MalformedBackend(), QwgV4RealCryptoBackendError, "b64u"),
+    ],
+)
+def test_v4_composite_signer_fails_closed_when_any_algorithm_fails(backend: Any, error: type[Exception], message: str) -> None:
+    with CompositeVerdictSigner(
+        signing_keys=[signing_key(CLASSICAL_ED25519, FakeBackend()), signing_key(ML_DSA, backend)],
+        max_workers=1,
+    ) as signer:
+        with pytest.raises(error, match=message):
+            signer.sign(unsigned_payload())
+        with pytest.raises(ValueError, match="fields must match required schema"):
+            signer.sign({"request_id": "partial"})
+
+
+@pytest.mark.parametrize(
+    ("signing_keys", "error", "message"),
+    [
+        ([], QwgV4RealCryptoBackendError, "signing_keys must be non-empty list"),
+        (["not-a-key"], QwgV4RealCryptoBackendError, "CompositeSigningKey"),
+        ([signing_key("rsa", FakeBackend())], QwgV4RealCryptoBackendError, "algorithm must be supported"),
+        ([signing_key(ML_DSA, FakeBackend(), standard_profile="fips206-draft-falcon1024-v1")], QwgV4RealCryptoBackendError, "standard_profile"),
+        ([signing_key(ML_DSA, FakeBackend(), key_version=0)], QwgV4RealCryptoBackendError, "key_version"),
+        ([signing_key(ML_DSA, FakeBackend(), private_key_reference="test-only-key")], QwgV4RealCryptoMaterialError, "test-only"),
+        ([signing_key(ML_DSA, ExplodingDiscoveryBackend())], QwgV4RealCryptoBackendError, "algorithm discovery failed closed"),
+        ([signing_key(FN_DSA, MalformedBackend()), signing_key(ML_DSA, FakeBackend()), signing_key(ML_DSA, FakeBackend())], QwgV4RealCryptoBackendError, "duplicate signing algorithm"),
+        ([signing_key(ML_DSA, FakeBackend())], QwgV4RealCryptoBackendUnavailable, "missing required algorithms: classical-ed25519"),
+    ],
+)
+def test_v4_composite_signer_validates_keys_once_at_construction(
+    signing_keys: list[Any], error: type[Exception], message: str
+) -> None:
+    with pytest.raises(error, match=message):
+        CompositeVerdictSigner(signing_keys=signing_keys)
+
+
+def test_v4_composite_signer_rejects_backend_without_algorithm_and_bad_worker_count() -> None:
+    narrow = FakeBackend()
+    narrow.supported_algorithms = (ML_DSA,)  # type: ignore[misc]
+    with pytest.raises(QwgV4RealCryptoBackendUnavailable, match="does not support"):
+        CompositeVerdictSigner(signing_keys=[signing_key(CLASSICAL_ED25519, narrow), signing_key(ML_DSA, narrow)])
+    with pytest.raises(ValueError, match="max_workers must be positive integer"):
+        CompositeVerdictSigner(
+            signing_keys=[signing_key(CLASSICAL_ED25519, FakeBackend()), signing_key(ML_DSA, FakeBackend())],
+            max_workers=0,
+        )
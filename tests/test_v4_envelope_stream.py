@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import mmap
+import runpy
+import sys
+import warnings
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import qwg.v4.envelope_stream as envelope_stream
+from qwg.v4.envelope_stream import (
+    iter_ndjson_envelope_slices,
+    load_verifier,
+    main,
+    stream_validate_crypto_verdict_envelopes,
+)
+from qwg.v4.signing import to_canonical_json, verify_test_only_signature
+from qwg.v4.trust_profile import build_test_trust_profile
+from tests.test_v4_crypto_verdict_contract import HASH_A, HASH_B, VERIFY_AT, signed_verdict
+
+VERIFIER_SPEC = "qwg.v4.signing:verify_test_only_signature"
+
+
+def envelope_line() -> bytes:
+    return to_canonical_json(signed_verdict()).encode("utf-8")
+
+
+def tampered_line() -> bytes:
+    verdict = signed_verdict()
+    verdict["signature_bundle"]["signatures"][0]["signature"] = "0" * 64
+    return to_canonical_json(verdict).encode("utf-8")
+
+
+def write_lines(path: Path, *lines: bytes, trailing_newline: bool = True) -> Path:
+    path.write_bytes(b"\n".join(lines) + (b"\n" if trailing_newline else b""))
+    return path
+
+
+def validate(path: Path, **overrides: Any) -> list[dict[str, Any]]:
+    return list(
+        stream_validate_crypto_verdict_envelopes(
+            path, trust_profile=build_test_trust_profile(), verifier=verify_test_only_signature, **overrides
+        )
+    )
+
+
+def test_v4_envelope_stream_yields_zero_copy_slices_released_per_line(tmp_path: Path) -> None:
+    path = write_lines(tmp_path / "verdicts.ndjson", b"first", b"", b"second\r", b"\r", b"third", trailing_newline=False)
+    slices = iter_ndjson_envelope_slices(path)
+    line_number, offset, view = next(slices)
+    assert (line_number, offset, bytes(view)) == (1, 0, b"first")
+    assert isinstance(view.obj, mmap.mmap)
+    rest = [(number, start, bytes(item)) for number, start, item in slices]
+    assert rest == [(3, 7, b"second"), (5, 17, b"third")]
+    with pytest.raises(ValueError, match="released"):
+        bytes(view)
+    assert list(iter_ndjson_envelope_slices(write_lines(tmp_path / "empty.ndjson", trailing_newline=False))) == []
+
+
+def test_v4_envelope_stream_drops_pages_behind_the_read_position(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    lines = [bytes([ord("a") + index % 26]) * (mmap.PAGESIZE // 3) for index in range(12)]
+    path = write_lines(tmp_path / "verdicts.ndjson", *lines)
+    monkeypatch.setattr(envelope_stream, "_RESIDENT_WINDOW", mmap.PAGESIZE)
+    assert [bytes(view) for _, _, view in iter_ndjson_envelope_slices(path)] == lines
+    monkeypatch.delattr(mmap, "MADV_SEQUENTIAL")
+    monkeypatch.delattr(mmap, "MADV_DONTNEED")
+    assert [bytes(view) for _, _, view in iter_ndjson_envelope_slices(path)] == lines
+
+
+def test_v4_envelope_stream_validates_each_line_fail_closed(tmp_path: Path) -> None:
+    good = envelope_line()
+    path = write_lines(
+        tmp_path / "verdicts.ndjson",
+        good,
+        b"",
+        good + b"\r",
+        b'{"a":1,"a":2}',
+        b"{not json",
+        b"\xff\xfe",
+        tampered_line(),
+        b"[" * 200_000,
+        good,
+        trailing_newline=False,
+    )
+    results = validate(path, bind_to_recorded_context=True)
+    assert [result["line_number"] for result in results] == [1, 3, 4, 5, 6, 7, 8, 9]
+    assert [result["valid"] for result in results] == [True, True, False, False, False, False, False, True]
+    assert results[0]["offset"] == 0 and results[0]["length"] == len(good)
+    assert results[0]["verdict"]["verification_summary"]["verified_algorithms"] == ["classical-ed25519", "ml-dsa"]
+    assert "verdict" not in results[2] and "error" not in results[0]
+    assert results[2]["error"] == "json contains duplicate key"
+    assert "utf-8" in results[4]["error"]
+    assert results[5]["error"] == "signature verification failed"
+    assert "recursion" in results[6]["error"]
+
+
+def test_v4_envelope_stream_requires_an_explicit_context_binding(tmp_path: Path) -> None:
+    path = write_lines(tmp_path / "verdicts.ndjson", envelope_line())
+    assert validate(path, expected_context_hash=HASH_A, verification_time=VERIFY_AT)[0]["valid"] is True
+    assert validate(path, expected_context_hash=HASH_B, verification_time=VERIFY_AT)[0]["error"] == "context_hash mismatch"
+    late = validate(path, bind_to_recorded_context=True, verification_time="2031-01-01T00:00:00Z")
+    assert late[0]["valid"] is False
+    for options in ({}, {"expected_context_hash": HASH_A}, {"verification_time": VERIFY_AT}):
+        with pytest.raises(ValueError, match="required unless bind_to_recorded_context"):
+            stream_validate_crypto_verdict_envelopes(
+                path, trust_profile=build_test_trust_profile(), verifier=verify_test_only_signature, **options
+            )
+    with pytest.raises(ValueError, match="cannot be combined with bind_to_recorded_context"):
+        validate(path, expected_context_hash=HASH_A, bind_to_recorded_context=True)
+
+
+def cli_files(tmp_path: Path, *lines: bytes) -> list[str]:
+    profile = tmp_path / "profile.json"
+    profile.write_text(to_canonical_json(build_test_trust_profile()), encoding="utf-8")
+    envelopes = write_lines(tmp_path / "verdicts.ndjson", *lines)
+    return [str(envelopes), "--trust-profile", str(profile), "--verifier", VERIFIER_SPEC]
+
+
+def test_v4_envelope_stream_cli_reports_progress_invalid_lines_and_summary(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    args = cli_files(tmp_path, envelope_line(), tampered_line(), envelope_line())
+    assert main([*args, "--bind-to-recorded-context", "--progress-interval", "0.000001"]) == 1
+    captured = capsys.readouterr()
+    reported = [json.loads(line) for line in captured.out.splitlines()]
+    assert reported[0] == {"line_number": 2, "offset": len(envelope_line()) + 1, "error": "signature verification failed"}
+    summary = reported[1]
+    assert (summary["envelopes"], summary["valid"], summary["invalid"]) == (3, 2, 1)
+    assert (summary["context_binding"], summary["verification_time"]) == ("recorded", "recorded_not_before")
+    assert summary["bytes"] == (tmp_path / "verdicts.ndjson").stat().st_size
+    assert "MiB/s" in captured.err and "100.0%" in captured.err
+
+    args = cli_files(tmp_path, envelope_line())
+    assert main([*args, "--expected-context-hash", HASH_A, "--verification-time", VERIFY_AT, "--progress-interval", "0"]) == 0
+    captured = capsys.readouterr()
+    summary = json.loads(captured.out)
+    assert (summary["valid"], summary["context_binding"], summary["verification_time"]) == (1, "expected", VERIFY_AT)
+    assert captured.err == ""
+
+
+@pytest.mark.parametrize(
+    ("spec", "match"),
+    [
+        ("no-colon", "module:attribute"),
+        (":attribute", "module:attribute"),
+        ("qwg.v4.missing_module:verify", "could not be imported"),
+        ("qwg.v4.signing:missing_verifier", "could not be imported"),
+        ("qwg.v4:COMPONENT_ID", "is not callable"),
+    ],
+)
+def test_v4_envelope_stream_verifier_spec_fails_closed(spec: str, match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        load_verifier(spec)
+    assert load_verifier(VERIFIER_SPEC) is verify_test_only_signature
+
+
+def test_v4_envelope_stream_cli_rejects_bad_setup(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    args = cli_files(tmp_path, envelope_line())
+    for bad_args in (
+        args,
+        [*args, "--bind-to-recorded-context", "--expected-context-hash", HASH_A],
+        [*args, "--expected-context-hash", HASH_A],
+        [*args[:-1], "no-colon", "--bind-to-recorded-context"],
+        [args[0], "--trust-profile", str(tmp_path / "missing.json"), "--verifier", VERIFIER_SPEC, "--bind-to-recorded-context"],
+        [str(tmp_path / "missing.ndjson"), *args[1:], "--bind-to-recorded-context"],
+    ):
+        with pytest.raises(SystemExit) as excinfo:
+            main(bad_args)
+        assert excinfo.value.code == 2
+    errors = capsys.readouterr().err
+    assert "one of the arguments --expected-context-hash --bind-to-recorded-context is required" in errors
+    assert "not allowed with argument" in errors
+    assert "--verification-time is required with --expected-context-hash" in errors
+
+
+def test_v4_envelope_stream_runs_as_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.setattr(sys, "argv", ["envelope_stream", *cli_files(tmp_path, envelope_line()), "--bind-to-recorded-context", "--progress-interval", "0"])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        with pytest.raises(SystemExit) as excinfo:
+            runpy.run_module("qwg.v4.envelope_stream", run_name="__main__")
+    assert excinfo.value.code == 0
+    assert json.loads(capsys.readouterr().out)["valid"] == 1
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import pytest
+
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES, SUPPORTED_REASON_IDS
+from qwg.v4.crypto_verdict import (
+    build_signed_crypto_verdict_envelope,
+    build_unsigned_crypto_verdict_payload,
+    canonical_unsigned_payload_and_hash,
+    contains_forbidden_metadata_authority,
+    validate_crypto_verdict_envelope,
+)
+from qwg.v4.signing import (
+    build_signature_bundle,
+    build_test_signature_entry,
+    signed_payload_hash,
+    verify_test_only_signature,
+)
+from qwg.v4.trust_profile import CLASSICAL_ED25519, ML_DSA, build_test_trust_profile
+
+HASH_A = "a" * 64
+HASH_B = "b" * 64
+VERIFY_AT = "2026-06-21T00:01:00Z"
+
+
+def signed_verdict() -> dict:
+    payload = build_unsigned_crypto_verdict_payload(
+        request_id="req-qwg-fast-path",
+        context_hash=HASH_A,
+        freshness_nonce="nonce-qwg-fast-path",
+        not_before="2026-06-21T00:00:00Z",
+        not_after="2026-06-21T00:05:00Z",
+        decision="ALLOW",
+        reason_ids=list(SUPPORTED_REASON_IDS[:2]),
+        evidence_hash=HASH_B,
+        evidence_families=list(SUPPORTED_EVIDENCE_FAMILIES),
+        metadata={"enrichment": {f"k{index}": [index, "safe"] for index in range(50)}},
+        key_registry_version=1,
+    )
+    payload_hash = signed_payload_hash(payload=payload)
+    return build_signed_crypto_verdict_envelope(
+        unsigned_payload=payload,
+        signature_bundle=build_signature_bundle(
+            signatures=[build_test_signature_entry(algorithm=algorithm, signed_hash=payload_hash) for algorithm in (CLASSICAL_ED25519, ML_DSA)]
+        ),
+    )
+
+
+def validate(verdict: dict) -> dict:
+    return validate_crypto_verdict_envelope(
+        verdict,
+        expected_context_hash=HASH_A,
+        trust_profile=build_test_trust_profile(),
+        verification_time=VERIFY_AT,
+        verifier=verify_test_only_signature,
+    )
+
+
+def test_canonical_envelope_is_validated_in_place_without_rebuilding() -> None:
+    verdict = signed_verdict()
+    unsigned, payload_hash = canonical_unsigned_payload_and_hash(verdict)
+
+    assert unsigned["reason_ids"] is verdict["reason_ids"]
+    assert unsigned["evidence_families"] is verdict["evidence_families"]
+    assert unsigned["metadata"] is verdict["metadata"]
+    assert payload_hash == signed_payload_hash(payload=unsigned) == verdict["signed_payload_hash"]
+    assert validate(verdict)["verification_summary"]["verified_algorithms"] == [CLASSICAL_ED25519, ML_DSA]
+
+
+@pytest.mark.parametrize(
+    ("field", "value"),
+    (
+        ("reason_ids", sorted(SUPPORTED_REASON_IDS[:2], reverse=True)),
+        ("evidence_families", tuple(SUPPORTED_EVIDENCE_FAMILIES)),
+        ("request_id", " req-qwg-fast-path "),
+        ("freshness_nonce", "nonce-qwg-fast-path\n"),
+        ("context_hash", f" {HASH_A}"),
+    ),
+)
+def test_non_canonical_but_equivalent_envelope_falls_back_to_full_rebuild(field: str, value: object) -> None:
+    verdict = {**signed_verdict(), field: value}
+    unsigned, payload_hash = canonical_unsigned_payload_and_hash(verdict)
+
+    assert (unsigned, payload_hash) == canonical_unsigned_payload_and_hash(signed_verdict())
+    assert unsigned[field] is not value
+    assert validate(verdict)["signed_payload_hash"] == verdict["signed_payload_hash"]
+
+
+@pytest.mark.parametrize(
+    ("field", "value", "message"),
+    (
+        ("decision", "MAYBE", "unsupported decision"),
+        ("request_id", "", "request_id must be non-empty"),
+        ("evidence_hash", HASH_B.upper(), "evidence_hash must be lowercase"),
+        ("reason_ids", ["QWG_UNKNOWN"], "unknown reason_ids"),
+        ("evidence_families", [], "evidence_families must not be empty"),
+        ("key_registry_version", True, "key_registry_version must be positive integer"),
+        ("metadata", {"nested": [{"override": "yes"}]}, "forbidden authority field"),
+        ("metadata", {"nested": {"safe": None}}, r"\$\.metadata\.nested\.safe must omit absent fields"),
+        ("metadata", ["not", "dict"], "metadata must be dict"),
+        ("not_after", "2026-06-20T00:00:00Z", "freshness window is invalid"),
+        ("not_before", "not-a-timestamp", "not_before must be RFC3339"),
+    ),
+)
+def test_fast_path_rejections_report_the_builder_error(field: str, value: object, message: str) -> None:
+    verdict = {**signed_verdict(), field: value}
+
+    with pytest.raises(ValueError, match=message):
+        canonical_unsigned_payload_and_hash(verdict)
+    with pytest.raises(ValueError, match=message):
+        validate(verdict)
+
+
+def test_metadata_authority_scan_inside_canonical_walk_matches_standalone_scan() -> None:
+    verdict = signed_verdict()
+    for metadata in (
+        {"deep": {"deeper": [{"bypass": 1}]}},
+        {"tupled": ({"override": 1},)},
+        {"Allow": "case-sensitive", "nested": {"ALLOW": 1}},
+    ):
+        candidate = {**verdict, "metadata": metadata}
+        if contains_forbidden_metadata_authority(metadata):
+            with pytest.raises(ValueError, match="forbidden authority field"):
+                canonical_unsigned_payload_and_hash(candidate)
+        else:
+            unsigned, payload_hash = canonical_unsigned_payload_and_hash(candidate)
+            assert unsigned["metadata"] is metadata
+            assert payload_hash == signed_payload_hash(payload=unsigned)
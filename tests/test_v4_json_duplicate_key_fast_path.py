@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import random
+from typing import Any
+
+import pytest
+
+import qwg.v4.signing as signing
+from qwg.v4.signing import (
+    parse_json_no_duplicate_keys,
+    reject_duplicate_json_keys,
+    to_canonical_json,
+)
+from tests.test_v4_binary_envelope import real_sized_verdict
+
+KEYS = ("a", "b", "request_id", "\u00e9", "e\u0301", "\\u00e9", "e\\u0301", "\\u0061", 'q\\"', "\\\\", "\u212b")
+WHITESPACE = ("", "", " ", "\n", "\t ", "\r\n")
+
+
+def reference_parse(raw_json: Any) -> dict[str, Any]:
+    parsed = json.loads(raw_json, object_pairs_hook=reject_duplicate_json_keys)
+    if not isinstance(parsed, dict):
+        raise ValueError("json root must be object")
+    return parsed
+
+
+def outcome(parse: Any, raw_json: Any) -> tuple[str, Any]:
+    try:
+        parsed = parse(raw_json)
+    except (ValueError, TypeError) as exc:
+        return type(exc).__name__, str(exc)
+    return "ok", json.dumps(parsed, ensure_ascii=False)
+
+
+def random_value_text(rng: random.Random, depth: int) -> str:
+    choice = rng.randrange(7 if depth < 3 else 4)
+    if choice == 0:
+        return str(rng.randint(-(10**20), 10**20))
+    if choice == 1:
+        return rng.choice(("true", "false", "null", "1.5", "NaN", "-0"))
+    if choice in (2, 3):
+        return json.dumps(rng.choice(("b64u:AAAA", "x:y", '":"', "\u00e9", "e\u0301")), ensure_ascii=rng.random() < 0.3)
+    if choice == 4:
+        return "[" + ",".join(random_value_text(rng, depth + 1) for _ in range(rng.randrange(4))) + "]"
+    return random_object_text(rng, depth + 1)
+
+
+def random_object_text(rng: random.Random, depth: int) -> str:
+    members = []
+    for _ in range(rng.randrange(5)):
+        gap = rng.choice(WHITESPACE)
+        members.append(f'"{rng.choice(KEYS)}"{gap}:{rng.choice(WHITESPACE)}{random_value_text(rng, depth)}')
+    return "{" + ",".join(members) + "}"
+
+
+def corrupt(rng: random.Random, text: str) -> str:
+    choice = rng.randrange(6)
+    if choice == 0 and text:
+        return text[: rng.randrange(len(text))]
+    if choice == 1:
+        return text + rng.choice(("}", ",", " x", " "))
+    if choice == 2:
+        return "\ufeff" + text
+    if choice == 3:
+        return "[" + text + "]"
+    return text
+
+
+def test_v4_parse_json_fast_path_matches_reference_parser_on_fuzzed_documents() -> None:
+    rng = random.Random(37)
+    fast_accepts = 0
+    for _ in range(3000):
+        text = random_object_text(rng, 0)
+        if rng.random() < 0.3:
+            text = corrupt(rng, text)
+        expected = outcome(reference_parse, text)
+        assert outcome(parse_json_no_duplicate_keys, text) == expected, text
+        assert outcome(parse_json_no_duplicate_keys, text.encode("utf-8")) == outcome(reference_parse, text.encode("utf-8"))
+        if expected[0] == "ok" and text.isascii() and "\\" not in text:
+            fast_accepts += 1
+    assert fast_accepts > 100
+
+
+@pytest.mark.parametrize(
+    "raw_json",
+    [
+        '{"a":1,"a":2}',
+        '{"a":{"b":1,"b":2},"c":1',
+        '{"a" :1, "a": 2}',
+        '{"a":1,"\\u0061":2}',
+        '{"\u00e9":1,"e\u0301":2}',
+        '{"\\u00e9":1,"e\\u0301":2}',
+        '["not-root-object"]',
+        '[{"a":1,"a":2}]',
+        "",
+        '{"a":1} x',
+        b'{"a":1,"a":2}',
+        1,
+    ],
+)
+def test_v4_parse_json_fast_path_rejects_exactly_like_reference(raw_json: Any) -> None:
+    expected = outcome(reference_parse, raw_json)
+    assert expected[0] != "ok"
+    assert outcome(parse_json_no_duplicate_keys, raw_json) == expected
+
+
+def test_v4_parse_json_ascii_envelopes_skip_the_normalizing_hook(monkeypatch: pytest.MonkeyPatch) -> None:
+    text = to_canonical_json(real_sized_verdict())
+    calls: list[int] = []
+
+    def counting_hook(pairs: Any) -> dict[str, Any]:
+        calls.append(len(pairs))
+        return reject_duplicate_json_keys(pairs)
+
+    monkeypatch.setattr(signing, "reject_duplicate_json_keys", counting_hook)
+    assert parse_json_no_duplicate_keys(text) == json.loads(text)
+    assert calls == []
+    parsed = parse_json_no_duplicate_keys('{"caf\u00e9":{"x":1}}')
+    assert parsed == {"caf\u00e9": {"x": 1}}
+    assert len(calls) == 2
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+from qwg.v4 import CANONICALIZATION_PROFILE, COMPONENT_ROLE, POLICY_VERSION
+from qwg.v4.manifest import build_manifest, cached_manifest
+from qwg.v4.signing import to_canonical_json
+from qwg.v4.trust_profile import FIPS204_ML_DSA_65_PROFILE, FN_DSA, ML_DSA
+
+
+def test_v4_manifest_declares_contract_identity_and_policy() -> None:
+    manifest = build_manifest()
+    assert manifest["component_role"] == COMPONENT_ROLE
+    assert manifest["contract_version"] == 4
+    assert manifest["canonicalization_profile"] == CANONICALIZATION_PROFILE
+    assert manifest["signature_policy"] == POLICY_VERSION
+    assert manifest["required_algorithms"] == ["classical-ed25519", ML_DSA]
+    assert manifest["optional_algorithms"] == [FN_DSA]
+    assert manifest["standard_profiles"][ML_DSA] == [FIPS204_ML_DSA_65_PROFILE]
+    assert "does not sign" in manifest["authority_boundary"]
+    assert build_manifest() is not build_manifest()
+
+
+def test_v4_cached_manifest_matches_a_fresh_build() -> None:
+    cached = cached_manifest()
+    canonical = to_canonical_json(build_manifest()).encode("utf-8")
+    assert cached is cached_manifest()
+    assert cached.canonical_bytes == canonical
+    assert cached.sha256 == hashlib.sha256(canonical).hexdigest()
+    assert cached.to_dict() == build_manifest()
+    assert cached.manifest["standard_profiles"][ML_DSA] == (FIPS204_ML_DSA_65_PROFILE,)
+    with pytest.raises(TypeError):
+        cached.manifest["standard_profiles"][ML_DSA] = ()  # type: ignore[index]
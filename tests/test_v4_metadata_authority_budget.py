@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+import pytest
+
+from qwg.v3.v3_2_lock import SUPPORTED_EVIDENCE_FAMILIES, SUPPORTED_REASON_IDS
+from qwg.v4.crypto_verdict import (
+    DEFAULT_METADATA_BUDGET,
+    build_signed_crypto_verdict_envelope,
+    build_unsigned_crypto_verdict_payload,
+    canonical_unsigned_payload_and_hash,
+    contains_forbidden_metadata_authority,
+    validate_crypto_verdict_envelope,
+)
+from qwg.v4.signing import (
+    DEFAULT_CANONICAL_BUDGET,
+    CanonicalBudget,
+    build_signature_bundle,
+    build_test_signature_entry,
+    domain_separated_payload_bytes,
+    normalise_for_signing,
+    signed_payload_hash,
+    to_canonical_json,
+    verify_test_only_signature,
+)
+from qwg.v4.trust_profile import CLASSICAL_ED25519, ML_DSA, build_test_trust_profile
+
+HASH_A = "a" * 64
+
+
+def nested(depth: int, leaf: object) -> object:
+    value = leaf
+    for index in range(depth):
+        value = {"level": value} if index % 2 else [value]
+    return value
+
+
+def unsigned_payload(metadata: dict, **kwargs: object) -> dict:
+    return build_unsigned_crypto_verdict_payload(
+        request_id="req-qwg-budget",
+        context_hash=HASH_A,
+        freshness_nonce="nonce-qwg-budget",
+        not_before="2026-06-21T00:00:00Z",
+        not_after="2026-06-21T00:05:00Z",
+        decision="ALLOW",
+        reason_ids=[SUPPORTED_REASON_IDS[0]],
+        evidence_hash="b" * 64,
+        evidence_families=[SUPPORTED_EVIDENCE_FAMILIES[0]],
+        metadata=metadata,
+        key_registry_version=1,
+        **kwargs,
+    )
+
+
+def signed_verdict(metadata: dict, **kwargs: object) -> dict:
+    payload = unsigned_payload(metadata, **kwargs)
+    payload_hash = signed_payload_hash(payload=payload)
+    return build_signed_crypto_verdict_envelope(
+        unsigned_payload=payload,
+        signature_bundle=build_signature_bundle(
+            signatures=[build_test_signature_entry(algorithm=algorithm, signed_hash=payload_hash) for algorithm in (CLASSICAL_ED25519, ML_DSA)]
+        ),
+    )
+
+
+def validate(verdict: dict, **kwargs: object) -> dict:
+    return validate_crypto_verdict_envelope(
+        verdict,
+        expected_context_hash=HASH_A,
+        trust_profile=build_test_trust_profile(),
+        verification_time="2026-06-21T00:01:00Z",
+        verifier=verify_test_only_signature,
+        **kwargs,
+    )
+
+
+def test_scanner_finds_authority_keys_anywhere_and_exits_early() -> None:
+    assert contains_forbidden_metadata_authority("scalar") is False
+    assert contains_forbidden_metadata_authority({"safe": [1, {"also": "safe"}]}) is False
+    assert contains_forbidden_metadata_authority(nested(DEFAULT_METADATA_BUDGET.max_depth - 1, {"bypass": 1})) is True
+    assert contains_forbidden_metadata_authority({"hidden": ({"override": True},)}) is True
+
+    huge = {"override": True, "wide": list(range(DEFAULT_METADATA_BUDGET.max_nodes * 2))}
+    assert contains_forbidden_metadata_authority(huge) is True
+
+
+def test_adversarial_depth_and_width_fail_closed_without_recursion_errors() -> None:
+    too_deep = {"blob": nested(50_000, "leaf")}
+    too_wide = {"blob": [{"k": index} for index in range(DEFAULT_METADATA_BUDGET.max_nodes)]}
+
+    with pytest.raises(ValueError, match="metadata exceeds nesting depth budget"):
+        contains_forbidden_metadata_authority(too_deep)
+    with pytest.raises(ValueError, match="metadata exceeds size budget"):
+        contains_forbidden_metadata_authority(too_wide)
+    with pytest.raises(ValueError, match="exceeds canonical nesting depth budget"):
+        to_canonical_json(too_deep, budget=DEFAULT_CANONICAL_BUDGET)
+    with pytest.raises(ValueError, match=r"\$\.blob exceeds canonical size budget"):
+        to_canonical_json(too_wide, budget=CanonicalBudget(max_nodes=1))
+    with pytest.raises(ValueError, match=r"\$ exceeds canonical size budget"):
+        to_canonical_json({"a": 1, "b": 2}, budget=CanonicalBudget(max_nodes=1))
+
+    for metadata, message in ((too_deep, "nesting depth budget"), (too_wide, "size budget")):
+        with pytest.raises(ValueError, match=message):
+            unsigned_payload(metadata, metadata_budget=DEFAULT_METADATA_BUDGET)
+        envelope = {**signed_verdict({"safe": True}), "metadata": metadata}
+        with pytest.raises(ValueError, match=f"metadata exceeds {message}"):
+            canonical_unsigned_payload_and_hash(envelope)
+        with pytest.raises(ValueError, match=f"metadata exceeds {message}"):
+            validate(envelope)
+
+
+def test_producers_hash_deep_payloads_the_recursive_walk_accepted() -> None:
+    metadata = {"blob": nested(200, "caf\u0065\u0301")}
+    payload = unsigned_payload(metadata)
+    baseline_json = json.dumps(
+        normalise_for_signing(payload, path="$"), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    baseline_hash = hashlib.sha256(domain_separated_payload_bytes(payload=payload)).hexdigest()
+
+    assert to_canonical_json(payload) == baseline_json
+    assert signed_payload_hash(payload=payload) == baseline_hash
+    verdict = signed_verdict(metadata)
+    assert verdict["signed_payload_hash"] == baseline_hash
+    with pytest.raises(ValueError, match="metadata exceeds nesting depth budget"):
+        validate(verdict)
+    deep_budget = CanonicalBudget(max_depth=256)
+    assert canonical_unsigned_payload_and_hash(verdict, metadata_budget=deep_budget)[1] == baseline_hash
+    assert validate(verdict, metadata_budget=deep_budget)["verification_summary"]["verified_algorithms"]
+
+
+def test_fast_path_budget_matches_standalone_scan_at_the_boundary() -> None:
+    budget = CanonicalBudget(max_depth=4, max_nodes=12)
+    at_depth = {"blob": nested(budget.max_depth, "leaf")}
+    over_depth = {"blob": nested(budget.max_depth + 1, "leaf")}
+    at_size = {f"k{index}": index for index in range(budget.max_nodes)}
+    over_size = {f"k{index}": index for index in range(budget.max_nodes + 1)}
+
+    for metadata in (at_depth, at_size):
+        verdict = signed_verdict(metadata, metadata_budget=budget)
+        unsigned, payload_hash = canonical_unsigned_payload_and_hash(verdict, metadata_budget=budget)
+        assert unsigned["metadata"] is metadata
+        assert payload_hash == verdict["signed_payload_hash"]
+        assert validate(verdict, metadata_budget=budget)["verification_summary"]["verified_algorithms"]
+    unbounded = CanonicalBudget(max_depth=budget.max_depth, max_nodes=None)
+    verdict = signed_verdict(over_size, metadata_budget=unbounded)
+    assert canonical_unsigned_payload_and_hash(verdict, metadata_budget=unbounded)[1] == verdict["signed_payload_hash"]
+    for metadata in (over_depth, over_size):
+        envelope = {**signed_verdict({"safe": True}), "metadata": metadata}
+        with pytest.raises(ValueError, match="metadata exceeds"):
+            canonical_unsigned_payload_and_hash(envelope, metadata_budget=budget)
+        with pytest.raises(ValueError, match="metadata exceeds"):
+            validate(envelope, metadata_budget=budget)
+
+
+def test_canonical_walk_rejects_nested_forbidden_keys_below_root_only() -> None:
+    forbidden = frozenset({"override"})
+
+    assert to_canonical_json({"override": 1}, nested_forbidden_keys=forbidden) == '{"override":1}'
+    with pytest.raises(ValueError, match=r"\$\.meta\[0\] contains forbidden key"):
+        to_canonical_json({"meta": [{"override": 1}]}, nested_forbidden_keys=forbidden)
+
+
+@pytest.mark.parametrize(("kwargs", "field"), (({"max_depth": 0}, "max_depth"), ({"max_nodes": 0}, "max_nodes")))
+def test_canonical_budget_rejects_non_positive_bounds(kwargs: dict, field: str) -> None:
+    with pytest.raises(ValueError, match=f"{field} must be positive integer"):
+        CanonicalBudget(**kwargs)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import threading
+import unicodedata
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from qwg.v4.crypto_verdict import (
+    build_signed_crypto_verdict_envelope,
+    validate_crypto_verdict_envelope,
+)
+from qwg.v4.nonce_store import NonceStore
+from qwg.v4.signing import (
+    build_signature_bundle,
+    build_test_signature_entry,
+    signed_payload_hash,
+    verify_test_only_signature,
+)
+from qwg.v4.trust_profile import CLASSICAL_ED25519, ML_DSA, build_test_trust_profile
+from tests.test_v4_crypto_verdict_contract import (
+    HASH_A,
+    VERIFY_AT,
+    signed_verdict,
+    unsigned_payload,
+)
+
+START = datetime(2026, 6, 21, tzinfo=UTC)
+
+
+def at(seconds: float) -> str:
+    return (START + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def record(store: NonceStore, request_id: str, nonce: str, *, now: float = 0, expires: float = 300) -> None:
+    store.check_and_record(request_id=request_id, freshness_nonce=nonce, not_after=at(expires), verification_time=at(now))
+
+
+def test_v4_nonce_store_rejects_replayed_pairs_within_the_window() -> None:
+    with NonceStore(bucket_seconds=60, buckets=10, max_nonces_per_bucket=8) as store:
+        record(store, "req-1", "nonce-1")
+        with pytest.raises(ValueError, match="freshness_nonce replay detected"):
+            record(store, "req-1", "nonce-1", now=200)
+        with pytest.raises(ValueError, match="freshness_nonce replay detected"):
+            record(store, "req-1", "nonce-1", expires=500)
+        record(store, "req-1", "nonce-2")
+        record(store, "req-2", "nonce-1")
+        record(store, "a", "bc")
+        record(store, "ab", "c")
+        assert store.stats() == {"live_nonces": 5, "buckets": 10, "bucket_seconds": 60, "capacity": 80}
+
+
+def test_v4_nonce_store_expires_whole_buckets_as_time_advances() -> None:
+    with NonceStore(bucket_seconds=60, buckets=4, max_nonces_per_bucket=4) as store:
+        record(store, "req-1", "nonce-1", expires=90)
+        record(store, "req-2", "nonce-2", expires=150)
+        assert store.stats()["live_nonces"] == 2
+        record(store, "req-3", "nonce-3", now=125, expires=200)
+        assert store.stats()["live_nonces"] == 2
+        record(store, "req-1", "nonce-1", now=125, expires=170)
+        record(store, "req-4", "nonce-4", now=200, expires=300)
+        record(store, "req-5", "nonce-5", now=250, expires=310)
+        with pytest.raises(ValueError, match="replay"):
+            record(store, "req-4", "nonce-4", now=250, expires=320)
+        record(store, "req-6", "nonce-6", now=250, expires=90 + 240)
+        record(store, "req-2", "nonce-2", now=250, expires=400)
+        assert store.stats()["live_nonces"] == 4
+
+
+def test_v4_nonce_store_fails_closed_outside_the_ring_or_when_full() -> None:
+    with NonceStore(bucket_seconds=60, buckets=3, max_nonces_per_bucket=3) as store:
+        with pytest.raises(ValueError, match="outside nonce store window"):
+            record(store, "req-1", "nonce-1", expires=180)
+        record(store, "req-1", "nonce-1", now=120, expires=130)
+        with pytest.raises(ValueError, match="outside nonce store window"):
+            record(store, "req-2", "nonce-2", now=0, expires=100)
+        record(store, "req-2", "nonce-2", now=0, expires=150)
+        record(store, "req-3", "nonce-3", now=0, expires=160)
+        with pytest.raises(ValueError, match="bucket is full"):
+            record(store, "req-4", "nonce-4", now=0, expires=170)
+        for bad in ({"request_id": " "}, {"freshness_nonce": ""}, {"not_after": "2026-06-21T00:05:00"}):
+            arguments = {"request_id": "req-9", "freshness_nonce": "nonce-9", "not_after": at(130), "verification_time": at(120)}
+            with pytest.raises(ValueError, match="must be"):
+                store.check_and_record(**{**arguments, **bad})
+
+
+def test_v4_nonce_store_probes_past_colliding_slots() -> None:
+    with NonceStore(bucket_seconds=60, buckets=2, max_nonces_per_bucket=64) as store:
+        for number in range(64):
+            record(store, f"req-{number}", "nonce", expires=30)
+        for number in range(64):
+            with pytest.raises(ValueError, match="replay"):
+                record(store, f"req-{number}", "nonce", expires=90)
+
+
+def test_v4_nonce_store_admits_exactly_one_of_concurrent_duplicates() -> None:
+    accepted: list[int] = []
+    with NonceStore(bucket_seconds=60, buckets=10, max_nonces_per_bucket=8) as store:
+
+        def attempt(worker: int) -> None:
+            try:
+                record(store, "req-1", "nonce-1")
+            except ValueError:
+                return
+            accepted.append(worker)
+
+        threads = [threading.Thread(target=attempt, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(accepted) == 1
+
+
+def test_v4_nonce_store_persists_through_a_mapped_file(tmp_path: Path) -> None:
+    path = tmp_path / "nonces.bin"
+    with NonceStore(bucket_seconds=60, buckets=4, max_nonces_per_bucket=4, path=path) as store:
+        record(store, "req-1", "nonce-1", now=60, expires=90)
+        store.flush()
+    store.close()
+    with NonceStore(bucket_seconds=60, buckets=4, max_nonces_per_bucket=4, path=path) as reopened:
+        assert reopened.stats()["live_nonces"] == 1
+        with pytest.raises(ValueError, match="replay"):
+            record(reopened, "req-1", "nonce-1", now=60, expires=100)
+        with pytest.raises(ValueError, match="outside nonce store window"):
+            record(reopened, "req-2", "nonce-2", now=0, expires=30)
+
+    for options in ({"buckets": 5}, {"bucket_seconds": 30}):
+        with pytest.raises(ValueError, match="parameters do not match"):
+            NonceStore(**{"bucket_seconds": 60, "buckets": 4, "max_nonces_per_bucket": 4, **options}, path=path)
+    path.write_bytes(b"\x00" * path.stat().st_size)
+    with pytest.raises(ValueError, match="parameters do not match"):
+        NonceStore(bucket_seconds=60, buckets=4, max_nonces_per_bucket=4, path=path)
+
+
+@pytest.mark.parametrize("option", ["bucket_seconds", "buckets", "max_nonces_per_bucket"])
+def test_v4_nonce_store_rejects_bad_geometry(option: str) -> None:
+    with pytest.raises(ValueError, match=f"{option} must be positive integer"):
+        NonceStore(**{option: 0})
+
+
+def test_v4_crypto_verdict_validation_checks_nonces_when_opted_in() -> None:
+    arguments = {
+        "expected_context_hash": HASH_A,
+        "trust_profile": build_test_trust_profile(),
+        "verification_time": VERIFY_AT,
+        "verifier": verify_test_only_signature,
+    }
+    validate_crypto_verdict_envelope(signed_verdict(), **arguments)
+    validate_crypto_verdict_envelope(signed_verdict(), **arguments)
+
+    with NonceStore() as store:
+        tampered = signed_verdict()
+        tampered["signature_bundle"]["signatures"][0]["signature"] = "0" * 64
+        with pytest.raises(ValueError, match="signature verification failed"):
+            validate_crypto_verdict_envelope(tampered, nonce_store=store, **arguments)
+        assert store.stats()["live_nonces"] == 0
+        checked = validate_crypto_verdict_envelope(signed_verdict(), nonce_store=store, **arguments)
+        assert checked["verification_summary"]["verified_algorithms"] == ["classical-ed25519", "ml-dsa"]
+        with pytest.raises(ValueError, match="freshness_nonce replay detected"):
+            validate_crypto_verdict_envelope(signed_verdict(), nonce_store=store, **arguments)
+
+
+def test_v4_crypto_verdict_replay_key_ignores_unicode_and_padding_spelling() -> None:
+    payload = {**unsigned_payload(), "request_id": "req-café", "freshness_nonce": "nonce-café"}
+    payload_hash = signed_payload_hash(payload=payload)
+    signatures = [build_test_signature_entry(algorithm=algorithm, signed_hash=payload_hash) for algorithm in (CLASSICAL_ED25519, ML_DSA)]
+    envelope = build_signed_crypto_verdict_envelope(unsigned_payload=payload, signature_bundle=build_signature_bundle(signatures=signatures))
+    arguments = {
+        "expected_context_hash": HASH_A,
+        "trust_profile": build_test_trust_profile(),
+        "verification_time": VERIFY_AT,
+        "verifier": verify_test_only_signature,
+    }
+    with NonceStore() as store:
+        validate_crypto_verdict_envelope(envelope, nonce_store=store, **arguments)
+        for request_id, nonce in (
+            ("req-café", unicodedata.normalize("NFD", "nonce-café")),
+            (unicodedata.normalize("NFD", "req-café"), " nonce-café "),
+        ):
+            respelled = {**envelope, "request_id": request_id, "freshness_nonce": nonce}
+            with pytest.raises(ValueError, match="freshness_nonce replay detected"):
+                validate_crypto_verdict_envelope(respelled, nonce_store=store, **arguments)
+        with pytest.raises(ValueError, match="freshness_nonce replay detected"):
+            record(store, "req-café", unicodedata.normalize("NFD", "nonce-café"), now=60)
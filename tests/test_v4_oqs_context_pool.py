@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Any
+
+import pytest
+
+from qwg.v4.oqs_context_pool import OqsSignatureContextPool
+from qwg.v4.oqs_falcon_backend import OQS_FALCON_MECHANISM, OqsFalcon1024Backend
+from qwg.v4.oqs_mldsa_backend import OQS_ML_DSA_MECHANISM, OqsMlDsaBackend
+from qwg.v4.real_crypto_backend import (
+    QwgV4RealCryptoBackendError,
+    encode_binary_signature_material,
+)
+
+REFERENCE = "hsm://qwg/pooled/v1"
+SECRET_KEY = b"qwg-v4-pooled-key"
+BACKENDS = (
+    pytest.param(OqsMlDsaBackend, "ml-dsa", OQS_ML_DSA_MECHANISM, id="ml-dsa"),
+    pytest.param(OqsFalcon1024Backend, "fn-dsa", OQS_FALCON_MECHANISM, id="falcon-1024"),
+)
+
+
+class NativeOqsError(RuntimeError):
+    pass
+
+
+class CountingSignature:
+    def __init__(self, mechanism: str, secret_key: bytes | None = None) -> None:
+        self.mechanism = mechanism
+        self.secret_key = secret_key
+        self.entered = False
+        self.freed = False
+        self.details_reads = 0
+
+    @property
+    def details(self) -> dict[str, int]:
+        self.details_reads += 1
+        return {"length_signature": hashlib.sha256(b"").digest_size}
+
+    def __enter__(self) -> CountingSignature:
+        self.entered = True
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.freed = True
+
+    def sign(self, message: bytes) -> bytes:
+        assert self.entered and not self.freed and self.secret_key is not None
+        return hashlib.sha256(b"sign|" + self.secret_key + message).digest()
+
+    def verify(self, message: bytes, signature: bytes, public_key: bytes) -> bool:
+        assert self.entered and not self.freed
+        return signature == hashlib.sha256(b"sign|" + public_key + message).digest()
+
+
+class CountingOqsModule:
+    def __init__(self, mechanism: str, signature_cls: type[CountingSignature] = CountingSignature) -> None:
+        self.enabled = (mechanism,)
+        self.signature_cls = signature_cls
+        self.discovery_calls = 0
+        self.contexts: list[CountingSignature] = []
+
+    def get_enabled_sig_mechanisms(self) -> tuple[str, ...]:
+        self.discovery_calls += 1
+        return self.enabled
+
+    def Signature(self, mechanism: str, secret_key: bytes | None = None) -> CountingSignature:  # noqa: N802
+        context = self.signature_cls(mechanism, secret_key)
+        self.contexts.append(context)
+        return context
+
+
+class CountingResolver:
+    def __init__(self, secret_key: bytes = SECRET_KEY) -> None:
+        self.secret_key = secret_key
+        self.calls = 0
+
+    def __call__(self, reference: str) -> bytes:
+        self.calls += 1
+        return self.secret_key
+
+
+def signed(message: bytes, secret_key: bytes = SECRET_KEY) -> str:
+    return encode_binary_signature_material(
+        hashlib.sha256(b"sign|" + secret_key + message).digest(),
+        field="signature",
+    )
+
+
+def verify(backend: Any, algorithm: str, message: bytes, signature: str) -> bool:
+    return backend.verify_signature(
+        algorithm=algorithm,
+        public_key=encode_binary_signature_material(SECRET_KEY, field="public_key"),
+        message=message,
+        signature=signature,
+    )
+
+
+@pytest.mark.parametrize(("backend_cls", "algorithm", "mechanism"), BACKENDS)
+def test_v4_oqs_backend_reuses_one_verifier_and_discovers_mechanism_once(
+    backend_cls: Any, algorithm: str, mechanism: str
+) -> None:
+    oqs = CountingOqsModule(mechanism)
+    backend = backend_cls(private_key_resolver=CountingResolver(), oqs_module=oqs)
+
+    for index in range(25):
+        message = f"message-{index}".encode()
+        assert verify(backend, algorithm, message, signed(message)) is True
+    assert verify(backend, algorithm, b"message", signed(b"other")) is False
+
+    assert oqs.discovery_calls == 1
+    assert len(oqs.contexts) == 1
+    assert oqs.contexts[0].details_reads == 1
+    assert oqs.contexts[0].freed is False
+
+
+@pytest.mark.parametrize(("backend_cls", "algorithm", "mechanism"), BACKENDS)
+def test_v4_oqs_backend_shares_pooled_verifier_contexts_across_threads(
+    backend_cls: Any, algorithm: str, mechanism: str
+) -> None:
+    oqs = CountingOqsModule(mechanism)
+    backend = backend_cls(private_key_resolver=CountingResolver(), oqs_module=oqs)
+    barrier = threading.Barrier(4)
+    results: list[bool] = []
+
+    def worker() -> None:
+        barrier.wait()
+        for _ in range(10):
+            results.append(verify(backend, algorithm, b"message", signed(b"message")))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 40
+    created = len(oqs.contexts)
+    assert 1 <= created <= 4
+
+    backend.close()
+    assert all(context.freed for context in oqs.contexts)
+    assert verify(backend, algorithm, b"message", signed(b"message")) is True
+    assert len(oqs.contexts) == created + 1
+
+
+@pytest.mark.parametrize(("backend_cls", "algorithm", "mechanism"), BACKENDS)
+def test_v4_oqs_backend_reuses_signer_while_resolving_key_on_every_call(
+    backend_cls: Any, algorithm: str, mechanism: str
+) -> None:
+    oqs = CountingOqsModule(mechanism)
+    resolver = CountingResolver()
+    backend = backend_cls(private_key_resolver=resolver, oqs_module=oqs)
+
+    for index in range(10):
+        message = f"message-{index}".encode()
+        assert backend.sign_message(algorithm=algorithm, private_key_reference=REFERENCE, message=message) == signed(message)
+    assert resolver.calls == 10
+    assert len(oqs.contexts) == 1
+
+    with pytest.raises(QwgV4RealCryptoBackendError, match="private_key_reference"):
+        backend.sign_message(algorithm=algorithm, private_key_reference="test-only-private", message=b"message")
+    assert resolver.calls == 10
+
+    resolver.secret_key = b"qwg-v4-rotated-key"
+    rotated = backend.sign_message(algorithm=algorithm, private_key_reference=REFERENCE, message=b"message")
+    assert rotated == signed(b"message", secret_key=b"qwg-v4-rotated-key")
+    assert len(oqs.contexts) == 2
+    assert oqs.contexts[0].freed is True
+    assert oqs.contexts[1].freed is False
+
+
+class BlockingSignature(CountingSignature):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def sign(self, message: bytes) -> bytes:
+        self.barrier.wait()
+        return super().sign(message)
+
+
+@pytest.mark.parametrize("max_idle_signers", [1, 4])
+def test_v4_oqs_signer_contexts_are_checked_out_exclusively(max_idle_signers: int) -> None:
+    oqs = CountingOqsModule(OQS_ML_DSA_MECHANISM, signature_cls=BlockingSignature)
+    backend = OqsMlDsaBackend(
+        private_key_resolver=CountingResolver(),
+        oqs_module=oqs,
+        max_idle_signers=max_idle_signers,
+    )
+    signatures: list[str] = []
+
+    def worker() -> None:
+        signatures.append(backend.sign_message(algorithm="ml-dsa", private_key_reference=REFERENCE, message=b"m"))
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert signatures == [signed(b"m")] * 2
+    assert len(oqs.contexts) == 2
+    assert sum(context.freed for context in oqs.contexts) == max(0, 2 - max_idle_signers)
+
+
+class FlakySignature(CountingSignature):
+    def sign(self, message: bytes) -> bytes:
+        if message == b"fail":
+            raise NativeOqsError("native sign failure")
+        return super().sign(message)
+
+    def verify(self, message: bytes, signature: bytes, public_key: bytes) -> bool:
+        if message == b"fail":
+            raise NativeOqsError("native verify failure")
+        return super().verify(message, signature, public_key)
+
+
+@pytest.mark.parametrize(("backend_cls", "algorithm", "mechanism"), BACKENDS)
+def test_v4_oqs_backend_never_reuses_context_after_native_failure(
+    backend_cls: Any, algorithm: str, mechanism: str
+) -> None:
+    oqs = CountingOqsModule(mechanism, signature_cls=FlakySignature)
+    backend = backend_cls(private_key_resolver=CountingResolver(), oqs_module=oqs)
+
+    assert verify(backend, algorithm, b"ok", signed(b"ok")) is True
+    with pytest.raises(QwgV4RealCryptoBackendError, match="verify failed closed"):
+        verify(backend, algorithm, b"fail", signed(b"fail"))
+    assert oqs.contexts[0].freed is True
+    assert verify(backend, algorithm, b"ok", signed(b"ok")) is True
+    assert len(oqs.contexts) == 2
+
+    with pytest.raises(QwgV4RealCryptoBackendError, match="sign failed closed"):
+        backend.sign_message(algorithm=algorithm, private_key_reference=REFERENCE, message=b"fail")
+    assert oqs.contexts[2].freed is True
+    assert backend.sign_message(algorithm=algorithm, private_key_reference=REFERENCE, message=b"ok") == signed(b"ok")
+    assert len(oqs.contexts) == 4
+
+
+class UnfreeableSignature:
+    def __init__(self, mechanism: str, secret_key: bytes | None = None) -> None:
+        self.mechanism = mechanism
+
+
+class FailingFreeSignature(UnfreeableSignature):
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        raise NativeOqsError("native free failure")
+
+
+def test_v4_oqs_context_pool_close_tolerates_contexts_without_clean_free() -> None:
+    pool = OqsSignatureContextPool(mechanism=OQS_ML_DSA_MECHANISM)
+    with pool.verifier(UnfreeableSignature) as unfreeable:
+        assert isinstance(unfreeable, UnfreeableSignature)
+    with pool.signer(FailingFreeSignature, private_key_reference=REFERENCE, secret_key=SECRET_KEY):
+        pass
+    with pytest.raises(NativeOqsError), pool.verifier(FailingFreeSignature):
+        raise NativeOqsError("native verify failure")
+    pool.close()
+
+
+def test_v4_oqs_context_pool_close_never_frees_a_context_in_use() -> None:
+    pool = OqsSignatureContextPool(mechanism=OQS_ML_DSA_MECHANISM, max_idle_verifiers=1)
+    with pool.verifier(CountingSignature) as idle:
+        pass
+    with pool.verifier(CountingSignature) as busy, pool.verifier(CountingSignature) as extra:
+        assert busy is idle and extra is not idle and extra.entered
+        with pool.signer(CountingSignature, private_key_reference=REFERENCE, secret_key=SECRET_KEY) as signer:
+            pool.close()
+            assert not busy.freed and not extra.freed and not signer.freed
+            assert busy.verify(b"m", hashlib.sha256(b"sign|k" + b"m").digest(), b"k")
+        assert signer.freed
+    assert busy.freed and extra.freed
+    assert pool.stats() == {"idle_verifiers": 0, "idle_signers": 0}
+    with pool.verifier(CountingSignature) as fresh:
+        assert fresh is not busy
+    with pool.verifier(CountingSignature) as reused:
+        assert reused is fresh
+
+
+def test_v4_oqs_context_pool_rejects_invalid_configuration() -> None:
+    with pytest.raises(ValueError, match="mechanism must be non-empty string"):
+        OqsSignatureContextPool(mechanism=" ")
+    with pytest.raises(ValueError, match="max_idle_signers must be positive integer"):
+        OqsSignatureContextPool(mechanism=OQS_ML_DSA_MECHANISM, max_idle_signers=0)
+    with pytest.raises(ValueError, match="max_idle_verifiers must be positive integer"):
+        OqsSignatureContextPool(mechanism=OQS_ML_DSA_MECHANISM, max_idle_verifiers=0)
+    with pytest.raises(ValueError, match="max_idle_signers must be positive integer"):
+        OqsMlDsaBackend(private_key_resolver=CountingResolver(), max_idle_signers=True)  # type: ignore[arg-type]
+
+
+def test_v4_oqs_context_pool_keeps_a_digest_not_the_secret_and_releases_signers() -> None:
+    pool = OqsSignatureContextPool(mechanism=OQS_ML_DSA_MECHANISM)
+    with pool.signer(CountingSignature, private_key_reference=REFERENCE, secret_key=SECRET_KEY) as idle:
+        pass
+    ((fingerprint, _),) = pool._idle_signers.values()
+    assert len(fingerprint) == 32 and SECRET_KEY not in fingerprint
+    assert pool.stats() == {"idle_verifiers": 0, "idle_signers": 1}
+
+    with pool.signer(CountingSignature, private_key_reference=REFERENCE, secret_key=SECRET_KEY) as reused:
+        assert reused is idle
+        pool.release_signers(REFERENCE)
+    assert reused.freed is True
+    assert pool.stats()["idle_signers"] == 0
+
+    with pool.signer(CountingSignature, private_key_reference=REFERENCE, secret_key=SECRET_KEY) as fresh:
+        assert fresh is not idle
+    pool.release_signers(REFERENCE)
+    pool.release_signers("hsm://qwg/never-used")
+    assert fresh.freed is True
+    assert pool.stats()["idle_signers"] == 0
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+import pytest
+
+from qwg.v4.oqs_falcon_backend import OQS_FALCON_MECHANISM, OqsFalcon1024Backend
+from qwg.v4.oqs_mldsa_backend import OQS_ML_DSA_MECHANISM, OqsMlDsaBackend
+from qwg.v4.private_key_cache import PrivateKeyCache
+from qwg.v4.real_crypto_backend import QwgV4RealCryptoBackendError, encode_binary_signature_material
+
+REFERENCE = "hsm://qwg/cached/v1"
+SECRET_KEY = b"qwg-v4-cached-private-key"
+BACKENDS = (
+    pytest.param(OqsMlDsaBackend, "ml-dsa", OQS_ML_DSA_MECHANISM, id="ml-dsa"),
+    pytest.param(OqsFalcon1024Backend, "fn-dsa", OQS_FALCON_MECHANISM, id="falcon-1024"),
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingResolver:
+    def __init__(self) -> None:
+        self.keys: dict[str, Any] = {REFERENCE: SECRET_KEY}
+        self.calls: list[str] = []
+
+    def __call__(self, reference: str) -> Any:
+        self.calls.append(reference)
+        return self.keys.get(reference, b"")
+
+
+class FakeOqsSignature:
+    def __init__(self, mechanism: str, secret_key: bytes | None = None) -> None:
+        self.secret_key = secret_key
+
+    def sign(self, message: bytes) -> bytes:
+        assert self.secret_key is not None
+        return hashlib.sha256(self.secret_key + message).digest()
+
+
+class FakeOqsModule:
+    def __init__(self, mechanism: str) -> None:
+        self.enabled = (mechanism,)
+
+    def get_enabled_sig_mechanisms(self) -> tuple[str, ...]:
+        return self.enabled
+
+    Signature = FakeOqsSignature
+
+
+def cached_materials(cache: PrivateKeyCache) -> list[bytearray]:
+    return [material for _, material in cache._entries.values()]
+
+
+def test_v4_private_key_cache_hits_until_ttl_then_zeroizes_expired_key() -> None:
+    clock = FakeClock()
+    resolver = CountingResolver()
+    cache = PrivateKeyCache(ttl_seconds=30, clock=clock)
+
+    assert cache.resolve(REFERENCE, resolver) == SECRET_KEY
+    (material,) = cached_materials(cache)
+    clock.now += 29.5
+    assert cache.resolve(REFERENCE, resolver) == SECRET_KEY
+    assert resolver.calls == [REFERENCE]
+
+    clock.now += 1
+    assert cache.resolve(REFERENCE, resolver) == SECRET_KEY
+    assert resolver.calls == [REFERENCE, REFERENCE]
+    assert material == bytearray(len(SECRET_KEY))
+    assert cache.stats() == {
+        "entries": 1,
+        "hits": 1,
+        "misses": 2,
+        "expirations": 1,
+        "evictions": 0,
+        "resolver_calls_saved": 1,
+    }
+
+
+def test_v4_private_key_cache_evicts_least_recently_used_and_zeroizes() -> None:
+    resolver = CountingResolver()
+    resolver.keys = {f"hsm://qwg/{index}": f"key-{index}".encode() for index in range(3)}
+    cache = PrivateKeyCache(max_entries=2, clock=FakeClock())
+
+    cache.resolve("hsm://qwg/0", resolver)
+    cache.resolve("hsm://qwg/1", resolver)
+    first, _ = cached_materials(cache)
+    cache.resolve("hsm://qwg/0", resolver)
+    cache.resolve("hsm://qwg/2", resolver)
+
+    assert list(cache._entries) == ["hsm://qwg/0", "hsm://qwg/2"]
+    assert first == bytearray(b"key-0")
+    assert cache.stats()["evictions"] == 1
+
+    remaining = cached_materials(cache)
+    assert cache.invalidate("hsm://qwg/0") is True
+    assert cache.invalidate("hsm://qwg/0") is False
+    cache.clear()
+    assert all(not any(material) for material in remaining)
+    assert cache.stats()["entries"] == 0
+
+
+def test_v4_private_key_cache_replaces_concurrently_resolved_entry() -> None:
+    cache = PrivateKeyCache(clock=FakeClock())
+    cache._store(REFERENCE, b"old-key")
+    (old,) = cached_materials(cache)
+    cache._store(REFERENCE, SECRET_KEY)
+    assert old == bytearray(len(b"old-key"))
+    assert cache.resolve(REFERENCE, CountingResolver()) == SECRET_KEY
+
+
+def test_v4_private_key_cache_never_caches_unusable_resolver_results() -> None:
+    resolver = CountingResolver()
+    resolver.keys = {"empty": b"", "mutable": bytearray(b"key"), "text": "key"}
+    cache = PrivateKeyCache(clock=FakeClock())
+
+    for reference in ("empty", "mutable", "text", "empty"):
+        assert cache.resolve(reference, resolver) == resolver.keys[reference]
+    assert resolver.calls == ["empty", "mutable", "text", "empty"]
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"ttl_seconds": 0}, "ttl_seconds"),
+        ({"ttl_seconds": float("inf")}, "ttl_seconds"),
+        ({"ttl_seconds": True}, "ttl_seconds"),
+        ({"ttl_seconds": "30"}, "ttl_seconds"),
+        ({"max_entries": 0}, "max_entries must be positive integer"),
+    ],
+)
+def test_v4_private_key_cache_rejects_invalid_configuration(kwargs: dict[str, Any], message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        PrivateKeyCache(**kwargs)
+
+
+@pytest.mark.parametrize(("backend_cls", "algorithm", "mechanism"), BACKENDS)
+def test_v4_oqs_backend_uses_private_key_cache_but_rejects_test_only_references_every_call(
+    backend_cls: Any, algorithm: str, mechanism: str
+) -> None:
+    resolver = CountingResolver()
+    resolver.keys["test-only-private"] = SECRET_KEY
+    cache = PrivateKeyCache(clock=FakeClock())
+    backend = backend_cls(private_key_resolver=resolver, oqs_module=FakeOqsModule(mechanism), private_key_cache=cache)
+    expected = encode_binary_signature_material(hashlib.sha256(SECRET_KEY + b"message").digest(), field="signature")
+
+    for _ in range(5):
+        assert backend.sign_message(algorithm=algorithm, private_key_reference=REFERENCE, message=b"message") == expected
+        with pytest.raises(QwgV4RealCryptoBackendError, match="private_key_reference"):
+            backend.sign_message(algorithm=algorithm, private_key_reference="test-only-private", message=b"message")
+    with pytest.raises(QwgV4RealCryptoBackendError, match="secret_key"):
+        backend.sign_message(algorithm=algorithm, private_key_reference="hsm://qwg/unknown", message=b"message")
+
+    assert resolver.calls == [REFERENCE, "hsm://qwg/unknown"]
+    assert cache.stats()["resolver_calls_saved"] == 4
+
+    with pytest.raises(QwgV4RealCryptoBackendError, match="private_key_cache"):
+        backend_cls(private_key_resolver=resolver, private_key_cache={})
+
+
+@pytest.mark.parametrize(("backend_cls", "algorithm", "mechanism"), BACKENDS)
+def test_v4_private_key_cache_serves_one_backend_and_refuses_a_second(
+    backend_cls: Any, algorithm: str, mechanism: str
+) -> None:
+    cache = PrivateKeyCache(clock=FakeClock())
+    resolver = CountingResolver()
+    owner = OqsFalcon1024Backend if backend_cls is OqsMlDsaBackend else OqsMlDsaBackend
+    other_mechanism = OQS_FALCON_MECHANISM if backend_cls is OqsMlDsaBackend else OQS_ML_DSA_MECHANISM
+    first = owner(private_key_resolver=resolver, oqs_module=FakeOqsModule(other_mechanism), private_key_cache=cache)
+    cache.bind(first)
+
+    with pytest.raises(QwgV4RealCryptoBackendError, match="already bound to another backend"):
+        backend_cls(private_key_resolver=resolver, oqs_module=FakeOqsModule(mechanism), private_key_cache=cache)
+    with pytest.raises(ValueError, match="already bound to another backend"):
+        cache.bind(object())
+
+
+class FreeTrackingSignature(FakeOqsSignature):
+    created: list[FreeTrackingSignature] = []
+
+    def __init__(self, mechanism: str, secret_key: bytes | None = None) -> None:
+        super().__init__(mechanism, secret_key)
+        self.freed = False
+        self.created.append(self)
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.freed = True
+
+
+class FreeTrackingOqsModule(FakeOqsModule):
+    Signature = FreeTrackingSignature
+
+
+@pytest.mark.parametrize(("backend_cls", "algorithm", "mechanism"), BACKENDS)
+def test_v4_oqs_backend_pooled_signers_do_not_outlive_the_cached_key(
+    backend_cls: Any, algorithm: str, mechanism: str
+) -> None:
+    FreeTrackingSignature.created = []
+    clock = FakeClock()
+    cache = PrivateKeyCache(ttl_seconds=30, clock=clock)
+    backend = backend_cls(
+        private_key_resolver=CountingResolver(), oqs_module=FreeTrackingOqsModule(mechanism), private_key_cache=cache
+    )
+
+    def sign() -> None:
+        backend.sign_message(algorithm=algorithm, private_key_reference=REFERENCE, message=b"message")
+
+    sign()
+    sign()
+    (first,) = FreeTrackingSignature.created
+    assert backend._contexts.stats()["idle_signers"] == 1
+    assert cache.invalidate(REFERENCE) is True
+    assert first.freed is True and backend._contexts.stats()["idle_signers"] == 0
+
+    sign()
+    second = FreeTrackingSignature.created[-1]
+    clock.now += 30
+    assert cache.purge_expired() == 1
+    assert cache.purge_expired() == 0
+    assert second.freed is True and backend._contexts.stats()["idle_signers"] == 0
+
+    sign()
+    third = FreeTrackingSignature.created[-1]
+    clock.now += 30
+    cache.resolve("hsm://qwg/other", CountingResolver())
+    assert third.freed is True
+    sign()
+    cache.clear()
+    assert all(context.freed for context in FreeTrackingSignature.created)
+    assert cache.stats()["expirations"] == 2
+
+
+def test_v4_private_key_cache_runs_discard_hooks_for_every_dropped_key() -> None:
+    dropped: list[str] = []
+    resolver = CountingResolver()
+    resolver.keys = {f"hsm://qwg/{index}": f"key-{index}".encode() for index in range(3)}
+    cache = PrivateKeyCache(max_entries=2, clock=FakeClock())
+    cache.add_discard_hook(dropped.append)
+    for index in range(3):
+        cache.resolve(f"hsm://qwg/{index}", resolver)
+    cache._store("hsm://qwg/2", b"rotated")
+    cache.invalidate("hsm://qwg/1")
+    assert dropped == ["hsm://qwg/0", "hsm://qwg/2", "hsm://qwg/1"]
+    with pytest.raises(ValueError, match="discard hook must be callable"):
+        cache.add_discard_hook("hook")  # type: ignore[arg-type]
@@ -0,0 +1,201 @@
+"""Process signing pool tests.
+
+This module doubles as the pure-Python stub ``oqs`` module imported by the
+spawned worker processes (``get_enabled_sig_mechanisms`` and ``Signature``
+below), so no liboqs installation is needed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from collections.abc import Iterator
+
+import pytest
+
+import qwg.v4.process_signing_pool as pool_module
+from qwg.v4.oqs_falcon_backend import OQS_FALCON_MECHANISM, OqsFalcon1024Backend
+from qwg.v4.oqs_mldsa_backend import OQS_ML_DSA_MECHANISM, OqsMlDsaBackend
+from qwg.v4.process_signing_pool import OqsWorkerBackendFactory, ProcessSigningPool
+from qwg.v4.real_crypto_backend import (
+    QwgV4RealCryptoBackendError,
+    QwgV4RealCryptoBackendUnavailable,
+    QwgV4RealCryptoMaterialError,
+    encode_binary_signature_material,
+)
+
+STUB_OQS_MODULE = __name__
+REFERENCES = {
+    "hsm://qwg/ml-dsa/v1": b"qwg-v4-process-ml-dsa-key",
+    "hsm://qwg/fn-dsa/v1": b"qwg-v4-process-falcon-key",
+}
+
+
+def get_enabled_sig_mechanisms() -> tuple[str, ...]:
+    return (OQS_ML_DSA_MECHANISM, OQS_FALCON_MECHANISM)
+
+
+def oqs_version() -> str:
+    return "stub-liboqs"
+
+
+def oqs_python_version() -> str:
+    return f"stub-liboqs-python-pid-{os.getpid()}"
+
+
+class Signature:
+    def __init__(self, mechanism: str, secret_key: bytes | None = None) -> None:
+        self.mechanism = mechanism
+        self.secret_key = secret_key
+
+    def sign(self, message: bytes) -> bytes:
+        assert self.secret_key is not None
+        return hashlib.sha256(self.mechanism.encode() + b"|" + self.secret_key + message).digest()
+
+    def verify(self, message: bytes, signature: bytes, public_key: bytes) -> bool:
+        return signature == hashlib.sha256(self.mechanism.encode() + b"|" + public_key + message).digest()
+
+
+def resolve_private_key(reference: str) -> bytes:
+    if reference == "hsm://qwg/crash":
+        os._exit(17)
+    return REFERENCES.get(reference, b"")
+
+
+def expected_signature(mechanism: str, reference: str, message: bytes) -> str:
+    digest = hashlib.sha256(mechanism.encode() + b"|" + REFERENCES[reference] + message).digest()
+    return encode_binary_signature_material(digest, field="signature")
+
+
+def factories(**overrides: object) -> tuple[OqsWorkerBackendFactory, ...]:
+    ml_dsa_fields: dict[str, object] = {
+        "backend_cls": OqsMlDsaBackend,
+        "private_key_resolver": resolve_private_key,
+        "oqs_module_name": STUB_OQS_MODULE,
+        "preload_private_key_references": ("hsm://qwg/ml-dsa/v1",),
+    }
+    ml_dsa_fields.update(overrides)
+    return (
+        OqsWorkerBackendFactory(**ml_dsa_fields),  # type: ignore[arg-type]
+        OqsWorkerBackendFactory(
+            backend_cls=OqsFalcon1024Backend,
+            private_key_resolver=resolve_private_key,
+            oqs_module_name=STUB_OQS_MODULE,
+        ),
+    )
+
+
+@pytest.fixture(scope="module")
+def pool() -> Iterator[ProcessSigningPool]:
+    with ProcessSigningPool(backend_factories=factories(), processes=2, batch_size=3) as signing_pool:
+        yield signing_pool
+
+
+def test_v4_process_signing_pool_signs_batches_in_request_order(pool: ProcessSigningPool) -> None:
+    requests = [
+        ("ml-dsa" if index % 2 else "fn-dsa", "hsm://qwg/ml-dsa/v1" if index % 2 else "hsm://qwg/fn-dsa/v1", f"m{index}".encode())
+        for index in range(11)
+    ]
+    expected = [
+        expected_signature(OQS_ML_DSA_MECHANISM if algorithm == "ml-dsa" else OQS_FALCON_MECHANISM, reference, message)
+        for algorithm, reference, message in requests
+    ]
+
+    assert pool.sign_messages(requests) == expected
+    assert pool.sign_messages([]) == []
+    assert pool.supported_algorithms == ("ml-dsa", "fn-dsa")
+    assert pool.backend_version.startswith("processes=2;liboqs=stub-liboqs;liboqs-python=stub-liboqs-python-pid-")
+
+    signature = pool.sign_message(algorithm="ml-dsa", private_key_reference="hsm://qwg/ml-dsa/v1", message=b"message")
+    public_key = encode_binary_signature_material(REFERENCES["hsm://qwg/ml-dsa/v1"], field="public_key")
+    assert pool.verify_signature(algorithm="ml-dsa", public_key=public_key, message=b"message", signature=signature) is True
+    assert pool.verify_signature(algorithm="ml-dsa", public_key=public_key, message=b"other", signature=signature) is False
+
+
+def test_v4_process_signing_pool_surfaces_worker_fail_closed_errors_unchanged(pool: ProcessSigningPool) -> None:
+    with pytest.raises(QwgV4RealCryptoMaterialError, match="private_key_reference must not contain test-only material"):
+        pool.sign_message(algorithm="ml-dsa", private_key_reference="test-only-key", message=b"message")
+    with pytest.raises(QwgV4RealCryptoBackendError, match="secret_key must be non-empty bytes"):
+        pool.sign_messages([("ml-dsa", "hsm://qwg/ml-dsa/v1", b"ok"), ("fn-dsa", "hsm://qwg/unknown", b"bad")])
+    with pytest.raises(QwgV4RealCryptoBackendUnavailable, match="process signing pool does not support"):
+        pool.sign_message(algorithm="classical-ed25519", private_key_reference="hsm://qwg/ml-dsa/v1", message=b"m")
+    with pytest.raises(QwgV4RealCryptoBackendError, match="public_key"):
+        pool.verify_signature(algorithm="fn-dsa", public_key="not-b64u", message=b"m", signature="b64u:AA")
+
+
+def test_v4_process_signing_pool_fails_closed_when_workers_crash_or_pool_is_closed() -> None:
+    signing_pool = ProcessSigningPool(backend_factories=factories(), processes=1)
+    with pytest.raises(QwgV4RealCryptoBackendError, match="process signing pool failed closed"):
+        signing_pool.sign_message(algorithm="ml-dsa", private_key_reference="hsm://qwg/crash", message=b"m")
+    with pytest.raises(QwgV4RealCryptoBackendError, match="process signing pool failed closed"):
+        signing_pool.sign_message(algorithm="ml-dsa", private_key_reference="hsm://qwg/ml-dsa/v1", message=b"m")
+    signing_pool.close()
+
+    closed_pool = ProcessSigningPool(backend_factories=factories(), processes=1)
+    closed_pool.close()
+    with pytest.raises(QwgV4RealCryptoBackendError, match="process signing pool failed closed"):
+        closed_pool.sign_messages([("ml-dsa", "hsm://qwg/ml-dsa/v1", b"m")])
+
+
+def test_v4_process_signing_pool_worker_functions_run_in_process() -> None:
+    try:
+        pool_module._worker_initialize(factories())
+        assert pool_module._worker_sign_batch([("fn-dsa", "hsm://qwg/fn-dsa/v1", b"m")]) == [
+            expected_signature(OQS_FALCON_MECHANISM, "hsm://qwg/fn-dsa/v1", b"m")
+        ]
+        public_key = encode_binary_signature_material(REFERENCES["hsm://qwg/fn-dsa/v1"], field="public_key")
+        signature = expected_signature(OQS_FALCON_MECHANISM, "hsm://qwg/fn-dsa/v1", b"m")
+        assert pool_module._worker_verify("fn-dsa", public_key, b"m", signature) is True
+        assert len(pool_module._worker_backend_versions()) == 2
+        with pytest.raises(QwgV4RealCryptoBackendUnavailable):
+            pool_module._worker_backend("classical-ed25519")
+    finally:
+        pool_module._WORKER_BACKENDS.clear()
+
+    with pytest.raises(QwgV4RealCryptoMaterialError):
+        factories(preload_private_key_references=("test-only-key",))[0]()
+
+
+def test_v4_process_signing_pool_reports_backend_version_without_a_round_trip(
+    pool: ProcessSigningPool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    version = pool.backend_version
+
+    def no_round_trip(*args: object) -> None:
+        raise AssertionError("backend_version must not submit work")
+
+    monkeypatch.setattr(pool, "_submit", no_round_trip)
+    assert pool.backend_version == version
+
+
+def test_v4_process_signing_pool_worker_keeps_preloaded_keys_for_its_lifetime() -> None:
+    calls: list[str] = []
+
+    def counting_resolver(reference: str) -> bytes:
+        calls.append(reference)
+        return REFERENCES[reference]
+
+    for ttl_seconds, resolutions in ((None, 1), (5.0, 2)):
+        calls.clear()
+        factory = factories(private_key_resolver=counting_resolver, private_key_cache_ttl_seconds=ttl_seconds)[0]
+        backend = factory()
+        backend._private_key_cache._clock = lambda: time.monotonic() + 86_400  # type: ignore[attr-defined]
+        backend.sign_message(algorithm="ml-dsa", private_key_reference="hsm://qwg/ml-dsa/v1", message=b"m")
+        assert calls == ["hsm://qwg/ml-dsa/v1"] * resolutions
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"backend_factories": []}, "backend_factories must be non-empty"),
+        ({"backend_factories": ["factory"]}, "backend_factories must be non-empty"),
+        ({"backend_factories": factories() + factories()[:1]}, "distinct algorithms"),
+        ({"backend_factories": [OqsWorkerBackendFactory(backend_cls=object, private_key_resolver=resolve_private_key)]}, "distinct algorithms"),
+        ({"backend_factories": factories(), "processes": 0}, "processes must be positive integer"),
+        ({"backend_factories": factories(), "batch_size": 0}, "batch_size must be positive integer"),
+    ],
+)
+def test_v4_process_signing_pool_rejects_invalid_configuration(kwargs: dict[str, object], message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        ProcessSigningPool(**kwargs)  # type: ignore[arg-type]
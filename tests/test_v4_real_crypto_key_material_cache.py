@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import random
+from typing import Any
+
+import pytest
+
+from qwg.v4.real_crypto_backend import (
+    DecodedPublicKeyCache,
+    ExecutorAsyncRealCryptoBackend,
+    QwgV4RealCryptoBackendError,
+    QwgV4RealCryptoMaterialError,
+    decode_binary_signature_material,
+    encode_binary_signature_material,
+    make_async_real_crypto_signature_verifier,
+    make_real_crypto_signature_verifier,
+    verify_signature_entry_with_async_backend,
+    verify_signature_entry_with_real_backend,
+)
+from tests.test_v4_async_real_crypto_backend import NativeAsyncBackend
+from tests.test_v4_real_crypto_backend_contract import (
+    PUBLIC_KEY_BYTES,
+    FakeRealBackend,
+    real_key,
+    signature_for_key,
+)
+
+_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+
+
+def reference_decode(body: str) -> bytes | None:
+    if not body or "=" in body or set(body) - set(_ALPHABET):
+        return None
+    try:
+        return base64.urlsafe_b64decode(body + "=" * (-len(body) % 4)) or None
+    except ValueError:
+        return None
+
+
+def test_v4_b64u_fast_path_matches_reference_decoder_on_fuzzed_bodies() -> None:
+    rng = random.Random(34)
+    noise = _ALPHABET + "+/=. \n\té٠"
+    for size in (1, 2, 3, 4, 5, 1312, 1793, 2420, 3309):
+        raw = rng.randbytes(size)
+        encoded = encode_binary_signature_material(raw, field="signature")
+        assert decode_binary_signature_material(encoded, field="signature") == raw
+    for _ in range(2_000):
+        body = "".join(rng.choice(noise if rng.random() < 0.2 else _ALPHABET) for _ in range(rng.randint(1, 12)))
+        expected = reference_decode(body)
+        if expected is None:
+            with pytest.raises(QwgV4RealCryptoBackendError, match="signature (b64u payload|must not contain surrounding whitespace)"):
+                decode_binary_signature_material(f"b64u:{body}", field="signature")
+        else:
+            assert decode_binary_signature_material(f"b64u:{body}", field="signature") == expected
+
+
+def test_v4_public_key_cache_decodes_each_registry_key_once_per_snapshot() -> None:
+    cache = DecodedPublicKeyCache()
+    verifier = make_real_crypto_signature_verifier(FakeRealBackend(), public_key_cache=cache)
+    keys = [real_key(algorithm=algorithm) for algorithm in ("classical-ed25519", "ml-dsa", "fn-dsa")]
+    for _ in range(3):
+        for key in keys:
+            assert verifier(signature_for_key(key), dict(key)) is True
+    assert cache.stats() == {"entries": 3, "hits": 6, "misses": 3}
+
+    rotated = real_key(public_key=encode_binary_signature_material(b"rotated-ml-dsa-public-key", field="public_key"))
+    assert verify_signature_entry_with_real_backend(signature_for_key(rotated), rotated, backend=FakeRealBackend(), public_key_cache=cache) is True
+    assert verifier(signature_for_key(keys[1]), keys[1]) is True
+    assert cache.stats() == {"entries": 3, "hits": 6, "misses": 5}
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+
+
+def test_v4_public_key_cache_keeps_fail_closed_material_checks() -> None:
+    cache = DecodedPublicKeyCache()
+    key = real_key()
+    entry = signature_for_key(key)
+    verify_signature_entry_with_real_backend(entry, key, backend=FakeRealBackend(), public_key_cache=cache)
+
+    with pytest.raises(QwgV4RealCryptoMaterialError, match="public_key must not contain test-only material"):
+        verify_signature_entry_with_real_backend(entry, real_key(public_key="TEST-ONLY-PUBLIC-key"), backend=FakeRealBackend(), public_key_cache=cache)
+    with pytest.raises(QwgV4RealCryptoBackendError, match="public_key b64u payload is invalid"):
+        verify_signature_entry_with_real_backend(entry, real_key(public_key="b64u:not*valid"), backend=FakeRealBackend(), public_key_cache=cache)
+    test_key = dict(key, key_id="test-shield_component_qwg-ml-dsa-v1")
+    with pytest.raises(QwgV4RealCryptoMaterialError, match="key_id must not contain test-only material"):
+        verify_signature_entry_with_real_backend(dict(entry, key_id=test_key["key_id"]), test_key, backend=FakeRealBackend(), public_key_cache=cache)
+    assert cache.stats() == {"entries": 1, "hits": 0, "misses": 3}
+
+
+def test_v4_async_verifier_shares_the_public_key_cache() -> None:
+    cache = DecodedPublicKeyCache()
+    key = real_key()
+    verifier = make_async_real_crypto_signature_verifier(NativeAsyncBackend(), public_key_cache=cache)
+
+    async def verify_twice() -> list[bool]:
+        return [await verifier(signature_for_key(key), key), await verifier(signature_for_key(key), key)]
+
+    assert asyncio.run(verify_twice()) == [True, True]
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+class DecodedInputBackend(FakeRealBackend):
+    def __init__(self) -> None:
+        object.__setattr__(self, "received", [])
+
+    def verify_signature(self, *, algorithm: str, public_key: str, message: bytes, signature: str) -> bool:
+        raise AssertionError("decoded material must not be re-encoded for the backend")
+
+    def verify_decoded_signature(self, *, algorithm: str, public_key: bytes, message: bytes, signature: bytes) -> bool:
+        self.received.append((public_key, signature))  # type: ignore[attr-defined]
+        return super().verify_signature(
+            algorithm=algorithm,
+            public_key=encode_binary_signature_material(public_key, field="public_key"),
+            message=message,
+            signature=encode_binary_signature_material(signature, field="signature"),
+        )
+
+
+def test_v4_public_key_cache_hands_its_decoded_bytes_to_the_backend() -> None:
+    cache = DecodedPublicKeyCache()
+    key = real_key()
+    entry = signature_for_key(key)
+    backend = DecodedInputBackend()
+    received: list[Any] = backend.received  # type: ignore[attr-defined]
+
+    assert verify_signature_entry_with_real_backend(entry, key, backend=backend, public_key_cache=cache) is True
+    assert verify_signature_entry_with_real_backend(entry, key, backend=backend) is True
+    assert asyncio.run(
+        verify_signature_entry_with_async_backend(
+            entry, key, backend=ExecutorAsyncRealCryptoBackend(backend), public_key_cache=cache
+        )
+    ) is True
+    cached = cache.resolve(algorithm="ml-dsa", key_id=key["key_id"], key_version=1, public_key=key["public_key"])
+    assert [public_key for public_key, _ in received] == [PUBLIC_KEY_BYTES] * 3
+    assert received[0][0] is cached and received[2][0] is cached
+    assert received[0][1] == decode_binary_signature_material(entry["signature"], field="signature")
+
+
+def test_v4_public_key_cache_argument_is_type_checked() -> None:
+    with pytest.raises(QwgV4RealCryptoBackendError, match="public_key_cache must be DecodedPublicKeyCache"):
+        make_real_crypto_signature_verifier(FakeRealBackend(), public_key_cache={})  # type: ignore[arg-type]
+    with pytest.raises(QwgV4RealCryptoBackendError, match="public_key_cache must be DecodedPublicKeyCache"):
+        make_async_real_crypto_signature_verifier(NativeAsyncBackend(), public_key_cache={})  # type: ignore[arg-type]
+    with pytest.raises(QwgV4RealCryptoBackendError, match="public_key_cache must be DecodedPublicKeyCache"):
+        verify_signature_entry_with_real_backend(
+            signature_for_key(real_key()), real_key(), backend=FakeRealBackend(), public_key_cache={}  # type: ignore[arg-type]
+        )
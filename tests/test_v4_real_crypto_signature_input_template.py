@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from qwg.v4.real_crypto_backend import (
+    REAL_CRYPTO_SIGNATURE_INPUT_PREFIX,
+    QwgV4RealCryptoBackendError,
+    RealCryptoSignatureInputTemplate,
+    build_real_crypto_signature_input,
+    real_crypto_signature_input_template,
+)
+from qwg.v4.signing import COMPONENT_VERDICT_DOMAIN
+from qwg.v4.trust_profile import SUPPORTED_ALGORITHMS, default_standard_profile_for_algorithm
+
+KEY_ID = "shield_component_qwg-ml-dsa-v1"
+
+
+def joined_input(*, algorithm: str, signed_payload_hash: str, key_id: str, key_version: int) -> bytes:
+    return "\n".join(
+        (
+            REAL_CRYPTO_SIGNATURE_INPUT_PREFIX,
+            COMPONENT_VERDICT_DOMAIN,
+            signed_payload_hash,
+            algorithm,
+            default_standard_profile_for_algorithm(algorithm),
+            key_id,
+            str(key_version),
+        )
+    ).encode("utf-8")
+
+
+def template_for(algorithm: str = "ml-dsa", *, key_id: str = KEY_ID, key_version: int = 1) -> RealCryptoSignatureInputTemplate:
+    return real_crypto_signature_input_template(
+        algorithm=algorithm,
+        standard_profile=default_standard_profile_for_algorithm(algorithm),
+        domain_tag=COMPONENT_VERDICT_DOMAIN,
+        key_id=key_id,
+        key_version=key_version,
+    )
+
+
+def test_v4_signature_input_template_matches_joined_input_for_every_algorithm() -> None:
+    rng = random.Random(35)
+    for algorithm in SUPPORTED_ALGORITHMS:
+        for key_version in (1, 7, 1_000_000):
+            key_id = f"prod-qwg-{algorithm}-ä-v{key_version}"
+            template = template_for(algorithm, key_id=key_id, key_version=key_version)
+            for _ in range(20):
+                payload_hash = rng.randbytes(32).hex()
+                assert template.render(payload_hash) == joined_input(
+                    algorithm=algorithm,
+                    signed_payload_hash=payload_hash,
+                    key_id=key_id,
+                    key_version=key_version,
+                )
+
+
+def test_v4_signature_input_templates_are_memoised_per_key_identity() -> None:
+    assert template_for() is template_for()
+    assert template_for() is not template_for(key_version=2)
+    assert template_for() is not template_for("fn-dsa", key_id=KEY_ID)
+
+
+@pytest.mark.parametrize(
+    ("signed_payload_hash", "match"),
+    [
+        ("A" * 64, "lowercase"),
+        ("a" * 63, "64-character"),
+        ("z" * 64, "sha256"),
+        (" " + "a" * 63, "surrounding whitespace"),
+        (b"a" * 64, "non-empty string"),
+        (None, "non-empty string"),
+    ],
+)
+def test_v4_signature_input_template_still_rejects_invalid_payload_hashes(signed_payload_hash: object, match: str) -> None:
+    with pytest.raises(QwgV4RealCryptoBackendError, match=match):
+        template_for().render(signed_payload_hash)  # type: ignore[arg-type]
+
+
+def test_v4_signature_input_template_keeps_the_previous_hash_acceptance_rules() -> None:
+    permissive_hash = "0x" + "a" * 62
+    assert build_real_crypto_signature_input(
+        algorithm="ml-dsa",
+        standard_profile=default_standard_profile_for_algorithm("ml-dsa"),
+        domain_tag=COMPONENT_VERDICT_DOMAIN,
+        signed_payload_hash=permissive_hash,
+        key_id=KEY_ID,
+        key_version=1,
+    ) == joined_input(algorithm="ml-dsa", signed_payload_hash=permissive_hash, key_id=KEY_ID, key_version=1)
+
+
+class KeyIdText(str):
+    pass
+
+
+def test_v4_signature_input_template_validates_values_outside_the_memoised_path() -> None:
+    template = template_for(key_id=KeyIdText(KEY_ID))
+    assert template.render("a" * 64) == template_for().render("a" * 64)
+    for bad_key_version in (True, 1.0, "1"):
+        with pytest.raises(QwgV4RealCryptoBackendError, match="key_version"):
+            template_for(key_version=bad_key_version)  # type: ignore[arg-type]
+    with pytest.raises(QwgV4RealCryptoBackendError, match="key_id"):
+        template_for(key_id=["not", "hashable"])  # type: ignore[arg-type]
+    with pytest.raises(QwgV4RealCryptoBackendError, match="domain_tag"):
+        real_crypto_signature_input_template(
+            algorithm="ml-dsa",
+            standard_profile=default_standard_profile_for_algorithm("ml-dsa"),
+            domain_tag="DGB-SHIELD-V4-ORCH-RECEIPT:shield.receipt.v2:policy.v1",
+            key_id=KEY_ID,
+            key_version=1,
+        )
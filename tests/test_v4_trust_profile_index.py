@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import pytest
+
+from qwg.v4 import COMPONENT_ROLE
+from qwg.v4.crypto_verdict import validate_crypto_verdict_envelope
+from qwg.v4.signing import verify_test_only_signature
+from qwg.v4.trust_profile import (
+    CLASSICAL_ED25519,
+    ML_DSA,
+    REVOKED,
+    SUPPORTED_ALGORITHMS,
+    TrustProfileIndex,
+    build_test_trust_profile,
+    find_trusted_key,
+    validate_trust_profile,
+)
+from tests.test_v4_crypto_verdict_contract import HASH_A, VERIFY_AT, signed_verdict
+
+
+def revoked_entry(number: int, algorithm: str = ML_DSA) -> dict[str, Any]:
+    return {
+        "role": COMPONENT_ROLE,
+        "key_id": f"retired-{number}",
+        "key_version": 1 + number % 3,
+        "algorithm": algorithm,
+        "not_before": "2020-01-01T00:00:00Z",
+        "not_after": "2030-01-01T00:00:00Z",
+        "status": REVOKED,
+        "public_key": f"TEST-ONLY-RETIRED-{number}",
+    }
+
+
+def registry(revoked: int, *, version: int = 1) -> dict[str, Any]:
+    profile = build_test_trust_profile()
+    profile["registry_version"] = version
+    profile["entries"].extend(revoked_entry(number, SUPPORTED_ALGORITHMS[number % 3]) for number in range(revoked))
+    return profile
+
+
+def outcome(profile: Any, **request: Any) -> Any:
+    try:
+        return find_trusted_key(profile, **request)
+    except ValueError as exc:
+        return str(exc)
+
+
+def test_v4_trust_profile_index_matches_linear_lookup() -> None:
+    profile = registry(300)
+    index = TrustProfileIndex(profile)
+    rng = random.Random(5)
+    windows = [
+        (VERIFY_AT, "2026-06-21T00:00:00Z", "2026-06-21T00:05:00Z"),
+        ("2031-01-01T00:00:00Z", "2026-06-21T00:00:00Z", "2026-06-21T00:05:00Z"),
+        (VERIFY_AT, "2025-06-21T00:00:00Z", "2026-06-21T00:05:00Z"),
+        (VERIFY_AT, "2026-06-21T00:05:00Z", "2026-06-21T00:00:00Z"),
+        ("2026-06-21T00:01:00", "2026-06-21T00:00:00Z", "2026-06-21T00:05:00Z"),
+    ]
+    active_ids = [(entry["key_id"], entry["algorithm"]) for entry in profile["entries"][:3]]
+    for _ in range(400):
+        kind = rng.randrange(4)
+        if kind == 0:
+            key_id, algorithm = rng.choice(active_ids)
+            key_version: Any = 1
+        elif kind == 1:
+            number = rng.randrange(300)
+            key_id, algorithm, key_version = f"retired-{number}", SUPPORTED_ALGORITHMS[number % 3], 1 + number % 3
+        elif kind == 2:
+            key_id, algorithm, key_version = f"unknown-{rng.randrange(50)}", rng.choice(SUPPORTED_ALGORITHMS), 1
+        else:
+            key_id, algorithm, key_version = rng.choice([("", ML_DSA, 1), ("k", "rsa", 1), ("k", ML_DSA, True)])
+        verification_time, not_before, not_after = rng.choice(windows)
+        request = {
+            "key_id": key_id,
+            "key_version": key_version,
+            "algorithm": algorithm,
+            "verification_time": verification_time,
+            "artifact_not_before": not_before,
+            "artifact_not_after": not_after,
+        }
+        assert outcome(index, **request) == outcome(profile, **request)
+    assert index.profile == validate_trust_profile(profile)
+    assert index.stats() == {
+        "registry_version": 1, "entries": 303, "active": 3, "revoked": 300, "reused_entries": 0, "bloom_bits": 6000
+    }
+
+
+def test_v4_trust_profile_index_rejects_revoked_keys_before_signature_work() -> None:
+    calls: list[str] = []
+
+    def counting_verifier(entry: dict[str, Any], key: dict[str, Any]) -> bool:
+        calls.append(entry["algorithm"])
+        return verify_test_only_signature(entry, key)
+
+    profile = build_test_trust_profile()
+    arguments = {"expected_context_hash": HASH_A, "verification_time": VERIFY_AT, "verifier": counting_verifier}
+    checked = validate_crypto_verdict_envelope(signed_verdict(), trust_profile=TrustProfileIndex(profile), **arguments)
+    assert checked["verification_summary"]["verified_algorithms"] == [CLASSICAL_ED25519, ML_DSA]
+    assert calls == [CLASSICAL_ED25519, ML_DSA]
+
+    profile["entries"][1]["status"] = REVOKED
+    profile["registry_version"] = 2
+    calls.clear()
+    with pytest.raises(ValueError, match="key is revoked"):
+        validate_crypto_verdict_envelope(signed_verdict(), trust_profile=TrustProfileIndex(profile), **arguments)
+    assert calls == []
+
+
+def test_v4_trust_profile_index_answers_revocation_queries() -> None:
+    index = TrustProfileIndex(registry(50))
+    assert index.is_revoked(key_id="retired-7", key_version=2, algorithm=SUPPORTED_ALGORITHMS[1]) is True
+    assert index.is_revoked(key_id="retired-7", key_version=1, algorithm=SUPPORTED_ALGORITHMS[1]) is False
+    assert not any(index.is_revoked(key_id=f"unknown-{n}", key_version=1, algorithm=ML_DSA) for n in range(200))
+    unfiltered = TrustProfileIndex(registry(50), bloom_bits_per_key=0)
+    assert unfiltered.stats()["bloom_bits"] == 0
+    assert unfiltered.is_revoked(key_id="retired-7", key_version=2, algorithm=SUPPORTED_ALGORITHMS[1]) is True
+    assert TrustProfileIndex(build_test_trust_profile()).stats()["bloom_bits"] == 0
+
+    key = find_trusted_key(
+        index,
+        key_id=f"test-{COMPONENT_ROLE}-{ML_DSA}-v1",
+        key_version=1,
+        algorithm=ML_DSA,
+        verification_time=VERIFY_AT,
+        artifact_not_before="2026-06-21T00:00:00Z",
+        artifact_not_after="2026-06-21T00:05:00Z",
+    )
+    key["status"] = REVOKED
+    assert index.stats()["active"] == 3
+
+
+def test_v4_trust_profile_index_rebuilds_incrementally() -> None:
+    first = TrustProfileIndex(registry(100))
+    second = first.rebuild(registry(150, version=2))
+    assert second.stats() == {
+        "registry_version": 2, "entries": 153, "active": 3, "revoked": 150, "reused_entries": 103, "bloom_bits": 2000
+    }
+    assert second.is_revoked(key_id="retired-149", key_version=3, algorithm=SUPPORTED_ALGORITHMS[2]) is True
+    assert first.is_revoked(key_id="retired-149", key_version=3, algorithm=SUPPORTED_ALGORITHMS[2]) is False
+
+    grown = second.rebuild(registry(400, version=3))
+    assert grown.stats()["bloom_bits"] == 8000 and grown.stats()["reused_entries"] == 153
+    shrunk = grown.rebuild(registry(10, version=4))
+    assert shrunk.stats()["bloom_bits"] == 200 and shrunk.stats()["revoked"] == 10
+    assert shrunk.rebuild(registry(10, version=4)).profile == shrunk.profile
+
+    with pytest.raises(ValueError, match="must not decrease"):
+        shrunk.rebuild(registry(10, version=3))
+    with pytest.raises(ValueError, match="must increase when entries change"):
+        shrunk.rebuild(registry(11, version=4))
+    tampered = registry(10, version=5)
+    tampered["entries"][5]["key_version"] = True
+    with pytest.raises(ValueError, match="key_version must be positive integer"):
+        shrunk.rebuild(tampered)
+    tampered["entries"][5]["key_version"] = [1]
+    with pytest.raises(ValueError, match="key_version must be positive integer"):
+        shrunk.rebuild(tampered)
+    tampered["entries"][5] = "entry"
+    with pytest.raises(ValueError, match="entry must be dict"):
+        shrunk.rebuild(tampered)
+
+
+@pytest.mark.parametrize(
+    ("mutate", "options", "match"),
+    [
+        (lambda profile: profile["entries"].append(dict(profile["entries"][0])), {}, "duplicate trust profile entry"),
+        (lambda profile: profile["entries"].append(dict(revoked_entry(1))), {}, "duplicate trust profile entry"),
+        (lambda profile: profile.__setitem__("entries", []), {}, "non-empty list"),
+        (lambda profile: None, {"bloom_bits_per_key": -1}, "bloom_bits_per_key"),
+        (lambda profile: None, {"bloom_bits_per_key": True}, "bloom_bits_per_key"),
+    ],
+)
+def test_v4_trust_profile_index_fails_closed_on_bad_input(mutate: Any, options: dict[str, Any], match: str) -> None:
+    profile = registry(3)
+    mutate(profile)
+    with pytest.raises(ValueError, match=match):
+        TrustProfileIndex(profile, **options)
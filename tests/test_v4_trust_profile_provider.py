@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from qwg.v4.crypto_verdict import validate_crypto_verdict_envelope
+from qwg.v4.signing import verify_test_only_signature
+from qwg.v4.trust_profile import ML_DSA, REVOKED, TrustProfileIndex
+from qwg.v4.trust_profile_provider import TrustProfileProvider
+from tests.test_v4_crypto_verdict_contract import HASH_A, VERIFY_AT, signed_verdict
+from tests.test_v4_trust_profile_index import registry
+
+ML_DSA_KEY = f"test-shield_component_qwg-{ML_DSA}-v1"
+
+
+def publish(path: Path, profile: dict[str, Any] | str) -> None:
+    staged = path.with_suffix(".tmp")
+    staged.write_text(profile if isinstance(profile, str) else json.dumps(profile), encoding="utf-8")
+    os.replace(staged, path)
+
+
+def revoke_ml_dsa(profile: dict[str, Any]) -> dict[str, Any]:
+    next(entry for entry in profile["entries"] if entry["key_id"] == ML_DSA_KEY)["status"] = REVOKED
+    return profile
+
+
+def wait_for(condition: Any) -> None:
+    deadline = time.monotonic() + 10
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_v4_trust_profile_provider_swaps_snapshots_on_refresh(tmp_path: Path) -> None:
+    path = tmp_path / "profile.json"
+    publish(path, registry(5))
+    with TrustProfileProvider(path, poll_interval=None) as provider:
+        first = provider.current()
+        assert isinstance(first, TrustProfileIndex)
+        assert provider.refresh() is False
+        publish(path, registry(5))
+        assert provider.refresh() is False
+        assert provider.current() is first
+
+        publish(path, revoke_ml_dsa(registry(6, version=2)))
+        assert provider.refresh() is True
+        assert provider.current().is_revoked(key_id=ML_DSA_KEY, key_version=1, algorithm=ML_DSA)
+        assert not first.is_revoked(key_id=ML_DSA_KEY, key_version=1, algorithm=ML_DSA)
+        assert provider.current().stats()["reused_entries"] == 7
+        assert provider.stats() == {"registry_version": 2, "reloads": 1, "failed_reloads": 0}
+
+
+def test_v4_trust_profile_provider_keeps_last_good_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "profile.json"
+    publish(path, registry(5, version=3))
+    with TrustProfileProvider(path, poll_interval=None) as provider:
+        good = provider.current()
+        for bad, match in (
+            ("{", "Expecting"),
+            ('{"a": 1, "a": 2}', "duplicate"),
+            (registry(5, version=2), "must not decrease"),
+            (registry(6, version=3), "must increase when entries change"),
+        ):
+            publish(path, bad)
+            with pytest.raises(ValueError, match=match):
+                provider.refresh()
+            assert provider.current() is good
+        assert provider.refresh() is False
+        assert provider.stats() == {
+            "registry_version": 3,
+            "reloads": 0,
+            "failed_reloads": 4,
+            "last_error": "registry_version must increase when entries change",
+        }
+        path.unlink()
+        with pytest.raises(FileNotFoundError):
+            provider.refresh()
+        publish(path, registry(6, version=4))
+        assert provider.refresh() is True
+        assert provider.stats() == {"registry_version": 4, "reloads": 1, "failed_reloads": 5}
+
+
+def test_v4_trust_profile_provider_fails_closed_at_startup(tmp_path: Path) -> None:
+    path = tmp_path / "profile.json"
+    with pytest.raises(FileNotFoundError):
+        TrustProfileProvider(path)
+    publish(path, {"schema_version": "x"})
+    with pytest.raises(ValueError, match="trust profile fields"):
+        TrustProfileProvider(path)
+    publish(path, registry(1))
+    for interval in (0, -1, True, "1"):
+        with pytest.raises(ValueError, match="poll_interval must be positive number or None"):
+            TrustProfileProvider(path, poll_interval=interval)  # type: ignore[arg-type]
+
+
+def test_v4_trust_profile_provider_polls_for_changes(tmp_path: Path) -> None:
+    path = tmp_path / "profile.json"
+    publish(path, registry(1))
+    with TrustProfileProvider(path, poll_interval=0.01) as provider:
+        publish(path, registry(2, version=2))
+        wait_for(lambda: provider.current().registry_version == 2)
+        publish(path, "[]")
+        wait_for(lambda: provider.stats()["failed_reloads"] == 1)
+        assert provider.stats()["last_error"] == "json root must be object"
+        assert provider.current().registry_version == 2
+
+
+def test_v4_trust_profile_provider_serves_concurrent_verifiers_during_swaps(tmp_path: Path) -> None:
+    path = tmp_path / "profile.json"
+    publish(path, registry(0))
+    arguments = {"expected_context_hash": HASH_A, "verification_time": VERIFY_AT, "verifier": verify_test_only_signature}
+    envelope = signed_verdict()
+    stop = threading.Event()
+    failures: list[BaseException] = []
+    observed: list[list[int]] = [[] for _ in range(4)]
+
+    with TrustProfileProvider(path, poll_interval=None) as provider:
+
+        def verify(reader: int) -> None:
+            try:
+                while not stop.is_set():
+                    snapshot = provider.current()
+                    observed[reader].append(snapshot.registry_version)
+                    validate_crypto_verdict_envelope(envelope, trust_profile=snapshot, **arguments)
+            except BaseException as exc:  # pragma: no cover - reported below
+                failures.append(exc)
+
+        readers = [threading.Thread(target=verify, args=(reader,)) for reader in range(4)]
+        for reader in readers:
+            reader.start()
+        for version in range(2, 42):
+            publish(path, registry(version * 10, version=version))
+            assert provider.refresh() is True
+            wait_for(lambda version=version: all(versions and versions[-1] >= version for versions in observed))
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+        assert failures == []
+        assert all(versions == sorted(versions) for versions in observed)
+        assert provider.stats()["reloads"] == 40
+
+        publish(path, revoke_ml_dsa(registry(420, version=42)))
+        provider.refresh()
+        with pytest.raises(ValueError, match="key is revoked"):
+            validate_crypto_verdict_envelope(envelope, trust_profile=provider.current(), **arguments)